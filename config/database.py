@@ -1,42 +1,75 @@
 """
 Maryland Viability Atlas - Database Connection Management
-SQLAlchemy + PostGIS configuration
+SQLAlchemy + PostGIS configuration, with an embedded SQLite backend for local runs
 """
 
 from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import NullPool, StaticPool
 from geoalchemy2 import Geometry
 from contextlib import contextmanager
-from typing import Generator
+from typing import Any, Dict, Generator, List, Optional
+import asyncio
 import logging
+import re
+from pathlib import Path
 
-from config.settings import get_settings
+from config.settings import get_settings, MD_COUNTY_FIPS
 
 logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
+# Embedded backend: a sqlite:/// DATABASE_URL runs the pipeline on a local
+# file (or in memory) with no database server, for laptop, profiling and CI
+# runs. PostGIS-only paths (ingestion, tract geometry, the API read model)
+# still need PostgreSQL.
+IS_EMBEDDED = make_url(settings.DATABASE_URL).get_backend_name() == "sqlite"
+
+EMBEDDED_SCHEMA_PATH = str(Path(__file__).resolve().parents[1] / "data" / "schemas" / "schema_embedded.sql")
+
+# PostgreSQL casts that SQLite has no type for; JSON is stored as text
+_EMBEDDED_CASTS = re.compile(r"CAST\(([^()]+?) AS jsonb\)", re.IGNORECASE)
+
+
+def _engine_options(database_url: str) -> Dict[str, Any]:
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        options: Dict[str, Any] = {"connect_args": {"check_same_thread": False}}
+        if url.database in (None, "", ":memory:"):
+            # One shared connection, otherwise every session sees an empty database
+            options["poolclass"] = StaticPool
+        return options
+    return {
+        # For production on Railway, use NullPool to avoid connection exhaustion
+        "poolclass": NullPool if settings.ENVIRONMENT == "production" else None,
+        "connect_args": {"options": "-c timezone=utc"},
+    }
+
+
 # SQLAlchemy engine
-# For production on Railway, use NullPool to avoid connection exhaustion
 engine = create_engine(
     settings.DATABASE_URL,
-    poolclass=NullPool if settings.ENVIRONMENT == "production" else None,
     echo=settings.DEBUG,
-    connect_args={
-        "options": "-c timezone=utc"
-    }
+    **_engine_options(settings.DATABASE_URL)
 )
 
-# Enable PostGIS on connection
-@event.listens_for(engine, "connect")
-def receive_connect(dbapi_conn, connection_record):
-    """Ensure PostGIS is available on connection"""
-    with dbapi_conn.cursor() as cursor:
-        cursor.execute("SELECT PostGIS_version();")
-        version = cursor.fetchone()
-        logger.debug(f"PostGIS version: {version[0] if version else 'Unknown'}")
+if IS_EMBEDDED:
+    @event.listens_for(engine, "before_cursor_execute", retval=True)
+    def translate_embedded_sql(conn, cursor, statement, parameters, context, executemany):
+        """Drop PostgreSQL-only casts so shared statements run on SQLite"""
+        return _EMBEDDED_CASTS.sub(r"\1", statement), parameters
+else:
+    # Enable PostGIS on connection
+    @event.listens_for(engine, "connect")
+    def receive_connect(dbapi_conn, connection_record):
+        """Ensure PostGIS is available on connection"""
+        with dbapi_conn.cursor() as cursor:
+            cursor.execute("SELECT PostGIS_version();")
+            version = cursor.fetchone()
+            logger.debug(f"PostGIS version: {version[0] if version else 'Unknown'}")
 
 
 # Session factory
@@ -72,6 +105,26 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+@contextmanager
+def use_db(db: Optional[Session] = None) -> Generator[Session, None, None]:
+    """
+    Session for a write that can join a caller's transaction.
+
+    With ``db`` the caller owns the transaction and nothing is committed here;
+    without it a new get_db() session commits on exit.
+
+    Usage:
+        def store_rows(rows, db=None):
+            with use_db(db) as session:
+                session.execute(...)
+    """
+    if db is not None:
+        yield db
+        return
+    with get_db() as session:
+        yield session
+
+
 def get_db_session() -> Session:
     """
     Dependency for FastAPI endpoints.
@@ -88,6 +141,104 @@ def get_db_session() -> Session:
         pass  # FastAPI will close it
 
 
+# Async access for the API
+# The FastAPI routes are coroutines; running blocking queries in them stalls every
+# request on the worker. AsyncDatabase gives them non-blocking reads: through
+# asyncpg (pooled connections, per-connection prepared statement cache) when the
+# async stack is installed, otherwise by running the sync engine in a thread.
+
+try:
+    import asyncpg  # noqa: F401
+    from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+    ASYNC_DRIVER_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    ASYNC_DRIVER_AVAILABLE = False
+
+_async_engine = None
+
+
+def get_async_engine() -> Optional["AsyncEngine"]:
+    """
+    Lazily create the asyncpg engine, or return None when it is unavailable
+    (asyncpg/greenlet missing or a non-PostgreSQL DATABASE_URL).
+    """
+    global _async_engine
+    if _async_engine is not None or not ASYNC_DRIVER_AVAILABLE:
+        return _async_engine
+
+    url = make_url(settings.DATABASE_URL)
+    if url.get_backend_name() != "postgresql":
+        return None
+    url = url.set(drivername="postgresql+asyncpg").update_query_dict(
+        {"prepared_statement_cache_size": str(settings.DB_STATEMENT_CACHE_SIZE)}
+    )
+    _async_engine = create_async_engine(
+        url,
+        pool_size=settings.DB_ASYNC_POOL_SIZE,
+        max_overflow=settings.DB_ASYNC_MAX_OVERFLOW,
+        pool_pre_ping=True,
+        echo=settings.DEBUG,
+        connect_args={"server_settings": {"timezone": "utc"}},
+    )
+    return _async_engine
+
+
+async def dispose_async_engine() -> None:
+    """Close pooled async connections (API shutdown)."""
+    global _async_engine
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+
+
+class AsyncDatabase:
+    """
+    Read-only query helper for async routes.
+
+    Each call checks out its own pooled connection, so independent queries for
+    one response can run concurrently:
+
+        layer, ts = await asyncio.gather(db.fetchone(q1, p1), db.fetchone(q2, p2))
+
+    Reuse module-level ``text()`` constants for hot queries: asyncpg prepares a
+    statement once per connection and serves repeats from its statement cache.
+    """
+
+    async def _execute(self, query, params: Optional[Dict[str, Any]], fetch: str):
+        async_engine = get_async_engine()
+        if async_engine is not None:
+            async with async_engine.connect() as conn:
+                result = await conn.execute(query, params or {})
+                return getattr(result, fetch)()
+        return await asyncio.to_thread(self._execute_sync, query, params, fetch)
+
+    @staticmethod
+    def _execute_sync(query, params: Optional[Dict[str, Any]], fetch: str):
+        with engine.connect() as conn:
+            return getattr(conn.execute(query, params or {}), fetch)()
+
+    async def fetchone(self, query, params: Optional[Dict[str, Any]] = None):
+        return await self._execute(query, params, "fetchone")
+
+    async def fetchall(self, query, params: Optional[Dict[str, Any]] = None) -> List[Any]:
+        return await self._execute(query, params, "fetchall")
+
+
+_async_db = AsyncDatabase()
+
+
+def get_async_db() -> AsyncDatabase:
+    """
+    Dependency for async FastAPI endpoints.
+
+    Usage:
+        @app.get("/endpoint")
+        async def endpoint(db: AsyncDatabase = Depends(get_async_db)):
+            row = await db.fetchone(QUERY, {"geoid": geoid})
+    """
+    return _async_db
+
+
 def test_connection() -> bool:
     """
     Test database connectivity and PostGIS availability.
@@ -101,6 +252,10 @@ def test_connection() -> bool:
             result = db.execute(text("SELECT 1"))
             assert result.scalar() == 1
 
+            if IS_EMBEDDED:
+                logger.info(f"Embedded database connection successful: {engine.url}")
+                return True
+
             # Test PostGIS
             result = db.execute(text("SELECT PostGIS_version()"))
             version = result.scalar()
@@ -130,6 +285,10 @@ def init_db():
     """
     logger.info("Initializing database schema...")
 
+    if IS_EMBEDDED:
+        init_embedded_db()
+        return
+
     try:
         # Use psql command directly to avoid SQL parsing issues
         import subprocess
@@ -217,6 +376,34 @@ def init_db():
         raise
 
 
+def init_embedded_db():
+    """
+    Create the embedded (SQLite) schema and load the county reference rows.
+
+    Idempotent: tables are created only if missing and counties are upserted.
+    """
+    with open(EMBEDDED_SCHEMA_PATH, 'r') as f:
+        schema_sql = f.read()
+
+    raw = engine.raw_connection()
+    try:
+        raw.executescript(schema_sql)
+        raw.commit()
+    finally:
+        raw.close()
+
+    with get_db() as db:
+        db.execute(
+            text("""
+                INSERT INTO md_counties (fips_code, county_name) VALUES (:fips_code, :county_name)
+                ON CONFLICT (fips_code) DO UPDATE SET county_name = excluded.county_name
+            """),
+            [{"fips_code": fips, "county_name": name} for fips, name in MD_COUNTY_FIPS.items()]
+        )
+
+    logger.info(f"Embedded database initialized from {EMBEDDED_SCHEMA_PATH}")
+
+
 def log_refresh(
     layer_name: str,
     data_source: str,
@@ -298,41 +485,62 @@ def get_latest_data_year(layer_table: str) -> int:
         return year if year else 0
 
 
-def bulk_insert(table_name: str, records: list[dict], conflict_cols: list[str] = None):
+def bulk_insert(
+    table_name: str,
+    records: list[dict],
+    conflict_cols: list[str] = None,
+    keep_existing: bool = False,
+    db: Optional[Session] = None
+):
     """
     Bulk insert with optional conflict resolution.
 
+    One INSERT is compiled and executed with all records as parameters; on
+    PostgreSQL SQLAlchemy batches them into multi-row VALUES pages
+    (insertmanyvalues), on SQLite they go through executemany. Either way a
+    large batch costs a few round trips instead of one per row.
+
     Args:
         table_name: Name of table to insert into
-        records: List of dictionaries (column: value)
+        records: List of dictionaries (column: value), all with the same keys
         conflict_cols: Columns to use for ON CONFLICT clause (upsert)
+        keep_existing: On conflict, keep the stored value where the new one is NULL
+        db: Session to write in; the caller commits (default: own transaction)
     """
     if not records:
         logger.warning(f"No records to insert into {table_name}")
         return
 
-    with get_db() as db:
-        from sqlalchemy import table, column, insert
-        from sqlalchemy.dialects.postgresql import insert as pg_insert
-
-        # Dynamically create table object
-        cols = [column(k) for k in records[0].keys()]
-        tbl = table(table_name, *cols)
-
-        if conflict_cols:
-            # Upsert
-            stmt = pg_insert(tbl).values(records)
-            update_dict = {c.name: c for c in stmt.excluded if c.name not in conflict_cols}
-            stmt = stmt.on_conflict_do_update(
-                index_elements=conflict_cols,
-                set_=update_dict
-            )
-        else:
-            # Simple insert
-            stmt = insert(tbl).values(records)
+    from sqlalchemy import table, column, func, insert
+    if IS_EMBEDDED:
+        from sqlalchemy.dialects.sqlite import insert as upsert_insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert as upsert_insert
+
+    # Dynamically create table object
+    cols = [column(k) for k in records[0].keys()]
+    tbl = table(table_name, *cols)
+
+    if conflict_cols:
+        # Upsert
+        stmt = upsert_insert(tbl)
+        update_dict = {
+            c.name: func.coalesce(c, tbl.c[c.name]) if keep_existing else c
+            for c in stmt.excluded
+            if c.name not in conflict_cols
+        }
+        stmt = stmt.on_conflict_do_update(
+            index_elements=conflict_cols,
+            set_=update_dict
+        )
+    else:
+        # Simple insert
+        stmt = insert(tbl)
+
+    with use_db(db) as session:
+        session.execute(stmt, records)
 
-        db.execute(stmt)
-        logger.info(f"Bulk inserted {len(records)} records into {table_name}")
+    logger.info(f"Bulk inserted {len(records)} records into {table_name}")
 
 
 if __name__ == "__main__":
@@ -25,6 +25,9 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str
+    DB_ASYNC_POOL_SIZE: int = 10  # Async API pool (asyncpg)
+    DB_ASYNC_MAX_OVERFLOW: int = 10
+    DB_STATEMENT_CACHE_SIZE: int = 256  # Prepared statements cached per connection
 
     # External APIs
     MAPBOX_ACCESS_TOKEN: str
@@ -52,6 +55,12 @@ class Settings(BaseSettings):
     CENSUS_API_RATE_LIMIT: int = 8  # Conservative: 500/day = ~8/min
     BLS_API_RATE_LIMIT: int = 8
     USASPENDING_RATE_LIMIT: int = 60  # No documented limit, be respectful
+    FEMA_NFHL_RATE_LIMIT: int = 120  # Per host, shared by all NFHL workers
+    # Token-bucket capacity (calls allowed back-to-back before the rate applies)
+    CENSUS_API_BURST: int = 2
+    BLS_API_BURST: int = 2
+    USASPENDING_BURST: int = 5
+    RATE_LIMIT_STATE_PATH: Optional[str] = None  # SQLite file shared by worker processes
 
     # Data sources
     LEHD_BASE_URL: str = "https://lehd.ces.census.gov/data/lodes/LODES8"
@@ -62,6 +71,9 @@ class Settings(BaseSettings):
     FEMA_NFHL_URL_FALLBACK: str = "https://hazards.fema.gov/gis/nfhl/rest/services/public/NFHL/MapServer"
     FEMA_NFHL_FEATURE_URL: str = "https://services.arcgis.com/2gdL2gxYNFY2TOUb/arcgis/rest/services/FEMA_National_Flood_Hazard_Layer/FeatureServer/0"
     FEMA_SKIP_NFHL: bool = True
+    FEMA_NFHL_MAX_WORKERS: int = 4
+    FEMA_NFHL_TILE_CACHE_DIR: str = "data/cache/risk/nfhl_tiles"
+    FEMA_NFHL_TILE_MAX_AGE_DAYS: int = 90  # Cached tiles older than this are refetched
     EPA_EJSCREEN_URL: str = "https://gaftp.epa.gov/EJSCREEN"
     EPA_EJSCREEN_ZENODO_URL: Optional[str] = "https://zenodo.org/records/14767363/files/2023.zip?download=1"
     NOAA_SLR_DATA_URL: Optional[str] = None
@@ -92,6 +104,27 @@ class Settings(BaseSettings):
     CENSUS_QWI_DATA_PATH: Optional[str] = None
     CENSUS_QWI_DATASET: str = "timeseries/qwi/sa"
 
+    # Ingestion concurrency
+    LAYER6_FETCH_MAX_WORKERS: int = 6  # Concurrent Layer 6 source loaders
+    HTTP_MAX_CONNECTIONS: int = 20  # Shared keep-alive pool for external fetchers
+    HTTP_RETRY_ATTEMPTS: int = 3
+    HTTP_FANOUT_CONCURRENCY: int = 8  # In-flight requests per fan-out batch
+    DOWNLOAD_SEGMENTS: int = 4  # Parallel Range requests per large download
+    DOWNLOAD_MIN_SEGMENT_MB: int = 16  # Smaller files are fetched in one stream
+    NATIONAL_CSV_CHUNKSIZE: int = 100_000  # Rows per chunk when streaming national files
+    STATE_SUBSET_CACHE_DIR: str = "data/cache/state_subsets"
+    STATE_SUBSET_MAX_AGE_DAYS: int = 30  # Cached subsets older than this are refetched
+    COVERAGE_SNAPSHOT_RETENTION_DAYS: int = 90  # Older coverage snapshots are pruned
+
+    # Processing concurrency
+    NORMALIZATION_MAX_WORKERS: int = 4  # Layers fetched and normalized concurrently
+
+    # HTTP record/replay (off | record | replay | auto)
+    HTTP_REPLAY_MODE: str = "off"
+    HTTP_REPLAY_DIR: str = "data/cache/http_replay"
+    HTTP_REPLAY_LATENCY_MS: float = 0.0  # Simulated time-to-first-byte on replay
+    HTTP_REPLAY_BANDWIDTH_MBPS: float = 0.0  # Simulated link speed on replay; 0 = unthrottled
+
     # Maryland state FIPS code
     MD_STATE_FIPS: str = "24"
 
@@ -107,8 +140,12 @@ class Settings(BaseSettings):
 
     # File storage
     EXPORT_DIR: str = "exports"
+    EXPORT_COORDINATE_PRECISION: int = 6  # Decimal places (~0.1 m) in GeoJSON coordinates
     LOG_DIR: str = "logs"
 
+    # What-if scenarios (in-memory baseline reused across requests)
+    SCENARIO_CACHE_SECONDS: int = 900
+
     # Classification thresholds (directional status)
     THRESHOLD_IMPROVING_MIN_LAYERS: int = 3  # Layers above high threshold
     THRESHOLD_IMPROVING_HIGH: float = 0.6  # High performance threshold
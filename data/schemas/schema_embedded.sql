@@ -0,0 +1,341 @@
+-- ============================================================================
+-- EMBEDDED (SQLite) SCHEMA
+-- Local, profiling and CI runs without a database server
+-- ============================================================================
+--
+-- Used when DATABASE_URL is a sqlite:/// URL (config/database.py::init_embedded_db).
+-- Covers the tables the multi-year pipeline and county export read and write:
+-- layer index columns, timeseries features, summary scores, final synthesis,
+-- sensitivity, coverage snapshots and bookkeeping. Column names match
+-- schema.sql, schema_timeseries.sql and the migrations; types use SQLite
+-- affinities (NUMERIC -> REAL, JSONB -> TEXT, no geometry).
+--
+-- Tract layer tables carry only the headline score column the tract synthesis
+-- reads. Ingestion and the API read model remain PostgreSQL-only.
+
+CREATE TABLE IF NOT EXISTS md_counties (
+    fips_code TEXT PRIMARY KEY,
+    county_name TEXT NOT NULL,
+    land_area_sq_mi REAL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS data_refresh_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    layer_name TEXT NOT NULL,
+    data_source TEXT NOT NULL,
+    refresh_date TIMESTAMP NOT NULL,
+    records_processed INTEGER,
+    records_inserted INTEGER,
+    records_updated INTEGER,
+    status TEXT CHECK (status IN ('success', 'partial', 'failed')),
+    error_message TEXT,
+    metadata TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- ============================================================================
+-- LAYER INDICES (inputs to timeseries feature extraction)
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS layer1_employment_gravity (
+    fips_code TEXT REFERENCES md_counties(fips_code),
+    data_year INTEGER NOT NULL,
+    economic_opportunity_index REAL,
+    economic_opportunity_index_effective REAL,
+    UNIQUE(fips_code, data_year)
+);
+
+CREATE TABLE IF NOT EXISTS layer2_mobility_optionality (
+    fips_code TEXT REFERENCES md_counties(fips_code),
+    data_year INTEGER NOT NULL,
+    mobility_optionality_index REAL,
+    mobility_optionality_index_effective REAL,
+    UNIQUE(fips_code, data_year)
+);
+
+CREATE TABLE IF NOT EXISTS layer3_school_trajectory (
+    fips_code TEXT REFERENCES md_counties(fips_code),
+    data_year INTEGER NOT NULL,
+    education_opportunity_index REAL,
+    education_opportunity_index_effective REAL,
+    UNIQUE(fips_code, data_year)
+);
+
+CREATE TABLE IF NOT EXISTS layer4_housing_elasticity (
+    fips_code TEXT REFERENCES md_counties(fips_code),
+    data_year INTEGER NOT NULL,
+    housing_opportunity_index REAL,
+    housing_opportunity_index_effective REAL,
+    UNIQUE(fips_code, data_year)
+);
+
+CREATE TABLE IF NOT EXISTS layer5_demographic_momentum (
+    fips_code TEXT REFERENCES md_counties(fips_code),
+    data_year INTEGER NOT NULL,
+    demographic_opportunity_index REAL,
+    demographic_opportunity_index_effective REAL,
+    UNIQUE(fips_code, data_year)
+);
+
+CREATE TABLE IF NOT EXISTS layer6_risk_drag (
+    fips_code TEXT REFERENCES md_counties(fips_code),
+    data_year INTEGER NOT NULL,
+    risk_drag_index REAL,
+    risk_drag_index_effective REAL,
+    UNIQUE(fips_code, data_year)
+);
+
+-- ============================================================================
+-- TRACT LAYER SCORES (inputs to tract-level synthesis)
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS layer1_economic_opportunity_tract (
+    tract_geoid TEXT NOT NULL,
+    fips_code TEXT NOT NULL,
+    data_year INTEGER NOT NULL,
+    economic_accessibility_score REAL,
+    UNIQUE(tract_geoid, data_year)
+);
+
+CREATE TABLE IF NOT EXISTS layer2_mobility_accessibility_tract (
+    tract_geoid TEXT NOT NULL,
+    fips_code TEXT NOT NULL,
+    data_year INTEGER NOT NULL,
+    multimodal_accessibility_score REAL,
+    UNIQUE(tract_geoid, data_year)
+);
+
+CREATE TABLE IF NOT EXISTS layer3_education_accessibility_tract (
+    tract_geoid TEXT NOT NULL,
+    fips_code TEXT NOT NULL,
+    data_year INTEGER NOT NULL,
+    education_opportunity_score REAL,
+    UNIQUE(tract_geoid, data_year)
+);
+
+CREATE TABLE IF NOT EXISTS layer4_housing_affordability_tract (
+    tract_geoid TEXT NOT NULL,
+    fips_code TEXT NOT NULL,
+    data_year INTEGER NOT NULL,
+    housing_affordability_score REAL,
+    UNIQUE(tract_geoid, data_year)
+);
+
+CREATE TABLE IF NOT EXISTS layer5_demographic_equity_tract (
+    tract_geoid TEXT NOT NULL,
+    fips_code TEXT NOT NULL,
+    data_year INTEGER NOT NULL,
+    demographic_opportunity_score REAL,
+    UNIQUE(tract_geoid, data_year)
+);
+
+CREATE TABLE IF NOT EXISTS layer6_risk_vulnerability_tract (
+    tract_geoid TEXT NOT NULL,
+    fips_code TEXT NOT NULL,
+    data_year INTEGER NOT NULL,
+    static_risk_score REAL,
+    UNIQUE(tract_geoid, data_year)
+);
+
+-- ============================================================================
+-- MULTI-YEAR EVIDENCE ENGINE
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS layer_timeseries_features (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    geoid TEXT NOT NULL REFERENCES md_counties(fips_code),
+    layer_name TEXT NOT NULL,
+    as_of_year INTEGER NOT NULL,
+    level_latest REAL,
+    level_baseline REAL,
+    momentum_slope REAL,
+    momentum_delta REAL,
+    momentum_percent_change REAL,
+    momentum_fit_quality REAL,
+    stability_volatility REAL,
+    stability_cv REAL,
+    stability_consistency REAL,
+    stability_persistence INTEGER,
+    coverage_years INTEGER NOT NULL,
+    min_year INTEGER,
+    max_year INTEGER,
+    data_gaps TEXT,
+    window_size INTEGER DEFAULT 5,
+    computation_method TEXT,
+    notes TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(geoid, layer_name, as_of_year)
+);
+
+CREATE TABLE IF NOT EXISTS layer_summary_scores (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    geoid TEXT NOT NULL REFERENCES md_counties(fips_code),
+    layer_name TEXT NOT NULL,
+    as_of_year INTEGER NOT NULL,
+    layer_level_score REAL,
+    layer_momentum_score REAL,
+    layer_stability_score REAL,
+    layer_overall_score REAL,
+    missingness_penalty REAL,
+    has_momentum BOOLEAN DEFAULT FALSE,
+    has_stability BOOLEAN DEFAULT FALSE,
+    coverage_years INTEGER,
+    weights TEXT,
+    normalization_method TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(geoid, layer_name, as_of_year)
+);
+
+CREATE TABLE IF NOT EXISTS final_synthesis_current (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    geoid TEXT NOT NULL UNIQUE REFERENCES md_counties(fips_code),
+    current_as_of_year INTEGER NOT NULL,
+    per_layer_coverage TEXT,
+    final_grouping TEXT NOT NULL,
+    directional_status TEXT NOT NULL,
+    confidence_level TEXT NOT NULL,
+    uncertainty_level TEXT,
+    uncertainty_reasons TEXT,
+    composite_score REAL,
+    risk_drag_applied REAL,
+    drivers TEXT,
+    constraints TEXT,
+    coverage_summary TEXT,
+    employment_gravity_score REAL,
+    mobility_optionality_score REAL,
+    school_trajectory_score REAL,
+    housing_elasticity_score REAL,
+    demographic_momentum_score REAL,
+    risk_drag_score REAL,
+    classification_version TEXT,
+    notes TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS classification_sensitivity (
+    geoid TEXT NOT NULL,
+    as_of_year INTEGER NOT NULL,
+    n_scenarios INTEGER NOT NULL,
+    baseline_rank REAL,
+    rank_p05 REAL,
+    rank_median REAL,
+    rank_p95 REAL,
+    baseline_grouping TEXT,
+    modal_grouping TEXT,
+    grouping_stability REAL,
+    directional_stability REAL,
+    grouping_frequencies TEXT,
+    directional_frequencies TEXT,
+    parameters TEXT,
+    computed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (geoid, as_of_year)
+);
+
+CREATE TABLE IF NOT EXISTS feature_coverage_snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    computed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    feature_count INTEGER NOT NULL,
+    report TEXT NOT NULL
+);
+
+-- ============================================================================
+-- TRACT-LEVEL MULTI-YEAR SYNTHESIS (migration 024)
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS layer_timeseries_features_tract (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    geoid TEXT NOT NULL,
+    fips_code TEXT NOT NULL,
+    layer_name TEXT NOT NULL,
+    as_of_year INTEGER NOT NULL,
+    level_latest REAL,
+    level_baseline REAL,
+    momentum_slope REAL,
+    momentum_delta REAL,
+    momentum_percent_change REAL,
+    momentum_fit_quality REAL,
+    stability_volatility REAL,
+    stability_cv REAL,
+    stability_consistency REAL,
+    stability_persistence INTEGER,
+    coverage_years INTEGER NOT NULL,
+    min_year INTEGER,
+    max_year INTEGER,
+    data_gaps TEXT,
+    window_size INTEGER DEFAULT 5,
+    computation_method TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(geoid, layer_name, as_of_year)
+);
+
+CREATE INDEX IF NOT EXISTS idx_tract_timeseries_year_layer
+    ON layer_timeseries_features_tract(as_of_year, layer_name);
+
+CREATE TABLE IF NOT EXISTS layer_summary_scores_tract (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    geoid TEXT NOT NULL,
+    fips_code TEXT NOT NULL,
+    layer_name TEXT NOT NULL,
+    as_of_year INTEGER NOT NULL,
+    layer_level_score REAL,
+    layer_momentum_score REAL,
+    layer_stability_score REAL,
+    layer_overall_score REAL,
+    missingness_penalty REAL,
+    has_momentum BOOLEAN DEFAULT FALSE,
+    has_stability BOOLEAN DEFAULT FALSE,
+    coverage_years INTEGER,
+    weights TEXT,
+    normalization_method TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(geoid, layer_name, as_of_year)
+);
+
+CREATE INDEX IF NOT EXISTS idx_tract_layer_scores_year_layer
+    ON layer_summary_scores_tract(as_of_year, layer_name);
+
+CREATE TABLE IF NOT EXISTS final_synthesis_current_tract (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    geoid TEXT NOT NULL UNIQUE,
+    fips_code TEXT NOT NULL,
+    current_as_of_year INTEGER NOT NULL,
+    final_grouping TEXT NOT NULL,
+    directional_status TEXT NOT NULL,
+    confidence_level TEXT NOT NULL,
+    uncertainty_level TEXT,
+    uncertainty_reasons TEXT,
+    composite_score REAL,
+    risk_drag_applied REAL,
+    employment_gravity_score REAL,
+    mobility_optionality_score REAL,
+    school_trajectory_score REAL,
+    housing_elasticity_score REAL,
+    demographic_momentum_score REAL,
+    risk_drag_score REAL,
+    classification_version TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_tract_synthesis_county
+    ON final_synthesis_current_tract(fips_code);
+
+-- ============================================================================
+-- EXPORT BOOKKEEPING
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS export_versions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    version TEXT UNIQUE NOT NULL,
+    export_date TIMESTAMP NOT NULL,
+    data_year INTEGER NOT NULL,
+    geojson_path TEXT,
+    record_count INTEGER,
+    checksum TEXT,
+    metadata TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
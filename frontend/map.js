@@ -8,6 +8,7 @@ const GEOJSON_PATH = `${API_BASE_URL}/layers/counties/latest`;  // API endpoint
 
 // Currently selected county FIPS (for layer detail lookups)
 let currentFipsCode = null;
+let layerDetailsRequest = null;  // { fipsCode, promise } for the open county's layers
 
 // Color schemes for different layers
 const SYNTHESIS_COLORS = {
@@ -795,6 +796,7 @@ async function loadCountyDetail(fipsCode) {
             panel.classList.remove('pulse-live', 'pulse-work', 'pulse-learn', 'pulse-transit');
         }
         currentFipsCode = fipsCode;
+        prefetchLayerDetails(fipsCode);
         const response = await fetch(`${API_BASE_URL}/areas/${fipsCode}`);
         const data = await response.json();
 
@@ -907,6 +909,29 @@ async function loadCountyDetail(fipsCode) {
     }
 }
 
+// Fetch every layer breakdown for a county in one request, keyed by layer_key
+function prefetchLayerDetails(fipsCode) {
+    const promise = fetch(`${API_BASE_URL}/areas/${fipsCode}/layers`)
+        .then(response => (response.ok ? response.json() : []))
+        .then(layers => Object.fromEntries(layers.map(layer => [layer.layer_key, layer])))
+        .catch(() => ({}));
+    layerDetailsRequest = { fipsCode, promise };
+}
+
+async function fetchLayerDetail(fipsCode, layerKey) {
+    if (layerDetailsRequest && layerDetailsRequest.fipsCode === fipsCode) {
+        const layers = await layerDetailsRequest.promise;
+        if (layers[layerKey]) {
+            return layers[layerKey];
+        }
+    }
+    const response = await fetch(`${API_BASE_URL}/areas/${fipsCode}/layers/${layerKey}`);
+    if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    return response.json();
+}
+
 // Load layer detail and show modal
 async function loadLayerDetail(layerKey) {
     if (!currentFipsCode) {
@@ -915,13 +940,7 @@ async function loadLayerDetail(layerKey) {
     }
 
     try {
-        const response = await fetch(`${API_BASE_URL}/areas/${currentFipsCode}/layers/${layerKey}`);
-
-        if (!response.ok) {
-            throw new Error(`HTTP error! status: ${response.status}`);
-        }
-
-        const data = await response.json();
+        const data = await fetchLayerDetail(currentFipsCode, layerKey);
 
         // Update modal header
         document.getElementById('layer-modal-title').textContent = data.display_name;
@@ -1055,6 +1074,7 @@ function closePanel() {
         map.setFilter('counties-hover', ['==', 'fips_code', '']);
     }
     currentFipsCode = null;
+    layerDetailsRequest = null;
 }
 
 // Clear selection (called from header button)
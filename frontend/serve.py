@@ -21,7 +21,8 @@ class CORSRequestHandler(http.server.SimpleHTTPRequestHandler):
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-        self.send_header('Cache-Control', 'no-store, no-cache, must-revalidate')
+        # Revalidate on every load (If-Modified-Since -> 304) instead of refetching
+        self.send_header('Cache-Control', 'no-cache')
         super().end_headers()
 
     def do_OPTIONS(self):
@@ -0,0 +1,18 @@
+-- Migration 021: Denormalized API read model
+-- Date: 2026-10-18
+--
+-- One pre-rendered response per (geoid, layer_key), rebuilt at the end of the
+-- multi-year pipeline by src/api/read_model.py::refresh_read_model.
+-- layer_key is 'area' for the area detail (final synthesis) row, otherwise a
+-- key of LAYER_CONFIGS (employment_gravity, mobility_optionality, ...).
+
+CREATE TABLE IF NOT EXISTS api_read_model (
+    geoid VARCHAR(5) NOT NULL REFERENCES md_counties(fips_code),
+    layer_key VARCHAR(40) NOT NULL,
+    data_year INTEGER,
+    payload JSONB NOT NULL,               -- AreaDetail / LayerDetail response body
+    refreshed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (geoid, layer_key)
+);
+
+COMMENT ON TABLE api_read_model IS 'Pre-joined area and layer detail responses served by the API (one row per geoid x layer)';
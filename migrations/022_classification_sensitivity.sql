@@ -0,0 +1,27 @@
+-- Migration 022: Classification sensitivity summary
+-- Date: 2026-10-18
+--
+-- Monte Carlo stability of composite ranks and final groupings under sampled
+-- weights and threshold perturbations (src/processing/sensitivity.py).
+-- One row per (geoid, as_of_year); per-scenario draws are not stored.
+
+CREATE TABLE IF NOT EXISTS classification_sensitivity (
+    geoid VARCHAR(5) NOT NULL,
+    as_of_year INTEGER NOT NULL,
+    n_scenarios INTEGER NOT NULL,
+    baseline_rank NUMERIC(6,1),            -- composite rank with pipeline parameters (1 = highest)
+    rank_p05 NUMERIC(6,1),
+    rank_median NUMERIC(6,1),
+    rank_p95 NUMERIC(6,1),
+    baseline_grouping VARCHAR(30),
+    modal_grouping VARCHAR(30),
+    grouping_stability NUMERIC(5,4),       -- share of scenarios keeping the baseline grouping
+    directional_stability NUMERIC(5,4),    -- share of scenarios keeping the baseline directional status
+    grouping_frequencies JSONB,            -- {final_grouping: share}
+    directional_frequencies JSONB,         -- {directional_status: share}
+    parameters JSONB,                      -- sampling parameters (scenarios, concentration, jitter, seed)
+    computed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (geoid, as_of_year)
+);
+
+COMMENT ON TABLE classification_sensitivity IS 'Per-geography rank intervals and classification stability from Monte Carlo weight/threshold sampling';
@@ -0,0 +1,18 @@
+-- Migration 023: Feature coverage snapshots
+-- Date: 2026-10-18
+--
+-- Registry feature coverage (counties with a non-null value per feature and
+-- data year), captured after each multi-year pipeline run by
+-- src/processing/coverage.py and served by GET /api/v1/metadata/coverage.
+
+CREATE TABLE IF NOT EXISTS feature_coverage_snapshots (
+    id SERIAL PRIMARY KEY,
+    computed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    feature_count INTEGER NOT NULL,
+    report JSONB NOT NULL                  -- {computed_at, features: [...], by_year: [...]}
+);
+
+CREATE INDEX IF NOT EXISTS idx_feature_coverage_snapshots_computed
+    ON feature_coverage_snapshots(computed_at DESC);
+
+COMMENT ON TABLE feature_coverage_snapshots IS 'Point-in-time feature coverage reports (one row per pipeline run)';
@@ -0,0 +1,98 @@
+-- Migration 024: Tract-level multi-year synthesis
+-- Date: 2026-10-18
+--
+-- Tract-grained counterparts of layer_timeseries_features, layer_summary_scores
+-- and final_synthesis_current, written by src/processing/tract_multiyear.py
+-- from the layer*_tract headline score columns. Same columns as the county
+-- tables plus fips_code for county rollups; geoid is the 11-digit tract GEOID.
+--
+-- The ratio features are unconstrained NUMERIC: tract series are percentile
+-- ranks across ~1,475 tracts, so a baseline near 1/1475 yields percent changes
+-- and CVs far beyond the county NUMERIC(8,4) range.
+
+CREATE TABLE IF NOT EXISTS layer_timeseries_features_tract (
+    id SERIAL PRIMARY KEY,
+    geoid VARCHAR(11) NOT NULL,
+    fips_code VARCHAR(5) NOT NULL,
+    layer_name VARCHAR(50) NOT NULL,
+    as_of_year INTEGER NOT NULL,
+    level_latest NUMERIC(10,6),
+    level_baseline NUMERIC(10,6),
+    momentum_slope NUMERIC(10,6),
+    momentum_delta NUMERIC(10,6),
+    momentum_percent_change NUMERIC,
+    momentum_fit_quality NUMERIC,
+    stability_volatility NUMERIC(10,6),
+    stability_cv NUMERIC,
+    stability_consistency NUMERIC(5,4),
+    stability_persistence INTEGER,
+    coverage_years INTEGER NOT NULL,
+    min_year INTEGER,
+    max_year INTEGER,
+    data_gaps JSONB,
+    window_size INTEGER DEFAULT 5,
+    computation_method VARCHAR(50),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_tract_timeseries UNIQUE (geoid, layer_name, as_of_year)
+);
+
+CREATE INDEX IF NOT EXISTS idx_tract_timeseries_year_layer
+    ON layer_timeseries_features_tract(as_of_year, layer_name);
+CREATE INDEX IF NOT EXISTS idx_tract_timeseries_county
+    ON layer_timeseries_features_tract(fips_code, as_of_year);
+
+CREATE TABLE IF NOT EXISTS layer_summary_scores_tract (
+    id SERIAL PRIMARY KEY,
+    geoid VARCHAR(11) NOT NULL,
+    fips_code VARCHAR(5) NOT NULL,
+    layer_name VARCHAR(50) NOT NULL,
+    as_of_year INTEGER NOT NULL,
+    layer_level_score NUMERIC(5,4),
+    layer_momentum_score NUMERIC(5,4),
+    layer_stability_score NUMERIC(5,4),
+    layer_overall_score NUMERIC(5,4),
+    missingness_penalty NUMERIC(5,4),
+    has_momentum BOOLEAN DEFAULT FALSE,
+    has_stability BOOLEAN DEFAULT FALSE,
+    coverage_years INTEGER,
+    weights JSONB,
+    normalization_method VARCHAR(50),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_tract_layer_scores UNIQUE (geoid, layer_name, as_of_year)
+);
+
+CREATE INDEX IF NOT EXISTS idx_tract_layer_scores_year_layer
+    ON layer_summary_scores_tract(as_of_year, layer_name);
+CREATE INDEX IF NOT EXISTS idx_tract_layer_scores_county
+    ON layer_summary_scores_tract(fips_code, as_of_year);
+
+CREATE TABLE IF NOT EXISTS final_synthesis_current_tract (
+    id SERIAL PRIMARY KEY,
+    geoid VARCHAR(11) NOT NULL UNIQUE,
+    fips_code VARCHAR(5) NOT NULL,
+    current_as_of_year INTEGER NOT NULL,
+    final_grouping VARCHAR(50) NOT NULL,
+    directional_status VARCHAR(20) NOT NULL,
+    confidence_level VARCHAR(20) NOT NULL,
+    uncertainty_level VARCHAR(20),
+    uncertainty_reasons JSONB,
+    composite_score NUMERIC(5,4),
+    risk_drag_applied NUMERIC(5,4),
+    employment_gravity_score NUMERIC(5,4),
+    mobility_optionality_score NUMERIC(5,4),
+    school_trajectory_score NUMERIC(5,4),
+    housing_elasticity_score NUMERIC(5,4),
+    demographic_momentum_score NUMERIC(5,4),
+    risk_drag_score NUMERIC(5,4),
+    classification_version VARCHAR(20),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_tract_synthesis_county
+    ON final_synthesis_current_tract(fips_code);
+CREATE INDEX IF NOT EXISTS idx_tract_synthesis_grouping
+    ON final_synthesis_current_tract(final_grouping);
+
+COMMENT ON TABLE layer_timeseries_features_tract IS 'Level/momentum/stability features per census tract and layer';
+COMMENT ON TABLE layer_summary_scores_tract IS 'Normalized layer scores per census tract (percentiles across Maryland tracts)';
+COMMENT ON TABLE final_synthesis_current_tract IS 'Current multi-year classification per census tract';
@@ -2,6 +2,7 @@
 Database Initialization Script
 
 Sets up PostgreSQL database with PostGIS and loads Maryland county boundaries.
+With a sqlite:/// DATABASE_URL, creates the embedded schema instead.
 
 Usage:
     python scripts/init_db.py
@@ -13,7 +14,7 @@ import os
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config.database import init_db, get_db, test_connection
+from config.database import IS_EMBEDDED, init_db, get_db, test_connection
 from config.settings import get_settings
 from src.utils.logging import setup_logging, get_logger
 from sqlalchemy import text
@@ -123,6 +124,11 @@ def main():
         logger.error(f"Schema initialization failed: {e}")
         sys.exit(1)
 
+    if IS_EMBEDDED:
+        # No PostGIS: county boundaries come from TIGER/Line at export time
+        logger.info("✓ Embedded database ready (county geometries are not stored)")
+        return
+
     # Load county boundaries
     logger.info("\n3. Loading Maryland county boundaries...")
     try:
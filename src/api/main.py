@@ -11,7 +11,7 @@ from typing import Optional
 import os
 
 from config.settings import get_settings
-from config.database import get_db_session, test_connection
+from config.database import dispose_async_engine, get_db_session, test_connection
 from src.api.routes import router
 from src.utils.logging import setup_logging
 
@@ -32,7 +32,7 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Configure properly in production
     allow_credentials=True,
-    allow_methods=["GET"],  # Read-only API
+    allow_methods=["GET", "POST"],  # Read-only API (POST only for in-memory scenarios)
     allow_headers=["*"],
 )
 
@@ -56,6 +56,7 @@ async def startup_event():
 async def shutdown_event():
     """Run on application shutdown"""
     logger.info("Shutting down API")
+    await dispose_async_engine()
 
 
 @app.get("/")
@@ -71,9 +72,15 @@ async def root():
         "endpoints": {
             "health": "/health",
             "counties_geojson": "/api/v1/layers/counties/latest",
+            "tracts_geojson": "/api/v1/layers/tracts/{resolution}",
+            "vector_tiles": "/api/v1/tiles/{tileset}.json",
             "area_detail": "/api/v1/areas/{geoid}",
+            "area_details_batch": "/api/v1/areas?geoids={geoid},{geoid}",
+            "layer_details": "/api/v1/areas/{geoid}/layers",
             "data_sources": "/api/v1/metadata/sources",
-            "latest_refresh": "/api/v1/metadata/refresh"
+            "latest_refresh": "/api/v1/metadata/refresh",
+            "feature_coverage": "/api/v1/metadata/coverage",
+            "scenarios": "POST /api/v1/scenarios/evaluate"
         }
     }
 
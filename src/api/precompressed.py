@@ -0,0 +1,124 @@
+"""
+Maryland Viability Atlas - Precompressed file responses
+Serve export artifacts with content negotiation and conditional GET.
+
+The GeoJSON export writes ``.gz`` / ``.br`` siblings next to each file. This
+module picks the best variant the client accepts, tags every representation
+with a strong ETag derived from the uncompressed content hash, and answers
+``If-None-Match`` with 304 so repeat visits transfer no body at all.
+"""
+
+import hashlib
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import FileResponse, Response
+
+# Preferred content-codings, best first, with their file suffixes
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+CACHE_REVALIDATE = "public, no-cache"
+CACHE_IMMUTABLE = "public, max-age=31536000, immutable"
+
+_checksums: Dict[str, Tuple[int, int, str]] = {}
+_checksums_lock = threading.Lock()
+
+
+def file_checksum(path: str) -> str:
+    """SHA-256 of a file, cached until its size or mtime changes."""
+    stat = os.stat(path)
+    with _checksums_lock:
+        cached = _checksums.get(path)
+    if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            sha256.update(chunk)
+    digest = sha256.hexdigest()
+    with _checksums_lock:
+        _checksums[path] = (stat.st_mtime_ns, stat.st_size, digest)
+    return digest
+
+
+def accepted_encodings(header: Optional[str]) -> List[str]:
+    """Content-codings with q > 0 from an Accept-Encoding header."""
+    accepted = []
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding and q > 0:
+            accepted.append(coding.strip().lower())
+    return accepted
+
+
+def _pick_variant(path: str, accept_encoding: Optional[str]) -> Tuple[str, Optional[str]]:
+    accepted = accepted_encodings(accept_encoding)
+    source_mtime = os.path.getmtime(path)
+    for coding, suffix in ENCODINGS:
+        variant = path + suffix
+        if (
+            (coding in accepted or "*" in accepted)
+            and os.path.exists(variant)
+            and os.path.getmtime(variant) >= source_mtime
+        ):
+            return variant, coding
+    return path, None
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True when an If-None-Match header matches ``etag`` (304 applies)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in candidates
+
+
+def precompressed_file_response(
+    request: Request,
+    path: str,
+    media_type: str,
+    filename: Optional[str] = None,
+    immutable: bool = False,
+    extra_headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """
+    Serve ``path`` (or a precompressed sibling) with ETag and 304 support.
+
+    Args:
+        request: Incoming request (Accept-Encoding, If-None-Match)
+        path: Uncompressed file on disk
+        media_type: Content-Type of the uncompressed file
+        filename: Download filename for Content-Disposition
+        immutable: Cache forever (content-addressed URLs)
+        extra_headers: Additional response headers
+    """
+    variant_path, coding = _pick_variant(path, request.headers.get("accept-encoding"))
+    checksum = file_checksum(path)
+    etag = f'"{checksum[:32]}{"-" + coding if coding else ""}"'
+
+    headers = {
+        "ETag": etag,
+        "Vary": "Accept-Encoding",
+        "Cache-Control": CACHE_IMMUTABLE if immutable else CACHE_REVALIDATE,
+        **(extra_headers or {}),
+    }
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    if coding:
+        headers["Content-Encoding"] = coding
+    return FileResponse(variant_path, media_type=media_type, filename=filename, headers=headers)
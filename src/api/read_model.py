@@ -0,0 +1,610 @@
+"""
+Maryland Viability Atlas - API read model
+Denormalized, pre-rendered responses for the area and layer detail endpoints.
+
+``refresh_read_model`` runs at the end of the multi-year pipeline. It reads the
+final synthesis, the latest row of every layer table and the latest timeseries
+features in a handful of set-based queries. From those it renders the exact
+``AreaDetail`` / ``LayerDetail`` payloads into ``api_read_model``, keyed by
+(geoid, layer_key), so the API answers each request with one primary-key lookup.
+The same builders serve the live fallback path in ``src.api.routes``.
+"""
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+
+from config.database import IS_EMBEDDED, get_db
+from config.settings import MD_COUNTY_FIPS
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# layer_key of the area-level (final synthesis) row
+AREA_KEY = "area"
+
+
+def _identify_top_strengths(layer_scores: dict, top_n: int = 2) -> List[str]:
+    valid_scores = {k: v for k, v in layer_scores.items() if v is not None}
+    if not valid_scores:
+        return []
+    sorted_layers = sorted(valid_scores.items(), key=lambda x: x[1], reverse=True)
+    return [name for name, _ in sorted_layers[:top_n]]
+
+
+def _identify_top_weaknesses(layer_scores: dict, top_n: int = 2) -> List[str]:
+    valid_scores = {k: v for k, v in layer_scores.items() if v is not None}
+    if not valid_scores:
+        return []
+    sorted_layers = sorted(valid_scores.items(), key=lambda x: x[1])
+    return [name for name, _ in sorted_layers[:top_n]]
+
+
+def _generate_explainability_payload(
+    directional_class: str,
+    confidence_class: str,
+    risk_drag_score: Optional[float],
+    layer_scores: dict,
+) -> dict:
+    layer_names = {
+        "employment_gravity": "Employment Gravity",
+        "mobility_optionality": "Mobility Optionality",
+        "school_trajectory": "School System Trajectory",
+        "housing_elasticity": "Housing Elasticity",
+        "demographic_momentum": "Demographic Momentum",
+    }
+
+    strengths = _identify_top_strengths(layer_scores, top_n=2)
+    weaknesses = _identify_top_weaknesses(layer_scores, top_n=2)
+
+    primary_strengths = [layer_names.get(s, s) for s in strengths]
+    primary_weaknesses = [layer_names.get(w, w) for w in weaknesses]
+
+    key_trends = []
+    if directional_class == "improving":
+        key_trends.append("Multiple reinforcing structural tailwinds present")
+    elif directional_class == "at_risk":
+        key_trends.append("Structural headwinds constraining growth capacity")
+    else:
+        key_trends.append("Balanced signals, mixed pressure directions")
+
+    if confidence_class == "strong":
+        key_trends.append("High policy delivery reliability")
+    elif confidence_class == "fragile":
+        key_trends.append("Low policy follow-through, high uncertainty")
+
+    if risk_drag_score is not None and risk_drag_score >= 0.5:
+        key_trends.append("Elevated environmental or infrastructure risk")
+
+    return {
+        "primary_strengths": primary_strengths,
+        "primary_weaknesses": primary_weaknesses,
+        "key_trends": key_trends,
+    }
+
+
+# Layer configuration for factor breakdown
+LAYER_CONFIGS = {
+    "employment_gravity": {
+        "table": "layer1_employment_gravity",
+        "display_name": "Economic Opportunity",
+        "description": "Measures access to high-wage jobs and economic diversification",
+        "version": "v2",
+        "formula": "0.40 × diversification + 0.60 × accessibility",
+        "factors": [
+            {
+                "col": "economic_opportunity_index",
+                "name": "Economic Opportunity Index",
+                "desc": "Combined v1+v2 composite score",
+                "weight": 1.0,
+            },
+            {
+                "col": "economic_accessibility_score",
+                "name": "Job Accessibility",
+                "desc": "High-wage jobs reachable within 45 min",
+                "weight": 0.60,
+            },
+            {
+                "col": "employment_diversification_score",
+                "name": "Employment Diversification",
+                "desc": "Sector diversity and wage quality",
+                "weight": 0.40,
+            },
+            {
+                "col": "high_wage_jobs_accessible_45min",
+                "name": "High-Wage Jobs (45 min)",
+                "desc": "Jobs earning >$40k accessible",
+                "weight": None,
+            },
+            {
+                "col": "wage_quality_ratio",
+                "name": "Wage Quality Ratio",
+                "desc": "High-wage to low-wage job ratio",
+                "weight": None,
+            },
+            {
+                "col": "sector_diversity_entropy",
+                "name": "Sector Diversity",
+                "desc": "Shannon entropy across industries",
+                "weight": None,
+            },
+        ],
+    },
+    "mobility_optionality": {
+        "table": "layer2_mobility_optionality",
+        "display_name": "Mobility Options",
+        "description": "Measures transportation accessibility and mode options",
+        "version": "v2",
+        "formula": "0.60 × transit + 0.25 × walk + 0.15 × bike",
+        "factors": [
+            {
+                "col": "mobility_optionality_index",
+                "name": "Mobility Index",
+                "desc": "Combined multimodal accessibility",
+                "weight": 1.0,
+            },
+            {
+                "col": "transit_accessibility_score",
+                "name": "Transit Accessibility",
+                "desc": "Jobs reachable by transit (45 min)",
+                "weight": 0.60,
+            },
+            {
+                "col": "walk_accessibility_score",
+                "name": "Walk Accessibility",
+                "desc": "Jobs reachable by walking (30 min)",
+                "weight": 0.25,
+            },
+            {
+                "col": "bike_accessibility_score",
+                "name": "Bike Accessibility",
+                "desc": "Jobs reachable by bike (30 min)",
+                "weight": 0.15,
+            },
+            {
+                "col": "transit_car_accessibility_ratio",
+                "name": "Transit vs Car Ratio",
+                "desc": "Transit competitiveness vs driving",
+                "weight": None,
+            },
+            {
+                "col": "mode_count",
+                "name": "Mode Count",
+                "desc": "Available transportation modes",
+                "weight": None,
+            },
+        ],
+    },
+    "school_trajectory": {
+        "table": "layer3_school_trajectory",
+        "display_name": "Education Access",
+        "description": "Measures access to quality schools and educational opportunity",
+        "version": "v2",
+        "formula": "0.40 × supply + 0.60 × accessibility",
+        "factors": [
+            {
+                "col": "education_opportunity_index",
+                "name": "Education Opportunity Index",
+                "desc": "Combined v1+v2 composite score",
+                "weight": 1.0,
+            },
+            {
+                "col": "education_accessibility_score",
+                "name": "Education Accessibility",
+                "desc": "Quality school access composite",
+                "weight": 0.60,
+            },
+            {
+                "col": "school_supply_score",
+                "name": "School Supply",
+                "desc": "Enrollment and school density",
+                "weight": 0.40,
+            },
+            {
+                "col": "avg_high_quality_accessible_30min",
+                "name": "Quality Schools (30 min)",
+                "desc": "Above-median schools accessible",
+                "weight": None,
+            },
+            {
+                "col": "prek_accessibility_score",
+                "name": "Pre-K Access",
+                "desc": "Early childhood program availability",
+                "weight": None,
+            },
+            {
+                "col": "avg_proficiency",
+                "name": "Avg Proficiency",
+                "desc": "Average ELA/Math proficiency",
+                "weight": None,
+            },
+        ],
+    },
+    "housing_elasticity": {
+        "table": "layer4_housing_elasticity",
+        "display_name": "Housing Affordability",
+        "description": "Measures housing supply responsiveness and affordability burden",
+        "version": "v2",
+        "formula": "0.40 × elasticity + 0.60 × affordability",
+        "factors": [
+            {
+                "col": "housing_opportunity_index",
+                "name": "Housing Opportunity Index",
+                "desc": "Combined v1+v2 composite score",
+                "weight": 1.0,
+            },
+            {
+                "col": "housing_affordability_score",
+                "name": "Affordability Score",
+                "desc": "Cost burden and affordable stock",
+                "weight": 0.60,
+            },
+            {
+                "col": "housing_elasticity_index",
+                "name": "Supply Elasticity",
+                "desc": "Permit activity and responsiveness",
+                "weight": 0.40,
+            },
+            {
+                "col": "cost_burdened_pct",
+                "name": "Cost Burdened %",
+                "desc": "Households paying >30% on housing",
+                "weight": None,
+                "invert": True,
+            },
+            {
+                "col": "affordable_units_pct",
+                "name": "Affordable Units %",
+                "desc": "Units affordable to low income",
+                "weight": None,
+            },
+            {
+                "col": "price_to_income_ratio",
+                "name": "Price-to-Income",
+                "desc": "Median home value / income",
+                "weight": None,
+                "invert": True,
+            },
+        ],
+    },
+    "demographic_momentum": {
+        "table": "layer5_demographic_momentum",
+        "display_name": "Demographic Health",
+        "description": "Measures population dynamics, equity, and migration patterns",
+        "version": "v2",
+        "formula": "0.30 × static + 0.40 × equity + 0.30 × migration",
+        "factors": [
+            {
+                "col": "demographic_opportunity_index",
+                "name": "Demographic Opportunity Index",
+                "desc": "Combined v1-v3 composite score",
+                "weight": 1.0,
+            },
+            {
+                "col": "equity_score",
+                "name": "Equity Score",
+                "desc": "Segregation and family viability",
+                "weight": 0.40,
+            },
+            {
+                "col": "static_demographic_score",
+                "name": "Static Demographics",
+                "desc": "Population structure",
+                "weight": 0.30,
+            },
+            {
+                "col": "migration_dynamics_score",
+                "name": "Migration Dynamics",
+                "desc": "Net migration and growth",
+                "weight": 0.30,
+            },
+            {
+                "col": "racial_diversity_index",
+                "name": "Diversity Index",
+                "desc": "Shannon entropy diversity",
+                "weight": None,
+            },
+            {
+                "col": "net_migration_rate",
+                "name": "Net Migration Rate",
+                "desc": "Inflow minus outflow rate",
+                "weight": None,
+            },
+        ],
+    },
+    "risk_drag": {
+        "table": "layer6_risk_drag",
+        "display_name": "Risk & Vulnerability",
+        "description": "Measures environmental hazards, climate risk, and community vulnerability",
+        "version": "v2",
+        "formula": "0.40 × static + 0.60 × modern_vulnerability",
+        "factors": [
+            {
+                "col": "risk_drag_index",
+                "name": "Risk Drag Index",
+                "desc": "Combined v1+v2 risk score",
+                "weight": 1.0,
+            },
+            {
+                "col": "modern_vulnerability_score",
+                "name": "Modern Vulnerability",
+                "desc": "Climate + social vulnerability",
+                "weight": 0.60,
+            },
+            {
+                "col": "static_risk_score",
+                "name": "Static Risk",
+                "desc": "Flood, pollution, infrastructure",
+                "weight": 0.40,
+            },
+            {
+                "col": "climate_projection_score",
+                "name": "Climate Projection",
+                "desc": "SLR + heat vulnerability",
+                "weight": None,
+            },
+            {
+                "col": "social_vulnerability_index",
+                "name": "Social Vulnerability",
+                "desc": "CDC SVI composite",
+                "weight": None,
+            },
+            {
+                "col": "sfha_pct_of_county",
+                "name": "Flood Zone %",
+                "desc": "Special Flood Hazard Area",
+                "weight": None,
+            },
+        ],
+    },
+}
+
+
+def _get_trend_direction(slope: Optional[float]) -> Optional[str]:
+    """Convert slope to trend direction"""
+    if slope is None:
+        return None
+    if slope > 0.01:
+        return "up"
+    elif slope < -0.01:
+        return "down"
+    return "stable"
+
+
+def layer_select_columns(config: dict) -> str:
+    """Quoted column list for a layer's factor columns plus data_year."""
+    factor_cols = [f["col"] for f in config["factors"]]
+    return ", ".join([f'"{c}"' if c != "data_year" else c for c in factor_cols + ["data_year"]])
+
+
+def _num(value: Any) -> Optional[float]:
+    return float(value) if value is not None else None
+
+
+def build_area_payload(result: Any, county_name: str) -> Dict[str, Any]:
+    """Render the AreaDetail response body from a final_synthesis_current row."""
+    layer_scores = {
+        "employment_gravity": _num(result.employment_gravity_score),
+        "mobility_optionality": _num(result.mobility_optionality_score),
+        "school_trajectory": _num(result.school_trajectory_score),
+        "housing_elasticity": _num(result.housing_elasticity_score),
+        "demographic_momentum": _num(result.demographic_momentum_score),
+        "risk_drag": _num(result.risk_drag_score),
+    }
+
+    explainability = _generate_explainability_payload(
+        directional_class=result.directional_status,
+        confidence_class=result.confidence_level,
+        risk_drag_score=layer_scores["risk_drag"],
+        layer_scores=layer_scores,
+    )
+
+    return {
+        "fips_code": result.fips_code,
+        "county_name": county_name,
+        "data_year": result.data_year,
+        "directional_class": result.directional_status,
+        "confidence_class": result.confidence_level,
+        "synthesis_grouping": result.final_grouping,
+        "composite_score": _num(result.composite_score),
+        "layer_scores": layer_scores,
+        "primary_strengths": explainability["primary_strengths"],
+        "primary_weaknesses": explainability["primary_weaknesses"],
+        "key_trends": explainability["key_trends"],
+        "last_updated": result.updated_at.isoformat() if result.updated_at else None,
+    }
+
+
+def _format_factor_value(col: str, value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if "pct" in col.lower() or "ratio" in col.lower():
+        return f"{value * 100:.1f}%" if value < 1 else f"{value:.1f}%"
+    if "index" in col.lower() or "score" in col.lower():
+        return f"{value:.3f}"
+    if isinstance(value, float):
+        return f"{value:,.0f}" if value > 100 else f"{value:.2f}"
+    return str(value)
+
+
+def build_layer_payload(layer_key: str, layer_result: Any, ts_result: Any = None) -> Dict[str, Any]:
+    """Render the LayerDetail response body from a layer row and its timeseries features."""
+    config = LAYER_CONFIGS[layer_key]
+
+    factors = []
+    for factor_config in config["factors"]:
+        col = factor_config["col"]
+        value = getattr(layer_result, col, None) if layer_result else None
+
+        # Determine trend from timeseries if available
+        trend = None
+        trend_value = None
+        if ts_result and factor_config.get("weight") == 1.0:  # Main index
+            trend = _get_trend_direction(ts_result.momentum_slope)
+            trend_value = ts_result.momentum_percent_change
+
+        factors.append(
+            {
+                "name": factor_config["name"],
+                "value": _num(value),
+                "formatted_value": _format_factor_value(col, value),
+                "description": factor_config["desc"],
+                "weight": factor_config.get("weight"),
+                "trend": trend,
+                "trend_value": _num(trend_value),
+            }
+        )
+
+    # Get the main score
+    main_score = next((f["value"] for f in factors if f["weight"] == 1.0), None)
+
+    return {
+        "layer_key": layer_key,
+        "display_name": config["display_name"],
+        "score": main_score,
+        "version": config["version"],
+        "formula": config["formula"],
+        "description": config["description"],
+        "factors": factors,
+        "momentum_slope": (
+            float(ts_result.momentum_slope) if ts_result and ts_result.momentum_slope else None
+        ),
+        "momentum_direction": _get_trend_direction(ts_result.momentum_slope) if ts_result else None,
+        "data_year": layer_result.data_year if layer_result else 2025,
+        "coverage_years": ts_result.coverage_years if ts_result else None,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Refresh
+# ---------------------------------------------------------------------------
+
+SYNTHESIS_ROWS_QUERY = text("""
+    SELECT
+        geoid AS fips_code,
+        current_as_of_year AS data_year,
+        final_grouping,
+        directional_status,
+        confidence_level,
+        composite_score,
+        updated_at,
+        employment_gravity_score,
+        mobility_optionality_score,
+        school_trajectory_score,
+        housing_elasticity_score,
+        demographic_momentum_score,
+        risk_drag_score
+    FROM final_synthesis_current
+""")
+
+LATEST_TIMESERIES_QUERY = text("""
+    SELECT DISTINCT ON (geoid, layer_name)
+        geoid,
+        layer_name,
+        momentum_slope,
+        momentum_percent_change,
+        coverage_years
+    FROM layer_timeseries_features
+    ORDER BY geoid, layer_name, as_of_year DESC
+""")
+
+INSERT_READ_MODEL_SQL = text("""
+    INSERT INTO api_read_model (geoid, layer_key, data_year, payload, refreshed_at)
+    VALUES (:geoid, :layer_key, :data_year, CAST(:payload AS jsonb), :refreshed_at)
+""")
+
+
+def _latest_layer_rows_query(config: dict):
+    return text(f"""
+        SELECT DISTINCT ON (fips_code) fips_code, {layer_select_columns(config)}
+        FROM {config["table"]}
+        ORDER BY fips_code, data_year DESC
+    """)
+
+
+def _json_default(value: Any):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+
+def build_read_model_rows(
+    synthesis_rows: List[Any],
+    layer_rows: Dict[str, List[Any]],
+    timeseries_rows: List[Any],
+) -> List[Dict[str, Any]]:
+    """Render every (geoid, layer_key) payload from bulk-loaded rows."""
+    refreshed_at = datetime.utcnow()
+    timeseries = {(r.geoid, r.layer_name): r for r in timeseries_rows}
+    records = []
+
+    def add(geoid: str, layer_key: str, data_year: Optional[int], payload: Dict[str, Any]):
+        records.append(
+            {
+                "geoid": geoid,
+                "layer_key": layer_key,
+                "data_year": data_year,
+                "payload": json.dumps(payload, default=_json_default),
+                "refreshed_at": refreshed_at,
+            }
+        )
+
+    for row in synthesis_rows:
+        if row.fips_code in MD_COUNTY_FIPS:
+            add(
+                row.fips_code,
+                AREA_KEY,
+                row.data_year,
+                build_area_payload(row, MD_COUNTY_FIPS[row.fips_code]),
+            )
+
+    for layer_key, rows in layer_rows.items():
+        for row in rows:
+            if row.fips_code in MD_COUNTY_FIPS:
+                payload = build_layer_payload(
+                    layer_key, row, timeseries.get((row.fips_code, layer_key))
+                )
+                add(row.fips_code, layer_key, row.data_year, payload)
+
+    return records
+
+
+def refresh_read_model() -> int:
+    """
+    Rebuild ``api_read_model`` from the current synthesis, layer and timeseries tables.
+
+    The table is replaced inside one transaction, so the API keeps serving the
+    previous snapshot until the new one commits.
+
+    Returns:
+        Number of rows written (0 on the embedded backend, which has no read model)
+    """
+    if IS_EMBEDDED:
+        logger.info("API read model is PostgreSQL-only; skipped on the embedded backend")
+        return 0
+
+    with get_db() as db:
+        synthesis_rows = db.execute(SYNTHESIS_ROWS_QUERY).fetchall()
+        timeseries_rows = db.execute(LATEST_TIMESERIES_QUERY).fetchall()
+        layer_rows = {}
+        for layer_key, config in LAYER_CONFIGS.items():
+            try:
+                layer_rows[layer_key] = db.execute(_latest_layer_rows_query(config)).fetchall()
+            except Exception as e:
+                # A missing optional column should not drop the other layers
+                logger.warning(f"Read model: skipping {layer_key}: {e}")
+                db.rollback()
+                layer_rows[layer_key] = []
+
+        records = build_read_model_rows(synthesis_rows, layer_rows, timeseries_rows)
+        db.execute(text("DELETE FROM api_read_model"))
+        if records:
+            db.execute(INSERT_READ_MODEL_SQL, records)
+
+    logger.info(f"✓ API read model refreshed: {len(records)} rows")
+    return len(records)
@@ -3,22 +3,51 @@ Maryland Viability Atlas - API Routes
 Endpoints for map data and metadata
 """
 
-from fastapi import APIRouter, HTTPException, Depends, Query
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.responses import JSONResponse, Response
 from sqlalchemy import text
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel
+import asyncio
+import gzip
+import json
 import os
+import re
 
 from config.settings import get_settings, MD_COUNTY_FIPS
-from config.database import get_db_session
+from config.database import AsyncDatabase, get_async_db
+from src.api.precompressed import (
+    CACHE_IMMUTABLE,
+    CACHE_REVALIDATE,
+    accepted_encodings,
+    etag_matches,
+    file_checksum,
+    precompressed_file_response,
+)
+from src.api.read_model import (
+    AREA_KEY,
+    LAYER_CONFIGS,
+    build_area_payload,
+    build_layer_payload,
+    layer_select_columns,
+)
+from src.api.tiles import TILE_MEDIA_TYPE, TILESETS, read_metadata, read_tile, tileset_path
 from src.utils.logging import get_logger
 
 router = APIRouter()
 settings = get_settings()
 logger = get_logger(__name__)
 
+# Content-addressed export versions (sha256 prefix) never change
+IMMUTABLE_VERSION_RE = re.compile(r"^[0-9a-f]{16}$")
+
+# Tract artifact resolutions (src.export.tract_export.ZOOM_BANDS; not imported
+# here to keep geopandas out of the API image)
+TRACT_RESOLUTIONS = ("low", "medium", "high")
+
+# Unversioned tile URLs may change on the next export
+TILE_CACHE_CONTROL = "public, max-age=3600"
+
 
 # Response models
 class LayerFactor(BaseModel):
@@ -72,6 +101,14 @@ class RefreshStatus(BaseModel):
     records_processed: Optional[int]
 
 
+class ScenarioRequest(BaseModel):
+    """What-if parameters; omitted fields keep the current pipeline values"""
+    as_of_year: Optional[int] = None
+    component_weights: Optional[Dict[str, float]] = None  # level / momentum / stability
+    layer_weights: Optional[Dict[str, float]] = None  # positive layers in the composite
+    thresholds: Optional[Dict[str, float]] = None  # classification thresholds by name
+
+
 class DataSource(BaseModel):
     """Data source documentation"""
     name: str
@@ -81,95 +118,180 @@ class DataSource(BaseModel):
     latest_available: str
 
 
-def _identify_top_strengths(layer_scores: dict, top_n: int = 2) -> List[str]:
-    valid_scores = {k: v for k, v in layer_scores.items() if v is not None}
-    if not valid_scores:
-        return []
-    sorted_layers = sorted(valid_scores.items(), key=lambda x: x[1], reverse=True)
-    return [name for name, _ in sorted_layers[:top_n]]
-
+@router.get("/layers/counties/latest")
+async def get_counties_geojson(request: Request):
+    """
+    Get latest county-level GeoJSON
 
-def _identify_top_weaknesses(layer_scores: dict, top_n: int = 2) -> List[str]:
-    valid_scores = {k: v for k, v in layer_scores.items() if v is not None}
-    if not valid_scores:
-        return []
-    sorted_layers = sorted(valid_scores.items(), key=lambda x: x[1])
-    return [name for name, _ in sorted_layers[:top_n]]
+    Served from precompressed variants when the client accepts them, with an
+    ETag for conditional requests. ``Content-Location`` points at the
+    content-addressed copy, which may be cached indefinitely.
 
+    Returns:
+        GeoJSON FeatureCollection with all Maryland counties
+    """
+    geojson_path = os.path.join(settings.EXPORT_DIR, "md_counties_latest.geojson")
 
-def _generate_explainability_payload(
-    directional_class: str,
-    confidence_class: str,
-    risk_drag_score: Optional[float],
-    layer_scores: dict
-) -> dict:
-    layer_names = {
-        "employment_gravity": "Employment Gravity",
-        "mobility_optionality": "Mobility Optionality",
-        "school_trajectory": "School System Trajectory",
-        "housing_elasticity": "Housing Elasticity",
-        "demographic_momentum": "Demographic Momentum"
-    }
+    if not os.path.exists(geojson_path):
+        raise HTTPException(
+            status_code=404,
+            detail="GeoJSON export not found. Run export pipeline first."
+        )
 
-    strengths = _identify_top_strengths(layer_scores, top_n=2)
-    weaknesses = _identify_top_weaknesses(layer_scores, top_n=2)
+    extra_headers = {}
+    immutable_version = file_checksum(geojson_path)[:16]
+    if os.path.exists(os.path.join(settings.EXPORT_DIR, f"md_counties_{immutable_version}.geojson")):
+        extra_headers["Content-Location"] = f"{request.url.path.rsplit('/', 1)[0]}/{immutable_version}"
 
-    primary_strengths = [layer_names.get(s, s) for s in strengths]
-    primary_weaknesses = [layer_names.get(w, w) for w in weaknesses]
+    return precompressed_file_response(
+        request,
+        geojson_path,
+        media_type="application/geo+json",
+        filename="md_counties_latest.geojson",
+        extra_headers=extra_headers,
+    )
 
-    key_trends = []
-    if directional_class == 'improving':
-        key_trends.append("Multiple reinforcing structural tailwinds present")
-    elif directional_class == 'at_risk':
-        key_trends.append("Structural headwinds constraining growth capacity")
-    else:
-        key_trends.append("Balanced signals, mixed pressure directions")
 
-    if confidence_class == 'strong':
-        key_trends.append("High policy delivery reliability")
-    elif confidence_class == 'fragile':
-        key_trends.append("Low policy follow-through, high uncertainty")
+@router.get("/layers/tracts/manifest")
+async def get_tracts_manifest():
+    """
+    Get the tract artifact manifest (zoom range, size and checksum per resolution)
+    """
+    manifest_path = os.path.join(settings.EXPORT_DIR, "md_tracts_manifest.json")
 
-    if risk_drag_score is not None and risk_drag_score >= 0.5:
-        key_trends.append("Elevated environmental or infrastructure risk")
+    if not os.path.exists(manifest_path):
+        raise HTTPException(
+            status_code=404,
+            detail="Tract export not found. Run export pipeline with --level tract first."
+        )
 
-    return {
-        "primary_strengths": primary_strengths,
-        "primary_weaknesses": primary_weaknesses,
-        "key_trends": key_trends
-    }
+    with open(manifest_path) as f:
+        return json.load(f)
 
 
-@router.get("/layers/counties/latest")
-async def get_counties_geojson():
+@router.get("/layers/tracts/{resolution}")
+async def get_tracts_geojson(resolution: str, request: Request):
     """
-    Get latest county-level GeoJSON
+    Get tract-level GeoJSON simplified for a zoom band
+
+    Args:
+        resolution: 'low', 'medium' or 'high' (see /layers/tracts/manifest)
 
     Returns:
-        GeoJSON FeatureCollection with all Maryland counties
+        GeoJSON FeatureCollection of Maryland census tracts
     """
-    geojson_path = os.path.join(settings.EXPORT_DIR, "md_counties_latest.geojson")
+    if resolution not in TRACT_RESOLUTIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid resolution. Must be one of: {', '.join(TRACT_RESOLUTIONS)}"
+        )
+
+    geojson_path = os.path.join(settings.EXPORT_DIR, f"md_tracts_{resolution}_latest.geojson")
 
     if not os.path.exists(geojson_path):
         raise HTTPException(
             status_code=404,
-            detail="GeoJSON export not found. Run export pipeline first."
+            detail="Tract export not found. Run export pipeline with --level tract first."
         )
 
-    return FileResponse(
+    return precompressed_file_response(
+        request,
         geojson_path,
         media_type="application/geo+json",
-        filename="md_counties_latest.geojson"
+        filename=f"md_tracts_{resolution}_latest.geojson",
     )
 
 
+@router.get("/tiles/{tileset}.json")
+def get_tilejson(tileset: str, request: Request):
+    """
+    Get TileJSON for a vector tileset ('counties' or 'tracts')
+
+    Tile URLs carry the archive version, so tiles can be cached as immutable;
+    this document itself is revalidated on every load.
+    """
+    path = _tileset_or_404(tileset)
+    version = file_checksum(path)[:16]
+    metadata = read_metadata(path)
+    tiles_url = f"{str(request.base_url).rstrip('/')}{request.url.path[:-len('.json')]}"
+
+    return JSONResponse(
+        {
+            "tilejson": "3.0.0",
+            "name": metadata.get("name", tileset),
+            "description": metadata.get("description", ""),
+            "version": version,
+            "tiles": [f"{tiles_url}/{{z}}/{{x}}/{{y}}.mvt?v={version}"],
+            "minzoom": metadata.get("minzoom", 0),
+            "maxzoom": metadata.get("maxzoom", 14),
+            "bounds": metadata.get("bounds"),
+            "center": metadata.get("center"),
+            "vector_layers": metadata.get("vector_layers", []),
+        },
+        headers={"Cache-Control": CACHE_REVALIDATE},
+    )
+
+
+@router.get("/tiles/{tileset}/{z}/{x}/{y}.mvt")
+def get_vector_tile(
+    tileset: str,
+    z: int,
+    x: int,
+    y: int,
+    request: Request,
+    v: Optional[str] = Query(default=None, description="Tileset version from TileJSON"),
+):
+    """
+    Get one Mapbox Vector Tile
+
+    Returns 204 for tiles with no features. Requests carrying the current
+    tileset version (``?v=``) are cacheable for a year.
+    """
+    path = _tileset_or_404(tileset)
+    version = file_checksum(path)[:16]
+    headers = {
+        "ETag": f'"{version}-{z}-{x}-{y}"',
+        "Cache-Control": CACHE_IMMUTABLE if v == version else TILE_CACHE_CONTROL,
+        "Vary": "Accept-Encoding",
+    }
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    data = read_tile(path, z, x, y)
+    if data is None:
+        return Response(status_code=204, headers=headers)
+
+    # Tiles are stored gzip-compressed; only inflate for clients that refuse gzip
+    if "gzip" in accepted_encodings(request.headers.get("accept-encoding")):
+        headers["Content-Encoding"] = "gzip"
+    else:
+        data = gzip.decompress(data)
+    return Response(content=data, media_type=TILE_MEDIA_TYPE, headers=headers)
+
+
+def _tileset_or_404(tileset: str) -> str:
+    if tileset not in TILESETS:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Unknown tileset. Must be one of: {', '.join(TILESETS)}"
+        )
+    path = tileset_path(tileset)
+    if not os.path.exists(path):
+        raise HTTPException(
+            status_code=404,
+            detail="Vector tiles not found. Run export pipeline first."
+        )
+    return path
+
+
 @router.get("/layers/counties/{version}")
-async def get_counties_geojson_versioned(version: str):
+async def get_counties_geojson_versioned(version: str, request: Request):
     """
     Get versioned county GeoJSON snapshot
 
     Args:
-        version: Version string (YYYYMMDD format, e.g., '20260128')
+        version: Version string (YYYYMMDD format, e.g., '20260128'), or the
+            16-character content hash of an immutable export (cached forever)
 
     Returns:
         GeoJSON FeatureCollection for specified version
@@ -182,17 +304,171 @@ async def get_counties_geojson_versioned(version: str):
             detail=f"Version {version} not found"
         )
 
-    return FileResponse(
+    return precompressed_file_response(
+        request,
         geojson_path,
         media_type="application/geo+json",
-        filename=f"md_counties_{version}.geojson"
+        filename=f"md_counties_{version}.geojson",
+        immutable=bool(IMMUTABLE_VERSION_RE.match(version)),
     )
 
 
+# Hot read queries, built once so every request reuses the same prepared statement
+READ_MODEL_QUERY = text("""
+    SELECT payload
+    FROM api_read_model
+    WHERE geoid = :geoid AND layer_key = :layer_key
+""")
+
+READ_MODEL_BATCH_QUERY = text("""
+    SELECT geoid, layer_key, payload
+    FROM api_read_model
+    WHERE geoid = ANY(:geoids) AND layer_key = ANY(:layer_keys)
+""")
+
+_SYNTHESIS_SELECT = """
+    SELECT
+        fsc.geoid AS fips_code,
+        fsc.current_as_of_year AS data_year,
+        fsc.final_grouping,
+        fsc.directional_status,
+        fsc.confidence_level,
+        fsc.composite_score,
+        fsc.updated_at,
+        fsc.employment_gravity_score,
+        fsc.mobility_optionality_score,
+        fsc.school_trajectory_score,
+        fsc.housing_elasticity_score,
+        fsc.demographic_momentum_score,
+        fsc.risk_drag_score
+    FROM final_synthesis_current fsc
+"""
+
+AREA_DETAIL_QUERY = text(_SYNTHESIS_SELECT + "    WHERE fsc.geoid = :geoid\n")
+
+AREA_DETAILS_QUERY = text(_SYNTHESIS_SELECT + "    WHERE fsc.geoid = ANY(:geoids)\n")
+
+TIMESERIES_QUERY = text("""
+    SELECT
+        momentum_slope,
+        momentum_percent_change,
+        coverage_years,
+        level_latest,
+        level_baseline
+    FROM layer_timeseries_features
+    WHERE geoid = :geoid AND layer_name = :layer_name
+    ORDER BY as_of_year DESC
+    LIMIT 1
+""")
+
+LAYER_TIMESERIES_QUERY = text("""
+    SELECT DISTINCT ON (layer_name)
+        layer_name,
+        momentum_slope,
+        momentum_percent_change,
+        coverage_years
+    FROM layer_timeseries_features
+    WHERE geoid = :geoid
+    ORDER BY layer_name, as_of_year DESC
+""")
+
+REFRESH_STATUS_QUERY = text("""
+    SELECT DISTINCT ON (layer_name)
+        layer_name,
+        data_source,
+        refresh_date,
+        status,
+        records_processed
+    FROM data_refresh_log
+    ORDER BY layer_name, refresh_date DESC
+    LIMIT :limit
+""")
+
+LATEST_COVERAGE_ID_QUERY = text("""
+    SELECT MAX(id) AS id FROM feature_coverage_snapshots
+""")
+
+COVERAGE_SNAPSHOT_QUERY = text("""
+    SELECT id, report FROM feature_coverage_snapshots WHERE id = :id
+""")
+
+# Latest coverage report, keyed by snapshot id (snapshots are append-only)
+_coverage_cache: Dict[str, Any] = {"id": None, "report": None}
+
+
+async def _read_model_payload(db: AsyncDatabase, geoid: str, layer_key: str) -> Optional[Dict[str, Any]]:
+    """Pre-rendered response from api_read_model, or None to fall back to live queries."""
+    try:
+        row = await db.fetchone(READ_MODEL_QUERY, {"geoid": geoid, "layer_key": layer_key})
+    except Exception as e:
+        logger.debug(f"Read model unavailable, using live queries: {e}")
+        return None
+    if not row:
+        return None
+    return json.loads(row.payload) if isinstance(row.payload, str) else row.payload
+
+
+async def _read_model_payloads(
+    db: AsyncDatabase, geoids: List[str], layer_keys: List[str]
+) -> Dict[tuple, Dict[str, Any]]:
+    """Batch form of _read_model_payload, keyed by (geoid, layer_key)."""
+    try:
+        rows = await db.fetchall(READ_MODEL_BATCH_QUERY, {"geoids": geoids, "layer_keys": layer_keys})
+    except Exception as e:
+        logger.debug(f"Read model unavailable, using live queries: {e}")
+        return {}
+    return {
+        (r.geoid, r.layer_key): json.loads(r.payload) if isinstance(r.payload, str) else r.payload
+        for r in rows
+    }
+
+
+def _parse_geoids(geoids: Optional[str]) -> List[str]:
+    if not geoids:
+        return list(MD_COUNTY_FIPS)
+    requested = list(dict.fromkeys(g.strip() for g in geoids.split(",") if g.strip()))
+    unknown = [g for g in requested if g not in MD_COUNTY_FIPS]
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Unknown FIPS code(s): {', '.join(unknown)}")
+    return requested
+
+
+@router.get("/areas", response_model=List[AreaDetail])
+async def get_area_details(
+    geoids: Optional[str] = Query(default=None, description="Comma-separated FIPS codes (default: all counties)"),
+    db: AsyncDatabase = Depends(get_async_db)
+):
+    """
+    Get detailed information for many areas in one request
+
+    Args:
+        geoids: Comma-separated FIPS codes, e.g. '24001,24031'
+
+    Returns:
+        Area details in request order; areas without data are omitted
+    """
+    requested = _parse_geoids(geoids)
+
+    try:
+        payloads = await _read_model_payloads(db, requested, [AREA_KEY])
+        missing = [g for g in requested if (g, AREA_KEY) not in payloads]
+        if missing:
+            for row in await db.fetchall(AREA_DETAILS_QUERY, {"geoids": missing}):
+                payloads[(row.fips_code, AREA_KEY)] = build_area_payload(row, MD_COUNTY_FIPS[row.fips_code])
+
+        return [AreaDetail(**payloads[(g, AREA_KEY)]) for g in requested if (g, AREA_KEY) in payloads]
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to fetch area details: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
 @router.get("/areas/{geoid}", response_model=AreaDetail)
 async def get_area_detail(
     geoid: str,
-    db: Session = Depends(get_db_session)
+    db: AsyncDatabase = Depends(get_async_db)
 ):
     """
     Get detailed information for a specific area
@@ -211,26 +487,11 @@ async def get_area_detail(
         )
 
     try:
-        query = text("""
-            SELECT
-                fsc.geoid AS fips_code,
-                fsc.current_as_of_year AS data_year,
-                fsc.final_grouping,
-                fsc.directional_status,
-                fsc.confidence_level,
-                fsc.composite_score,
-                fsc.updated_at,
-                fsc.employment_gravity_score,
-                fsc.mobility_optionality_score,
-                fsc.school_trajectory_score,
-                fsc.housing_elasticity_score,
-                fsc.demographic_momentum_score,
-                fsc.risk_drag_score
-            FROM final_synthesis_current fsc
-            WHERE fsc.geoid = :geoid
-        """)
-
-        result = db.execute(query, {"geoid": geoid}).fetchone()
+        payload = await _read_model_payload(db, geoid, AREA_KEY)
+        if payload is not None:
+            return AreaDetail(**payload)
+
+        result = await db.fetchone(AREA_DETAIL_QUERY, {"geoid": geoid})
 
         if not result:
             raise HTTPException(
@@ -238,157 +499,77 @@ async def get_area_detail(
                 detail=f"No data found for FIPS code {geoid}"
             )
 
-        layer_scores = {
-            "employment_gravity": result.employment_gravity_score,
-            "mobility_optionality": result.mobility_optionality_score,
-            "school_trajectory": result.school_trajectory_score,
-            "housing_elasticity": result.housing_elasticity_score,
-            "demographic_momentum": result.demographic_momentum_score,
-            "risk_drag": result.risk_drag_score
-        }
-
-        explainability = _generate_explainability_payload(
-            directional_class=result.directional_status,
-            confidence_class=result.confidence_level,
-            risk_drag_score=result.risk_drag_score,
-            layer_scores=layer_scores
-        )
-
-        return AreaDetail(
-            fips_code=result.fips_code,
-            county_name=MD_COUNTY_FIPS[geoid],
-            data_year=result.data_year,
-            directional_class=result.directional_status,
-            confidence_class=result.confidence_level,
-            synthesis_grouping=result.final_grouping,
-            composite_score=result.composite_score,
-            layer_scores=layer_scores,
-            primary_strengths=explainability['primary_strengths'],
-            primary_weaknesses=explainability['primary_weaknesses'],
-            key_trends=explainability['key_trends'],
-            last_updated=result.updated_at.isoformat() if result.updated_at else None
-        )
+        return AreaDetail(**build_area_payload(result, MD_COUNTY_FIPS[geoid]))
 
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Failed to fetch area detail: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error")
-    finally:
-        db.close()
-
-
-# Layer configuration for factor breakdown
-LAYER_CONFIGS = {
-    "employment_gravity": {
-        "table": "layer1_employment_gravity",
-        "display_name": "Economic Opportunity",
-        "description": "Measures access to high-wage jobs and economic diversification",
-        "version": "v2",
-        "formula": "0.40 × diversification + 0.60 × accessibility",
-        "factors": [
-            {"col": "economic_opportunity_index", "name": "Economic Opportunity Index", "desc": "Combined v1+v2 composite score", "weight": 1.0},
-            {"col": "economic_accessibility_score", "name": "Job Accessibility", "desc": "High-wage jobs reachable within 45 min", "weight": 0.60},
-            {"col": "employment_diversification_score", "name": "Employment Diversification", "desc": "Sector diversity and wage quality", "weight": 0.40},
-            {"col": "high_wage_jobs_accessible_45min", "name": "High-Wage Jobs (45 min)", "desc": "Jobs earning >$40k accessible", "weight": None},
-            {"col": "wage_quality_ratio", "name": "Wage Quality Ratio", "desc": "High-wage to low-wage job ratio", "weight": None},
-            {"col": "sector_diversity_entropy", "name": "Sector Diversity", "desc": "Shannon entropy across industries", "weight": None},
-        ]
-    },
-    "mobility_optionality": {
-        "table": "layer2_mobility_optionality",
-        "display_name": "Mobility Options",
-        "description": "Measures transportation accessibility and mode options",
-        "version": "v2",
-        "formula": "0.60 × transit + 0.25 × walk + 0.15 × bike",
-        "factors": [
-            {"col": "mobility_optionality_index", "name": "Mobility Index", "desc": "Combined multimodal accessibility", "weight": 1.0},
-            {"col": "transit_accessibility_score", "name": "Transit Accessibility", "desc": "Jobs reachable by transit (45 min)", "weight": 0.60},
-            {"col": "walk_accessibility_score", "name": "Walk Accessibility", "desc": "Jobs reachable by walking (30 min)", "weight": 0.25},
-            {"col": "bike_accessibility_score", "name": "Bike Accessibility", "desc": "Jobs reachable by bike (30 min)", "weight": 0.15},
-            {"col": "transit_car_accessibility_ratio", "name": "Transit vs Car Ratio", "desc": "Transit competitiveness vs driving", "weight": None},
-            {"col": "mode_count", "name": "Mode Count", "desc": "Available transportation modes", "weight": None},
-        ]
-    },
-    "school_trajectory": {
-        "table": "layer3_school_trajectory",
-        "display_name": "Education Access",
-        "description": "Measures access to quality schools and educational opportunity",
-        "version": "v2",
-        "formula": "0.40 × supply + 0.60 × accessibility",
-        "factors": [
-            {"col": "education_opportunity_index", "name": "Education Opportunity Index", "desc": "Combined v1+v2 composite score", "weight": 1.0},
-            {"col": "education_accessibility_score", "name": "Education Accessibility", "desc": "Quality school access composite", "weight": 0.60},
-            {"col": "school_supply_score", "name": "School Supply", "desc": "Enrollment and school density", "weight": 0.40},
-            {"col": "avg_high_quality_accessible_30min", "name": "Quality Schools (30 min)", "desc": "Above-median schools accessible", "weight": None},
-            {"col": "prek_accessibility_score", "name": "Pre-K Access", "desc": "Early childhood program availability", "weight": None},
-            {"col": "avg_proficiency", "name": "Avg Proficiency", "desc": "Average ELA/Math proficiency", "weight": None},
-        ]
-    },
-    "housing_elasticity": {
-        "table": "layer4_housing_elasticity",
-        "display_name": "Housing Affordability",
-        "description": "Measures housing supply responsiveness and affordability burden",
-        "version": "v2",
-        "formula": "0.40 × elasticity + 0.60 × affordability",
-        "factors": [
-            {"col": "housing_opportunity_index", "name": "Housing Opportunity Index", "desc": "Combined v1+v2 composite score", "weight": 1.0},
-            {"col": "housing_affordability_score", "name": "Affordability Score", "desc": "Cost burden and affordable stock", "weight": 0.60},
-            {"col": "housing_elasticity_index", "name": "Supply Elasticity", "desc": "Permit activity and responsiveness", "weight": 0.40},
-            {"col": "cost_burdened_pct", "name": "Cost Burdened %", "desc": "Households paying >30% on housing", "weight": None, "invert": True},
-            {"col": "affordable_units_pct", "name": "Affordable Units %", "desc": "Units affordable to low income", "weight": None},
-            {"col": "price_to_income_ratio", "name": "Price-to-Income", "desc": "Median home value / income", "weight": None, "invert": True},
-        ]
-    },
-    "demographic_momentum": {
-        "table": "layer5_demographic_momentum",
-        "display_name": "Demographic Health",
-        "description": "Measures population dynamics, equity, and migration patterns",
-        "version": "v2",
-        "formula": "0.30 × static + 0.40 × equity + 0.30 × migration",
-        "factors": [
-            {"col": "demographic_opportunity_index", "name": "Demographic Opportunity Index", "desc": "Combined v1-v3 composite score", "weight": 1.0},
-            {"col": "equity_score", "name": "Equity Score", "desc": "Segregation and family viability", "weight": 0.40},
-            {"col": "static_demographic_score", "name": "Static Demographics", "desc": "Population structure", "weight": 0.30},
-            {"col": "migration_dynamics_score", "name": "Migration Dynamics", "desc": "Net migration and growth", "weight": 0.30},
-            {"col": "racial_diversity_index", "name": "Diversity Index", "desc": "Shannon entropy diversity", "weight": None},
-            {"col": "net_migration_rate", "name": "Net Migration Rate", "desc": "Inflow minus outflow rate", "weight": None},
-        ]
-    },
-    "risk_drag": {
-        "table": "layer6_risk_drag",
-        "display_name": "Risk & Vulnerability",
-        "description": "Measures environmental hazards, climate risk, and community vulnerability",
-        "version": "v2",
-        "formula": "0.40 × static + 0.60 × modern_vulnerability",
-        "factors": [
-            {"col": "risk_drag_index", "name": "Risk Drag Index", "desc": "Combined v1+v2 risk score", "weight": 1.0},
-            {"col": "modern_vulnerability_score", "name": "Modern Vulnerability", "desc": "Climate + social vulnerability", "weight": 0.60},
-            {"col": "static_risk_score", "name": "Static Risk", "desc": "Flood, pollution, infrastructure", "weight": 0.40},
-            {"col": "climate_projection_score", "name": "Climate Projection", "desc": "SLR + heat vulnerability", "weight": None},
-            {"col": "social_vulnerability_index", "name": "Social Vulnerability", "desc": "CDC SVI composite", "weight": None},
-            {"col": "sfha_pct_of_county", "name": "Flood Zone %", "desc": "Special Flood Hazard Area", "weight": None},
-        ]
-    }
-}
 
 
-def _get_trend_direction(slope: Optional[float]) -> Optional[str]:
-    """Convert slope to trend direction"""
-    if slope is None:
-        return None
-    if slope > 0.01:
-        return "up"
-    elif slope < -0.01:
-        return "down"
-    return "stable"
+def _layer_detail_query(config: dict):
+    return text(f"""
+        SELECT {layer_select_columns(config)}
+        FROM {config["table"]}
+        WHERE fips_code = :geoid
+        ORDER BY data_year DESC
+        LIMIT 1
+    """)
+
+
+LAYER_DETAIL_QUERIES = {key: _layer_detail_query(config) for key, config in LAYER_CONFIGS.items()}
+
+
+@router.get("/areas/{geoid}/layers", response_model=List[LayerDetail])
+async def get_all_layer_details(
+    geoid: str,
+    db: AsyncDatabase = Depends(get_async_db)
+):
+    """
+    Get the factor breakdown for every layer of an area in one request
+
+    Args:
+        geoid: FIPS code (e.g., '24031' for Montgomery County)
+
+    Returns:
+        Layer details in LAYER_CONFIGS order; layers without data are omitted
+    """
+    if geoid not in MD_COUNTY_FIPS:
+        raise HTTPException(status_code=404, detail=f"Unknown FIPS code: {geoid}")
+
+    layer_keys = list(LAYER_CONFIGS)
+
+    try:
+        payloads = await _read_model_payloads(db, [geoid], layer_keys)
+        missing = [k for k in layer_keys if (geoid, k) not in payloads]
+        if missing:
+            # Live fallback: missing layer rows plus one timeseries query, all concurrently
+            *layer_rows, ts_rows = await asyncio.gather(
+                *(db.fetchone(LAYER_DETAIL_QUERIES[k], {"geoid": geoid}) for k in missing),
+                db.fetchall(LAYER_TIMESERIES_QUERY, {"geoid": geoid}),
+            )
+            timeseries = {r.layer_name: r for r in ts_rows}
+            for layer_key, layer_result in zip(missing, layer_rows):
+                if layer_result:
+                    payloads[(geoid, layer_key)] = build_layer_payload(
+                        layer_key, layer_result, timeseries.get(layer_key)
+                    )
+
+        return [LayerDetail(**payloads[(geoid, k)]) for k in layer_keys if (geoid, k) in payloads]
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to fetch layer details: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal server error")
 
 
 @router.get("/areas/{geoid}/layers/{layer_key}", response_model=LayerDetail)
 async def get_layer_detail(
     geoid: str,
     layer_key: str,
-    db: Session = Depends(get_db_session)
+    db: AsyncDatabase = Depends(get_async_db)
 ):
     """
     Get detailed factor breakdown for a specific layer
@@ -406,111 +587,32 @@ async def get_layer_detail(
     if layer_key not in LAYER_CONFIGS:
         raise HTTPException(status_code=404, detail=f"Unknown layer: {layer_key}")
 
-    config = LAYER_CONFIGS[layer_key]
-
     try:
-        # Build column list for query
-        factor_cols = [f["col"] for f in config["factors"]]
-        col_list = ", ".join([f'"{c}"' if c != "data_year" else c for c in factor_cols + ["data_year"]])
-
-        # Query layer table
-        layer_query = text(f"""
-            SELECT {col_list}
-            FROM {config["table"]}
-            WHERE fips_code = :geoid
-            ORDER BY data_year DESC
-            LIMIT 1
-        """)
-
-        layer_result = db.execute(layer_query, {"geoid": geoid}).fetchone()
+        payload = await _read_model_payload(db, geoid, layer_key)
+        if payload is not None:
+            return LayerDetail(**payload)
+
+        # Layer values and timeseries momentum are independent: fetch both at once
+        layer_result, ts_result = await asyncio.gather(
+            db.fetchone(LAYER_DETAIL_QUERIES[layer_key], {"geoid": geoid}),
+            db.fetchone(TIMESERIES_QUERY, {"geoid": geoid, "layer_name": layer_key}),
+        )
 
         if not layer_result:
             raise HTTPException(status_code=404, detail=f"No {layer_key} data for {geoid}")
 
-        # Query timeseries features for momentum
-        ts_query = text("""
-            SELECT
-                momentum_slope,
-                momentum_percent_change,
-                coverage_years,
-                level_latest,
-                level_baseline
-            FROM layer_timeseries_features
-            WHERE geoid = :geoid AND layer_name = :layer_name
-            ORDER BY as_of_year DESC
-            LIMIT 1
-        """)
-
-        ts_result = db.execute(ts_query, {"geoid": geoid, "layer_name": layer_key}).fetchone()
-
-        # Build factors list
-        factors = []
-        for factor_config in config["factors"]:
-            col = factor_config["col"]
-            value = getattr(layer_result, col, None) if layer_result else None
-
-            # Format the value for display
-            formatted = None
-            if value is not None:
-                if "pct" in col.lower() or "ratio" in col.lower():
-                    formatted = f"{value * 100:.1f}%" if value < 1 else f"{value:.1f}%"
-                elif "index" in col.lower() or "score" in col.lower():
-                    formatted = f"{value:.3f}"
-                elif isinstance(value, float):
-                    formatted = f"{value:,.0f}" if value > 100 else f"{value:.2f}"
-                else:
-                    formatted = str(value)
-
-            # Determine trend from timeseries if available
-            trend = None
-            trend_value = None
-            if ts_result and factor_config.get("weight") == 1.0:  # Main index
-                trend = _get_trend_direction(ts_result.momentum_slope)
-                trend_value = ts_result.momentum_percent_change
-
-            factors.append(LayerFactor(
-                name=factor_config["name"],
-                value=float(value) if value is not None else None,
-                formatted_value=formatted,
-                description=factor_config["desc"],
-                weight=factor_config.get("weight"),
-                trend=trend,
-                trend_value=float(trend_value) if trend_value is not None else None
-            ))
-
-        # Get the main score
-        main_score = None
-        for f in factors:
-            if f.weight == 1.0:
-                main_score = f.value
-                break
-
-        return LayerDetail(
-            layer_key=layer_key,
-            display_name=config["display_name"],
-            score=main_score,
-            version=config["version"],
-            formula=config["formula"],
-            description=config["description"],
-            factors=factors,
-            momentum_slope=float(ts_result.momentum_slope) if ts_result and ts_result.momentum_slope else None,
-            momentum_direction=_get_trend_direction(ts_result.momentum_slope) if ts_result else None,
-            data_year=layer_result.data_year if layer_result else 2025,
-            coverage_years=ts_result.coverage_years if ts_result else None
-        )
+        return LayerDetail(**build_layer_payload(layer_key, layer_result, ts_result))
 
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Failed to fetch layer detail: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error")
-    finally:
-        db.close()
 
 
 @router.get("/metadata/refresh", response_model=List[RefreshStatus])
 async def get_latest_refresh_status(
-    db: Session = Depends(get_db_session),
+    db: AsyncDatabase = Depends(get_async_db),
     limit: int = Query(default=10, le=50)
 ):
     """
@@ -523,19 +625,7 @@ async def get_latest_refresh_status(
         List of recent refresh operations
     """
     try:
-        query = text("""
-            SELECT DISTINCT ON (layer_name)
-                layer_name,
-                data_source,
-                refresh_date,
-                status,
-                records_processed
-            FROM data_refresh_log
-            ORDER BY layer_name, refresh_date DESC
-            LIMIT :limit
-        """)
-
-        results = db.execute(query, {"limit": limit}).fetchall()
+        results = await db.fetchall(REFRESH_STATUS_QUERY, {"limit": limit})
 
         return [
             RefreshStatus(
@@ -551,8 +641,49 @@ async def get_latest_refresh_status(
     except Exception as e:
         logger.error(f"Failed to fetch refresh status: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error")
-    finally:
-        db.close()
+
+
+@router.get("/metadata/coverage")
+async def get_feature_coverage(
+    request: Request,
+    db: AsyncDatabase = Depends(get_async_db)
+):
+    """
+    Get the latest feature coverage snapshot
+
+    Snapshots are written after each pipeline run; the report is cached in
+    process until a newer snapshot appears, and carries an ETag for
+    conditional requests.
+
+    Returns:
+        Coverage report: per-feature summary and per-year counts
+    """
+    try:
+        latest = await db.fetchone(LATEST_COVERAGE_ID_QUERY)
+        snapshot_id = latest.id if latest else None
+        if snapshot_id is None:
+            raise HTTPException(
+                status_code=404,
+                detail="Coverage snapshot not found. Run the multi-year pipeline first."
+            )
+
+        etag = f'"coverage-{snapshot_id}"'
+        headers = {"ETag": etag, "Cache-Control": CACHE_REVALIDATE}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+
+        if _coverage_cache["id"] != snapshot_id:
+            row = await db.fetchone(COVERAGE_SNAPSHOT_QUERY, {"id": snapshot_id})
+            report = json.loads(row.report) if isinstance(row.report, str) else row.report
+            _coverage_cache.update(id=snapshot_id, report=report)
+
+        return JSONResponse(content=_coverage_cache["report"], headers=headers)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to fetch feature coverage: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal server error")
 
 
 @router.get("/metadata/sources", response_model=List[DataSource])
@@ -662,6 +793,35 @@ async def get_classification_definitions():
     }
 
 
+@router.post("/scenarios/evaluate")
+def evaluate_scenario(body: ScenarioRequest):
+    """
+    Re-score and re-classify counties for alternative weights and thresholds
+
+    Runs entirely in memory against a cached baseline; nothing is stored.
+
+    Returns:
+        Per-county scenario results, classification changes versus the
+        current pipeline output, and the parameters actually applied
+    """
+    from src.processing import scenarios
+
+    try:
+        baseline = scenarios.get_baseline(body.as_of_year)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    try:
+        return scenarios.evaluate_scenario(
+            baseline,
+            component_weights=body.component_weights,
+            layer_weights=body.layer_weights,
+            thresholds=body.thresholds,
+        )
+    except scenarios.ScenarioError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
 @router.get("/counties")
 async def list_counties():
     """
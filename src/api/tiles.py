@@ -0,0 +1,61 @@
+"""
+Maryland Viability Atlas - Vector tile reads
+Serve single tiles and TileJSON from the MBTiles archives written by
+src/export/vector_tiles.py.
+
+Only the standard library is used (sqlite3), so the API image does not need
+the geospatial export stack.
+"""
+
+import json
+import os
+import sqlite3
+from typing import Any, Dict, Optional
+
+from config.settings import get_settings
+
+settings = get_settings()
+
+TILESETS = ("counties", "tracts")
+TILE_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+
+
+def tileset_path(tileset: str) -> str:
+    return os.path.join(settings.EXPORT_DIR, f"md_{tileset}.mbtiles")
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    return sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+
+
+def read_tile(path: str, z: int, x: int, y: int) -> Optional[bytes]:
+    """Gzip-compressed MVT bytes for XYZ tile (z, x, y), or None if empty."""
+    if z < 0 or z > 30 or not (0 <= x < (1 << z)) or not (0 <= y < (1 << z)):
+        return None
+    conn = _connect(path)
+    try:
+        row = conn.execute(
+            "SELECT tile_data FROM tiles WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?",
+            (z, x, (1 << z) - 1 - y),  # MBTiles rows are TMS (flipped y)
+        ).fetchone()
+    finally:
+        conn.close()
+    return row[0] if row else None
+
+
+def read_metadata(path: str) -> Dict[str, Any]:
+    """MBTiles metadata table as a dict, with numeric and JSON fields decoded."""
+    conn = _connect(path)
+    try:
+        metadata = dict(conn.execute("SELECT name, value FROM metadata").fetchall())
+    finally:
+        conn.close()
+    for key in ("minzoom", "maxzoom"):
+        if key in metadata:
+            metadata[key] = int(metadata[key])
+    for key in ("bounds", "center"):
+        if key in metadata:
+            metadata[key] = [float(v) for v in metadata[key].split(",")]
+    if "json" in metadata:
+        metadata.update(json.loads(metadata.pop("json")))
+    return metadata
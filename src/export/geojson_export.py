@@ -8,25 +8,52 @@ Data sources:
 
 Outputs:
 - exports/md_counties_latest.geojson (always current)
-- exports/md_counties_{YYYYMMDD}.geojson (versioned snapshots)
+- exports/md_counties_{sha256[:16]}.geojson (immutable, content-addressed copy)
+- exports/md_counties_{YYYYMMDD}.geojson (versioned snapshots, linked to the
+  content-addressed file so identical versions share storage)
+- exports/md_counties_export_state.json (input fingerprint of the last export;
+  unchanged inputs skip regeneration)
+- exports/md_counties.mbtiles (vector tiles, see vector_tiles.py)
+
+Each output also gets precompressed ``.gz`` and (when ``brotli`` is installed)
+``.br`` siblings so the API can serve them without compressing per request.
 """
 
 import geopandas as gpd
 import pandas as pd
+import gzip
 import json
 import os
+import shutil
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional, Sequence, Union
 from sqlalchemy import text
 import hashlib
 
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    BROTLI_AVAILABLE = False
+
 from config.database import get_db, log_refresh
 from config.settings import get_settings
+from src.export.geojson_writer import write_geojson
+from src.export.vector_tiles import TILESETS, export_tileset
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 settings = get_settings()
 
+# TIGER/Line cartographic boundary vintage used for county and tract geometry
+BOUNDARY_YEAR = 2023
+
+# Bump when the output encoding changes so unchanged inputs still re-export
+EXPORT_FORMAT_VERSION = 2
+
+# Columns that change on every pipeline run without changing the data
+VOLATILE_COLUMNS = ("updated_at", "last_updated")
+
 
 def fetch_maryland_county_boundaries() -> gpd.GeoDataFrame:
     """
@@ -45,7 +72,7 @@ def fetch_maryland_county_boundaries() -> gpd.GeoDataFrame:
 
         # Fetch Maryland counties (FIPS 24)
         # pygris caches automatically in ~/.cache/pygris
-        md_counties = counties(state="MD", year=2023, cb=True)  # cb=True for simplified boundaries
+        md_counties = counties(state="MD", year=BOUNDARY_YEAR, cb=True)  # cb=True for simplified boundaries
 
         # Ensure FIPS code is properly formatted
         md_counties['GEOID'] = md_counties['GEOID'].astype(str).str.zfill(5)
@@ -162,6 +189,7 @@ def fetch_latest_synthesis() -> pd.DataFrame:
                 fsc.classification_version,
                 fsc.updated_at
             FROM final_synthesis_current fsc
+            ORDER BY fsc.geoid
         """)
 
         df = pd.read_sql(query, db.connection())
@@ -224,8 +252,12 @@ def merge_geojson_data(
         how='left'
     )
 
-    # Add metadata
-    merged['last_updated'] = datetime.utcnow().isoformat()
+    # Add metadata: when the data last changed (not export time), so identical
+    # inputs produce byte-identical exports
+    if 'updated_at' in classifications_df.columns and classifications_df['updated_at'].notna().any():
+        merged['last_updated'] = pd.Timestamp(classifications_df['updated_at'].max()).isoformat()
+    else:
+        merged['last_updated'] = datetime.utcnow().isoformat()
 
     logger.info(f"Merged data for {len(merged)} counties")
 
@@ -236,7 +268,9 @@ def prepare_geojson_properties(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
     """
     Prepare GeoJSON properties for optimal frontend consumption.
 
-    Ensures all fields are JSON-serializable and properly typed.
+    Normalizes list-like explainability fields and rounds scores. JSON
+    encoding (nested values as strings, NaN as null) happens column-wise in
+    the streaming writer.
 
     Args:
         gdf: GeoDataFrame with merged data
@@ -249,93 +283,224 @@ def prepare_geojson_properties(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
     # Normalize common list-like fields
     for col in ['primary_strengths', 'primary_weaknesses', 'key_trends']:
         if col in gdf.columns:
-            gdf[col] = gdf[col].apply(
-                lambda x: list(x) if isinstance(x, (list, tuple)) else []
-            )
+            gdf[col] = [list(x) if isinstance(x, (list, tuple)) else [] for x in gdf[col]]
 
-    # Round numeric columns
+    # Round numeric columns (NaN stays NaN and is written as null)
     numeric_cols = [
         'composite_score', 'composite_raw', 'composite_normalized',
         'employment_gravity_score', 'mobility_optionality_score',
         'school_trajectory_score', 'housing_elasticity_score',
         'demographic_momentum_score', 'risk_drag_score'
     ]
-
-    # Round numeric columns (only non-null values)
     for col in numeric_cols:
         if col in gdf.columns:
-            # Only round non-null values
-            mask = pd.notna(gdf[col])
-            if mask.any():
-                gdf.loc[mask, col] = gdf.loc[mask, col].round(4)
-
-    # Convert list/dict/object fields to JSON strings for GeoJSON compatibility
-    import json
-
-    def safe_json_dumps(x):
-        if x is None:
-            return None
-        try:
-            if isinstance(x, float) and pd.isna(x):
-                return None
-            return json.dumps(x)
-        except (TypeError, ValueError):
-            return None
-
-    # Known array/json fields
-    array_cols = [
-        'primary_strengths', 'primary_weaknesses', 'key_trends',
-        'uncertainty_reasons', 'per_layer_coverage', 'drivers', 'constraints',
-        'coverage_summary'
-    ]
-    for col in array_cols:
-        if col in gdf.columns:
-            gdf[col] = gdf[col].apply(safe_json_dumps)
-
-    # Fallback: stringify any remaining list/dict values in object columns
-    object_cols = [c for c in gdf.columns if gdf[c].dtype == 'object']
-    for col in object_cols:
-        def coerce_obj(v):
-            if isinstance(v, (list, dict, tuple)):
-                return safe_json_dumps(v)
-            return v
-        gdf[col] = gdf[col].apply(coerce_obj)
-
-    # Fill NaN with None (for JSON null)
-    gdf = gdf.where(pd.notna(gdf), None)
+            gdf[col] = pd.to_numeric(gdf[col], errors='coerce').round(4)
 
     return gdf
 
 
 def export_geojson(
     gdf: gpd.GeoDataFrame,
-    output_path: str,
-    indent: Optional[int] = None
-) -> str:
+    output_paths: Union[str, Sequence[str]],
+    precision: Optional[int] = None
+) -> List[str]:
     """
-    Export GeoDataFrame to GeoJSON file.
+    Export GeoDataFrame to one or more GeoJSON files in a single pass.
 
     Args:
         gdf: GeoDataFrame to export
-        output_path: Output file path
-        indent: JSON indentation (None for compact, 2 for readable)
+        output_paths: Output file path(s); all receive identical content
+        precision: Coordinate decimal places (default: settings.EXPORT_COORDINATE_PRECISION)
 
     Returns:
-        Path to exported file
+        List of exported file paths
     """
-    logger.info(f"Exporting GeoJSON to {output_path}")
-
-    # Ensure output directory exists
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    if isinstance(output_paths, str):
+        output_paths = [output_paths]
+    logger.info(f"Exporting GeoJSON to {', '.join(output_paths)}")
 
-    # Export
-    gdf.to_file(output_path, driver='GeoJSON', indent=indent)
+    sizes = write_geojson(gdf, output_paths, precision=precision)
 
-    # Calculate file size
-    file_size = os.path.getsize(output_path)
+    file_size = max(sizes.values())
     logger.info(f"Exported {len(gdf)} features, file size: {file_size / 1024:.1f} KB")
 
-    return output_path
+    return list(output_paths)
+
+
+def _replace_file(path: str, data: bytes) -> None:
+    """Write via a temp file and rename, never truncating in place.
+
+    Published files may be hard links shared with content-addressed copies;
+    rewriting one in place would change every version that shares it.
+    """
+    tmp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _link_or_copy(source: str, target: str) -> None:
+    """Point ``target`` at ``source``'s bytes, sharing storage when possible."""
+    tmp_path = os.path.join(os.path.dirname(target), f".{os.path.basename(target)}.{os.getpid()}.tmp")
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    try:
+        os.link(source, tmp_path)
+    except OSError:
+        shutil.copyfile(source, tmp_path)
+    os.replace(tmp_path, target)
+
+
+def write_precompressed_variants(file_path: str) -> Dict[str, str]:
+    """
+    Write ``.gz`` and ``.br`` siblings of an exported file.
+
+    Output is deterministic (no gzip timestamp), so identical exports produce
+    identical bytes and ETags.
+
+    Args:
+        file_path: Path to the uncompressed file
+
+    Returns:
+        Dict mapping content-coding ('gzip', 'br') to the written path
+    """
+    with open(file_path, 'rb') as f:
+        raw = f.read()
+
+    variants = {}
+    gz_path = f"{file_path}.gz"
+    _replace_file(gz_path, gzip.compress(raw, compresslevel=9, mtime=0))
+    variants['gzip'] = gz_path
+
+    if BROTLI_AVAILABLE:
+        br_path = f"{file_path}.br"
+        _replace_file(br_path, brotli.compress(raw, quality=11, mode=brotli.MODE_TEXT))
+        variants['br'] = br_path
+    else:
+        logger.debug("brotli not installed; skipping .br variant")
+
+    sizes = ", ".join(f"{enc} {os.path.getsize(p) / 1024:.1f} KB" for enc, p in variants.items())
+    logger.info(f"Precompressed {os.path.basename(file_path)}: {sizes}")
+    return variants
+
+
+def publish_immutable_copy(latest_path: str, checksum: str, prefix: str = "md_counties") -> str:
+    """
+    Store the latest export (and its compressed variants) under its content hash.
+
+    The name changes whenever the content does, so clients may cache it
+    forever. Identical content maps to the same file, which is hard-linked
+    rather than copied when the filesystem allows.
+
+    Returns:
+        Path to the content-addressed file
+    """
+    directory = os.path.dirname(latest_path)
+    immutable_path = os.path.join(directory, f"{prefix}_{checksum[:16]}.geojson")
+    for suffix in ("", ".gz", ".br"):
+        if os.path.exists(latest_path + suffix) and not os.path.exists(immutable_path + suffix):
+            _link_or_copy(latest_path + suffix, immutable_path + suffix)
+    return immutable_path
+
+
+def link_dated_version(immutable_path: str, version: str, prefix: str = "md_counties") -> str:
+    """
+    Expose a content-addressed export under its dated name ({prefix}_YYYYMMDD).
+
+    Dated versions are links to the content-addressed file, so snapshots with
+    identical content share storage.
+    """
+    dated_path = os.path.join(os.path.dirname(immutable_path), f"{prefix}_{version}.geojson")
+    for suffix in ("", ".gz", ".br"):
+        if os.path.exists(immutable_path + suffix):
+            _link_or_copy(immutable_path + suffix, dated_path + suffix)
+    return dated_path
+
+
+def compute_export_fingerprint(level: str, inputs: Dict[str, pd.DataFrame], config: Dict) -> str:
+    """
+    Fingerprint everything an export depends on.
+
+    Args:
+        level: Export level ('county', 'tract')
+        inputs: Named input tables; row order and volatile timestamp columns
+            are ignored (rows are sorted on every column)
+        config: Export settings that affect the output (boundary vintage,
+            precision, zoom bands, ...)
+
+    Returns:
+        Hex SHA-256 fingerprint
+    """
+    sha256 = hashlib.sha256()
+    sha256.update(json.dumps(
+        {"level": level, "format_version": EXPORT_FORMAT_VERSION, **config},
+        sort_keys=True, default=str
+    ).encode())
+    for name in sorted(inputs):
+        df = inputs[name].drop(columns=[c for c in VOLATILE_COLUMNS if c in inputs[name].columns])
+        df = df.reindex(sorted(df.columns), axis=1).reset_index(drop=True)
+        if len(df.columns):
+            # Compare as text: list-valued columns (strengths, reasons) are not orderable
+            keys = df.astype(str)
+            df = df.loc[keys.sort_values(list(keys.columns), kind='stable').index]
+        sha256.update(name.encode())
+        sha256.update(df.to_csv(index=False).encode())
+    return sha256.hexdigest()
+
+
+def load_export_state(name: str) -> Dict:
+    """Fingerprint and outputs of the last successful export, or {}."""
+    path = os.path.join(settings.EXPORT_DIR, f"md_{name}_export_state.json")
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_export_state(name: str, state: Dict) -> None:
+    path = os.path.join(settings.EXPORT_DIR, f"md_{name}_export_state.json")
+    _replace_file(path, json.dumps(state, indent=2, default=str).encode())
+
+
+def _file_signature(path: str) -> Optional[List[int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def output_signatures(paths: List[Optional[str]]) -> Dict[str, List[int]]:
+    """
+    Size and mtime of every published artifact, for the export state.
+
+    Each path is recorded together with its .gz/.br variants, so a deleted or
+    rewritten variant invalidates the export as well as the file itself.
+    """
+    signatures = {}
+    for path in filter(None, paths):
+        for suffix in ("", ".gz", ".br"):
+            signature = _file_signature(path + suffix)
+            if signature is not None:
+                signatures[path + suffix] = signature
+    return signatures
+
+
+def export_is_current(state: Dict, fingerprint: str) -> bool:
+    """True if the last export used the same inputs and its outputs are unchanged."""
+    outputs = state.get("outputs") or {}
+    if not isinstance(outputs, dict):
+        # State written before signatures were recorded: existence only
+        outputs = {p: None for p in outputs if p}
+    return (
+        state.get("fingerprint") == fingerprint
+        and bool(outputs)
+        and all(
+            os.path.exists(p) if signature is None else _file_signature(p) == signature
+            for p, signature in outputs.items()
+        )
+    )
 
 
 def calculate_file_checksum(file_path: str) -> str:
@@ -361,7 +526,8 @@ def log_export_version(
     version: str,
     geojson_path: str,
     record_count: int,
-    data_year: int
+    data_year: int,
+    checksum: Optional[str] = None
 ):
     """
     Log export version to database for reproducibility.
@@ -371,10 +537,11 @@ def log_export_version(
         geojson_path: Path to exported file
         record_count: Number of features exported
         data_year: Data year included in export
+        checksum: SHA-256 of the file, if already known
     """
     logger.info(f"Logging export version {version}")
 
-    checksum = calculate_file_checksum(geojson_path)
+    checksum = checksum or calculate_file_checksum(geojson_path)
 
     with get_db() as db:
         sql = text("""
@@ -413,26 +580,33 @@ def log_export_version(
 
 def run_geojson_export(
     level: str = "county",
-    versioned: bool = True
+    versioned: bool = True,
+    force: bool = False
 ) -> dict:
     """
     Main entry point for GeoJSON export pipeline.
 
+    The export is skipped when its inputs (synthesis rows, boundary vintage,
+    export settings) match the last successful export, so unchanged data does
+    not rewrite files or invalidate downstream caches.
+
     Args:
-        level: Geography level ('county' for V1, 'tract' for future)
+        level: Geography level ('county', or 'tract' for multi-resolution tract artifacts)
         versioned: If True, create dated snapshot in addition to 'latest'
+        force: Rebuild even if inputs are unchanged
 
     Returns:
-        Dict with export metadata
+        Dict with export metadata ('skipped': True when nothing changed)
     """
+    if level == "tract":
+        from src.export.tract_export import run_tract_export
+        return run_tract_export(versioned=versioned, force=force)
+
     logger.info(f"Starting GeoJSON export (level={level}, versioned={versioned})")
 
     try:
         if level != "county":
-            raise ValueError("Only 'county' level supported in V1")
-
-        # Fetch county boundaries
-        boundaries_gdf = fetch_maryland_county_boundaries()
+            raise ValueError(f"Unsupported export level: {level}")
 
         # Fetch latest synthesis
         classifications_df = fetch_latest_synthesis()
@@ -440,6 +614,30 @@ def run_geojson_export(
         if classifications_df.empty:
             raise ValueError("No classification data available for export")
 
+        fingerprint = compute_export_fingerprint(
+            level,
+            {"synthesis": classifications_df},
+            {
+                "boundary_year": BOUNDARY_YEAR,
+                "precision": settings.EXPORT_COORDINATE_PRECISION,
+                "tiles": TILESETS["counties"],
+            }
+        )
+        state = load_export_state("counties")
+        if not force and export_is_current(state, fingerprint):
+            logger.info(f"Export inputs unchanged (fingerprint {fingerprint[:12]}); skipping regeneration")
+            log_refresh(
+                layer_name="geojson_export",
+                data_source="final_synthesis_current",
+                status="success",
+                records_processed=len(classifications_df),
+                metadata={"skipped": True, "fingerprint": fingerprint, "checksum": state.get("checksum")}
+            )
+            return {**state["result"], "skipped": True}
+
+        # Fetch county boundaries
+        boundaries_gdf = fetch_maryland_county_boundaries()
+
         # Merge data
         merged_gdf = merge_geojson_data(boundaries_gdf, classifications_df)
 
@@ -449,22 +647,22 @@ def run_geojson_export(
         # Determine data year
         data_year = int(merged_gdf['data_year'].iloc[0])
 
-        # Export latest
+        # Export latest, then store it by content hash
         latest_path = os.path.join(settings.EXPORT_DIR, "md_counties_latest.geojson")
-        export_geojson(merged_gdf, latest_path, indent=None)  # Compact for production
+        export_geojson(merged_gdf, latest_path)
+        write_precompressed_variants(latest_path)
+        checksum = calculate_file_checksum(latest_path)
+        immutable_path = publish_immutable_copy(latest_path, checksum)
+        tiles = export_tileset(merged_gdf, "counties", settings.EXPORT_DIR)
 
-        # Export versioned snapshot
+        # Dated snapshot links to the content-addressed file
         versioned_path = None
         if versioned:
             version = datetime.utcnow().strftime("%Y%m%d")
-            versioned_path = os.path.join(
-                settings.EXPORT_DIR,
-                f"md_counties_{version}.geojson"
-            )
-            export_geojson(merged_gdf, versioned_path, indent=2)  # Readable for archive
+            versioned_path = link_dated_version(immutable_path, version)
 
             # Log version
-            log_export_version(version, versioned_path, len(merged_gdf), data_year)
+            log_export_version(version, immutable_path, len(merged_gdf), data_year, checksum=checksum)
 
         # Log success
         log_refresh(
@@ -475,20 +673,37 @@ def run_geojson_export(
             records_inserted=len(merged_gdf),
             metadata={
                 "data_year": data_year,
+                "fingerprint": fingerprint,
                 "output_latest": latest_path,
-                "output_versioned": versioned_path
+                "output_immutable": immutable_path,
+                "output_versioned": versioned_path,
+                "output_tiles": tiles["path"] if tiles else None
             }
         )
 
         logger.info("GeoJSON export completed successfully")
 
-        return {
+        result = {
             "level": level,
             "record_count": len(merged_gdf),
             "data_year": data_year,
             "latest_path": latest_path,
-            "versioned_path": versioned_path
+            "immutable_path": immutable_path,
+            "checksum": checksum,
+            "versioned_path": versioned_path,
+            "tiles_path": tiles["path"] if tiles else None,
+            "skipped": False
         }
+        save_export_state("counties", {
+            "fingerprint": fingerprint,
+            "checksum": checksum,
+            "exported_at": datetime.utcnow().isoformat(),
+            "outputs": output_signatures(
+                [latest_path, immutable_path, versioned_path, tiles["path"] if tiles else None]
+            ),
+            "result": result,
+        })
+        return result
 
     except Exception as e:
         logger.error(f"GeoJSON export failed: {e}", exc_info=True)
@@ -510,12 +725,12 @@ if __name__ == "__main__":
 
     setup_logging("geojson_export")
 
-    parser = argparse.ArgumentParser(description="Export Maryland county data to GeoJSON")
+    parser = argparse.ArgumentParser(description="Export Maryland county or tract data to GeoJSON")
     parser.add_argument(
         "--level",
         type=str,
         default="county",
-        choices=["county"],
+        choices=["county", "tract"],
         help="Geography level"
     )
     parser.add_argument(
@@ -528,12 +743,18 @@ if __name__ == "__main__":
         action="store_true",
         help="Only update 'latest' file"
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild even if export inputs are unchanged"
+    )
 
     args = parser.parse_args()
 
     result = run_geojson_export(
         level=args.level,
-        versioned=not args.latest_only
+        versioned=not args.latest_only,
+        force=args.force
     )
 
     print(json.dumps(result, indent=2))
@@ -0,0 +1,188 @@
+"""
+Maryland Viability Atlas - Streaming GeoJSON writer
+Writes FeatureCollections feature by feature, without GDAL.
+
+Geometries are quantized and serialized in one vectorized shapely call;
+properties are read column-wise into plain Python values and encoded per
+feature with orjson when available. Each encoded feature is written to every
+output path in the same pass, one feature per line, so the latest and
+versioned exports cost a single serialization.
+
+Files are written to a temporary name and renamed into place, so readers
+(the API) never see a partially written export.
+"""
+
+import json
+import math
+import os
+from contextlib import ExitStack
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    ORJSON_AVAILABLE = False
+
+from config.settings import get_settings
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+
+def _dumps(value: Any) -> bytes:
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":"), allow_nan=False).encode()
+
+
+def _coerce_value(value: Any) -> Any:
+    """Convert one object-column cell to a JSON-native value."""
+    if value is None:
+        return None
+    if isinstance(value, float):
+        return None if math.isnan(value) else value
+    if isinstance(value, (list, tuple, dict, np.ndarray)):
+        # Nested values are stored as JSON strings (flat GeoJSON properties)
+        if isinstance(value, np.ndarray):
+            value = value.tolist()
+        try:
+            return json.dumps(value, default=str)
+        except (TypeError, ValueError):
+            return None
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return _coerce_value(value.item())
+    if value is pd.NaT or value is pd.NA:
+        return None
+    return value
+
+
+def column_values(series: pd.Series) -> List[Any]:
+    """
+    Convert a property column to a list of JSON-native values.
+
+    Numeric and datetime columns are converted in one vectorized step;
+    only object columns fall back to a per-value conversion.
+    """
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_integer_dtype(series):
+        if series.isna().any():
+            return [None if pd.isna(v) else v for v in series.astype(object).tolist()]
+        return series.tolist()
+    if pd.api.types.is_float_dtype(series):
+        values = series.to_numpy(dtype=float)
+        nan_mask = np.isnan(values)
+        out = values.tolist()
+        if nan_mask.any():
+            for i in np.flatnonzero(nan_mask):
+                out[i] = None
+        return out
+    if pd.api.types.is_datetime64_any_dtype(series):
+        formatted = series.dt.strftime("%Y-%m-%dT%H:%M:%S")
+        return [None if pd.isna(v) else v for v in formatted.tolist()]
+    return [_coerce_value(v) for v in series.tolist()]
+
+
+def geometry_json(geometries: Sequence, precision: Optional[int] = None) -> List[bytes]:
+    """
+    Serialize geometries to GeoJSON, rounding coordinates to ``precision`` decimals.
+
+    Args:
+        geometries: GeoSeries or array of shapely geometries (None allowed)
+        precision: Decimal places to keep (default: settings.EXPORT_COORDINATE_PRECISION)
+    """
+    if precision is None:
+        precision = settings.EXPORT_COORDINATE_PRECISION
+    geoms = np.asarray(geometries, dtype=object)
+    if precision >= 0:
+        geoms = shapely.transform(geoms, lambda coords: np.round(coords, precision))
+    encoded = shapely.to_geojson(geoms)
+    return [b"null" if g is None else g.encode() for g in encoded]
+
+
+def simplify_coverage(geometries: gpd.GeoSeries, tolerance: float) -> gpd.GeoSeries:
+    """
+    Simplify polygons while keeping shared boundaries aligned.
+
+    Uses GEOS coverage simplification (shapely >= 2.1) so each shared edge is
+    simplified once for both neighbours; older shapely falls back to
+    topology-preserving simplification of each polygon.
+    """
+    values = geometries.values
+    if hasattr(shapely, "coverage_simplify"):
+        simplified = shapely.coverage_simplify(values, tolerance)
+    else:  # pragma: no cover - depends on installed shapely/GEOS
+        simplified = shapely.simplify(values, tolerance, preserve_topology=True)
+    return gpd.GeoSeries(simplified, index=geometries.index, crs=geometries.crs)
+
+
+def iter_features(gdf, precision: Optional[int] = None) -> Iterator[bytes]:
+    """Yield each row of a GeoDataFrame as an encoded GeoJSON Feature."""
+    geometry_name = gdf.geometry.name
+    names = [c for c in gdf.columns if c != geometry_name]
+    columns = [column_values(gdf[c]) for c in names]
+    geometries = geometry_json(gdf.geometry.values, precision)
+
+    for i, geometry in enumerate(geometries):
+        properties = _dumps({name: col[i] for name, col in zip(names, columns)})
+        yield b'{"type":"Feature","properties":' + properties + b',"geometry":' + geometry + b"}"
+
+
+def write_geojson(
+    gdf,
+    output_paths: Sequence[str],
+    precision: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Stream a GeoDataFrame to one or more GeoJSON files in a single pass.
+
+    Args:
+        gdf: GeoDataFrame in EPSG:4326
+        output_paths: Files to write (identical content)
+        precision: Coordinate decimal places (default: settings.EXPORT_COORDINATE_PRECISION)
+
+    Returns:
+        Dict mapping each output path to its size in bytes
+    """
+    tmp_paths = []
+    for path in output_paths:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_paths.append(
+            os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.{os.getpid()}.tmp")
+        )
+
+    count = 0
+    try:
+        with ExitStack() as stack:
+            files = [stack.enter_context(open(p, "wb")) for p in tmp_paths]
+            for f in files:
+                f.write(b'{"type":"FeatureCollection","features":[')
+            for feature in iter_features(gdf, precision):
+                sep = b",\n" if count else b"\n"
+                for f in files:
+                    f.write(sep)
+                    f.write(feature)
+                count += 1
+            for f in files:
+                f.write(b"\n]}\n")
+    except BaseException:
+        for p in tmp_paths:
+            if os.path.exists(p):
+                os.remove(p)
+        raise
+
+    sizes = {}
+    for tmp_path, path in zip(tmp_paths, output_paths):
+        os.replace(tmp_path, path)
+        sizes[path] = os.path.getsize(path)
+    logger.info(f"Wrote {count} features to {len(output_paths)} file(s)")
+    return sizes
@@ -0,0 +1,374 @@
+"""
+Maryland Viability Atlas - Tract-level GeoJSON Export
+Exports census tract layer scores at several geometry resolutions.
+
+Full-precision TIGER tract polygons are far too heavy to ship to a browser,
+so each artifact targets a zoom band:
+
+- Geometry is simplified with a tolerance matched to the band. Shared tract
+  boundaries are simplified once as a coverage when GEOS supports it, so
+  neighbouring tracts stay gap-free; otherwise each polygon is simplified
+  with topology preserved.
+- Coordinates are quantized to the band's precision.
+- Properties are pruned to what the map renders.
+- Each artifact's gzip size is checked against the band's budget.
+
+Outputs:
+- exports/md_tracts_{resolution}_latest.geojson (+ .gz/.br)
+- exports/md_tracts_{resolution}_{checksum}.geojson (content-addressed copy;
+  dated snapshots link to it)
+- exports/md_tracts_manifest.json (zoom ranges, sizes, checksums)
+- exports/md_tracts.mbtiles (vector tiles, see vector_tiles.py)
+"""
+
+import json
+import os
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import geopandas as gpd
+import pandas as pd
+import shapely
+from sqlalchemy import text
+
+from config.database import get_db, log_refresh
+from config.settings import get_settings
+from src.export.geojson_export import (
+    BOUNDARY_YEAR,
+    calculate_file_checksum,
+    compute_export_fingerprint,
+    export_is_current,
+    link_dated_version,
+    load_export_state,
+    output_signatures,
+    publish_immutable_copy,
+    save_export_state,
+    write_precompressed_variants,
+)
+from src.export.geojson_writer import simplify_coverage, write_geojson
+from src.export.vector_tiles import TILESETS, export_tileset
+from src.processing.timeseries_features import tract_timeseries_layer_configs
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+
+@dataclass(frozen=True)
+class ZoomBand:
+    """One tract artifact: the zoom range it serves and how it is generalized."""
+
+    resolution: str
+    min_zoom: int
+    max_zoom: int
+    tolerance: float  # Simplification tolerance in degrees
+    precision: int  # Coordinate decimal places
+    budget_kb: int  # Maximum gzip-compressed size
+
+
+ZOOM_BANDS = (
+    ZoomBand("low", 0, 7, tolerance=0.005, precision=3, budget_kb=150),
+    ZoomBand("medium", 8, 10, tolerance=0.001, precision=4, budget_kb=400),
+    ZoomBand("high", 11, 22, tolerance=0.0001, precision=5, budget_kb=1500),
+)
+
+# Layer key -> (tract table, headline tract score column); shared with the
+# tract-level multi-year synthesis
+TRACT_LAYERS = {
+    layer: (config["table"], config["metric"])
+    for layer, config in tract_timeseries_layer_configs().items()
+}
+
+# Properties shipped to the map; everything else is dropped
+TRACT_PROPERTIES = ["geoid", "fips_code", "data_year"] + [f"{key}_score" for key in TRACT_LAYERS]
+
+SCORE_DECIMALS = 3
+
+
+class ExportBudgetError(ValueError):
+    """Raised when an export artifact exceeds its size budget."""
+
+
+def fetch_maryland_tract_boundaries(year: int = BOUNDARY_YEAR) -> gpd.GeoDataFrame:
+    """
+    Fetch Maryland census tract boundaries from Census TIGER/Line (via pygris).
+
+    Returns:
+        GeoDataFrame with ``geoid`` and geometry in EPSG:4326
+    """
+    logger.info("Fetching Maryland tract boundaries from Census TIGER/Line")
+
+    from pygris import tracts
+
+    md_tracts = tracts(state="MD", year=year, cb=True)
+    md_tracts["geoid"] = md_tracts["GEOID"].astype(str).str.zfill(11)
+    if md_tracts.crs != "EPSG:4326":
+        md_tracts = md_tracts.to_crs("EPSG:4326")
+
+    logger.info(f"Fetched {len(md_tracts)} Maryland tract boundaries")
+    return md_tracts[["geoid", "geometry"]]
+
+
+def fetch_latest_tract_scores() -> pd.DataFrame:
+    """
+    Fetch the latest year of each layer's headline tract score.
+
+    Returns:
+        DataFrame with one row per tract: geoid, fips_code, data_year and
+        ``{layer}_score`` columns
+    """
+    logger.info("Fetching latest tract-level layer scores")
+
+    frames = []
+    with get_db() as db:
+        for layer_key, (table, column) in TRACT_LAYERS.items():
+            query = text(f"""
+                SELECT DISTINCT ON (tract_geoid)
+                    tract_geoid AS geoid,
+                    fips_code,
+                    data_year,
+                    {column} AS {layer_key}_score
+                FROM {table}
+                ORDER BY tract_geoid, data_year DESC
+            """)
+            try:
+                frames.append(pd.read_sql(query, db.connection()))
+            except Exception as e:
+                logger.warning(f"Skipping {table}: {e}")
+                db.rollback()
+
+    if not frames or all(df.empty for df in frames):
+        logger.warning("No tract-level scores found in database")
+        return pd.DataFrame(columns=TRACT_PROPERTIES)
+
+    # One row per tract; 'first' skips the NaNs from layers a frame lacks
+    long_df = pd.concat(frames, ignore_index=True)
+    score_cols = [c for c in long_df.columns if c.endswith("_score")]
+    merged = long_df.groupby("geoid", as_index=False).agg(
+        {"fips_code": "first", "data_year": "max", **{c: "first" for c in score_cols}}
+    )
+
+    logger.info(f"Fetched tract scores for {len(merged)} tracts")
+    return merged
+
+
+def prune_tract_properties(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+    """Keep only the properties the map needs, with scores rounded."""
+    gdf = gdf.copy()
+    for col in TRACT_PROPERTIES:
+        if col not in gdf.columns:
+            gdf[col] = None
+    for layer_key in TRACT_LAYERS:
+        col = f"{layer_key}_score"
+        gdf[col] = pd.to_numeric(gdf[col], errors="coerce").round(SCORE_DECIMALS)
+    gdf["data_year"] = pd.to_numeric(gdf["data_year"], errors="coerce").astype("Int64")
+    return gdf[TRACT_PROPERTIES + [gdf.geometry.name]]
+
+
+def write_tract_artifacts(
+    gdf: gpd.GeoDataFrame,
+    export_dir: str,
+    bands: Sequence[ZoomBand] = ZOOM_BANDS,
+    version: Optional[str] = None,
+    enforce_budgets: bool = True,
+) -> List[Dict]:
+    """
+    Write one simplified, quantized GeoJSON artifact per zoom band.
+
+    Args:
+        gdf: Tract GeoDataFrame (EPSG:4326) with pruned properties
+        export_dir: Output directory
+        bands: Zoom bands to generate
+        version: Optional dated snapshot name, linked to each content-addressed file
+        enforce_budgets: Raise ExportBudgetError if any artifact exceeds its budget
+
+    Returns:
+        Per-artifact report (resolution, zooms, raw and gzip sizes, budget,
+        checksum and published paths)
+    """
+    gdf = gdf[gdf.geometry.notna() & ~gdf.geometry.is_empty]
+    report = []
+    staged = []
+    try:
+        for band in bands:
+            banded = gdf.set_geometry(simplify_coverage(gdf.geometry, band.tolerance))
+            # Staged under a temporary name: nothing is published unless every band fits
+            staging_path = os.path.join(export_dir, f".md_tracts_{band.resolution}.staging.geojson")
+            staged.append(staging_path)
+            sizes = write_geojson(banded, [staging_path], precision=band.precision)
+            variants = write_precompressed_variants(staging_path)
+            gzip_bytes = os.path.getsize(variants["gzip"])
+
+            entry = {
+                "resolution": band.resolution,
+                "min_zoom": band.min_zoom,
+                "max_zoom": band.max_zoom,
+                "path": os.path.join(export_dir, f"md_tracts_{band.resolution}_latest.geojson"),
+                "features": len(banded),
+                "vertices": int(shapely.get_num_coordinates(banded.geometry.values).sum()),
+                "raw_bytes": sizes[staging_path],
+                "gzip_bytes": gzip_bytes,
+                "budget_bytes": band.budget_kb * 1024,
+                "within_budget": gzip_bytes <= band.budget_kb * 1024,
+                "checksum": calculate_file_checksum(staging_path),
+            }
+            report.append(entry)
+            logger.info(
+                f"Tract artifact {band.resolution} (z{band.min_zoom}-{band.max_zoom}): "
+                f"{entry['vertices']} vertices, {entry['raw_bytes'] / 1024:.0f} KB raw, "
+                f"{gzip_bytes / 1024:.0f} KB gzip (budget {band.budget_kb} KB)"
+            )
+
+        over = [e for e in report if not e["within_budget"]]
+        if over and enforce_budgets:
+            details = ", ".join(
+                f"{e['resolution']} {e['gzip_bytes'] // 1024} KB > {e['budget_bytes'] // 1024} KB"
+                for e in over
+            )
+            raise ExportBudgetError(f"Tract artifacts over size budget: {details}")
+        for e in over:
+            logger.warning(f"Tract artifact {e['resolution']} exceeds its size budget")
+
+        for staging_path, entry in zip(staged, report):
+            for suffix in ("", ".gz", ".br"):
+                if os.path.exists(staging_path + suffix):
+                    os.replace(staging_path + suffix, entry["path"] + suffix)
+            prefix = f"md_tracts_{entry['resolution']}"
+            entry["immutable_path"] = publish_immutable_copy(
+                entry["path"], entry["checksum"], prefix=prefix
+            )
+            entry["versioned_path"] = (
+                link_dated_version(entry["immutable_path"], version, prefix=prefix)
+                if version
+                else None
+            )
+    finally:
+        for staging_path in staged:
+            for suffix in ("", ".gz", ".br"):
+                if os.path.exists(staging_path + suffix):
+                    os.remove(staging_path + suffix)
+
+    manifest_path = os.path.join(export_dir, "md_tracts_manifest.json")
+    with open(manifest_path, "w") as f:
+        json.dump(
+            {
+                "generated_at": datetime.utcnow().isoformat(),
+                "artifacts": [
+                    {
+                        **e,
+                        **{
+                            key: os.path.basename(e[key]) if e[key] else None
+                            for key in ("path", "immutable_path", "versioned_path")
+                        },
+                    }
+                    for e in report
+                ],
+            },
+            f,
+            indent=2,
+        )
+
+    return report
+
+
+def run_tract_export(
+    versioned: bool = True, enforce_budgets: bool = True, force: bool = False
+) -> dict:
+    """
+    Export tract-level layer scores as multi-resolution GeoJSON.
+
+    Skipped when tract scores, boundary vintage and band settings match the
+    last successful export.
+
+    Args:
+        versioned: If True, also write dated snapshots
+        enforce_budgets: Fail the export when an artifact exceeds its budget
+        force: Rebuild even if inputs are unchanged
+
+    Returns:
+        Dict with export metadata and the per-artifact size report
+    """
+    logger.info(f"Starting tract GeoJSON export (versioned={versioned})")
+
+    try:
+        scores = fetch_latest_tract_scores()
+        if scores.empty:
+            raise ValueError("No tract-level data available for export")
+
+        fingerprint = compute_export_fingerprint(
+            "tract",
+            {"scores": scores},
+            {
+                "boundary_year": BOUNDARY_YEAR,
+                "bands": [asdict(band) for band in ZOOM_BANDS],
+                "tiles": TILESETS["tracts"],
+            },
+        )
+        state = load_export_state("tracts")
+        if not force and export_is_current(state, fingerprint):
+            logger.info(
+                f"Tract export inputs unchanged (fingerprint {fingerprint[:12]}); "
+                "skipping regeneration"
+            )
+            return {**state["result"], "skipped": True}
+
+        boundaries = fetch_maryland_tract_boundaries()
+
+        merged = prune_tract_properties(boundaries.merge(scores, on="geoid", how="inner"))
+        version = datetime.utcnow().strftime("%Y%m%d") if versioned else None
+        report = write_tract_artifacts(
+            merged, settings.EXPORT_DIR, version=version, enforce_budgets=enforce_budgets
+        )
+        # Tiles are cut from full-resolution geometry, simplified per zoom
+        tiles = export_tileset(merged, "tracts", settings.EXPORT_DIR)
+
+        log_refresh(
+            layer_name="geojson_export_tract",
+            data_source="layer*_tract",
+            status="success",
+            records_processed=len(merged),
+            records_inserted=len(merged),
+            metadata={
+                "artifacts": [
+                    {k: e[k] for k in ("resolution", "raw_bytes", "gzip_bytes", "budget_bytes")}
+                    for e in report
+                ]
+            },
+        )
+
+        logger.info("Tract GeoJSON export completed successfully")
+
+        result = {
+            "level": "tract",
+            "record_count": len(merged),
+            "latest_path": report[-1]["path"],
+            "artifacts": report,
+            "tiles_path": tiles["path"] if tiles else None,
+            "skipped": False,
+        }
+        save_export_state(
+            "tracts",
+            {
+                "fingerprint": fingerprint,
+                "exported_at": datetime.utcnow().isoformat(),
+                "outputs": output_signatures(
+                    [e[key] for e in report for key in ("path", "immutable_path", "versioned_path")]
+                    + [tiles["path"] if tiles else None]
+                ),
+                "result": result,
+            },
+        )
+        return result
+
+    except Exception as e:
+        logger.error(f"Tract GeoJSON export failed: {e}", exc_info=True)
+
+        log_refresh(
+            layer_name="geojson_export_tract",
+            data_source="layer*_tract",
+            status="failed",
+            error_message=str(e),
+        )
+
+        raise
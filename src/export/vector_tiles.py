@@ -0,0 +1,446 @@
+"""
+Maryland Viability Atlas - Vector Tile Export
+Writes county and tract layers as Mapbox Vector Tiles in an MBTiles archive.
+
+Tiles let the map fetch only the geometry in view at the current zoom, so
+first paint no longer depends on the size of the whole dataset.
+
+- Geometry is projected to Web Mercator once, simplified once per zoom at
+  about one tile unit, then clipped per tile (with a small buffer).
+- Tiles are encoded to the MVT 2.1 protobuf format by a small encoder in
+  this module (polygons and points), gzip-compressed and stored in an
+  MBTiles SQLite archive, which the API serves tile by tile.
+
+Outputs:
+- exports/md_counties.mbtiles
+- exports/md_tracts.mbtiles
+"""
+
+import gzip
+import json
+import os
+import sqlite3
+import struct
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import geopandas as gpd
+import shapely
+from shapely import STRtree
+
+from src.export.geojson_writer import column_values, simplify_coverage
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+EXTENT = 4096
+BUFFER = 64  # Tile units of geometry kept beyond each tile edge
+WEB_MERCATOR_HALF = 20037508.342789244
+
+# Attributes carried into tiles
+COUNTY_TILE_ATTRIBUTES = [
+    "fips_code",
+    "county_name",
+    "data_year",
+    "synthesis_grouping",
+    "directional_class",
+    "confidence_class",
+    "composite_score",
+    "employment_gravity_score",
+    "mobility_optionality_score",
+    "school_trajectory_score",
+    "housing_elasticity_score",
+    "demographic_momentum_score",
+    "risk_drag_score",
+]
+
+# Tileset name -> attributes (None = all columns) and zoom range
+TILESETS = {
+    "counties": {
+        "attributes": COUNTY_TILE_ATTRIBUTES,
+        "minzoom": 0,
+        "maxzoom": 10,
+        "description": "Maryland county synthesis and layer scores",
+    },
+    "tracts": {
+        "attributes": None,
+        "minzoom": 0,
+        "maxzoom": 12,
+        "description": "Maryland census tract layer scores",
+    },
+}
+
+# Geometry command ids (MVT spec 4.3)
+_MOVE_TO, _LINE_TO, _CLOSE_PATH = 1, 2, 7
+# Feature geometry types
+_POINT, _POLYGON = 1, 3
+
+
+# ----------------------------------------------------------------------
+# Protobuf encoding
+# ----------------------------------------------------------------------
+
+
+def _varint(n: int) -> bytes:
+    out = bytearray()
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+    return bytes(out)
+
+
+def _zigzag(n: int) -> int:
+    return (n << 1) ^ (n >> 63)
+
+
+def _field(number: int, payload: bytes) -> bytes:
+    """Length-delimited field."""
+    return _varint(number << 3 | 2) + _varint(len(payload)) + payload
+
+
+def _varint_field(number: int, value: int) -> bytes:
+    return _varint(number << 3) + _varint(value)
+
+
+def _packed(number: int, values: Sequence[int]) -> bytes:
+    return _field(number, b"".join(_varint(v) for v in values))
+
+
+def _encode_value(value: Any) -> bytes:
+    if isinstance(value, bool):
+        return _varint_field(7, int(value))
+    if isinstance(value, int):
+        return _varint_field(6, _zigzag(value))
+    if isinstance(value, float):
+        return _varint(3 << 3 | 1) + struct.pack("<d", value)
+    return _field(1, str(value).encode())
+
+
+# ----------------------------------------------------------------------
+# Geometry encoding
+# ----------------------------------------------------------------------
+
+
+def _command(command_id: int, count: int) -> int:
+    return (command_id & 0x7) | (count << 3)
+
+
+def _ring_area(ring: List[Tuple[int, int]]) -> int:
+    """Twice the signed area (positive = clockwise on screen, y down)."""
+    return sum(x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in zip(ring, ring[1:] + ring[:1]))
+
+
+def _tile_ring(coords, exterior: bool) -> Optional[List[Tuple[int, int]]]:
+    ring = []
+    for x, y in coords[:-1]:
+        point = (int(round(x)), int(round(y)))
+        if not ring or ring[-1] != point:
+            ring.append(point)
+    while len(ring) > 1 and ring[0] == ring[-1]:
+        ring.pop()
+    if len(ring) < 3:
+        return None
+    area = _ring_area(ring)
+    if area == 0:
+        return None
+    # Exterior rings must have positive area, interior rings negative
+    if (area > 0) != exterior:
+        ring.reverse()
+    return ring
+
+
+def _encode_geometry(geom) -> Tuple[Optional[int], List[int]]:
+    """Encode a geometry already in tile coordinates as MVT commands."""
+    commands: List[int] = []
+    cursor = [0, 0]
+
+    def move(points: List[Tuple[int, int]], command_id: int):
+        commands.append(_command(command_id, len(points)))
+        for x, y in points:
+            commands.extend((_zigzag(x - cursor[0]), _zigzag(y - cursor[1])))
+            cursor[0], cursor[1] = x, y
+
+    if geom.geom_type in ("Point", "MultiPoint"):
+        points = [(int(round(p.x)), int(round(p.y))) for p in getattr(geom, "geoms", [geom])]
+        move(points, _MOVE_TO)
+        return _POINT, commands
+
+    if geom.geom_type in ("Polygon", "MultiPolygon"):
+        for polygon in getattr(geom, "geoms", [geom]):
+            exterior = _tile_ring(list(polygon.exterior.coords), exterior=True)
+            if exterior is None:
+                continue
+            for ring in [exterior] + [
+                r
+                for r in (_tile_ring(list(i.coords), exterior=False) for i in polygon.interiors)
+                if r
+            ]:
+                move(ring[:1], _MOVE_TO)
+                move(ring[1:], _LINE_TO)
+                commands.append(_command(_CLOSE_PATH, 1))
+        return (_POLYGON, commands) if commands else (None, [])
+
+    if geom.geom_type == "GeometryCollection":
+        polygons = [g for g in geom.geoms if g.geom_type in ("Polygon", "MultiPolygon")]
+        if polygons:
+            return _encode_geometry(
+                shapely.multipolygons([p for g in polygons for p in getattr(g, "geoms", [g])])
+            )
+    return None, []
+
+
+def encode_tile(layer_name: str, features: Sequence[Tuple[int, Any, Dict[str, Any]]]) -> bytes:
+    """
+    Encode one MVT layer.
+
+    Args:
+        layer_name: Layer name
+        features: (feature id, geometry in tile coordinates, properties) triples;
+            ids are stable across tiles so clients can match split features
+
+    Returns:
+        Uncompressed MVT protobuf bytes (empty if no feature encodes)
+    """
+    keys: Dict[str, int] = {}
+    values: Dict[Tuple[type, Any], int] = {}
+    encoded_features = []
+    for feature_id, geom, properties in features:
+        geom_type, commands = _encode_geometry(geom)
+        if geom_type is None:
+            continue
+        tags = []
+        for key, value in properties.items():
+            if value is None:
+                continue
+            tags.append(keys.setdefault(key, len(keys)))
+            tags.append(values.setdefault((type(value), value), len(values)))
+        encoded_features.append(
+            _field(
+                2,
+                (
+                    _varint_field(1, feature_id)
+                    + (_packed(2, tags) if tags else b"")
+                    + _varint_field(3, geom_type)
+                    + _packed(4, commands)
+                ),
+            )
+        )
+    if not encoded_features:
+        return b""
+
+    layer = (
+        _varint_field(15, 2)
+        + _field(1, layer_name.encode())
+        + b"".join(encoded_features)
+        + b"".join(_field(3, key.encode()) for key in keys)
+        + b"".join(_field(4, _encode_value(value)) for _, value in values)
+        + _varint_field(5, EXTENT)
+    )
+    return _field(3, layer)
+
+
+# ----------------------------------------------------------------------
+# Tiling
+# ----------------------------------------------------------------------
+
+
+def tile_bounds(z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """Web Mercator bounds (minx, miny, maxx, maxy) of an XYZ tile."""
+    size = 2 * WEB_MERCATOR_HALF / (1 << z)
+    minx = -WEB_MERCATOR_HALF + x * size
+    maxy = WEB_MERCATOR_HALF - y * size
+    return minx, maxy - size, minx + size, maxy
+
+
+def _tile_range(bounds: Sequence[float], z: int) -> Tuple[range, range]:
+    n = 1 << z
+    size = 2 * WEB_MERCATOR_HALF / n
+    minx, miny, maxx, maxy = bounds
+    x0 = max(0, int((minx + WEB_MERCATOR_HALF) // size))
+    x1 = min(n - 1, int((maxx + WEB_MERCATOR_HALF) // size))
+    y0 = max(0, int((WEB_MERCATOR_HALF - maxy) // size))
+    y1 = min(n - 1, int((WEB_MERCATOR_HALF - miny) // size))
+    return range(x0, x1 + 1), range(y0, y1 + 1)
+
+
+def generate_tiles(
+    gdf: gpd.GeoDataFrame,
+    layer_name: str,
+    minzoom: int,
+    maxzoom: int,
+    attributes: Optional[Sequence[str]] = None,
+) -> Iterator[Tuple[int, int, int, bytes]]:
+    """
+    Yield (z, x, y, mvt_bytes) for every non-empty tile of a layer.
+
+    Args:
+        gdf: Features in any CRS (reprojected to EPSG:3857)
+        layer_name: MVT layer name
+        minzoom, maxzoom: Zoom range to generate
+        attributes: Columns to carry as tile attributes (default: all)
+    """
+    gdf = gdf[gdf.geometry.notna() & ~gdf.geometry.is_empty].to_crs(epsg=3857)
+    names = [c for c in (attributes or gdf.columns) if c in gdf.columns and c != gdf.geometry.name]
+    columns = [column_values(gdf[c]) for c in names]
+    properties = (
+        [dict(zip(names, row)) for row in zip(*columns)] if names else [{} for _ in range(len(gdf))]
+    )
+
+    for z in range(minzoom, maxzoom + 1):
+        tile_size = 2 * WEB_MERCATOR_HALF / (1 << z)
+        simplified = simplify_coverage(gdf.geometry, tile_size / EXTENT).values
+        tree = STRtree(simplified)
+        xs, ys = _tile_range(gdf.total_bounds, z)
+        buffer = tile_size * BUFFER / EXTENT
+        for x in xs:
+            for y in ys:
+                minx, miny, maxx, maxy = tile_bounds(z, x, y)
+                hits = tree.query(
+                    shapely.box(minx - buffer, miny - buffer, maxx + buffer, maxy + buffer)
+                )
+                if not len(hits):
+                    continue
+                hits.sort()
+                clipped = shapely.clip_by_rect(
+                    simplified[hits], minx - buffer, miny - buffer, maxx + buffer, maxy + buffer
+                )
+                scale = EXTENT / tile_size
+                in_tile = shapely.transform(clipped, lambda c: (c - [minx, maxy]) * [scale, -scale])
+                features = [
+                    (int(i) + 1, geom, properties[i])
+                    for i, geom in zip(hits, in_tile)
+                    if geom is not None and not geom.is_empty
+                ]
+                data = encode_tile(layer_name, features)
+                if data:
+                    yield z, x, y, data
+
+
+def write_mbtiles(
+    gdf: gpd.GeoDataFrame,
+    output_path: str,
+    layer_name: str,
+    minzoom: int,
+    maxzoom: int,
+    attributes: Optional[Sequence[str]] = None,
+    description: str = "",
+) -> Dict[str, Any]:
+    """
+    Write a layer's vector tiles to an MBTiles archive.
+
+    The archive is built under a temporary name and renamed into place, so the
+    API never reads a half-written file.
+
+    Returns:
+        Summary dict (path, tile count, bytes, zoom range)
+    """
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    tmp_path = os.path.join(
+        os.path.dirname(output_path), f".{os.path.basename(output_path)}.{os.getpid()}.tmp"
+    )
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    bounds = gdf.to_crs(epsg=4326).total_bounds
+    fields = {
+        name: ("Number" if gdf[name].dtype.kind in "iuf" else "String")
+        for name in (attributes or gdf.columns)
+        if name in gdf.columns and name != gdf.geometry.name
+    }
+
+    count = 0
+    tile_bytes = 0
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript("""
+            CREATE TABLE metadata (name TEXT, value TEXT);
+            CREATE TABLE tiles (
+                zoom_level INTEGER, tile_column INTEGER, tile_row INTEGER, tile_data BLOB
+            );
+        """)
+        batch = []
+        for z, x, y, data in generate_tiles(gdf, layer_name, minzoom, maxzoom, attributes):
+            compressed = gzip.compress(data, compresslevel=6, mtime=0)
+            # MBTiles rows use TMS numbering (y axis flipped)
+            batch.append((z, x, (1 << z) - 1 - y, compressed))
+            count += 1
+            tile_bytes += len(compressed)
+            if len(batch) >= 500:
+                conn.executemany("INSERT INTO tiles VALUES (?, ?, ?, ?)", batch)
+                batch.clear()
+        conn.executemany("INSERT INTO tiles VALUES (?, ?, ?, ?)", batch)
+        conn.execute("CREATE UNIQUE INDEX tile_index ON tiles (zoom_level, tile_column, tile_row)")
+
+        metadata = {
+            "name": layer_name,
+            "description": description,
+            "format": "pbf",
+            "type": "overlay",
+            "version": "1",
+            "minzoom": str(minzoom),
+            "maxzoom": str(maxzoom),
+            "bounds": ",".join(f"{v:.6f}" for v in bounds),
+            "center": (
+                f"{(bounds[0] + bounds[2]) / 2:.6f},{(bounds[1] + bounds[3]) / 2:.6f},{minzoom}"
+            ),
+            "json": json.dumps(
+                {
+                    "vector_layers": [
+                        {
+                            "id": layer_name,
+                            "fields": fields,
+                            "minzoom": minzoom,
+                            "maxzoom": maxzoom,
+                        }
+                    ]
+                }
+            ),
+        }
+        conn.executemany("INSERT INTO metadata VALUES (?, ?)", list(metadata.items()))
+        conn.commit()
+    except BaseException:
+        conn.close()
+        os.remove(tmp_path)
+        raise
+    conn.close()
+    os.replace(tmp_path, output_path)
+
+    logger.info(
+        f"Wrote {count} {layer_name} tiles (z{minzoom}-{maxzoom}, "
+        f"{tile_bytes / 1024:.0f} KB) to {output_path}"
+    )
+    return {
+        "path": output_path,
+        "tiles": count,
+        "bytes": os.path.getsize(output_path),
+        "minzoom": minzoom,
+        "maxzoom": maxzoom,
+    }
+
+
+def export_tileset(
+    gdf: gpd.GeoDataFrame, tileset: str, export_dir: str
+) -> Optional[Dict[str, Any]]:
+    """
+    Write ``md_{tileset}.mbtiles`` next to the GeoJSON exports.
+
+    Tiles are an additional artifact: a failure is logged and the GeoJSON
+    export still completes.
+
+    Returns:
+        Summary from write_mbtiles, or None if tiling failed
+    """
+    config = TILESETS[tileset]
+    try:
+        return write_mbtiles(
+            gdf,
+            os.path.join(export_dir, f"md_{tileset}.mbtiles"),
+            layer_name=tileset,
+            minzoom=config["minzoom"],
+            maxzoom=config["maxzoom"],
+            attributes=config["attributes"],
+            description=config["description"],
+        )
+    except Exception as e:
+        logger.warning(f"Vector tile export for {tileset} failed: {e}", exc_info=True)
+        return None
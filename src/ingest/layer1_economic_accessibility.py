@@ -37,7 +37,6 @@ import pandas as pd
 import geopandas as gpd
 import numpy as np
 from sqlalchemy import text
-import requests
 
 # Ensure project root is on sys.path
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
@@ -48,7 +47,8 @@ from config.settings import get_settings, MD_COUNTY_FIPS
 from config.database import get_db, log_refresh
 from src.utils.logging import get_logger
 from src.utils.prediction_utils import apply_predictions_to_table
-from src.utils.data_sources import download_file
+from src.utils.data_sources import census_limiter, download_file
+from src.utils.http_client import RequestSpec, get_http_client
 
 logger = get_logger(__name__)
 settings = get_settings()
@@ -69,6 +69,9 @@ ACS_CACHE_DIR.mkdir(exist_ok=True)
 QWI_CACHE_DIR = CACHE_DIR / "qwi"
 QWI_CACHE_DIR.mkdir(exist_ok=True)
 
+# QWI probes sent per batch (both variants for two quarters)
+QWI_PROBE_BATCH = 4
+
 # LODES wage segments
 # SE01: $1,250/month or less (~$15k/year)
 # SE02: $1,251/month to $3,333/month (~$15k-$40k/year)
@@ -173,6 +176,9 @@ def _fetch_qwi_api(data_year: int) -> pd.DataFrame:
         "seasonadj": "U"   # unadjusted
     }
 
+    # Probe newest year/quarter first, preferred variant first, a few at a
+    # time through the Census key budget; stop at the first batch with data.
+    specs = []
     for year in target_years:
         for quarter in [4, 3, 2, 1]:
             for get_fields in get_variants:
@@ -185,53 +191,59 @@ def _fetch_qwi_api(data_year: int) -> pd.DataFrame:
                     "key": settings.CENSUS_API_KEY,
                     **base_params
                 }
-                try:
-                    resp = requests.get(base_url, params=params, timeout=30)
-                    if resp.status_code != 200:
-                        warn = False
-                        if resp.status_code in (401, 403):
-                            warn = True
-                        elif resp.status_code == 400 and get_fields == "Emp,HirA,Sep":
-                            warn = True
-                        if warn:
-                            logger.warning(
-                                "QWI API request failed",
-                                extra={
-                                    "status_code": resp.status_code,
-                                    "year": year,
-                                    "quarter": quarter,
-                                    "url": resp.url
-                                }
-                            )
-                        continue
-                    data = resp.json()
-                    if not data or len(data) < 2:
-                        continue
-                    df = pd.DataFrame(data[1:], columns=data[0])
-                    df = _normalize_columns(df)
-                    df['fips_code'] = (
-                        df['state'].astype(str).str.zfill(2) +
-                        df['county'].astype(str).str.zfill(3)
-                    )
-                    df['emp'] = pd.to_numeric(df.get('emp'), errors='coerce')
-                    df['hira'] = pd.to_numeric(df.get('hira'), errors='coerce')
-                    sep_col = df.get('sep')
-                    if sep_col is None:
-                        sep_col = df.get('sepa')
-                    df['sep'] = pd.to_numeric(sep_col, errors='coerce')
-                    df['qwi_year'] = year
-                    df['qwi_quarter'] = quarter
-
-                    cache_path = QWI_CACHE_DIR / f"qwi_{year}_q{quarter}.csv"
-                    try:
-                        df.to_csv(cache_path, index=False)
-                    except Exception:
-                        pass
-
-                    logger.info(f"Fetched QWI API data for {year} Q{quarter} ({get_fields})")
-                    return df
-                except Exception:
-                    continue
+                specs.append(RequestSpec(base_url, params=params, timeout=30, tag=(year, quarter, get_fields)))
+
+    def _has_rows(resp) -> bool:
+        if resp.status_code != 200:
+            return False
+        data = resp.json()
+        return bool(data) and len(data) >= 2
+
+    hit, results = get_http_client().first_success(
+        specs, accept=_has_rows, limiter=census_limiter, batch_size=QWI_PROBE_BATCH
+    )
+
+    for spec, resp in zip(specs[:hit], results[:hit]):
+        year, quarter, get_fields = spec.tag
+        if isinstance(resp, Exception) or resp.status_code == 200:
+            continue
+        if resp.status_code in (401, 403) or (resp.status_code == 400 and get_fields == "Emp,HirA,Sep"):
+            logger.warning(
+                "QWI API request failed",
+                extra={
+                    "status_code": resp.status_code,
+                    "year": year,
+                    "quarter": quarter,
+                    "url": str(resp.url)
+                }
+            )
+
+    if hit is not None:
+        year, quarter, get_fields = specs[hit].tag
+        data = results[hit].json()
+        df = pd.DataFrame(data[1:], columns=data[0])
+        df = _normalize_columns(df)
+        df['fips_code'] = (
+            df['state'].astype(str).str.zfill(2) +
+            df['county'].astype(str).str.zfill(3)
+        )
+        df['emp'] = pd.to_numeric(df.get('emp'), errors='coerce')
+        df['hira'] = pd.to_numeric(df.get('hira'), errors='coerce')
+        sep_col = df.get('sep')
+        if sep_col is None:
+            sep_col = df.get('sepa')
+        df['sep'] = pd.to_numeric(sep_col, errors='coerce')
+        df['qwi_year'] = year
+        df['qwi_quarter'] = quarter
+
+        cache_path = QWI_CACHE_DIR / f"qwi_{year}_q{quarter}.csv"
+        try:
+            df.to_csv(cache_path, index=False)
+        except Exception:
+            pass
+
+        logger.info(f"Fetched QWI API data for {year} Q{quarter} ({get_fields})")
+        return df
 
     logger.warning("QWI API returned no data for requested years")
     return pd.DataFrame()
@@ -39,7 +39,6 @@ import pandas as pd
 import geopandas as gpd
 import numpy as np
 from sqlalchemy import text
-import requests
 
 # Note: gtfs_kit imports are deferred to avoid r5py import hook triggering
 # when Java is not available. Import only in functions that need it.
@@ -198,20 +197,11 @@ def download_maryland_osm() -> Path:
     url = "https://download.geofabrik.de/north-america/us/maryland-latest.osm.pbf"
     logger.info(f"Downloading Maryland OSM extract from Geofabrik...")
 
-    try:
-        response = requests.get(url, stream=True, timeout=300)
-        response.raise_for_status()
-
-        with open(osm_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-
-        logger.info(f"✓ Downloaded OSM extract: {osm_path.stat().st_size / 1e6:.1f} MB")
-        return osm_path
+    if not download_file(url, str(osm_path), timeout=300):
+        raise RuntimeError(f"Failed to download OSM extract from {url}")
 
-    except Exception as e:
-        logger.error(f"Failed to download OSM extract: {e}")
-        raise
+    logger.info(f"✓ Downloaded OSM extract: {osm_path.stat().st_size / 1e6:.1f} MB")
+    return osm_path
 
 
 def download_gtfs_feeds(feed_names: Optional[List[str]] = None) -> List[GTFSFeedInfo]:
@@ -248,19 +238,12 @@ def download_gtfs_feeds(feed_names: Optional[List[str]] = None) -> List[GTFSFeed
 
         if needs_download:
             logger.info(f"Downloading GTFS feed: {feed_name}")
-            try:
-                response = requests.get(feed_info['url'], timeout=120)
-                response.raise_for_status()
-
-                with open(feed_path, 'wb') as f:
-                    f.write(response.content)
-
-                logger.info(f"✓ Downloaded {feed_name}")
-
-            except Exception as e:
-                logger.warning(f"Failed to download {feed_name}: {e}")
+            if not download_file(feed_info['url'], str(feed_path), timeout=120):
+                logger.warning(f"Failed to download {feed_name}")
                 continue
 
+            logger.info(f"✓ Downloaded {feed_name}")
+
         # Compute file hash and extract feed date
         file_hash = hashlib.md5(open(feed_path, 'rb').read()).hexdigest()
 
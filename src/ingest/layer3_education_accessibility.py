@@ -37,7 +37,6 @@ import pandas as pd
 import numpy as np
 from scipy.spatial.distance import cdist
 from sqlalchemy import text
-import requests
 
 # Ensure project root is on sys.path
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
@@ -46,6 +45,8 @@ if str(PROJECT_ROOT) not in sys.path:
 
 from config.settings import get_settings, MD_COUNTY_FIPS
 from config.database import get_db, log_refresh
+from src.utils.data_sources import download_file
+from src.utils.http_client import get_http_client
 from src.utils.logging import get_logger
 from src.utils.prediction_utils import apply_predictions_to_table
 
@@ -138,9 +139,8 @@ def download_nces_school_directory(year: int) -> pd.DataFrame:
             zip_url = settings.NCES_CCD_PRELIM_URL
             logger.info(f"Using NCES preliminary CCD directory: {zip_url}")
             zip_path = NCES_CACHE_DIR / f"ccd_prelim_{year}.zip"
-            resp = requests.get(zip_url, timeout=120)
-            resp.raise_for_status()
-            zip_path.write_bytes(resp.content)
+            if not download_file(zip_url, str(zip_path), timeout=120):
+                raise RuntimeError(f"download failed: {zip_url}")
 
             with zipfile.ZipFile(zip_path, 'r') as zf:
                 csv_files = [n for n in zf.namelist() if n.lower().endswith('.csv')]
@@ -168,7 +168,7 @@ def download_nces_school_directory(year: int) -> pd.DataFrame:
 
     # Try to resolve the actual URL from the browse page
     try:
-        resp = requests.get("https://nces.ed.gov/ccd/pubschuniv.asp", timeout=60)
+        resp = get_http_client().get("https://nces.ed.gov/ccd/pubschuniv.asp", timeout=60)
         pattern = rf"Data/zip/ccd_sch_029_{yy_format}[^\"'<>]+\.zip"
         matches = re.findall(pattern, resp.text)
 
@@ -179,9 +179,8 @@ def download_nces_school_directory(year: int) -> pd.DataFrame:
             # Download and extract
             zip_path = NCES_CACHE_DIR / f"ccd_schools_{year}.zip"
 
-            resp = requests.get(zip_url, timeout=120)
-            resp.raise_for_status()
-            zip_path.write_bytes(resp.content)
+            if not download_file(zip_url, str(zip_path), timeout=120):
+                raise RuntimeError(f"download failed: {zip_url}")
 
             # Read the ZIP file
             with zipfile.ZipFile(zip_path, 'r') as zf:
@@ -15,7 +15,6 @@ Enforces MAX 5-year lookback from current date (January 29, 2026).
 """
 
 import sys
-import zipfile
 import re
 import argparse
 from pathlib import Path
@@ -25,7 +24,6 @@ from typing import Dict, List, Optional
 import pandas as pd
 import numpy as np
 from sqlalchemy import text
-import requests
 
 # Ensure project root is on sys.path when running as a script
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
@@ -34,7 +32,8 @@ if str(PROJECT_ROOT) not in sys.path:
 
 from config.settings import get_settings, MD_COUNTY_FIPS
 from config.database import get_db, log_refresh
-from src.utils.data_sources import download_file
+from src.utils.data_sources import download_file, maryland_row_filter, read_csv_filtered
+from src.utils.http_client import get_http_client
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -82,7 +81,7 @@ def _resolve_membership_zip_url(year: int) -> Optional[str]:
         Full download URL or None if not found
     """
     try:
-        resp = requests.get(CCD_LEA_BROWSE_URL, timeout=60)
+        resp = get_http_client().get(CCD_LEA_BROWSE_URL, timeout=60)
         resp.raise_for_status()
     except Exception as e:
         logger.warning(f"Failed to load CCD browse page: {e}")
@@ -132,33 +131,28 @@ def _download_membership_file(year: int) -> Path:
 
 
 def _read_membership_zip(zip_path: Path) -> pd.DataFrame:
-    """Read membership data from ZIP file with encoding fallback"""
-    with zipfile.ZipFile(zip_path, 'r') as zf:
-        candidates = [n for n in zf.namelist() if n.lower().endswith(('.csv', '.txt'))]
-        if not candidates:
-            raise RuntimeError(f"No data file found in {zip_path.name}")
-
-        # Prefer LEA-level membership files
-        preferred = [n for n in candidates if "lea" in n.lower() or "agency" in n.lower()]
-        data_name = preferred[0] if preferred else candidates[0]
-
-        # Try multiple encodings (NCES files vary)
-        encodings_to_try = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-        df = None
-
-        for encoding in encodings_to_try:
-            try:
-                with zf.open(data_name) as f:
-                    df = pd.read_csv(f, dtype=str, encoding=encoding, low_memory=False)
-                    logger.info(f"Successfully read {data_name} with {encoding} encoding")
-                    break
-            except Exception:
-                continue
-
-        if df is None:
-            raise RuntimeError(f"Could not read {data_name} with any encoding")
+    """
+    Read Maryland rows from a national membership ZIP with encoding fallback.
 
-        return df
+    The national file is streamed in chunks and only Maryland LEAs are kept;
+    the subset is cached next to the ZIP and reused while the ZIP is unchanged.
+    """
+    row_filter = maryland_row_filter(
+        value_columns=['ST', 'STABBR', 'STATE', 'STATE_ABBR'],
+        prefix_columns=['FIPST', 'ST_FIPS', 'STATE_FIPS'],
+        width=2,
+    )
+    try:
+        return read_csv_filtered(
+            zip_path,
+            row_filter=row_filter,
+            member_hints=("lea", "agency"),
+            # Try multiple encodings (NCES files vary)
+            encodings=['utf-8', 'latin-1', 'cp1252', 'iso-8859-1'],
+            cache_path=zip_path.with_name(f"{zip_path.stem}_md.csv"),
+        )
+    except ValueError as e:
+        raise RuntimeError(f"Could not read {zip_path.name}: {e}") from e
 
 
 def _filter_md_lea(df: pd.DataFrame) -> pd.DataFrame:
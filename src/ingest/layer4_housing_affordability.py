@@ -24,9 +24,7 @@ import warnings
 import pandas as pd
 import numpy as np
 from sqlalchemy import text
-import zipfile
 import io
-import requests
 
 # Ensure project root is on sys.path
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
@@ -35,9 +33,10 @@ if str(PROJECT_ROOT) not in sys.path:
 
 from config.settings import get_settings, MD_COUNTY_FIPS
 from config.database import get_db, log_refresh
+from src.utils.http_client import get_http_client
 from src.utils.logging import get_logger
 from src.utils.prediction_utils import apply_predictions_to_table
-from src.utils.data_sources import download_file
+from src.utils.data_sources import download_file, maryland_row_filter, read_csv_filtered
 
 logger = get_logger(__name__)
 settings = get_settings()
@@ -150,7 +149,7 @@ def _fetch_hud_fmr_api(data_year: int) -> pd.DataFrame:
     for year in range(data_year, data_year - 5, -1):
         url = f"{base_url}/statedata/MD"
         try:
-            resp = requests.get(url, headers=headers, params={"year": year}, timeout=30)
+            resp = get_http_client().get(url, headers=headers, params={"year": year}, timeout=30)
             if resp.status_code != 200:
                 continue
             payload = resp.json()
@@ -242,7 +241,7 @@ def _load_zip_crosswalk(zip_codes: list[str]) -> pd.DataFrame:
         for zip_code in zip_codes:
             params = {"type": 3, "query": zip_code}
             try:
-                resp = requests.get(f"{base_url}/crosswalk", headers=headers, params=params, timeout=30)
+                resp = get_http_client().get(f"{base_url}/crosswalk", headers=headers, params=params, timeout=30)
                 if resp.status_code != 200:
                     continue
                 payload = resp.json()
@@ -362,25 +361,19 @@ def fetch_lihtc_by_county(data_year: int) -> pd.DataFrame:
         logger.warning("HUD LIHTC data source not configured; skipping LIHTC enrichment")
         return pd.DataFrame()
 
+    # Stream the national file and keep only Maryland projects
+    row_filter = maryland_row_filter(
+        value_columns=["proj_st", "st2020", "state_fips", "state"],
+        prefix_columns=["fips2020", "fips2010", "fips", "geoid"],
+        width=5,
+    )
     try:
-        if source_path.suffix.lower() == ".zip":
-            with zipfile.ZipFile(source_path, "r") as zf:
-                candidates = [n for n in zf.namelist() if n.lower().endswith((".csv", ".txt"))]
-                if not candidates:
-                    logger.warning("LIHTC ZIP contains no CSV/TXT files")
-                    return pd.DataFrame()
-                preferred = None
-                for name in candidates:
-                    lower_name = name.lower()
-                    if "lihtc" in lower_name and "pub" in lower_name:
-                        preferred = name
-                        break
-                if preferred is None:
-                    preferred = candidates[0]
-                with zf.open(preferred) as fh:
-                    df = pd.read_csv(fh, dtype=str, low_memory=False)
-        else:
-            df = pd.read_csv(source_path, dtype=str, compression='infer', low_memory=False)
+        df = read_csv_filtered(
+            source_path,
+            row_filter=row_filter,
+            member_hints=(("lihtc", "pub"),),
+            cache_path=CACHE_DIR / f"{source_path.stem}_md.csv",
+        )
     except Exception as e:
         logger.warning(f"Failed to read HUD LIHTC data {source_path}: {e}")
         return pd.DataFrame()
@@ -16,7 +16,6 @@ from datetime import datetime
 from sqlalchemy import text
 import argparse
 from typing import Optional
-import requests
 import re
 from urllib.parse import urljoin, urlparse
 try:
@@ -32,6 +31,7 @@ if str(PROJECT_ROOT) not in sys.path:
 from config.settings import get_settings, MD_COUNTY_FIPS
 from config.database import get_db, log_refresh
 from src.utils.data_sources import fetch_census_data, download_file
+from src.utils.http_client import get_http_client
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -367,7 +367,7 @@ def _fetch_crosswalk_from_api(zip_codes: list[str]) -> pd.DataFrame:
     for zip_code in zip_codes:
         params = {"type": 3, "query": zip_code}
         try:
-            resp = requests.get(f"{base_url}/crosswalk", headers=headers, params=params, timeout=30)
+            resp = get_http_client().get(f"{base_url}/crosswalk", headers=headers, params=params, timeout=30)
             if resp.status_code != 200:
                 continue
             payload = resp.json()
@@ -12,7 +12,6 @@ import sys
 import pandas as pd
 import numpy as np
 import geopandas as gpd
-import requests
 from datetime import datetime
 from sqlalchemy import text
 from typing import Optional
@@ -25,7 +24,8 @@ if str(PROJECT_ROOT) not in sys.path:
 
 from config.settings import get_settings, MD_COUNTY_FIPS
 from config.database import get_db, log_refresh
-from src.utils.data_sources import fetch_fema_nfhl, fetch_epa_ejscreen
+from src.utils.data_sources import NFHLTileFetcher, fetch_arcgis_features, fetch_epa_ejscreen
+from src.utils.http_client import get_http_client
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -96,17 +96,19 @@ def _compute_sfha_metrics() -> pd.DataFrame:
     counties_proj = counties.to_crs('EPSG:5070')
     results = []
 
+    # Fetch every county's tiles in one pass so tiles shared by neighbours download once
+    fetcher = NFHLTileFetcher(max_attempts=2)
+    bboxes = {row['fips_code']: tuple(row['geometry'].bounds) for _, row in counties.iterrows()}
+    try:
+        features_by_county = fetcher.fetch_bboxes(bboxes)
+    except Exception as e:
+        logger.warning(f"FEMA NFHL tile fetch failed: {e}")
+        features_by_county = {}
+    logger.info(f"FEMA NFHL tile stats: {fetcher.stats}")
+
     for _, county in counties.iterrows():
         fips = county['fips_code']
-        geom = county['geometry']
-        minx, miny, maxx, maxy = geom.bounds
-
-        try:
-            geojson = fetch_fema_nfhl("MD", geometry=(minx, miny, maxx, maxy), max_attempts=2)
-            features = geojson.get("features", [])
-        except Exception as e:
-            logger.warning(f"FEMA NFHL failed for {fips}: {e}")
-            features = []
+        features = features_by_county.get(fips, [])
 
         if not features:
             results.append({
@@ -228,7 +230,7 @@ def _pick_fields(fields: list[dict], candidates: list[str]) -> list[str]:
 
 def _fetch_nbi_bridge_metrics(state_fips: str = "24", state_abbr: str = "MD") -> pd.DataFrame:
     try:
-        meta = requests.get(NBI_SERVICE_URL, params={"f": "json"}, timeout=60).json()
+        meta = get_http_client().get(NBI_SERVICE_URL, params={"f": "json"}, timeout=60).json()
     except Exception as e:
         logger.warning(f"Failed to load NBI metadata: {e}")
         return pd.DataFrame()
@@ -271,31 +273,16 @@ def _fetch_nbi_bridge_metrics(state_fips: str = "24", state_abbr: str = "MD") ->
     else:
         state_where = f"{state_field_name}={int(state_fips)}"
 
-    records = []
-    offset = 0
-    page_size = 2000
-    while True:
-        params = {
-            "where": state_where,
-            "outFields": ",".join(
-                [state_field_name, county_field_name] + ([deficient_field_name] if deficient_field_name else []) + condition_fields
-            ),
-            "returnGeometry": "false",
-            "f": "json",
-            "resultOffset": offset,
-            "resultRecordCount": page_size
-        }
-        resp = requests.get(f"{NBI_SERVICE_URL}/query", params=params, timeout=120)
-        resp.raise_for_status()
-        data = resp.json()
-        feats = data.get("features", [])
-        for feat in feats:
-            attrs = feat.get("attributes", {})
-            records.append(attrs)
-
-        if not data.get("exceededTransferLimit") and len(feats) < page_size:
-            break
-        offset += page_size
+    params = {
+        "where": state_where,
+        "outFields": ",".join(
+            [state_field_name, county_field_name] + ([deficient_field_name] if deficient_field_name else []) + condition_fields
+        ),
+        "returnGeometry": "false",
+        "f": "json",
+    }
+    features = fetch_arcgis_features(f"{NBI_SERVICE_URL}/query", params, page_size=2000, timeout=120)
+    records = [feat.get("attributes", {}) for feat in features]
 
     if not records:
         return pd.DataFrame()
@@ -21,13 +21,15 @@ Data Sources:
 """
 
 import sys
+import time
 import pandas as pd
 import numpy as np
 import geopandas as gpd
-import requests
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, List, Tuple
+from typing import Optional, Dict, List, Tuple, Callable, Any
 from sqlalchemy import text
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
@@ -36,7 +38,18 @@ if str(PROJECT_ROOT) not in sys.path:
 
 from config.settings import get_settings, MD_COUNTY_FIPS
 from config.database import get_db, log_refresh
-from src.utils.data_sources import fetch_epa_ejscreen, fetch_fema_nfhl, download_file
+from src.utils.data_sources import (
+    fetch_epa_ejscreen,
+    fetch_fema_nfhl,
+    download_file,
+    fetch_arcgis_features,
+    fetch_csv_filtered,
+    maryland_row_filter,
+    read_state_subset,
+    state_subset_path,
+    write_state_subset,
+)
+from src.utils.http_client import HTTPError, request_deadline
 from src.utils.logging import get_logger
 from src.utils.prediction_utils import apply_predictions_to_table
 
@@ -63,6 +76,20 @@ CLIMATE_PROJECTION_WEIGHT = 0.40
 SOCIAL_VULNERABILITY_WEIGHT = 0.35
 RESILIENCE_DEFICIT_WEIGHT = 0.25
 
+# Per-source wall-clock budgets (seconds) for the concurrent fetch stage.
+# A source that overruns is recorded as a data gap and merged as empty.
+RISK_SOURCE_TIMEOUTS = {
+    "tract_population": 300,
+    "cdc_svi": 900,
+    "slr": 1800,
+    "heat": 600,
+    "land_cover": 600,
+    "ejscreen": 1800,
+    "infrastructure": 900,
+    "adaptive_capacity": 60,
+    "sfha": 3600,
+}
+
 # Maryland coastal counties (for SLR exposure)
 MD_COASTAL_COUNTIES = {
     "24003": "Anne Arundel",
@@ -185,22 +212,21 @@ def fetch_tract_population_data(data_year: int) -> pd.DataFrame:
 # CDC SOCIAL VULNERABILITY INDEX (SVI)
 # =============================================================================
 
-def _read_svi_csv_from_bytes(content: bytes) -> pd.DataFrame:
-    import io
-    import zipfile
+# Columns read from the national SVI file; everything else is dropped while streaming
+SVI_COLUMNS = [
+    'FIPS', 'TRACTFIPS', 'TRACT_FIPS', 'GEOID', 'ST_ABBR', 'STATE', 'STATE_FIPS',
+    'E_TOTPOP', 'TOTPOP', 'RPL_THEME1', 'RPL_THEME2', 'RPL_THEME3', 'RPL_THEME4', 'RPL_THEMES',
+    'EP_POV150', 'EP_POV', 'EP_UNEMP', 'EP_NOHSDP', 'EP_UNINSUR', 'EP_AGE65', 'EP_AGE17',
+    'EP_DISABL', 'EP_LIMENG', 'EP_MINRTY', 'EP_MOBILE', 'EP_MUNIT', 'EP_NOVEH', 'EP_GROUPQ',
+]
 
-    buffer = io.BytesIO(content)
-    if zipfile.is_zipfile(buffer):
-        buffer.seek(0)
-        with zipfile.ZipFile(buffer) as zf:
-            csv_candidates = [f for f in zf.namelist() if f.lower().endswith('.csv')]
-            if not csv_candidates:
-                raise ValueError("SVI zip did not contain a CSV file")
-            with zf.open(csv_candidates[0]) as f:
-                return pd.read_csv(f, low_memory=False)
 
-    buffer.seek(0)
-    return pd.read_csv(buffer, low_memory=False)
+def _svi_row_filter():
+    return maryland_row_filter(
+        value_columns=['ST_ABBR', 'STATE', 'STATE_FIPS'],
+        prefix_columns=['FIPS', 'TRACTFIPS', 'TRACT_FIPS', 'GEOID'],
+        width=11,
+    )
 
 
 def _candidate_svi_urls(year: int) -> list[str]:
@@ -229,26 +255,13 @@ def _fetch_svi_arcgis() -> pd.DataFrame:
         "where": "ST_ABBR='MD'",
         "outFields": "*",
         "f": "json",
-        "resultRecordCount": 2000
     }
-    all_rows = []
-    offset = 0
-    for _ in range(200):
-        params["resultOffset"] = offset
-        resp = requests.get(base_url, params=params, timeout=120)
-        if resp.status_code != 200:
-            break
-        payload = resp.json()
-        features = payload.get("features", [])
-        if not features:
-            break
-        for feat in features:
-            attrs = feat.get("attributes")
-            if attrs:
-                all_rows.append(attrs)
-        if len(features) < params["resultRecordCount"]:
-            break
-        offset += params["resultRecordCount"]
+    try:
+        features = fetch_arcgis_features(base_url, params, page_size=2000, timeout=120)
+    except (HTTPError, ValueError) as e:
+        logger.warning(f"SVI ArcGIS service request failed: {e}")
+        return pd.DataFrame()
+    all_rows = [feat["attributes"] for feat in features if feat.get("attributes")]
 
     if not all_rows:
         return pd.DataFrame()
@@ -281,15 +294,27 @@ def fetch_cdc_svi_data(year: int = None, lookback_years: int = 3) -> pd.DataFram
     last_error = None
     last_url = None
     for target_year in years_to_try:
+        cache_path = state_subset_path(f"cdc_svi_{target_year}_md.csv")
+        df = read_state_subset(cache_path)
+        if df is not None:
+            df['svi_year'] = target_year
+            last_url = df['source_url'].iloc[0] if 'source_url' in df.columns and not df.empty else None
+            break
         for url in _candidate_svi_urls(target_year):
             try:
-                response = requests.get(url, timeout=120)
-                if response.status_code != 200:
+                row_filter = _svi_row_filter()
+                df = fetch_csv_filtered(
+                    url, timeout=120, row_filter=row_filter, columns=SVI_COLUMNS
+                )
+                if df is None or df.empty:
+                    # Try older files and the ArcGIS fallback rather than stopping here
+                    df = None
                     continue
-                df = _read_svi_csv_from_bytes(response.content)
                 last_url = url
-                logger.info(f"Downloaded {len(df)} SVI records for {target_year}")
+                logger.info(f"Downloaded {len(df)} Maryland SVI records for {target_year}")
                 df['svi_year'] = target_year
+                df['source_url'] = url
+                write_state_subset(df, cache_path, row_filter)
                 break
             except Exception as e:
                 last_error = e
@@ -1325,24 +1350,174 @@ def store_risk_vulnerability_data(df: pd.DataFrame, data_year: int):
     logger.info("Risk vulnerability data stored successfully")
 
 
+# =============================================================================
+# SOURCE FETCH STAGE
+# =============================================================================
+
+@dataclass
+class SourceFetchResult:
+    """Outcome of one source loader in the fetch stage."""
+    name: str
+    data: pd.DataFrame
+    status: str  # 'ok', 'empty', 'failed', 'timeout'
+    seconds: float
+    error: Optional[str] = None
+
+
+def _risk_source_loaders(data_year: int) -> Dict[str, Callable[[], pd.DataFrame]]:
+    """Independent source loaders; each is network/disk bound and safe to run concurrently."""
+    from src.ingest.layer6_risk import _compute_sfha_metrics
+
+    return {
+        "tract_population": lambda: fetch_tract_population_data(data_year),
+        "cdc_svi": lambda: fetch_cdc_svi_data(year=data_year),
+        "slr": fetch_slr_exposure_data,
+        "heat": fetch_heat_projection_data,
+        "land_cover": fetch_land_cover_metrics,
+        "ejscreen": lambda: fetch_expanded_ejscreen_data(year=data_year),
+        "infrastructure": lambda: fetch_infrastructure_metrics(data_year),
+        "adaptive_capacity": fetch_adaptive_capacity_metrics,
+        "sfha": _compute_sfha_metrics,
+    }
+
+
+def _run_timed(
+    loader: Callable[[], pd.DataFrame], timing: Dict[str, float], budget: float
+) -> pd.DataFrame:
+    timing["start"] = time.monotonic()
+    try:
+        # HTTP calls made by the loader share its budget and fail fast once it is spent
+        with request_deadline(budget):
+            return loader()
+    finally:
+        timing["end"] = time.monotonic()
+
+
+def fetch_risk_sources(
+    data_year: int,
+    loaders: Optional[Dict[str, Callable[[], pd.DataFrame]]] = None,
+    max_workers: Optional[int] = None,
+    timeouts: Optional[Dict[str, float]] = None
+) -> Dict[str, SourceFetchResult]:
+    """
+    Run all Layer 6 source loaders concurrently on a bounded thread pool.
+
+    Each source has its own wall-clock budget (RISK_SOURCE_TIMEOUTS). Sources
+    that raise, overrun, or return nothing come back with an empty DataFrame
+    and a non-'ok' status so the merge step can proceed and the gap is logged.
+
+    The stage returns once every source has finished or hit its budget; it
+    does not wait for overrunning loaders. Python threads cannot be killed,
+    so an overrunning loader keeps its worker until it returns (and the
+    interpreter joins it at exit), but every request it makes through the
+    shared HTTP client is capped to the source's remaining budget and fails
+    with DeadlineExceeded once it is spent, so abandoned network-bound loaders
+    wind down shortly after their deadline. Their results are discarded.
+
+    Returns:
+        Dict of source name -> SourceFetchResult
+    """
+    loaders = loaders if loaders is not None else _risk_source_loaders(data_year)
+    timeouts = {**RISK_SOURCE_TIMEOUTS, **(timeouts or {})}
+    max_workers = max_workers or settings.LAYER6_FETCH_MAX_WORKERS
+
+    results: Dict[str, SourceFetchResult] = {}
+    timings: Dict[str, Dict[str, float]] = {name: {} for name in loaders}
+    stage_start = time.monotonic()
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="l6-fetch")
+    futures = {
+        executor.submit(_run_timed, loader, timings[name], timeouts.get(name, 1800)): name
+        for name, loader in loaders.items()
+    }
+    pending = set(futures)
+
+    def _elapsed(name: str) -> float:
+        timing = timings[name]
+        start = timing.get("start", stage_start)
+        return timing.get("end", time.monotonic()) - start
+
+    try:
+        while pending:
+            # A source's clock starts when a worker picks it up, not when it is queued
+            now = time.monotonic()
+            deadlines = {
+                f: timings[futures[f]].get("start", now) + timeouts.get(futures[f], 1800)
+                for f in pending
+            }
+            overdue = [f for f in pending if "start" in timings[futures[f]] and deadlines[f] <= now]
+            for future in overdue:
+                name = futures[future]
+                pending.discard(future)
+                future.cancel()
+                results[name] = SourceFetchResult(
+                    name, pd.DataFrame(), "timeout", _elapsed(name),
+                    f"exceeded {timeouts.get(name, 1800)}s budget"
+                )
+                logger.warning(f"Layer 6 source '{name}' timed out after {_elapsed(name):.1f}s")
+            if not pending:
+                break
+
+            next_deadline = min(deadlines[f] for f in pending)
+            done, pending = wait(pending, timeout=max(0.01, next_deadline - now), return_when=FIRST_COMPLETED)
+            for future in done:
+                name = futures[future]
+                try:
+                    df = future.result()
+                except Exception as e:
+                    logger.warning(f"Layer 6 source '{name}' failed: {e}")
+                    results[name] = SourceFetchResult(name, pd.DataFrame(), "failed", _elapsed(name), str(e))
+                    continue
+                df = df if isinstance(df, pd.DataFrame) else pd.DataFrame()
+                status = "ok" if not df.empty else "empty"
+                results[name] = SourceFetchResult(name, df, status, _elapsed(name))
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    wall = time.monotonic() - stage_start
+    total = sum(r.seconds for r in results.values())
+    logger.info(f"Layer 6 fetch stage: {len(results)} sources in {wall:.1f}s (sequential sum {total:.1f}s)")
+    for name in loaders:
+        r = results[name]
+        logger.info(f"  {name:<18} {r.status:<8} {r.seconds:7.1f}s  rows={len(r.data)}")
+    return results
+
+
+def summarize_source_gaps(results: Dict[str, SourceFetchResult]) -> Dict[str, Any]:
+    """Data-gap summary of a fetch stage, shaped for log_refresh metadata."""
+    return {
+        "data_gaps": sorted(name for name, r in results.items() if r.status != "ok"),
+        "source_status": {name: r.status for name, r in results.items()},
+        "source_seconds": {name: round(r.seconds, 2) for name, r in results.items()},
+        "source_errors": {name: r.error for name, r in results.items() if r.error},
+    }
+
+
 # =============================================================================
 # MAIN PIPELINE
 # =============================================================================
 
-def compute_risk_vulnerability(data_year: int = 2025) -> pd.DataFrame:
+def compute_risk_vulnerability(
+    data_year: int = 2025,
+    sources: Optional[Dict[str, SourceFetchResult]] = None
+) -> pd.DataFrame:
     """
     Main pipeline for risk vulnerability computation.
 
     Steps:
-    1. Fetch tract population data
-    2. Fetch CDC SVI data
-    3. Fetch climate projections (SLR, heat)
-    4. Fetch pollution burden (EJScreen)
-    5. Fetch infrastructure metrics
-    6. Fetch adaptive capacity metrics
-    7. Compute static risk score (v1)
-    8. Compute modern vulnerability score (v2)
-    9. Compute composite risk_drag_index
+    1. Fetch all sources concurrently (tract population, CDC SVI, SLR, heat,
+       land cover, EJScreen, infrastructure, adaptive capacity, SFHA)
+    2. Merge sources to county level
+    3. Compute static risk score (v1)
+    4. Compute modern vulnerability score (v2)
+    5. Compute composite risk_drag_index
+
+    Args:
+        data_year: Data year
+        sources: Pre-fetched results from fetch_risk_sources (fetched if None)
+
+    Returns:
+        County DataFrame; ``df.attrs['source_report']`` holds the data-gap summary
     """
     logger.info("=" * 70)
     logger.info("LAYER 6: RISK VULNERABILITY v2 COMPUTATION")
@@ -1350,37 +1525,25 @@ def compute_risk_vulnerability(data_year: int = 2025) -> pd.DataFrame:
     logger.info(f"Data year: {data_year}")
     logger.info(f"Formula: risk_drag = {STATIC_WEIGHT:.0%} static + {MODERN_WEIGHT:.0%} modern")
 
-    # Initialize county base
-    counties = pd.DataFrame({'fips_code': list(MD_COUNTY_FIPS.keys())})
+    if sources is None:
+        sources = fetch_risk_sources(data_year)
 
-    # 1. Fetch population data
-    tract_pop = fetch_tract_population_data(data_year)
+    def _source(name: str) -> pd.DataFrame:
+        result = sources.get(name)
+        return result.data if result is not None else pd.DataFrame()
 
-    # 2. Fetch CDC SVI
-    svi_df = fetch_cdc_svi_data(year=data_year)
-
-    # 3. Climate projections
-    slr_df = fetch_slr_exposure_data()
-    heat_df = fetch_heat_projection_data()
-    land_cover_df = fetch_land_cover_metrics()
-
-    # 4. Pollution burden
-    pollution_df = fetch_expanded_ejscreen_data(year=data_year)
-
-    # 5. Infrastructure resilience
-    infra_df = fetch_infrastructure_metrics(data_year)
+    # Initialize county base
+    counties = pd.DataFrame({'fips_code': list(MD_COUNTY_FIPS.keys())})
 
-    # 6. Adaptive capacity
-    adaptive_df = fetch_adaptive_capacity_metrics()
+    tract_pop = _source("tract_population")
+    svi_df = _source("cdc_svi")
 
-    # Merge all data
+    # Merge all county-level data
     df = counties.copy()
-    df = df.merge(slr_df, on='fips_code', how='left')
-    df = df.merge(heat_df, on='fips_code', how='left')
-    df = df.merge(land_cover_df, on='fips_code', how='left')
-    df = df.merge(pollution_df, on='fips_code', how='left')
-    df = df.merge(infra_df, on='fips_code', how='left')
-    df = df.merge(adaptive_df, on='fips_code', how='left')
+    for name in ["slr", "heat", "land_cover", "ejscreen", "infrastructure", "adaptive_capacity"]:
+        source_df = _source(name)
+        if 'fips_code' in source_df.columns:
+            df = df.merge(source_df, on='fips_code', how='left')
 
     # Aggregate SVI to county if we have tract data
     if not svi_df.empty:
@@ -1415,18 +1578,14 @@ def compute_risk_vulnerability(data_year: int = 2025) -> pd.DataFrame:
         df['proximity_hazwaste_score'] = df['proximity_hazwaste']
 
     # Add v1 flood metrics (from existing pipeline if available)
-    from src.ingest.layer6_risk import _compute_sfha_metrics
-    try:
-        sfha_df = _compute_sfha_metrics()
-        if not sfha_df.empty:
-            df = df.merge(sfha_df, on='fips_code', how='left')
-    except Exception as e:
-        logger.warning(f"SFHA metrics unavailable: {e}")
+    sfha_df = _source("sfha")
+    if not sfha_df.empty:
+        df = df.merge(sfha_df, on='fips_code', how='left')
 
-    # 7. Compute static risk score
+    # 3. Compute static risk score
     df = compute_static_risk_score(df)
 
-    # 8-9. Compute composite scores
+    # 4-5. Compute composite scores
     df = compute_risk_vulnerability_composite(df)
 
     # Add metadata
@@ -1437,7 +1596,7 @@ def compute_risk_vulnerability(data_year: int = 2025) -> pd.DataFrame:
     df['climate_projection_source'] = 'NOAA_SLR_CDC_HEAT'
 
     # Legacy fields (for v1 compatibility)
-    slr_series = pd.to_numeric(df.get('slr_exposure_2ft', pd.NA), errors='coerce')
+    slr_series = pd.to_numeric(df.get('slr_exposure_2ft', pd.Series(np.nan, index=df.index)), errors='coerce')
     df['sea_level_rise_exposure'] = pd.NA
     has_slr = slr_series.notna()
     df.loc[has_slr, 'sea_level_rise_exposure'] = slr_series[has_slr] > 0
@@ -1446,6 +1605,8 @@ def compute_risk_vulnerability(data_year: int = 2025) -> pd.DataFrame:
     # Replace infinities
     df.replace([np.inf, -np.inf], np.nan, inplace=True)
 
+    df.attrs['source_report'] = summarize_source_gaps(sources)
+
     logger.info(f"Computed risk vulnerability for {len(df)} counties")
     return df
 
@@ -1504,17 +1665,27 @@ def main():
             name = MD_COUNTY_FIPS.get(row['fips_code'], 'Unknown')
             logger.info(f"  {name}: {row['risk_drag_index']:.3f}")
 
+        source_report = df.attrs.get('source_report', {})
+        failed_sources = [
+            name for name, status in source_report.get('source_status', {}).items()
+            if status in ('failed', 'timeout')
+        ]
+        if source_report.get('data_gaps'):
+            logger.warning(f"Layer 6 data gaps: {', '.join(source_report['data_gaps'])}")
+
         log_refresh(
             layer_name="layer6_risk_drag",
             data_source="NOAA+CDC+EPA+NBI",
-            status="success",
+            status="partial" if failed_sources else "success",
             records_processed=len(df),
             records_inserted=len(df),
+            error_message=f"Sources failed: {', '.join(failed_sources)}" if failed_sources else None,
             metadata={
                 "data_year": data_year,
                 "version": "v2-vulnerability",
                 "static_weight": STATIC_WEIGHT,
-                "modern_weight": MODERN_WEIGHT
+                "modern_weight": MODERN_WEIGHT,
+                **source_report
             }
         )
 
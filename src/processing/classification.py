@@ -17,16 +17,163 @@ NO PREDICTIONS. Only directional pressure classification.
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from sqlalchemy import text
 
 from config.database import get_db, log_refresh
 from config.settings import get_settings
+from src.processing.classification_rules import Rule, RuleSet, column_matrix, thresholds_from
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 settings = get_settings()
 
+# Layers scored for direction (risk drag is handled separately)
+DIRECTIONAL_LAYERS = [
+    'employment_gravity',
+    'mobility_optionality',
+    'school_trajectory',
+    'housing_elasticity',
+    'demographic_momentum'
+]
+
+THRESHOLD_NAMES = (
+    'THRESHOLD_IMPROVING_MIN_LAYERS', 'THRESHOLD_IMPROVING_HIGH', 'THRESHOLD_IMPROVING_LOW',
+    'THRESHOLD_AT_RISK_COUNT', 'THRESHOLD_AT_RISK_WITH_DRAG',
+    'CONFIDENCE_STRONG_MIN', 'CONFIDENCE_CONDITIONAL_MIN',
+)
+
+# Classification rules, first match wins
+DIRECTIONAL_RULES = RuleSet(
+    name='directional_class',
+    rules=[
+        # Default when no data
+        Rule('stable', 'n_valid == 0'),
+        # ≥3 layers above 0.6 AND none below 0.3
+        Rule('improving', 'n_high >= THRESHOLD_IMPROVING_MIN_LAYERS and n_low == 0'),
+        # ≥2 layers below 0.3
+        Rule('at_risk', 'n_low >= THRESHOLD_AT_RISK_COUNT'),
+        # With severe risk drag (≥ 0.7), lower the threshold
+        Rule('at_risk', 'risk_drag >= 0.7 and n_below_drag >= 1'),
+    ],
+    default='stable',
+)
+
+CONFIDENCE_RULES = RuleSet(
+    name='confidence_class',
+    rules=[
+        # No policy data = default to conditional
+        Rule('conditional', 'no_policy'),
+        Rule('strong', 'policy >= CONFIDENCE_STRONG_MIN'),
+        Rule('conditional', 'policy >= CONFIDENCE_CONDITIONAL_MIN'),
+    ],
+    default='fragile',
+)
+
+SYNTHESIS_RULES = RuleSet(
+    name='synthesis_grouping',
+    rules=[
+        # HIGH UNCERTAINTY / CONTESTED takes precedence (<2 layers = sparse)
+        Rule('high_uncertainty', "confidence == 'fragile' or contested or n_valid < 2"),
+        # Structural headwinds dominate (severe risk drag ≥ 0.5, weak policy < 0.3)
+        Rule('at_risk_headwinds', "directional == 'at_risk' or (risk_drag >= 0.5 and policy < 0.3)"),
+        # Stacked tailwinds with high confidence
+        Rule('emerging_tailwinds', "directional == 'improving' and confidence == 'strong'"),
+        # Upside exists but execution matters
+        Rule('conditional_growth', "directional == 'improving'"),
+    ],
+    # Stable situations without severe headwinds
+    default='stable_constrained',
+)
+
+
+def classification_thresholds(overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Classification thresholds from settings, optionally overridden by name."""
+    return thresholds_from(settings, THRESHOLD_NAMES, overrides)
+
+
+def directional_classes(
+    layer_scores: np.ndarray,
+    risk_drag: np.ndarray,
+    thresholds: Optional[Dict[str, Any]] = None
+) -> np.ndarray:
+    """
+    Classify directional status for every row.
+
+    Args:
+        layer_scores: (n x layers) matrix of layer scores, NaN = missing
+        risk_drag: (n,) risk drag scores
+        thresholds: Threshold values (default: classification_thresholds())
+
+    Returns:
+        Array of 'improving', 'stable', or 'at_risk'
+    """
+    th = thresholds or classification_thresholds()
+    layer_scores = np.asarray(layer_scores, dtype=float)
+    variables = {
+        'n_valid': np.count_nonzero(~np.isnan(layer_scores), axis=1),
+        'n_high': np.count_nonzero(layer_scores >= th['THRESHOLD_IMPROVING_HIGH'], axis=1),
+        'n_low': np.count_nonzero(layer_scores < th['THRESHOLD_IMPROVING_LOW'], axis=1),
+        'n_below_drag': np.count_nonzero(layer_scores < th['THRESHOLD_AT_RISK_WITH_DRAG'], axis=1),
+        'risk_drag': np.asarray(risk_drag, dtype=float),
+    }
+    no_data = int((variables['n_valid'] == 0).sum())
+    if no_data:
+        logger.warning(f"No valid layer scores for classification ({no_data} rows)")
+
+    labels, _ = DIRECTIONAL_RULES.classify(variables, th, len(layer_scores))
+    return labels
+
+
+def confidence_classes(
+    policy_persistence: np.ndarray,
+    thresholds: Optional[Dict[str, Any]] = None
+) -> np.ndarray:
+    """
+    Classify confidence for every row from policy persistence scores.
+
+    Args:
+        policy_persistence: (n,) policy persistence scores (0-1), NaN = no data
+        thresholds: Threshold values (default: classification_thresholds())
+
+    Returns:
+        Array of 'strong', 'conditional', or 'fragile'
+    """
+    policy = np.asarray(policy_persistence, dtype=float)
+    variables = {'policy': policy, 'no_policy': np.isnan(policy)}
+    labels, _ = CONFIDENCE_RULES.classify(variables, thresholds or classification_thresholds(), len(policy))
+    return labels
+
+
+def synthesis_groupings(
+    directional: np.ndarray,
+    confidence: np.ndarray,
+    risk_drag: np.ndarray,
+    policy_persistence: np.ndarray,
+    n_valid_layers: np.ndarray,
+    contested: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Final synthesis grouping for every row (see calculate_final_synthesis_grouping).
+
+    Returns:
+        Array of grouping names
+    """
+    directional = np.asarray(directional, dtype=object)
+    variables = {
+        'directional': directional,
+        'confidence': np.asarray(confidence, dtype=object),
+        'risk_drag': np.asarray(risk_drag, dtype=float),
+        'policy': np.asarray(policy_persistence, dtype=float),
+        'n_valid': np.asarray(n_valid_layers),
+        'contested': (
+            np.zeros(len(directional), dtype=bool) if contested is None
+            else np.asarray(contested, dtype=bool)
+        ),
+    }
+    labels, _ = SYNTHESIS_RULES.classify(variables, size=len(directional))
+    return labels
+
 
 def classify_directional_status(
     layer_scores: pd.Series,
@@ -42,40 +189,8 @@ def classify_directional_status(
     Returns:
         Classification: 'improving', 'stable', or 'at_risk'
     """
-    # Filter out NaN scores
-    valid_scores = layer_scores.dropna()
-
-    if len(valid_scores) == 0:
-        logger.warning("No valid layer scores for classification")
-        return 'stable'  # Default when no data
-
-    # Count layers above/below thresholds
-    high_performers = (valid_scores >= settings.THRESHOLD_IMPROVING_HIGH).sum()
-    low_performers = (valid_scores < settings.THRESHOLD_IMPROVING_LOW).sum()
-
-    # Check for severe risk drag
-    severe_risk_drag = (
-        pd.notna(risk_drag_score) and
-        risk_drag_score >= 0.7  # High risk drag threshold
-    )
-
-    # IMPROVING: ≥3 layers above 0.6 AND none below 0.3
-    if (high_performers >= settings.THRESHOLD_IMPROVING_MIN_LAYERS and
-            low_performers == 0):
-        return 'improving'
-
-    # AT RISK: ≥2 layers below 0.3 OR (severe risk drag AND ≥1 layer below 0.4)
-    if low_performers >= settings.THRESHOLD_AT_RISK_COUNT:
-        return 'at_risk'
-
-    if severe_risk_drag:
-        # With severe risk drag, lower the threshold
-        at_risk_with_drag = (valid_scores < settings.THRESHOLD_AT_RISK_WITH_DRAG).sum()
-        if at_risk_with_drag >= 1:
-            return 'at_risk'
-
-    # STABLE: everything else
-    return 'stable'
+    scores = np.asarray(layer_scores, dtype=float).reshape(1, -1)
+    return str(directional_classes(scores, [risk_drag_score])[0])
 
 
 def classify_confidence(policy_persistence_score: float) -> str:
@@ -88,16 +203,7 @@ def classify_confidence(policy_persistence_score: float) -> str:
     Returns:
         Classification: 'strong', 'conditional', or 'fragile'
     """
-    if pd.isna(policy_persistence_score):
-        # No policy data = default to conditional
-        return 'conditional'
-
-    if policy_persistence_score >= settings.CONFIDENCE_STRONG_MIN:
-        return 'strong'
-    elif policy_persistence_score >= settings.CONFIDENCE_CONDITIONAL_MIN:
-        return 'conditional'
-    else:
-        return 'fragile'
+    return str(confidence_classes([policy_persistence_score])[0])
 
 
 def calculate_final_synthesis_grouping(
@@ -132,44 +238,14 @@ def calculate_final_synthesis_grouping(
     Returns:
         Final synthesis grouping name
     """
-    # Check data completeness
-    valid_layers = layer_scores.dropna()
-    data_sparse = len(valid_layers) < 2  # Less than 2 layers = sparse
-
-    # Severe risk drag threshold
-    severe_risk_drag = pd.notna(risk_drag_score) and risk_drag_score >= 0.5
-
-    # Weak policy persistence
-    weak_policy = pd.notna(policy_persistence_score) and policy_persistence_score < 0.3
-
-    # HIGH UNCERTAINTY / CONTESTED
-    # Takes precedence - if we can't trust the assessment, say so explicitly
-    if (confidence_class == 'fragile' or
-        classification_contested or
-        data_sparse):
-        return 'high_uncertainty'
-
-    # AT RISK / HEADWINDS
-    # Structural headwinds dominate
-    if (directional_class == 'at_risk' or
-        (severe_risk_drag and weak_policy)):
-        return 'at_risk_headwinds'
-
-    # EMERGING TAILWINDS
-    # Stacked tailwinds with high confidence
-    if (directional_class == 'improving' and
-        confidence_class == 'strong'):
-        return 'emerging_tailwinds'
-
-    # CONDITIONAL GROWTH
-    # Upside exists but execution matters
-    if directional_class == 'improving':
-        # Either conditional confidence or other uncertainty factors
-        return 'conditional_growth'
-
-    # STABLE BUT CONSTRAINED
-    # Default for stable situations without severe headwinds
-    return 'stable_constrained'
+    return str(synthesis_groupings(
+        [directional_class],
+        [confidence_class],
+        [risk_drag_score],
+        [policy_persistence_score],
+        [int(pd.Series(layer_scores).notna().sum())],
+        [classification_contested]
+    )[0])
 
 
 def identify_top_strengths(
@@ -340,53 +416,43 @@ def classify_all_counties(
         logger.warning("No policy persistence scores found")
         layer_scores_df['confidence_score'] = np.nan
 
-    # Classify each county
-    classifications = []
-
-    for _, row in layer_scores_df.iterrows():
-        # Extract layer scores (excluding risk drag)
-        layer_scores = pd.Series({
-            'employment_gravity': row.get('employment_gravity_score'),
-            'mobility_optionality': row.get('mobility_optionality_score'),
-            'school_trajectory': row.get('school_trajectory_score'),
-            'housing_elasticity': row.get('housing_elasticity_score'),
-            'demographic_momentum': row.get('demographic_momentum_score')
-        })
-
-        risk_drag = row.get('risk_drag_score')
-        policy_score = row.get('confidence_score')
-
-        # Classify directional status
-        directional_class = classify_directional_status(layer_scores, risk_drag)
-
-        # Classify confidence
-        confidence_class = classify_confidence(policy_score)
-
-        # Calculate final synthesis grouping (PRIMARY MAP OUTPUT)
-        synthesis_grouping = calculate_final_synthesis_grouping(
-            directional_class=directional_class,
-            confidence_class=confidence_class,
-            risk_drag_score=risk_drag,
-            policy_persistence_score=policy_score,
-            layer_scores=layer_scores,
-            classification_contested=False  # TODO: Implement claims system
-        )
+    # Classify all counties at once
+    thresholds = classification_thresholds()
+    layer_scores = column_matrix(layer_scores_df, [f"{layer}_score" for layer in DIRECTIONAL_LAYERS])
+    risk_drag = column_matrix(layer_scores_df, ['risk_drag_score'])[:, 0]
+    policy_score = column_matrix(layer_scores_df, ['confidence_score'])[:, 0]
+
+    directional_class = directional_classes(layer_scores, risk_drag, thresholds)
+    confidence_class = confidence_classes(policy_score, thresholds)
+
+    # Final synthesis grouping (PRIMARY MAP OUTPUT)
+    synthesis_grouping = synthesis_groupings(
+        directional_class,
+        confidence_class,
+        risk_drag,
+        policy_score,
+        np.count_nonzero(~np.isnan(layer_scores), axis=1),
+        contested=None  # TODO: Implement claims system
+    )
 
-        # Generate explainability
-        row_with_classes = row.copy()
-        row_with_classes['directional_class'] = directional_class
-        row_with_classes['confidence_class'] = confidence_class
-        row_with_classes['synthesis_grouping'] = synthesis_grouping
+    # Generate explainability
+    rows = layer_scores_df.assign(
+        directional_class=directional_class,
+        confidence_class=confidence_class,
+        synthesis_grouping=synthesis_grouping
+    ).to_dict('records')
 
-        explainability = generate_explainability_payload(row_with_classes)
+    classifications = []
+    for row in rows:
+        explainability = generate_explainability_payload(row)
 
         classifications.append({
             'fips_code': row['fips_code'],
             'data_year': data_year,
-            'directional_class': directional_class,
+            'directional_class': row['directional_class'],
             'composite_score': row.get('composite_normalized'),
-            'confidence_class': confidence_class,
-            'synthesis_grouping': synthesis_grouping,
+            'confidence_class': row['confidence_class'],
+            'synthesis_grouping': row['synthesis_grouping'],
             'primary_strengths': explainability['primary_strengths'],
             'primary_weaknesses': explainability['primary_weaknesses'],
             'key_trends': explainability['key_trends'],
@@ -0,0 +1,169 @@
+"""
+Maryland Viability Atlas - Classification Rule Engine
+Declarative first-match rules evaluated over all geographies at once
+
+A rule set is an ordered list of rules, each a label, a boolean condition
+and optional reason codes. Conditions are written as plain expressions over
+named per-geography arrays (counts, scores, earlier labels) and named
+thresholds, e.g.:
+
+    Rule('improving', 'n_high >= THRESHOLD_IMPROVING_MIN_LAYERS and n_low == 0')
+
+Each condition is compiled once, with ``and``/``or``/``not`` rewritten to the
+elementwise ``&``/``|``/``~``, so evaluating a rule yields one boolean mask
+for every row. The first matching rule per row sets its label and reasons;
+rows matching nothing get the rule set's default.
+
+Thresholds are passed at evaluation time, so the same compiled rules can be
+re-run cheaply for threshold variants.
+"""
+
+import ast
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Rule:
+    """A labelled condition; ``reasons`` are reported for rows it matches."""
+
+    label: str
+    when: str
+    reasons: Tuple[str, ...] = ()
+
+
+# Name under which rule namespaces expose np.logical_not for rewritten ``not``
+_LOGICAL_NOT = "__logical_not__"
+
+
+class _Elementwise(ast.NodeTransformer):
+    """Rewrite boolean keywords to elementwise operators for numpy arrays."""
+
+    def visit_BoolOp(self, node: ast.BoolOp) -> ast.AST:
+        self.generic_visit(node)
+        op = ast.BitAnd() if isinstance(node.op, ast.And) else ast.BitOr()
+        expr = node.values[0]
+        for value in node.values[1:]:
+            expr = ast.BinOp(left=expr, op=op, right=value)
+        return expr
+
+    def visit_UnaryOp(self, node: ast.UnaryOp) -> ast.AST:
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Not):
+            # Not ``~``: that flips every bit of Python bools and ints (~True == -2)
+            return ast.Call(
+                func=ast.Name(id=_LOGICAL_NOT, ctx=ast.Load()), args=[node.operand], keywords=[]
+            )
+        return node
+
+
+def compile_condition(expression: str, name: str = "<rule>"):
+    """Compile a rule condition into an elementwise code object."""
+    tree = _Elementwise().visit(ast.parse(expression, mode="eval"))
+    return compile(ast.fix_missing_locations(tree), name, "eval")
+
+
+@dataclass
+class RuleSet:
+    """Ordered rules compiled to vectorized boolean masks (first match wins)."""
+
+    name: str
+    rules: Sequence[Rule]
+    default: str
+    default_reasons: Tuple[str, ...] = ()
+    _compiled: List[Any] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._compiled = [
+            compile_condition(rule.when, f"<{self.name}:{i}:{rule.label}>")
+            for i, rule in enumerate(self.rules)
+        ]
+
+    def match(
+        self,
+        variables: Mapping[str, Any],
+        thresholds: Optional[Mapping[str, Any]] = None,
+        size: Optional[Union[int, Tuple[int, ...]]] = None,
+    ) -> np.ndarray:
+        """
+        Index of the first matching rule for each row.
+
+        Args:
+            variables: Per-row arrays referenced by the rule conditions
+            thresholds: Named thresholds referenced by the conditions; scalars,
+                or arrays broadcastable to the row shape
+            size: Number of rows, or a row shape such as (scenarios, geographies)
+                (default: shape of the first variable)
+
+        Returns:
+            Integer array; len(rules) marks rows that fell through to the default
+        """
+        if size is None:
+            size = np.shape(next(iter(variables.values())))
+        shape = tuple(size) if isinstance(size, tuple) else (size,)
+        namespace = {
+            "__builtins__": {},
+            _LOGICAL_NOT: np.logical_not,
+            **(thresholds or {}),
+            **variables,
+        }
+
+        masks = [
+            np.broadcast_to(np.asarray(eval(code, namespace), dtype=bool), shape)
+            for code in self._compiled
+        ]
+        if not masks:
+            return np.zeros(shape, dtype=int)
+        return np.select(masks, np.arange(len(masks)), default=len(masks))
+
+    def labels(
+        self,
+        variables: Mapping[str, Any],
+        thresholds: Optional[Mapping[str, Any]] = None,
+        size: Optional[Union[int, Tuple[int, ...]]] = None,
+    ) -> np.ndarray:
+        """Label every row (object array with the row shape)."""
+        index = self.match(variables, thresholds, size)
+        return np.array([rule.label for rule in self.rules] + [self.default], dtype=object)[index]
+
+    def classify(
+        self,
+        variables: Mapping[str, Any],
+        thresholds: Optional[Mapping[str, Any]] = None,
+        size: Optional[int] = None,
+    ) -> Tuple[np.ndarray, List[List[str]]]:
+        """
+        Label every row and collect its reason codes.
+
+        Returns:
+            Tuple of (labels as an object array, reason-code list per row)
+        """
+        index = self.match(variables, thresholds, size)
+        labels = np.array([rule.label for rule in self.rules] + [self.default], dtype=object)
+        reasons = [list(rule.reasons) for rule in self.rules] + [list(self.default_reasons)]
+        return labels[index], [list(reasons[i]) for i in index.ravel()]
+
+
+def column_matrix(df, columns: Sequence[str]) -> np.ndarray:
+    """Float matrix of ``columns`` (missing columns and None become NaN)."""
+    return df.reindex(columns=list(columns)).to_numpy(dtype=float)
+
+
+def row_stat(func, matrix: np.ndarray) -> np.ndarray:
+    """Apply a NaN-aware row reduction; rows with no values give NaN quietly."""
+    out = np.full(matrix.shape[0], np.nan)
+    has_values = (~np.isnan(matrix)).any(axis=1)
+    if has_values.any():
+        out[has_values] = func(matrix[has_values], axis=1)
+    return out
+
+
+def thresholds_from(
+    source: Any, names: Sequence[str], overrides: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Collect named thresholds from a module or settings object, with overrides."""
+    values = {name: getattr(source, name) for name in names}
+    values.update(overrides or {})
+    return values
@@ -0,0 +1,159 @@
+"""
+Maryland Viability Atlas - Feature Coverage Snapshots
+Point-in-time report of which registry features have data, per data year
+
+Coverage is computed with one aggregate query per source table
+(feature_registry.feature_coverage_by_year) and stored as a JSON report in
+feature_coverage_snapshots after each pipeline run. The API serves the
+latest snapshot from GET /api/v1/metadata/coverage, so monitoring never
+queries the layer tables directly. Snapshots older than
+COVERAGE_SNAPSHOT_RETENTION_DAYS are pruned whenever a new one is stored.
+
+Usage:
+    python -m src.processing.coverage [--by-county]
+"""
+
+import argparse
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from config.database import use_db
+from config.settings import get_settings
+from src.processing.feature_registry import feature_coverage_by_year
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+
+def summarize_coverage(by_year: List[Dict]) -> List[Dict]:
+    """
+    Collapse per-year coverage to one summary per feature.
+
+    Args:
+        by_year: Records from feature_coverage_by_year
+
+    Returns:
+        Per-feature records with years_covered, latest_year (latest year with
+        any data) and geo_count / total_geos in that year
+    """
+    summary: Dict[str, Dict[str, Any]] = {}
+
+    for record in by_year:
+        entry = summary.setdefault(
+            record["feature"],
+            {
+                "layer": record["layer"],
+                "feature": record["feature"],
+                "source_table": record["source_table"],
+                "source_column": record["source_column"],
+                "years_covered": 0,
+                "latest_year": None,
+                "geo_count": 0,
+                "total_geos": 0,
+            },
+        )
+        if record["geo_count"] == 0:
+            continue
+        entry["years_covered"] += 1
+        if entry["latest_year"] is None or record["data_year"] > entry["latest_year"]:
+            entry.update(
+                latest_year=record["data_year"],
+                geo_count=record["geo_count"],
+                total_geos=record["total_geos"],
+            )
+
+    return list(summary.values())
+
+
+def build_coverage_report(db_session: Session, by_county: bool = False) -> Dict[str, Any]:
+    """
+    Compute a coverage report (one query per source table).
+
+    Args:
+        db_session: Database session
+        by_county: Include per-county rows (larger report)
+
+    Returns:
+        Dict with computed_at, features (per-feature summary), by_year and
+        optionally by_county
+    """
+    by_year = feature_coverage_by_year(db_session)
+    report = {
+        "computed_at": datetime.utcnow().isoformat(),
+        "features": summarize_coverage(by_year),
+        "by_year": by_year,
+    }
+    if by_county:
+        report["by_county"] = feature_coverage_by_year(db_session, by_county=True)
+    return report
+
+
+def store_coverage_snapshot(
+    by_county: bool = False,
+    db: Optional[Session] = None,
+    retention_days: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Compute the coverage report, append it to feature_coverage_snapshots and
+    prune expired snapshots.
+
+    Rows are never updated in place: the API caches the report by snapshot id.
+
+    Args:
+        by_county: Include per-county rows
+        db: Session to write in; the caller commits (default: own transaction)
+        retention_days: Delete snapshots computed this long before the new one
+            (default: COVERAGE_SNAPSHOT_RETENTION_DAYS)
+
+    Returns:
+        The stored report
+    """
+    if retention_days is None:
+        retention_days = settings.COVERAGE_SNAPSHOT_RETENTION_DAYS
+    with use_db(db) as session:
+        report = build_coverage_report(session, by_county=by_county)
+        computed_at = datetime.fromisoformat(report["computed_at"])
+        session.execute(
+            text("""
+            INSERT INTO feature_coverage_snapshots (computed_at, feature_count, report)
+            VALUES (:computed_at, :feature_count, CAST(:report AS jsonb))
+        """),
+            {
+                "computed_at": computed_at,
+                "feature_count": len(report["features"]),
+                "report": json.dumps(report),
+            },
+        )
+        pruned = session.execute(
+            text("DELETE FROM feature_coverage_snapshots WHERE computed_at < :cutoff"),
+            {"cutoff": computed_at - timedelta(days=retention_days)},
+        ).rowcount
+        if pruned:
+            logger.info(f"Pruned {pruned} coverage snapshots older than {retention_days} days")
+
+    covered = sum(1 for f in report["features"] if f["geo_count"] > 0)
+    logger.info(f"Stored coverage snapshot: {covered}/{len(report['features'])} features with data")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Store a feature coverage snapshot")
+    parser.add_argument("--by-county", action="store_true", help="Include per-county coverage rows")
+    args = parser.parse_args()
+
+    report = store_coverage_snapshot(by_county=args.by_county)
+    for feature in report["features"]:
+        print(
+            f"{feature['layer']}.{feature['feature']}: "
+            f"{feature['geo_count']}/{feature['total_geos']} geographies "
+            f"in {feature['latest_year']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
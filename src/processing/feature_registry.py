@@ -12,7 +12,7 @@ This registry defines:
 NO feature should be scored without being registered here.
 """
 
-from typing import Literal, Dict, List
+from typing import Literal, Dict, List, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
@@ -467,6 +467,59 @@ def get_ai_dependent_features() -> List[FeatureDefinition]:
     return [f for f in ALL_FEATURES if f.requires_ai]
 
 
+def feature_coverage_query(
+    source_table: str,
+    columns: List[str],
+    group_by: Tuple[str, ...] = ()
+) -> str:
+    """
+    One aggregate query covering every listed column of a source table.
+
+    Each column becomes ``COUNT(DISTINCT fips_code) FILTER (WHERE col IS NOT NULL)``
+    alongside ``total_geos``, optionally grouped (e.g. by data_year, fips_code).
+    """
+    keys = ", ".join(group_by)
+    aggregates = ",\n            ".join(
+        ["COUNT(DISTINCT fips_code) AS total_geos"] + [
+            f"COUNT(DISTINCT fips_code) FILTER (WHERE {column} IS NOT NULL) AS {column}"
+            for column in columns
+        ]
+    )
+    query = f"""
+        SELECT {keys + ", " if keys else ""}{aggregates}
+        FROM {source_table}
+    """
+    if keys:
+        query += f"GROUP BY {keys}\nORDER BY {keys}\n"
+    return query
+
+
+def _table_coverage(db_session, group_by: Tuple[str, ...] = ()):
+    """
+    Yield (features, rows) per source table, one query per table.
+
+    Tables that do not exist yield no rows; registry columns missing from a
+    table are left out of the query (no coverage).
+    """
+    from sqlalchemy import inspect, text
+
+    inspector = inspect(db_session.connection())
+    by_table: Dict[str, List[FeatureDefinition]] = {}
+    for features in FEATURES_BY_LAYER.values():
+        for feature in features:
+            by_table.setdefault(feature.source_table, []).append(feature)
+
+    for source_table, features in by_table.items():
+        if not inspector.has_table(source_table):
+            yield features, []
+            continue
+
+        present = {c["name"] for c in inspector.get_columns(source_table)}
+        columns = list(dict.fromkeys(f.source_column for f in features if f.source_column in present))
+        rows = db_session.execute(text(feature_coverage_query(source_table, columns, group_by)))
+        yield features, rows.mappings().all()
+
+
 def validate_feature_coverage(db_session) -> Dict[str, Dict[str, int]]:
     """
     Check which features have data coverage in the database.
@@ -474,27 +527,51 @@ def validate_feature_coverage(db_session) -> Dict[str, Dict[str, int]]:
     Returns:
         Dict mapping layer -> {feature_name: record_count}
     """
-    from sqlalchemy import text
+    coverage = {
+        layer_name: {feature.name: 0 for feature in features}
+        for layer_name, features in FEATURES_BY_LAYER.items()
+    }
 
-    coverage = {}
+    for features, rows in _table_coverage(db_session):
+        for row in rows:
+            for feature in features:
+                coverage[feature.layer][feature.name] = row.get(feature.source_column) or 0
 
-    for layer_name, features in FEATURES_BY_LAYER.items():
-        layer_coverage = {}
+    return coverage
 
-        for feature in features:
-            query = text(f"""
-                SELECT COUNT(DISTINCT fips_code)
-                FROM {feature.source_table}
-                WHERE {feature.source_column} IS NOT NULL
-            """)
 
-            result = db_session.execute(query)
-            count = result.scalar()
-            layer_coverage[feature.name] = count
+def feature_coverage_by_year(db_session, by_county: bool = False) -> List[Dict]:
+    """
+    Per-feature coverage for every data year (and optionally county).
 
-        coverage[layer_name] = layer_coverage
+    Args:
+        db_session: Database session
+        by_county: Also group by fips_code (geo_count is then 0 or 1)
 
-    return coverage
+    Returns:
+        Records with layer, feature, source_table, source_column, data_year,
+        [fips_code,] geo_count and total_geos
+    """
+    group_by = ("data_year", "fips_code") if by_county else ("data_year",)
+    records = []
+
+    for features, rows in _table_coverage(db_session, group_by):
+        for row in rows:
+            for feature in features:
+                record = {
+                    "layer": feature.layer,
+                    "feature": feature.name,
+                    "source_table": feature.source_table,
+                    "source_column": feature.source_column,
+                    "data_year": int(row["data_year"]),
+                    "geo_count": int(row.get(feature.source_column) or 0),
+                    "total_geos": int(row["total_geos"]),
+                }
+                if by_county:
+                    record["fips_code"] = row["fips_code"]
+                records.append(record)
+
+    return records
 
 
 # ============================================================================
@@ -8,14 +8,24 @@ Implements:
 - Final Synthesis Grouping: 5 categories with multi-year reasoning
 """
 
+import sys
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from sqlalchemy import text
+from sqlalchemy.orm import Session
 import json
 
 from config.settings import get_settings
-from config.database import get_db, log_refresh
+from config.database import get_db, log_refresh, use_db
+from src.processing.classification_rules import (
+    Rule,
+    RuleSet,
+    column_matrix,
+    row_stat,
+    thresholds_from,
+)
+from src.processing.multiyear_scoring import SUMMARY_SCORE_DECIMALS
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -36,6 +46,69 @@ MOMENTUM_POSITIVE_THRESHOLD = 0.55  # Percentile threshold for positive momentum
 COVERAGE_STRONG = 5  # Years needed for strong confidence
 COVERAGE_CONDITIONAL = 3  # Years needed for conditional confidence
 
+THRESHOLD_NAMES = (
+    'THRESHOLD_IMPROVING_HIGH', 'THRESHOLD_IMPROVING_LOW', 'THRESHOLD_IMPROVING_MIN_LAYERS',
+    'THRESHOLD_AT_RISK_LOW', 'THRESHOLD_AT_RISK_COUNT', 'THRESHOLD_RISK_DRAG_SEVERE',
+    'MOMENTUM_POSITIVE_THRESHOLD', 'COVERAGE_STRONG', 'COVERAGE_CONDITIONAL',
+)
+
+# Layers that add to the composite (risk drag is a penalty)
+POSITIVE_LAYERS = [
+    'employment_gravity', 'mobility_optionality', 'school_trajectory',
+    'housing_elasticity', 'demographic_momentum'
+]
+
+# Classification rules, first match wins
+DIRECTIONAL_RULES = RuleSet(
+    name='directional_status',
+    rules=[
+        # Insufficient data defaults to stable with high uncertainty
+        Rule('stable', 'n_scores < 3'),
+        # Strong levels, with positive momentum or no momentum data (rely on level)
+        Rule('improving', 'n_high >= THRESHOLD_IMPROVING_MIN_LAYERS and n_low <= 1 '
+                          'and (n_positive_momentum >= 2 or n_momentum == 0)'),
+        # Multiple weak signals, or severe risk drag with any weak signal
+        Rule('at_risk', 'n_low >= THRESHOLD_AT_RISK_COUNT '
+                        'or (risk_drag >= THRESHOLD_RISK_DRAG_SEVERE and n_low >= 1)'),
+        # Negative momentum trend despite OK levels
+        Rule('at_risk', 'n_negative_momentum >= 2'),
+    ],
+    default='stable',
+)
+
+CONFIDENCE_RULES = RuleSet(
+    name='confidence_level',
+    rules=[
+        Rule('fragile', 'n_coverage == 0', ('no_coverage_data',)),
+        # Mostly full coverage, few missing years
+        Rule('strong', 'avg_coverage >= COVERAGE_STRONG and min_coverage >= COVERAGE_CONDITIONAL'),
+        # Sparse data overall
+        Rule('fragile', 'avg_coverage < COVERAGE_CONDITIONAL', ('sparse_coverage',)),
+        # Partial coverage
+        Rule('conditional', 'min_coverage < COVERAGE_CONDITIONAL', ('some_layers_sparse',)),
+    ],
+    default='conditional',
+)
+
+GROUPING_RULES = RuleSet(
+    name='final_grouping',
+    rules=[
+        # High uncertainty takes precedence
+        Rule('high_uncertainty', "confidence == 'fragile' or n_reasons >= 2"),
+        Rule('at_risk_headwinds', "directional == 'at_risk'"),
+        Rule('emerging_tailwinds', "directional == 'improving' and confidence == 'strong'"),
+        Rule('conditional_growth', "directional == 'improving'"),
+        # Consistent but low upside
+        Rule('stable_constrained', "directional == 'stable'"),
+    ],
+    default='high_uncertainty',
+)
+
+
+def classification_thresholds(overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Current classification thresholds, optionally overridden by name."""
+    return thresholds_from(sys.modules[__name__], THRESHOLD_NAMES, overrides)
+
 
 def load_layer_summary_scores(as_of_year: int = 2025) -> pd.DataFrame:
     """
@@ -85,7 +158,23 @@ def load_layer_summary_scores(as_of_year: int = 2025) -> pd.DataFrame:
 
     logger.info(f"Loaded {len(df)} layer score records")
 
-    # Pivot to wide format (one row per geoid, columns for each layer)
+    result = pivot_layer_summary_scores(df)
+    logger.info(f"Pivoted to {len(result)} geographies")
+
+    return result
+
+
+def pivot_layer_summary_scores(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Pivot long layer summary scores to one row per geoid.
+
+    Args:
+        df: Rows of (geoid, layer_name, layer_overall_score,
+            layer_momentum_score, coverage_years)
+
+    Returns:
+        DataFrame with {layer}_score, {layer}_momentum and {layer}_coverage columns
+    """
     pivot_overall = df.pivot(index='geoid', columns='layer_name', values='layer_overall_score')
     pivot_overall.columns = [f'{col}_score' for col in pivot_overall.columns]
 
@@ -96,120 +185,260 @@ def load_layer_summary_scores(as_of_year: int = 2025) -> pd.DataFrame:
     pivot_coverage.columns = [f'{col}_coverage' for col in pivot_coverage.columns]
 
     # Combine
-    result = pivot_overall.join(pivot_momentum).join(pivot_coverage)
-    result = result.reset_index()
+    return pivot_overall.join(pivot_momentum).join(pivot_coverage).reset_index()
 
-    logger.info(f"Pivoted to {len(result)} geographies")
 
-    return result
+def summary_scores_frame(scores: pd.DataFrame) -> pd.DataFrame:
+    """
+    Wide layer scores from in-memory layer summary scores.
 
+    Scores are rounded to the stored NUMERIC(5,4) scale first, so the result
+    matches load_layer_summary_scores() after storing the same rows.
 
-def classify_directional_status(row: pd.Series) -> str:
+    Args:
+        scores: Long layer scores from compute_all_layer_scores
+
+    Returns:
+        DataFrame pivoted like load_layer_summary_scores
     """
-    Classify directional status using multi-year evidence.
+    if scores.empty:
+        return pd.DataFrame()
+
+    df = scores[['geoid', 'layer_name', 'layer_overall_score', 'layer_momentum_score', 'coverage_years']].copy()
+    for col in ('layer_overall_score', 'layer_momentum_score'):
+        df[col] = pd.to_numeric(df[col], errors='coerce').round(SUMMARY_SCORE_DECIMALS)
+
+    return pivot_layer_summary_scores(df)
+
+
+def directional_statuses(
+    df: pd.DataFrame,
+    thresholds: Optional[Dict[str, Any]] = None
+) -> np.ndarray:
+    """
+    Classify directional status for every row using multi-year evidence.
 
     Args:
-        row: DataFrame row with layer scores
+        df: Wide DataFrame with {layer}_score and {layer}_momentum columns
+        thresholds: Threshold values (default: classification_thresholds())
 
     Returns:
-        'improving', 'stable', or 'at_risk'
+        Array of 'improving', 'stable', or 'at_risk'
+    """
+    th = thresholds or classification_thresholds()
+    variables = directional_variables(
+        column_matrix(df, [f'{layer}_score' for layer in POSITIVE_LAYERS]),
+        column_matrix(df, [f'{layer}_momentum' for layer in POSITIVE_LAYERS]),
+        column_matrix(df, ['risk_drag_score'])[:, 0],
+        th
+    )
+    return DIRECTIONAL_RULES.labels(variables, th, len(df))
+
+
+def directional_variables(
+    scores: np.ndarray,
+    momentum: np.ndarray,
+    risk_drag: np.ndarray,
+    thresholds: Dict[str, Any]
+) -> Dict[str, np.ndarray]:
+    """
+    Per-row inputs for DIRECTIONAL_RULES.
+
+    The positive-layer axis is last, so the same code serves (geo x layer)
+    and batched (scenario x geo x layer) arrays. Thresholds may be scalars or
+    arrays broadcastable to the row shape (e.g. one value per scenario).
+
+    Args:
+        scores: Positive layer overall scores
+        momentum: Positive layer momentum scores
+        risk_drag: Risk drag score per row
+        thresholds: Threshold values
+
+    Returns:
+        Dict of count and score arrays with the row shape
     """
-    # Extract layer overall scores
-    layer_scores = {
-        'employment': row.get('employment_gravity_score'),
-        'mobility': row.get('mobility_optionality_score'),
-        'schools': row.get('school_trajectory_score'),
-        'housing': row.get('housing_elasticity_score'),
-        'demographics': row.get('demographic_momentum_score'),
-        'risk': row.get('risk_drag_score')
+    def per_layer(name):
+        return np.expand_dims(np.asarray(thresholds[name], dtype=float), -1)
+
+    positive_momentum = per_layer('MOMENTUM_POSITIVE_THRESHOLD')
+    return {
+        'n_scores': np.count_nonzero(~np.isnan(scores), axis=-1),
+        'n_high': np.count_nonzero(scores >= per_layer('THRESHOLD_IMPROVING_HIGH'), axis=-1),
+        'n_low': np.count_nonzero(scores < per_layer('THRESHOLD_IMPROVING_LOW'), axis=-1),
+        'n_momentum': np.count_nonzero(~np.isnan(momentum), axis=-1),
+        'n_positive_momentum': np.count_nonzero(momentum >= positive_momentum, axis=-1),
+        'n_negative_momentum': np.count_nonzero(momentum < (1 - positive_momentum), axis=-1),
+        'risk_drag': risk_drag,
     }
 
-    # Extract momentum scores (if available)
-    momentum_scores = {
-        'employment': row.get('employment_gravity_momentum'),
-        'mobility': row.get('mobility_optionality_momentum'),
-        'schools': row.get('school_trajectory_momentum'),
-        'housing': row.get('housing_elasticity_momentum'),
-        'demographics': row.get('demographic_momentum_momentum'),
+
+def confidence_levels(
+    df: pd.DataFrame,
+    thresholds: Optional[Dict[str, Any]] = None
+) -> Tuple[np.ndarray, List[List[str]]]:
+    """
+    Classify confidence for every row from coverage across layers.
+
+    Args:
+        df: DataFrame with *_coverage columns
+        thresholds: Threshold values (default: classification_thresholds())
+
+    Returns:
+        Tuple of (confidence levels, uncertainty reasons per row)
+    """
+    th = thresholds or classification_thresholds()
+    coverage = column_matrix(df, [col for col in df.columns if str(col).endswith('_coverage')])
+
+    variables = {
+        'n_coverage': np.count_nonzero(~np.isnan(coverage), axis=1),
+        'avg_coverage': row_stat(np.nanmean, coverage),
+        'min_coverage': row_stat(np.nanmin, coverage),
     }
+    return CONFIDENCE_RULES.classify(variables, th, len(df))
 
-    # Count valid scores
-    valid_scores = {k: v for k, v in layer_scores.items() if pd.notna(v) and k != 'risk'}
-    valid_momentum = {k: v for k, v in momentum_scores.items() if pd.notna(v)}
 
-    if len(valid_scores) < 3:
-        # Insufficient data defaults to stable with high uncertainty
-        return 'stable'
+def composite_from_layers(
+    layer_scores: np.ndarray,
+    risk_drag: np.ndarray,
+    layer_weights: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Weighted mean of available positive layers with risk drag penalty.
 
-    # IMPROVING: Multiple strong signals + positive momentum (if available)
-    high_scores = [v for v in valid_scores.values() if v >= THRESHOLD_IMPROVING_HIGH]
-    low_scores = [v for v in valid_scores.values() if v < THRESHOLD_IMPROVING_LOW]
+    The positive-layer axis is last, so the same code serves (geo x layer)
+    and batched (scenario x geo x layer) arrays.
 
-    # Check momentum evidence
-    positive_momentum = [v for v in valid_momentum.values() if v >= MOMENTUM_POSITIVE_THRESHOLD]
-    has_positive_momentum_evidence = len(positive_momentum) >= 2
+    Args:
+        layer_scores: Positive layer overall scores, NaN = not scored
+        risk_drag: Risk drag score per row, NaN = no penalty
+        layer_weights: Weights broadcastable to layer_scores, e.g. one vector
+            per scenario (default: equal weights)
 
-    if len(high_scores) >= THRESHOLD_IMPROVING_MIN_LAYERS and len(low_scores) <= 1:
-        # Strong level scores
-        if has_positive_momentum_evidence or len(valid_momentum) == 0:
-            # Either has positive momentum OR no momentum data available (rely on level)
-            return 'improving'
+    Returns:
+        Array of composite scores with the row shape, NaN where no layer is scored
+    """
+    layer_scores = np.asarray(layer_scores, dtype=float)
+    if layer_weights is None:
+        weights = np.ones(layer_scores.shape[-1])
+    else:
+        weights = np.asarray(layer_weights, dtype=float)
+    valid = ~np.isnan(layer_scores)
+    weight_total = np.sum(valid * weights, axis=-1)
+    numerator = np.sum(np.where(valid, layer_scores, 0.0) * weights, axis=-1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        composite_raw = np.where(weight_total > 0, numerator / weight_total, np.nan)
+
+    # Risk drag reduces ceiling with a floor to prevent over-penalization
+    risk_multiplier = np.maximum(1.0 - np.clip(risk_drag, 0.0, 1.0), settings.RISK_DRAG_PENALTY_FLOOR)
+    return np.where(np.isnan(risk_drag), composite_raw, composite_raw * risk_multiplier)
+
+
+def composite_scores(
+    df: pd.DataFrame,
+    layer_weights: Optional[Dict[str, float]] = None
+) -> np.ndarray:
+    """
+    Composite score per row: mean of available positive layers with risk drag penalty.
 
-    # AT RISK: Multiple weak signals OR severe risk drag
-    risk_score = layer_scores.get('risk')
-    severe_risk = pd.notna(risk_score) and risk_score >= THRESHOLD_RISK_DRAG_SEVERE
+    Args:
+        df: DataFrame with layer scores
+        layer_weights: Optional weight per positive layer (default: equal weights)
 
-    # Check for negative momentum
-    negative_momentum = [v for v in valid_momentum.values() if v < (1 - MOMENTUM_POSITIVE_THRESHOLD)]
-    has_negative_momentum = len(negative_momentum) >= 2
+    Returns:
+        Array of composite scores (0-1), NaN where no layer is scored
+    """
+    weights = None
+    if layer_weights is not None:
+        weights = [layer_weights.get(layer, 1.0) for layer in POSITIVE_LAYERS]
+    return composite_from_layers(
+        column_matrix(df, [f'{layer}_score' for layer in POSITIVE_LAYERS]),
+        column_matrix(df, ['risk_drag_score'])[:, 0],
+        weights
+    )
 
-    if len(low_scores) >= THRESHOLD_AT_RISK_COUNT or (severe_risk and len(low_scores) >= 1):
-        return 'at_risk'
 
-    if has_negative_momentum:
-        # Negative momentum trend despite OK levels
-        return 'at_risk'
+def final_groupings(directional, confidence, n_reasons) -> np.ndarray:
+    """
+    Final synthesis grouping for every row.
 
-    # STABLE: Everything else
-    return 'stable'
+    Args:
+        directional: Directional statuses
+        confidence: Confidence levels
+        n_reasons: Number of uncertainty reasons per row
 
+        confidence and n_reasons broadcast against directional, so per-geography
+        values can be combined with (scenario x geography) statuses.
 
-def classify_confidence_level(row: pd.Series) -> Tuple[str, List[str]]:
+    Returns:
+        Array of grouping names
     """
-    Classify confidence level based on data coverage and consistency.
+    variables = {
+        'directional': np.asarray(directional, dtype=object),
+        'confidence': np.asarray(confidence, dtype=object),
+        'n_reasons': np.asarray(n_reasons),
+    }
+    return GROUPING_RULES.labels(variables, size=variables['directional'].shape)
+
+
+def classify_geographies(
+    df: pd.DataFrame,
+    thresholds: Optional[Dict[str, Any]] = None,
+    layer_weights: Optional[Dict[str, float]] = None
+) -> pd.DataFrame:
+    """
+    Add directional status, confidence, composite score and final grouping.
+
+    All rules are evaluated as vectorized masks over every row at once.
 
     Args:
-        row: DataFrame row with coverage info
+        df: Wide layer summary scores (one row per geography)
+        thresholds: Threshold values (default: classification_thresholds())
+        layer_weights: Composite weight per positive layer (default: equal weights)
 
     Returns:
-        Tuple of (confidence_level, uncertainty_reasons)
+        Copy of df with classification columns added
     """
-    # Check coverage across layers
-    coverage_cols = [col for col in row.index if col.endswith('_coverage')]
-    coverages = [row[col] for col in coverage_cols if pd.notna(row[col])]
+    th = thresholds or classification_thresholds()
+    df = df.copy()
+
+    confidence, reasons = confidence_levels(df, th)
+    df['directional_status'] = directional_statuses(df, th)
+    df['confidence_level'] = confidence
+    df['uncertainty_reasons'] = reasons
+    df['composite_score'] = composite_scores(df, layer_weights)
+    df['final_grouping'] = final_groupings(
+        df['directional_status'].to_numpy(),
+        df['confidence_level'].to_numpy(),
+        np.fromiter((len(r) for r in reasons), dtype=int, count=len(reasons))
+    )
+    return df
 
-    if not coverages:
-        return 'fragile', ['no_coverage_data']
 
-    avg_coverage = np.mean(coverages)
-    min_coverage = np.min(coverages)
+def classify_directional_status(row: pd.Series) -> str:
+    """
+    Classify directional status using multi-year evidence.
 
-    uncertainty_reasons = []
+    Args:
+        row: DataFrame row with layer scores
 
-    # STRONG: Mostly full coverage, few missing years
-    if avg_coverage >= COVERAGE_STRONG and min_coverage >= COVERAGE_CONDITIONAL:
-        return 'strong', []
+    Returns:
+        'improving', 'stable', or 'at_risk'
+    """
+    return str(directional_statuses(row.to_frame().T)[0])
 
-    # FRAGILE: Sparse data overall
-    if avg_coverage < COVERAGE_CONDITIONAL:
-        uncertainty_reasons.append('sparse_coverage')
-        return 'fragile', uncertainty_reasons
 
-    # CONDITIONAL: Partial coverage
-    if min_coverage < COVERAGE_CONDITIONAL:
-        uncertainty_reasons.append('some_layers_sparse')
+def classify_confidence_level(row: pd.Series) -> Tuple[str, List[str]]:
+    """
+    Classify confidence level based on data coverage and consistency.
+
+    Args:
+        row: DataFrame row with coverage info
 
-    return 'conditional', uncertainty_reasons
+    Returns:
+        Tuple of (confidence_level, uncertainty_reasons)
+    """
+    levels, reasons = confidence_levels(row.to_frame().T)
+    return str(levels[0]), reasons[0]
 
 
 def compute_composite_score(row: pd.Series) -> float:
@@ -222,31 +451,7 @@ def compute_composite_score(row: pd.Series) -> float:
     Returns:
         Composite score (0-1)
     """
-    # Get layer scores (excluding risk)
-    layer_scores = []
-    for layer in ['employment_gravity', 'mobility_optionality', 'school_trajectory',
-                  'housing_elasticity', 'demographic_momentum']:
-        score = row.get(f'{layer}_score')
-        if pd.notna(score):
-            layer_scores.append(score)
-
-    if not layer_scores:
-        return np.nan
-
-    # Mean of available layers
-    composite_raw = np.mean(layer_scores)
-
-    # Apply risk drag as multiplicative penalty
-    risk_score = row.get('risk_drag_score')
-    if pd.notna(risk_score):
-        # Risk drag reduces ceiling with a floor to prevent over-penalization
-        risk_score = min(max(float(risk_score), 0.0), 1.0)
-        risk_multiplier = max(1.0 - risk_score, settings.RISK_DRAG_PENALTY_FLOOR)
-        composite_adjusted = composite_raw * risk_multiplier
-    else:
-        composite_adjusted = composite_raw
-
-    return composite_adjusted
+    return float(composite_scores(row.to_frame().T)[0])
 
 
 def determine_final_grouping(
@@ -267,38 +472,20 @@ def determine_final_grouping(
     Returns:
         Final grouping name
     """
-    # HIGH UNCERTAINTY takes precedence
-    if confidence == 'fragile' or len(uncertainty_reasons) >= 2:
-        return 'high_uncertainty'
-
-    # AT RISK / HEADWINDS
-    if directional == 'at_risk':
-        return 'at_risk_headwinds'
-
-    # IMPROVING path
-    if directional == 'improving':
-        if confidence == 'strong':
-            return 'emerging_tailwinds'
-        else:
-            return 'conditional_growth'
-
-    # STABLE path
-    # Distinguish "stable constrained" (consistent but low upside) from volatile
-    if directional == 'stable':
-        # If composite score is low-mid and confidence conditional
-        # → stable but constrained
-        return 'stable_constrained'
-
-    # Default fallback
-    return 'high_uncertainty'
+    return str(final_groupings([directional], [confidence], [len(uncertainty_reasons)])[0])
 
 
-def classify_all_counties(as_of_year: int = 2025) -> pd.DataFrame:
+def classify_all_counties(
+    as_of_year: int = 2025,
+    scores: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
     """
     Classify all counties using multi-year evidence.
 
     Args:
         as_of_year: Year to classify for
+        scores: Long layer scores from compute_all_layer_scores
+            (default: load from layer_summary_scores)
 
     Returns:
         DataFrame with classifications
@@ -309,28 +496,14 @@ def classify_all_counties(as_of_year: int = 2025) -> pd.DataFrame:
     logger.info(f"As of year: {as_of_year}")
 
     # Load layer scores
-    df = load_layer_summary_scores(as_of_year)
+    df = load_layer_summary_scores(as_of_year) if scores is None else summary_scores_frame(scores)
 
     if df.empty:
         logger.error("No layer scores available")
         return df
 
-    # Classify each county
-    df['directional_status'] = df.apply(classify_directional_status, axis=1)
-    df[['confidence_level', 'uncertainty_reasons']] = df.apply(
-        lambda row: pd.Series(classify_confidence_level(row)),
-        axis=1
-    )
-    df['composite_score'] = df.apply(compute_composite_score, axis=1)
-    df['final_grouping'] = df.apply(
-        lambda row: determine_final_grouping(
-            row['directional_status'],
-            row['confidence_level'],
-            row['uncertainty_reasons'],
-            row['composite_score']
-        ),
-        axis=1
-    )
+    # Classify all counties at once
+    df = classify_geographies(df)
 
     # Add as_of_year
     df['current_as_of_year'] = as_of_year
@@ -350,18 +523,67 @@ def classify_all_counties(as_of_year: int = 2025) -> pd.DataFrame:
     return df
 
 
-def store_final_synthesis(df: pd.DataFrame):
+def final_synthesis_rows(df: pd.DataFrame) -> List[Dict]:
+    """
+    Database rows for classified geographies, scores rounded to the stored scale.
+
+    Args:
+        df: DataFrame with classifications
+
+    Returns:
+        One dict per row, uncertainty reasons as a JSON string
+    """
+    def _optional(value):
+        return float(np.round(value, SUMMARY_SCORE_DECIMALS)) if pd.notna(value) else None
+
+    rows = []
+    for row in df.to_dict('records'):
+        # Determine uncertainty level from reasons
+        n_reasons = len(row['uncertainty_reasons'])
+        if n_reasons == 0:
+            uncertainty_level = 'low'
+        elif n_reasons == 1:
+            uncertainty_level = 'medium'
+        else:
+            uncertainty_level = 'high'
+
+        rows.append({
+            'geoid': row['geoid'],
+            'current_as_of_year': int(row['current_as_of_year']),
+            'final_grouping': row['final_grouping'],
+            'directional_status': row['directional_status'],
+            'confidence_level': row['confidence_level'],
+            'uncertainty_level': uncertainty_level,
+            'uncertainty_reasons': json.dumps(row['uncertainty_reasons']),
+            'composite_score': _optional(row['composite_score']),
+            'risk_drag_applied': _optional(row.get('risk_drag_score')),
+            'employment_gravity_score': _optional(row.get('employment_gravity_score')),
+            'mobility_optionality_score': _optional(row.get('mobility_optionality_score')),
+            'school_trajectory_score': _optional(row.get('school_trajectory_score')),
+            'housing_elasticity_score': _optional(row.get('housing_elasticity_score')),
+            'demographic_momentum_score': _optional(row.get('demographic_momentum_score')),
+            'risk_drag_score': _optional(row.get('risk_drag_score')),
+            'classification_version': 'v2.0-multiyear'
+        })
+
+    return rows
+
+
+def store_final_synthesis(df: pd.DataFrame, db: Optional[Session] = None):
     """
     Store final synthesis classifications to database.
 
     Args:
         df: DataFrame with classifications
+        db: Session to write in; the caller commits (default: own transaction)
     """
     logger.info(f"Storing {len(df)} final synthesis records")
 
-    with get_db() as db:
+    rows = final_synthesis_rows(df)
+
+    with use_db(db) as session:
         # Delete existing records
-        db.execute(text("DELETE FROM final_synthesis_current"))
+        session.execute(text("DELETE FROM final_synthesis_current"))
 
         # Insert new records
         insert_sql = text("""
@@ -385,39 +607,8 @@ def store_final_synthesis(df: pd.DataFrame):
                 :classification_version
             )
         """)
-
-        for _, row in df.iterrows():
-            # Determine uncertainty level from reasons
-            n_reasons = len(row['uncertainty_reasons'])
-            if n_reasons == 0:
-                uncertainty_level = 'low'
-            elif n_reasons == 1:
-                uncertainty_level = 'medium'
-            else:
-                uncertainty_level = 'high'
-
-            row_dict = {
-                'geoid': row['geoid'],
-                'current_as_of_year': int(row['current_as_of_year']),
-                'final_grouping': row['final_grouping'],
-                'directional_status': row['directional_status'],
-                'confidence_level': row['confidence_level'],
-                'uncertainty_level': uncertainty_level,
-                'uncertainty_reasons': json.dumps(row['uncertainty_reasons']),
-                'composite_score': float(row['composite_score']) if pd.notna(row['composite_score']) else None,
-                'risk_drag_applied': float(row.get('risk_drag_score', 0)) if pd.notna(row.get('risk_drag_score')) else None,
-                'employment_gravity_score': float(row.get('employment_gravity_score')) if pd.notna(row.get('employment_gravity_score')) else None,
-                'mobility_optionality_score': float(row.get('mobility_optionality_score')) if pd.notna(row.get('mobility_optionality_score')) else None,
-                'school_trajectory_score': float(row.get('school_trajectory_score')) if pd.notna(row.get('school_trajectory_score')) else None,
-                'housing_elasticity_score': float(row.get('housing_elasticity_score')) if pd.notna(row.get('housing_elasticity_score')) else None,
-                'demographic_momentum_score': float(row.get('demographic_momentum_score')) if pd.notna(row.get('demographic_momentum_score')) else None,
-                'risk_drag_score': float(row.get('risk_drag_score')) if pd.notna(row.get('risk_drag_score')) else None,
-                'classification_version': 'v2.0-multiyear'
-            }
-
-            db.execute(insert_sql, row_dict)
-
-        db.commit()
+        if rows:
+            session.execute(insert_sql, rows)
 
     logger.info("✓ Final synthesis stored successfully")
 
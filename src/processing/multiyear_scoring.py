@@ -10,34 +10,47 @@ Implements deterministic weighted composition:
 Composition: 0.5*level + 0.3*momentum + 0.2*stability
 """
 
+import json
+
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional
 from sqlalchemy import text
+from sqlalchemy.orm import Session
 
 from config.settings import get_settings
-from config.database import get_db, log_refresh
+from config.database import get_db, log_refresh, use_db
+from src.processing.scoring_kernel import (
+    COMPONENTS,
+    COMPOSITE_WEIGHTS_FULL,
+    COMPOSITE_WEIGHTS_LEVEL_ONLY,
+    COVERAGE_THRESHOLD_FULL,
+    COVERAGE_THRESHOLD_PARTIAL,
+    composite_scores,
+    grouped_percentile_rank,
+    missingness_penalty,
+    weights_to_dicts,
+)
+from src.processing.timeseries_features import STORED_DECIMALS
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 settings = get_settings()
 
 # Scoring weights
-WEIGHTS_FULL = {
-    'level': 0.50,
-    'momentum': 0.30,
-    'stability': 0.20
-}
+WEIGHTS_FULL = dict(zip(COMPONENTS, COMPOSITE_WEIGHTS_FULL))
+WEIGHTS_NO_MOMENTUM = dict(zip(COMPONENTS, COMPOSITE_WEIGHTS_LEVEL_ONLY))
 
-WEIGHTS_NO_MOMENTUM = {
-    'level': 1.00,
-    'momentum': 0.00,
-    'stability': 0.00
-}
+# layer_timeseries_features columns used for scoring
+FEATURE_COLUMNS = [
+    'level_latest', 'level_baseline',
+    'momentum_slope', 'momentum_delta', 'momentum_percent_change',
+    'stability_volatility', 'stability_cv', 'stability_consistency', 'stability_persistence',
+    'coverage_years', 'min_year', 'max_year',
+]
 
-# Missingness threshold
-COVERAGE_THRESHOLD_FULL = 5  # 5 years for no penalty
-COVERAGE_THRESHOLD_PARTIAL = 3  # 3 years for reduced penalty
+# Stored NUMERIC(5,4) scale of layer_summary_scores
+SUMMARY_SCORE_DECIMALS = 4
 
 
 def percentile_normalize(series: pd.Series) -> pd.Series:
@@ -80,25 +93,20 @@ def invert_score(score: float) -> float:
     return 1.0 - score
 
 
-def calculate_missingness_penalty(coverage_years: int, window_size: int = 5) -> float:
+def calculate_missingness_penalty(coverage_years, window_size: int = 5):
     """
     Calculate penalty for missing data.
 
     Args:
-        coverage_years: Number of years with actual data
+        coverage_years: Number of years with actual data (scalar or array)
         window_size: Expected window size
 
     Returns:
-        Penalty value (0 = no penalty, 1 = severe penalty)
+        Penalty value (0 = no penalty, 1 = severe penalty); an array when
+        given an array
     """
-    if coverage_years >= COVERAGE_THRESHOLD_FULL:
-        return 0.0  # No penalty
-    elif coverage_years >= COVERAGE_THRESHOLD_PARTIAL:
-        # Linear penalty between 3-5 years
-        return 0.2 * (COVERAGE_THRESHOLD_FULL - coverage_years) / (COVERAGE_THRESHOLD_FULL - COVERAGE_THRESHOLD_PARTIAL)
-    else:
-        # High penalty for <3 years
-        return 0.5 + 0.3 * (COVERAGE_THRESHOLD_PARTIAL - coverage_years) / COVERAGE_THRESHOLD_PARTIAL
+    penalty = missingness_penalty(coverage_years)
+    return float(penalty) if penalty.ndim == 0 else penalty
 
 
 def load_timeseries_features(as_of_year: int = 2025) -> pd.DataFrame:
@@ -143,28 +151,42 @@ def load_timeseries_features(as_of_year: int = 2025) -> pd.DataFrame:
         logger.warning(f"No timeseries features found for {as_of_year}")
         return pd.DataFrame()
 
-    df = pd.DataFrame(rows, columns=[
-        'geoid', 'layer_name', 'as_of_year',
-        'level_latest', 'level_baseline',
-        'momentum_slope', 'momentum_delta', 'momentum_percent_change',
-        'stability_volatility', 'stability_cv', 'stability_consistency', 'stability_persistence',
-        'coverage_years', 'min_year', 'max_year'
-    ])
+    df = pd.DataFrame(rows, columns=['geoid', 'layer_name', 'as_of_year', *FEATURE_COLUMNS])
 
     # Convert Decimal to float for numeric operations
-    numeric_cols = [
-        'level_latest', 'level_baseline',
-        'momentum_slope', 'momentum_delta', 'momentum_percent_change',
-        'stability_volatility', 'stability_cv', 'stability_consistency',
-        'stability_persistence', 'coverage_years', 'min_year', 'max_year'
-    ]
-    for col in numeric_cols:
+    for col in FEATURE_COLUMNS:
         df[col] = pd.to_numeric(df[col], errors='coerce')
 
     logger.info(f"Loaded {len(df)} timeseries feature records")
     return df
 
 
+def timeseries_features_frame(features: List[Dict]) -> pd.DataFrame:
+    """
+    Build the load_timeseries_features() frame from in-memory feature records.
+
+    Values are rounded to their stored scale (see store_timeseries_features),
+    so scoring the records directly gives the same results as storing and
+    reloading them.
+
+    Args:
+        features: Feature dicts from compute_timeseries_feature_records
+
+    Returns:
+        DataFrame with the same columns as load_timeseries_features
+    """
+    if not features:
+        return pd.DataFrame()
+
+    df = pd.DataFrame(features).reindex(columns=['geoid', 'layer_name', 'as_of_year', *FEATURE_COLUMNS])
+    for col in FEATURE_COLUMNS:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+        if col in STORED_DECIMALS:
+            df[col] = df[col].round(STORED_DECIMALS[col])
+
+    return df.sort_values(['geoid', 'layer_name']).reset_index(drop=True)
+
+
 def normalize_layer_features(df: pd.DataFrame) -> pd.DataFrame:
     """
     Normalize level, momentum, stability per layer across all geographies.
@@ -179,49 +201,34 @@ def normalize_layer_features(df: pd.DataFrame) -> pd.DataFrame:
 
     df = df.copy()
 
-    # Initialize score columns
-    df['layer_level_score'] = np.nan
-    df['layer_momentum_score'] = np.nan
-    df['layer_stability_score'] = np.nan
-
-    # Normalize per layer
-    for layer in df['layer_name'].unique():
-        layer_mask = df['layer_name'] == layer
+    # LEVEL and MOMENTUM: percentile within each layer (higher is better);
+    # all layers are ranked in one grouped pass
+    ranks = grouped_percentile_rank(df[['level_latest', 'momentum_slope']], df['layer_name'])
+    df['layer_level_score'] = ranks['level_latest']
+    df['layer_momentum_score'] = ranks['momentum_slope']
 
-        # LEVEL: Percentile of level_latest (higher is better)
-        df.loc[layer_mask, 'layer_level_score'] = percentile_normalize(
-            df.loc[layer_mask, 'level_latest']
-        )
-
-        # MOMENTUM: Percentile of momentum_slope (higher is better)
-        # Only normalize if momentum exists for this layer
-        momentum_valid = df.loc[layer_mask, 'momentum_slope'].notna()
-        if momentum_valid.any():
-            df.loc[layer_mask & momentum_valid, 'layer_momentum_score'] = percentile_normalize(
-                df.loc[layer_mask & momentum_valid, 'momentum_slope']
-            )
-
-        # STABILITY: Derived from consistency (higher consistency = better stability)
-        # consistency ranges 0-1, so we can use it directly as stability score
-        stability_valid = df.loc[layer_mask, 'stability_consistency'].notna()
-        if stability_valid.any():
-            df.loc[layer_mask & stability_valid, 'layer_stability_score'] = (
-                df.loc[layer_mask & stability_valid, 'stability_consistency']
-            )
+    # STABILITY: consistency ranges 0-1, so it is used directly
+    df['layer_stability_score'] = df['stability_consistency']
 
-        logger.debug(f"  {layer}: level={layer_mask.sum()}, "
-                    f"momentum={momentum_valid.sum()}, "
-                    f"stability={stability_valid.sum()}")
+    counts = df[['layer_name', 'level_latest', 'momentum_slope', 'stability_consistency']].groupby('layer_name').count()
+    for layer, row in counts.iterrows():
+        logger.debug(f"  {layer}: level={row['level_latest']}, "
+                    f"momentum={row['momentum_slope']}, "
+                    f"stability={row['stability_consistency']}")
 
     return df
 
 
-def compute_composite_scores(df: pd.DataFrame) -> pd.DataFrame:
+def compute_composite_scores(
+    df: pd.DataFrame,
+    component_weights: Optional[Dict[str, float]] = None
+) -> pd.DataFrame:
     """
     Compute composite layer scores using weighted combination.
 
     Args:
         df: DataFrame with normalized scores
+        component_weights: Level/momentum/stability weights (default: WEIGHTS_FULL)
 
     Returns:
         DataFrame with composite scores and metadata
@@ -230,75 +237,81 @@ def compute_composite_scores(df: pd.DataFrame) -> pd.DataFrame:
 
     df = df.copy()
 
+    components = df[['layer_level_score', 'layer_momentum_score', 'layer_stability_score']].to_numpy(dtype=float)
+
     # Determine which components are available
     df['has_momentum'] = df['layer_momentum_score'].notna()
     df['has_stability'] = df['layer_stability_score'].notna()
 
-    # Calculate missingness penalty
-    df['missingness_penalty'] = df['coverage_years'].apply(calculate_missingness_penalty)
-
-    # Compute composite score
-    def compute_weighted_score(row):
-        level = row['layer_level_score']
-        momentum = row['layer_momentum_score']
-        stability = row['layer_stability_score']
-
-        # Handle missing components
-        if pd.isna(level):
-            return np.nan
-
-        # Full composition if all components available
-        if pd.notna(momentum) and pd.notna(stability):
-            weights = WEIGHTS_FULL
-            score = (weights['level'] * level +
-                    weights['momentum'] * momentum +
-                    weights['stability'] * stability)
-            used_weights = weights
-        # Level + momentum only
-        elif pd.notna(momentum):
-            # Reweight: 0.625 level + 0.375 momentum (same ratio as 0.5:0.3)
-            score = 0.625 * level + 0.375 * momentum
-            used_weights = {'level': 0.625, 'momentum': 0.375, 'stability': 0.0}
-        # Level only
-        else:
-            score = level
-            used_weights = WEIGHTS_NO_MOMENTUM
-
-        # Apply missingness penalty by reducing score slightly
-        # Penalty reduces effective score but doesn't eliminate it
-        penalty = row['missingness_penalty']
-        if penalty > 0:
-            score = score * (1 - 0.5 * penalty)  # Max 50% reduction for full penalty
-
-        return score, used_weights
-
-    # Apply to all rows
-    results = df.apply(compute_weighted_score, axis=1, result_type='expand')
-    df['layer_overall_score'] = results[0]
-    df['weights_used'] = results[1]
+    # Weighted composition with missingness penalty, for all rows at once
+    full_weights = None
+    if component_weights is not None:
+        full_weights = [component_weights.get(name, 0.0) for name in COMPONENTS]
+    scores, weights, penalty = composite_scores(
+        components, df['coverage_years'].to_numpy(dtype=float), full_weights
+    )
+    df['missingness_penalty'] = penalty
+    df['layer_overall_score'] = scores
+    df['weights_used'] = weights_to_dicts(weights)
 
     logger.info(f"Computed {df['layer_overall_score'].notna().sum()} composite scores")
 
     return df
 
 
-def store_layer_summary_scores(df: pd.DataFrame):
+def layer_summary_score_rows(df: pd.DataFrame) -> List[Dict]:
+    """
+    Database rows for computed layer scores, rounded to the stored scale.
+
+    Args:
+        df: DataFrame with computed scores
+
+    Returns:
+        One dict per row, weights as a JSON string
+    """
+    def _optional(value):
+        return float(np.round(value, SUMMARY_SCORE_DECIMALS)) if pd.notna(value) else None
+
+    return [
+        {
+            'geoid': row['geoid'],
+            'layer_name': row['layer_name'],
+            'as_of_year': int(row['as_of_year']),
+            'layer_level_score': _optional(row['layer_level_score']),
+            'layer_momentum_score': _optional(row['layer_momentum_score']),
+            'layer_stability_score': _optional(row['layer_stability_score']),
+            'layer_overall_score': _optional(row['layer_overall_score']),
+            'missingness_penalty': float(np.round(row['missingness_penalty'], SUMMARY_SCORE_DECIMALS)),
+            'has_momentum': bool(row['has_momentum']),
+            'has_stability': bool(row['has_stability']),
+            'coverage_years': int(row['coverage_years']),
+            'weights': json.dumps(row['weights_used']),
+            'normalization_method': 'percentile_rank'
+        }
+        for row in df.to_dict('records')
+    ]
+
+
+def store_layer_summary_scores(df: pd.DataFrame, db: Optional[Session] = None):
     """
     Store layer summary scores to database.
 
     Args:
         df: DataFrame with computed scores
+        db: Session to write in; the caller commits (default: own transaction)
     """
     logger.info(f"Storing {len(df)} layer summary scores")
 
-    with get_db() as db:
+    rows = layer_summary_score_rows(df)
+
+    with use_db(db) as session:
         # Delete existing scores for this as_of_year
         as_of_year = df['as_of_year'].iloc[0]
         delete_sql = text("""
             DELETE FROM layer_summary_scores
             WHERE as_of_year = :as_of_year
         """)
-        db.execute(delete_sql, {"as_of_year": int(as_of_year)})
+        session.execute(delete_sql, {"as_of_year": int(as_of_year)})
 
         # Insert new scores
         insert_sql = text("""
@@ -320,39 +333,23 @@ def store_layer_summary_scores(df: pd.DataFrame):
                 CAST(:weights AS jsonb), :normalization_method
             )
         """)
-
-        import json
-
-        for _, row in df.iterrows():
-            row_dict = {
-                'geoid': row['geoid'],
-                'layer_name': row['layer_name'],
-                'as_of_year': int(row['as_of_year']),
-                'layer_level_score': float(row['layer_level_score']) if pd.notna(row['layer_level_score']) else None,
-                'layer_momentum_score': float(row['layer_momentum_score']) if pd.notna(row['layer_momentum_score']) else None,
-                'layer_stability_score': float(row['layer_stability_score']) if pd.notna(row['layer_stability_score']) else None,
-                'layer_overall_score': float(row['layer_overall_score']) if pd.notna(row['layer_overall_score']) else None,
-                'missingness_penalty': float(row['missingness_penalty']),
-                'has_momentum': bool(row['has_momentum']),
-                'has_stability': bool(row['has_stability']),
-                'coverage_years': int(row['coverage_years']),
-                'weights': json.dumps(row['weights_used']),
-                'normalization_method': 'percentile_rank'
-            }
-
-            db.execute(insert_sql, row_dict)
-
-        db.commit()
+        session.execute(insert_sql, rows)
 
     logger.info("✓ Layer summary scores stored successfully")
 
 
-def compute_all_layer_scores(as_of_year: int = 2025) -> pd.DataFrame:
+def compute_all_layer_scores(
+    as_of_year: int = 2025,
+    features: Optional[pd.DataFrame] = None,
+    store: bool = True
+) -> pd.DataFrame:
     """
     Main function to compute all layer summary scores.
 
     Args:
         as_of_year: Year to compute scores for
+        features: Timeseries features to score (default: load from database)
+        store: Write the scores to layer_summary_scores
 
     Returns:
         DataFrame with computed scores
@@ -363,7 +360,7 @@ def compute_all_layer_scores(as_of_year: int = 2025) -> pd.DataFrame:
     logger.info(f"As of year: {as_of_year}")
 
     # Load timeseries features
-    df = load_timeseries_features(as_of_year)
+    df = load_timeseries_features(as_of_year) if features is None else features
 
     if df.empty:
         logger.error("No timeseries features available")
@@ -376,7 +373,8 @@ def compute_all_layer_scores(as_of_year: int = 2025) -> pd.DataFrame:
     df = compute_composite_scores(df)
 
     # Store results
-    store_layer_summary_scores(df)
+    if store:
+        store_layer_summary_scores(df)
 
     # Log summary statistics
     logger.info("\nScoring summary by layer:")
@@ -398,14 +396,15 @@ def compute_all_layer_scores(as_of_year: int = 2025) -> pd.DataFrame:
         logger.info(f"    Avg coverage: {stats[('coverage_years', 'mean')]:.1f} years")
 
     # Log refresh
-    log_refresh(
-        layer_name="layer_summary_scores",
-        data_source="timeseries_features",
-        status="success",
-        records_processed=len(df),
-        records_inserted=len(df),
-        metadata={"as_of_year": as_of_year}
-    )
+    if store:
+        log_refresh(
+            layer_name="layer_summary_scores",
+            data_source="timeseries_features",
+            status="success",
+            records_processed=len(df),
+            records_inserted=len(df),
+            metadata={"as_of_year": as_of_year}
+        )
 
     logger.info("=" * 70)
     logger.info(f"✓ Multi-year scoring complete: {len(df)} scores computed")
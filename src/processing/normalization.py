@@ -12,11 +12,12 @@ All normalization is within-Maryland only (no national comparison).
 
 import pandas as pd
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
-from sqlalchemy import text
+from sqlalchemy import inspect, text
 from datetime import datetime
 
-from config.database import get_db, log_refresh
+from config.database import bulk_insert, get_db, log_refresh
 from config.settings import get_settings
 from src.processing.feature_registry import (
     ALL_FEATURES,
@@ -190,6 +191,85 @@ def normalize_feature(
     return result
 
 
+def normalize_features_frame(
+    df: pd.DataFrame,
+    features: List[FeatureDefinition]
+) -> pd.DataFrame:
+    """
+    Normalize all features of a layer at once.
+
+    Column-wise equivalent of calling normalize_feature for each feature:
+    features sharing a method are ranked / scaled in one DataFrame operation.
+
+    Args:
+        df: DataFrame with raw feature values
+        features: Feature definitions from registry
+
+    Returns:
+        DataFrame (same index as df) with one column per feature name
+    """
+    raw = pd.DataFrame(index=df.index)
+    for feature in features:
+        if feature.source_column not in df.columns:
+            logger.warning(f"Feature {feature.name} column {feature.source_column} not found")
+            raw[feature.name] = np.nan
+        else:
+            raw[feature.name] = pd.to_numeric(df[feature.source_column], errors='coerce')
+
+    for name, count in raw.notna().sum().items():
+        if count == 0:
+            logger.warning(f"Feature {name} has all NaN values")
+        elif count < 3:
+            logger.warning(f"Feature {name} has fewer than 3 valid values")
+            raw[name] = np.nan
+
+    result = pd.DataFrame(np.nan, index=df.index, columns=raw.columns)
+
+    for method in NormMethod:
+        cols = [f.name for f in features if f.norm_method == method]
+        if not cols:
+            continue
+        values = raw[cols]
+
+        if method == NormMethod.PERCENTILE:
+            scores = values.rank(pct=True, method='average')
+
+        elif method == NormMethod.ROBUST_ZSCORE:
+            clip_std = 3.0
+            median = values.median()
+            iqr = values.quantile(0.75) - values.quantile(0.25)
+            scores = (values - median) / iqr.where(iqr != 0)
+            scores = (scores.clip(-clip_std, clip_std) + clip_std) / (2 * clip_std)
+            flat = iqr.index[iqr == 0]
+            scores[flat] = values[flat].where(values[flat].isna(), 0.5)
+
+        else:
+            spread = values.max() - values.min()
+            scores = (values - values.min()) / spread.where(spread != 0)
+            flat = spread.index[spread == 0]
+            scores[flat] = values[flat].where(values[flat].isna(), 0.5)
+
+        result[cols] = scores
+
+    negative = [f.name for f in features if f.directionality == Directionality.NEGATIVE]
+    result[negative] = 1 - result[negative]
+
+    return result
+
+
+def layer_source_columns(layer_name: str) -> List[str]:
+    """
+    Source columns the registry reads from a layer table, in registry order.
+
+    Args:
+        layer_name: Name of layer
+
+    Returns:
+        Unique source column names
+    """
+    return list(dict.fromkeys(f.source_column for f in FEATURES_BY_LAYER.get(layer_name, [])))
+
+
 def fetch_layer_data(
     layer_name: str,
     data_year: Optional[int] = None
@@ -197,6 +277,10 @@ def fetch_layer_data(
     """
     Fetch raw data for a layer from database.
 
+    Only fips_code, data_year and the registry's source columns are selected;
+    registry columns missing from the table are left out of the query (and
+    reported by normalization) rather than failing the read.
+
     Args:
         layer_name: Name of layer (e.g., 'employment_gravity')
         data_year: Specific year to fetch (default: latest)
@@ -214,9 +298,13 @@ def fetch_layer_data(
     source_table = features[0].source_table
 
     with get_db() as db:
+        table_columns = {c["name"] for c in inspect(db.connection()).get_columns(source_table)}
+        columns = [c for c in layer_source_columns(layer_name) if c in table_columns]
+        select_list = ", ".join(["fips_code", "data_year", *columns])
+
         if data_year:
             query = text(f"""
-                SELECT *
+                SELECT {select_list}
                 FROM {source_table}
                 WHERE data_year = :data_year
             """)
@@ -224,13 +312,13 @@ def fetch_layer_data(
         else:
             # Get latest year
             query = text(f"""
-                SELECT *
+                SELECT {select_list}
                 FROM {source_table}
                 WHERE data_year = (SELECT MAX(data_year) FROM {source_table})
             """)
             df = pd.read_sql(query, db.connection())
 
-    logger.info(f"Fetched {len(df)} records for layer {layer_name}")
+    logger.info(f"Fetched {len(df)} records ({len(columns)} columns) for layer {layer_name}")
     return df
 
 
@@ -260,34 +348,41 @@ def normalize_layer(
     # Get features for this layer
     features = FEATURES_BY_LAYER[layer_name]
 
-    # Normalize each feature
+    # Normalize all features in one pass
+    scores = normalize_features_frame(df, features)
     normalized_df = df[['fips_code', 'data_year']].copy()
-
     for feature in features:
-        normalized_df[f"{feature.name}_normalized"] = normalize_feature(df, feature)
+        normalized_df[f"{feature.name}_normalized"] = scores[feature.name]
+
+    logger.info(
+        f"Normalized {layer_name}: {len(features)} features, "
+        f"missing={int(scores.isna().sum().sum())}"
+    )
 
     return normalized_df
 
 
 def normalize_all_layers(
     data_year: Optional[int] = None,
-    skip_ai_features: bool = False
+    skip_ai_features: bool = False,
+    max_workers: Optional[int] = None
 ) -> Dict[str, pd.DataFrame]:
     """
     Normalize all layers and return results.
 
+    Layers are independent, so they are fetched and normalized concurrently.
+
     Args:
         data_year: Specific year (default: latest)
         skip_ai_features: If True, skip AI-dependent features
+        max_workers: Concurrent layers (default: settings.NORMALIZATION_MAX_WORKERS)
 
     Returns:
         Dict mapping layer_name -> normalized DataFrame
     """
     logger.info(f"Normalizing all layers (data_year={data_year}, skip_ai={skip_ai_features})")
 
-    normalized_layers = {}
-
-    for layer_name in FEATURES_BY_LAYER.keys():
+    def _normalize(layer_name: str) -> pd.DataFrame:
         try:
             normalized_df = normalize_layer(layer_name, data_year)
 
@@ -300,11 +395,18 @@ def normalize_all_layers(
                 ai_cols = [f"{f.name}_normalized" for f in ai_features]
                 normalized_df = normalized_df.drop(columns=ai_cols, errors='ignore')
 
-            normalized_layers[layer_name] = normalized_df
+            return normalized_df
 
         except Exception as e:
             logger.error(f"Failed to normalize layer {layer_name}: {e}", exc_info=True)
-            normalized_layers[layer_name] = pd.DataFrame()
+            return pd.DataFrame()
+
+    layer_names = list(FEATURES_BY_LAYER.keys())
+    max_workers = max_workers or settings.NORMALIZATION_MAX_WORKERS
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="normalize") as executor:
+        results = executor.map(_normalize, layer_names)
+        normalized_layers = dict(zip(layer_names, results))
 
     return normalized_layers
 
@@ -347,6 +449,31 @@ def store_normalized_features(
     # Ensure data_year column
     merged['data_year'] = data_year
 
+    # Long format for flexibility: one row per (fips_code, feature)
+    value_cols = [c for c in merged.columns if c.endswith('_normalized')]
+    long_df = merged.melt(
+        id_vars=['fips_code'],
+        value_vars=value_cols,
+        var_name='feature_name',
+        value_name='normalized_value'
+    ).dropna(subset=['normalized_value'])
+    long_df['feature_name'] = long_df['feature_name'].str.replace('_normalized', '', regex=False)
+
+    created_at = datetime.utcnow()
+    records = [
+        {
+            "fips_code": str(fips_code),
+            "data_year": int(data_year),
+            "feature_name": feature_name,
+            "normalized_value": float(value),
+            "created_at": created_at,
+        }
+        for fips_code, feature_name, value in long_df[
+            ['fips_code', 'feature_name', 'normalized_value']
+        ].itertuples(index=False)
+    ]
+    insert_count = len(records)
+
     # Store in database
     with get_db() as db:
         # Create normalized_features table if it doesn't exist
@@ -362,42 +489,13 @@ def store_normalized_features(
             )
         """)
         db.execute(create_table_sql)
-        db.commit()
-
-        # Insert normalized features (long format for flexibility)
-        insert_count = 0
-
-        for _, row in merged.iterrows():
-            fips_code = row['fips_code']
-
-            for col in merged.columns:
-                if col.endswith('_normalized'):
-                    feature_name = col.replace('_normalized', '')
-                    normalized_value = row[col]
-
-                    if pd.notna(normalized_value):
-                        insert_sql = text("""
-                            INSERT INTO normalized_features (
-                                fips_code, data_year, feature_name, normalized_value
-                            ) VALUES (
-                                :fips_code, :data_year, :feature_name, :normalized_value
-                            )
-                            ON CONFLICT (fips_code, data_year, feature_name)
-                            DO UPDATE SET
-                                normalized_value = EXCLUDED.normalized_value,
-                                created_at = CURRENT_TIMESTAMP
-                        """)
-
-                        db.execute(insert_sql, {
-                            "fips_code": str(fips_code),
-                            "data_year": int(data_year),
-                            "feature_name": str(feature_name),
-                            "normalized_value": float(normalized_value)
-                        })
-
-                        insert_count += 1
-
-        db.commit()
+
+        bulk_insert(
+            "normalized_features",
+            records,
+            conflict_cols=["fips_code", "data_year", "feature_name"],
+            db=db
+        )
 
     logger.info(f"Stored {insert_count} normalized feature values")
 
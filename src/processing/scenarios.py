@@ -0,0 +1,291 @@
+"""
+Maryland Viability Atlas - What-If Scenarios
+Re-score and re-classify geographies in memory for alternative weights and thresholds
+
+The baseline (normalized layer_timeseries_features plus the stored
+layer_summary_scores and their classification) is loaded from the database
+once and cached. Each scenario then re-runs composite scoring and
+classification on the in-memory arrays only:
+- component_weights: level/momentum/stability weights within each layer
+- layer_weights: weight of each positive layer in the overall composite
+- thresholds: classification thresholds (see multiyear_classification)
+
+Results are compared against the stored baseline so callers can see which
+classifications a scenario changes. Nothing is written back.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from config.database import get_db
+from config.settings import get_settings, MD_COUNTY_FIPS
+from src.processing.multiyear_classification import (
+    POSITIVE_LAYERS,
+    THRESHOLD_NAMES,
+    classification_thresholds,
+    classify_geographies,
+    load_layer_summary_scores,
+    pivot_layer_summary_scores,
+)
+from src.processing.multiyear_scoring import (
+    SUMMARY_SCORE_DECIMALS,
+    WEIGHTS_FULL,
+    load_timeseries_features,
+    normalize_layer_features,
+)
+from src.processing.scoring_kernel import COMPONENTS, composite_scores
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+# Classification fields compared against the baseline
+COMPARED_FIELDS = ("directional_status", "confidence_level", "final_grouping")
+
+COMPONENT_COLUMNS = ["layer_level_score", "layer_momentum_score", "layer_stability_score"]
+
+
+class ScenarioError(ValueError):
+    """Invalid scenario parameters."""
+
+
+@dataclass
+class ScenarioBaseline:
+    """In-memory inputs and stored results for one as_of_year."""
+
+    as_of_year: int
+    features: pd.DataFrame  # normalized timeseries features (one row per geoid x layer)
+    components: np.ndarray  # (rows x 3) level/momentum/stability scores
+    coverage_years: np.ndarray
+    classified: pd.DataFrame  # baseline classification, indexed by geoid
+    loaded_at: float
+
+
+def build_baseline(
+    features: pd.DataFrame, summary: pd.DataFrame, as_of_year: int
+) -> ScenarioBaseline:
+    """
+    Prepare a baseline from timeseries features and stored summary scores.
+
+    Args:
+        features: layer_timeseries_features rows (raw, not yet normalized)
+        summary: Wide layer summary scores (see load_layer_summary_scores)
+        as_of_year: Year the inputs describe
+
+    Returns:
+        ScenarioBaseline ready for evaluate_scenario
+    """
+    features = normalize_layer_features(features).reset_index(drop=True)
+    classified = classify_geographies(summary).set_index("geoid")
+
+    return ScenarioBaseline(
+        as_of_year=int(as_of_year),
+        features=features[["geoid", "layer_name", "layer_momentum_score", "coverage_years"]],
+        components=features[COMPONENT_COLUMNS].to_numpy(dtype=float),
+        coverage_years=features["coverage_years"].to_numpy(dtype=float),
+        classified=classified,
+        loaded_at=time.time(),
+    )
+
+
+def latest_as_of_year() -> Optional[int]:
+    """Most recent as_of_year with stored layer summary scores."""
+    with get_db() as db:
+        row = db.execute(text("SELECT MAX(as_of_year) FROM layer_summary_scores")).fetchone()
+    return int(row[0]) if row and row[0] is not None else None
+
+
+def load_baseline(as_of_year: Optional[int] = None) -> ScenarioBaseline:
+    """
+    Load a scenario baseline from the database.
+
+    Raises:
+        LookupError: If no scores exist for the year
+    """
+    if as_of_year is None:
+        as_of_year = latest_as_of_year()
+        if as_of_year is None:
+            raise LookupError("No layer summary scores available")
+
+    features = load_timeseries_features(as_of_year)
+    summary = load_layer_summary_scores(as_of_year)
+    if features.empty or summary.empty:
+        raise LookupError(f"No scenario inputs for as_of_year {as_of_year}")
+
+    baseline = build_baseline(features, summary, as_of_year)
+    logger.info(
+        f"Loaded scenario baseline for {as_of_year}: "
+        f"{len(baseline.classified)} geographies, {len(baseline.features)} layer rows"
+    )
+    return baseline
+
+
+_baselines: Dict[Optional[int], ScenarioBaseline] = {}
+_baseline_lock = threading.Lock()
+
+
+def get_baseline(as_of_year: Optional[int] = None) -> ScenarioBaseline:
+    """Cached baseline, reloaded after settings.SCENARIO_CACHE_SECONDS."""
+    with _baseline_lock:
+        baseline = _baselines.get(as_of_year)
+        if baseline is None or time.time() - baseline.loaded_at > settings.SCENARIO_CACHE_SECONDS:
+            baseline = load_baseline(as_of_year)
+            _baselines[as_of_year] = baseline
+        return baseline
+
+
+def clear_baseline_cache():
+    """Drop cached baselines (e.g. after the pipeline rewrites scores)."""
+    with _baseline_lock:
+        _baselines.clear()
+
+
+def _check_weights(weights: Dict[str, float], allowed, kind: str):
+    unknown = sorted(set(weights) - set(allowed))
+    if unknown:
+        raise ScenarioError(f"Unknown {kind}: {', '.join(unknown)}")
+    if any(not np.isfinite(w) or w < 0 for w in weights.values()):
+        raise ScenarioError(f"{kind.capitalize()} must be finite and non-negative")
+
+
+def resolve_component_weights(overrides: Optional[Dict[str, float]]) -> Optional[List[float]]:
+    """Merge level/momentum/stability overrides with WEIGHTS_FULL and normalize to sum 1."""
+    if not overrides:
+        return None
+    _check_weights(overrides, COMPONENTS, "component weights")
+    merged = {**WEIGHTS_FULL, **overrides}
+    if merged["level"] <= 0:
+        raise ScenarioError("Level weight must be positive")
+    total = sum(merged.values())
+    return [merged[name] / total for name in COMPONENTS]
+
+
+def resolve_layer_weights(overrides: Optional[Dict[str, float]]) -> Optional[Dict[str, float]]:
+    """Validate positive-layer weights (unlisted layers keep weight 1.0)."""
+    if not overrides:
+        return None
+    _check_weights(overrides, POSITIVE_LAYERS, "layer weights")
+    if sum(overrides.get(layer, 1.0) for layer in POSITIVE_LAYERS) <= 0:
+        raise ScenarioError("At least one layer weight must be positive")
+    return dict(overrides)
+
+
+def resolve_thresholds(overrides: Optional[Dict[str, float]]) -> Dict[str, Any]:
+    """Classification thresholds with named overrides applied."""
+    overrides = overrides or {}
+    unknown = sorted(set(overrides) - set(THRESHOLD_NAMES))
+    if unknown:
+        raise ScenarioError(f"Unknown thresholds: {', '.join(unknown)}")
+    if any(not np.isfinite(v) for v in overrides.values()):
+        raise ScenarioError("Thresholds must be finite")
+    return classification_thresholds(overrides)
+
+
+def _optional_float(value) -> Optional[float]:
+    return None if pd.isna(value) else round(float(value), 4)
+
+
+def _counts(labels: pd.Series) -> Dict[str, int]:
+    return {str(k): int(v) for k, v in labels.value_counts().items()}
+
+
+def evaluate_scenario(
+    baseline: ScenarioBaseline,
+    component_weights: Optional[Dict[str, float]] = None,
+    layer_weights: Optional[Dict[str, float]] = None,
+    thresholds: Optional[Dict[str, float]] = None,
+) -> Dict[str, Any]:
+    """
+    Re-score and re-classify the baseline under alternative parameters.
+
+    Args:
+        baseline: Loaded ScenarioBaseline
+        component_weights: Level/momentum/stability weight overrides
+        layer_weights: Positive-layer weight overrides for the composite
+        thresholds: Classification threshold overrides by name
+
+    Returns:
+        Dict with per-geography results, the classification changes against
+        the baseline, and a grouping summary
+
+    Raises:
+        ScenarioError: If any parameter is unknown or out of range
+    """
+    full_weights = resolve_component_weights(component_weights)
+    weights = resolve_layer_weights(layer_weights)
+    resolved_thresholds = resolve_thresholds(thresholds)
+
+    # Layer scores for every geography and layer in one pass
+    scores, _, _ = composite_scores(baseline.components, baseline.coverage_years, full_weights)
+    layer_rows = baseline.features.assign(layer_overall_score=scores)
+    # Round to the stored NUMERIC(5,4) scale, as the baseline was (summary_scores_frame)
+    for col in ("layer_overall_score", "layer_momentum_score"):
+        layer_rows[col] = layer_rows[col].astype(float).round(SUMMARY_SCORE_DECIMALS)
+
+    scenario = classify_geographies(
+        pivot_layer_summary_scores(layer_rows), resolved_thresholds, weights
+    ).set_index("geoid")
+
+    base = baseline.classified.reindex(scenario.index)
+    changed = {
+        field: scenario[field].to_numpy() != base[field].to_numpy() for field in COMPARED_FIELDS
+    }
+    any_changed = np.logical_or.reduce([changed[field] for field in COMPARED_FIELDS])
+
+    geoids = scenario.index.tolist()
+    columns = {
+        name: scenario[name].tolist()
+        for name in ("composite_score", "directional_status", "confidence_level", "final_grouping")
+    }
+    base_columns = {name: base[name].tolist() for name in ("composite_score",) + COMPARED_FIELDS}
+
+    results = [
+        {
+            "geoid": geoid,
+            "county_name": MD_COUNTY_FIPS.get(geoid),
+            "composite_score": _optional_float(columns["composite_score"][i]),
+            "baseline_composite_score": _optional_float(base_columns["composite_score"][i]),
+            "directional_status": columns["directional_status"][i],
+            "confidence_level": columns["confidence_level"][i],
+            "final_grouping": columns["final_grouping"][i],
+            "baseline_final_grouping": base_columns["final_grouping"][i],
+            "changed": bool(any_changed[i]),
+        }
+        for i, geoid in enumerate(geoids)
+    ]
+    changes = [
+        {
+            "geoid": geoids[i],
+            "field": field,
+            "baseline": base_columns[field][i],
+            "scenario": columns[field][i],
+        }
+        for i in np.flatnonzero(any_changed)
+        for field in COMPARED_FIELDS
+        if changed[field][i]
+    ]
+
+    return {
+        "as_of_year": baseline.as_of_year,
+        "parameters": {
+            "component_weights": (
+                dict(zip(COMPONENTS, full_weights)) if full_weights else dict(WEIGHTS_FULL)
+            ),
+            "layer_weights": {layer: (weights or {}).get(layer, 1.0) for layer in POSITIVE_LAYERS},
+            "thresholds": resolved_thresholds,
+        },
+        "results": results,
+        "changes": changes,
+        "summary": {
+            "geographies": len(results),
+            "changed": int(any_changed.sum()),
+            "final_grouping": _counts(scenario["final_grouping"]),
+            "baseline_final_grouping": _counts(base["final_grouping"]),
+        },
+    }
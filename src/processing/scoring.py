@@ -21,6 +21,7 @@ from src.processing.feature_registry import (
     LAYER_DEFINITIONS,
     get_primary_features
 )
+from src.processing.scoring_kernel import layer_feature_weights, weighted_layer_scores
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -57,42 +58,18 @@ def calculate_layer_score(
         logger.warning(f"No normalized features found for layer {layer_name}")
         return pd.Series(np.nan, index=df.index), pd.Series(0.0, index=df.index)
 
-    # Get weights
-    if use_weights:
-        weights = {
-            f"{f.name}_normalized": f.weight
-            for f in features
-            if f"{f.name}_normalized" in available_cols
-        }
-    else:
-        weights = {col: 1.0 for col in available_cols}
-
-    # Calculate weighted average
-    scores = []
-    coverage = []
-
-    for _, row in df.iterrows():
-        values = []
-        wts = []
-
-        for col in available_cols:
-            val = row[col]
-            if pd.notna(val):
-                values.append(val)
-                wts.append(weights[col])
-
-        if values:
-            # Weighted average
-            score = np.average(values, weights=wts)
-            cov = len(values) / len(available_cols)  # Feature coverage
-        else:
-            score = np.nan
-            cov = 0.0
-
-        scores.append(score)
-        coverage.append(cov)
-
-    return pd.Series(scores, index=df.index), pd.Series(coverage, index=df.index)
+    # Feature weights from the registry, restricted to available columns
+    columns, weights, _ = layer_feature_weights([layer_name], use_weights)
+    keep = [i for i, col in enumerate(columns) if col in available_cols]
+    available_cols = [columns[i] for i in keep]
+
+    # Weighted average over non-missing features, all rows at once
+    scores, coverage = weighted_layer_scores(
+        df[available_cols].to_numpy(dtype=float),
+        weights[keep]
+    )
+
+    return pd.Series(scores[:, 0], index=df.index), pd.Series(coverage[:, 0], index=df.index)
 
 
 def calculate_all_layer_scores(
@@ -0,0 +1,233 @@
+"""
+Maryland Viability Atlas - Scoring Kernel
+Masked matrix operations shared by the v1 and multi-year scoring paths
+
+Every function works on a (geography x feature) matrix with NaN marking
+missing values, so a whole layer set is scored in a handful of numpy calls
+instead of one Python iteration per geography:
+- weighted_layer_scores: weighted mean of available features, per layer
+- grouped_percentile_rank: percentile rank within groups (e.g. per layer)
+- missingness_penalty: coverage-years penalty
+- composite_scores: level/momentum/stability composition with reweighting
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.processing.feature_registry import FEATURES_BY_LAYER
+
+# Composite component order: columns of the component matrix
+COMPONENTS = ("level", "momentum", "stability")
+
+# Composite weights by component availability (level is required)
+COMPOSITE_WEIGHTS_FULL = (0.50, 0.30, 0.20)
+COMPOSITE_WEIGHTS_LEVEL_MOMENTUM = (0.625, 0.375, 0.0)  # same 0.5:0.3 ratio
+COMPOSITE_WEIGHTS_LEVEL_ONLY = (1.0, 0.0, 0.0)
+
+# Missingness thresholds (coverage years)
+COVERAGE_THRESHOLD_FULL = 5  # no penalty
+COVERAGE_THRESHOLD_PARTIAL = 3  # reduced penalty
+
+# Share of the score removed at penalty 1.0
+MAX_PENALTY_REDUCTION = 0.5
+
+
+def layer_feature_weights(
+    layer_names: Sequence[str], use_weights: bool = True
+) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    Build the feature axis for one or more layers from FEATURES_BY_LAYER.
+
+    Args:
+        layer_names: Layers to include, in output column order
+        use_weights: If True, use registry weights; otherwise equal weights
+
+    Returns:
+        Tuple of (normalized column names, weight vector, layer index per feature)
+    """
+    columns, weights, layer_index = [], [], []
+    for i, layer_name in enumerate(layer_names):
+        for feature in FEATURES_BY_LAYER.get(layer_name, []):
+            columns.append(f"{feature.name}_normalized")
+            weights.append(feature.weight if use_weights else 1.0)
+            layer_index.append(i)
+    return columns, np.asarray(weights, dtype=float), np.asarray(layer_index, dtype=int)
+
+
+def weighted_layer_scores(
+    values: np.ndarray,
+    weights: np.ndarray,
+    layer_index: Optional[np.ndarray] = None,
+    n_layers: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Weighted mean of the available features for every geography and layer.
+
+    Missing (NaN) features drop out of both the numerator and the weight
+    total, so a geography is scored on whatever features it has.
+
+    Args:
+        values: (n_geo x n_features) matrix of normalized values, NaN = missing
+        weights: (n_features,) feature weights
+        layer_index: (n_features,) layer column for each feature (default: one layer)
+        n_layers: Number of layers (default: max(layer_index) + 1)
+
+    Returns:
+        Tuple of (scores, coverage), each (n_geo x n_layers). Scores are NaN
+        where a layer has no available features; coverage is the share of the
+        layer's features that are present.
+    """
+    values = np.asarray(values, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    if layer_index is None:
+        layer_index = np.zeros(values.shape[1], dtype=int)
+    if n_layers is None:
+        n_layers = int(layer_index.max()) + 1 if len(layer_index) else 0
+
+    # (n_features x n_layers) membership matrix sums features into layers
+    membership = np.zeros((values.shape[1], n_layers))
+    membership[np.arange(values.shape[1]), layer_index] = 1.0
+
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+
+    numerator = (filled * weights) @ membership
+    weight_total = (valid * weights) @ membership
+    present = valid.astype(float) @ membership
+    defined = membership.sum(axis=0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        scores = np.where(weight_total > 0, numerator / weight_total, np.nan)
+        coverage = np.where(defined > 0, present / defined, 0.0)
+
+    return scores, coverage
+
+
+def grouped_percentile_rank(values: pd.DataFrame, groups: pd.Series) -> pd.DataFrame:
+    """
+    Percentile-rank every column within each group, ignoring missing values.
+
+    Ties share the average rank; NaN stays NaN and does not count toward the
+    group size.
+
+    Args:
+        values: DataFrame of raw values (one column per measure)
+        groups: Group label per row (e.g. layer_name)
+
+    Returns:
+        DataFrame of 0-1 ranks with the same shape and index as ``values``
+    """
+    return values.groupby(groups.to_numpy()).rank(method="average", pct=True, na_option="keep")
+
+
+def missingness_penalty(coverage_years) -> np.ndarray:
+    """
+    Penalty for short coverage windows (0 = none, up to 0.8 at zero years).
+
+    - >= 5 years: 0
+    - 3-5 years: linear up to 0.2
+    - < 3 years: 0.5 rising to 0.8
+
+    Args:
+        coverage_years: Scalar or array of years with actual data
+
+    Returns:
+        Array of penalties (NaN where coverage is unknown)
+    """
+    years = np.asarray(coverage_years, dtype=float)
+    partial = (
+        0.2
+        * (COVERAGE_THRESHOLD_FULL - years)
+        / (COVERAGE_THRESHOLD_FULL - COVERAGE_THRESHOLD_PARTIAL)
+    )
+    severe = 0.5 + 0.3 * (COVERAGE_THRESHOLD_PARTIAL - years) / COVERAGE_THRESHOLD_PARTIAL
+    return np.select(
+        [years >= COVERAGE_THRESHOLD_FULL, years >= COVERAGE_THRESHOLD_PARTIAL],
+        [0.0, partial],
+        default=severe,
+    )
+
+
+def composite_weights(
+    components: np.ndarray, full_weights: Optional[Sequence[float]] = None
+) -> np.ndarray:
+    """
+    Component weights per row given which components are present.
+
+    Args:
+        components: (n x 3) matrix of level, momentum, stability scores
+        full_weights: Level/momentum/stability weights when all are present
+            (default: COMPOSITE_WEIGHTS_FULL), either one (3,) vector or a
+            (scenarios x 3) batch. Without stability, level and momentum keep
+            their ratio; with level only, level gets 1.0.
+
+    Returns:
+        (n x 3) weight matrix, or (scenarios x n x 3) for a batch; rows with
+        no level score are all NaN
+    """
+    components = np.asarray(components, dtype=float)
+    present = ~np.isnan(components)
+    has_level, has_momentum, has_stability = present[:, :1], present[:, 1:2], present[:, 2:]
+
+    if full_weights is None:
+        full = np.asarray(COMPOSITE_WEIGHTS_FULL)
+        level_momentum = np.asarray(COMPOSITE_WEIGHTS_LEVEL_MOMENTUM)
+    else:
+        full = np.asarray(full_weights, dtype=float)
+        total = full[..., 0] + full[..., 1]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            level_momentum = np.stack(
+                [full[..., 0] / total, full[..., 1] / total, np.zeros_like(total)], axis=-1
+            )
+        level_momentum = np.where(
+            (total > 0)[..., None], level_momentum, COMPOSITE_WEIGHTS_LEVEL_ONLY
+        )
+
+    # Most complete case wins; rows without level get NaN weights
+    return np.where(
+        has_level & has_momentum & has_stability,
+        full[..., None, :],
+        np.where(
+            has_level & has_momentum,
+            level_momentum[..., None, :],
+            np.where(has_level, np.asarray(COMPOSITE_WEIGHTS_LEVEL_ONLY), np.nan),
+        ),
+    )
+
+
+def composite_scores(
+    components: np.ndarray, coverage_years, full_weights: Optional[Sequence[float]] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Weighted level/momentum/stability composite with missingness penalty.
+
+    Args:
+        components: (n x 3) matrix of level, momentum, stability scores
+        coverage_years: (n,) years of coverage per row
+        full_weights: Component weights when all are present, one vector or a
+            (scenarios x 3) batch (see composite_weights)
+
+    Returns:
+        Tuple of (scores, weights, penalty). Scores are (n,), or
+        (scenarios x n) for a batch, and NaN where level is missing; a
+        positive penalty reduces the score by up to MAX_PENALTY_REDUCTION.
+    """
+    components = np.asarray(components, dtype=float)
+    weights = composite_weights(components, full_weights)
+    penalty = missingness_penalty(coverage_years)
+
+    raw = np.sum(np.nan_to_num(components) * np.nan_to_num(weights), axis=-1)
+    raw = np.where(np.isnan(weights[..., 0]), np.nan, raw)
+
+    with np.errstate(invalid="ignore"):
+        applied = np.where(penalty > 0, penalty, 0.0)
+    scores = raw * (1 - MAX_PENALTY_REDUCTION * applied)
+
+    return scores, weights, penalty
+
+
+def weights_to_dicts(weights: np.ndarray) -> List[Optional[Dict[str, float]]]:
+    """Convert a composite weight matrix to per-row {component: weight} dicts."""
+    return [None if np.isnan(row[0]) else dict(zip(COMPONENTS, map(float, row))) for row in weights]
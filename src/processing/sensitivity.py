@@ -0,0 +1,425 @@
+"""
+Maryland Viability Atlas - Classification Sensitivity
+Monte Carlo stability of composite ranks and classifications under weight and threshold uncertainty
+
+Samples thousands of parameter sets around the values the pipeline uses:
+- Component weights (level/momentum/stability): Dirichlet centred on WEIGHTS_FULL
+- Layer weights in the composite: Dirichlet centred on equal weights
+- Continuous classification thresholds: uniform perturbation of +/- jitter
+
+All scenarios are evaluated together as (scenario x geography x layer)
+arrays, in chunks to bound memory, reusing the scoring kernel and the
+classification rule sets. Per geography the result is a composite-rank
+interval and how often each classification occurs; one compact row per
+geography is stored in classification_sensitivity.
+
+Usage:
+    python -m src.processing.sensitivity [--as-of-year 2025] [--scenarios 2000]
+"""
+
+import argparse
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from config.database import get_db, log_refresh
+from src.processing.multiyear_classification import (
+    DIRECTIONAL_RULES,
+    GROUPING_RULES,
+    POSITIVE_LAYERS,
+    classification_thresholds,
+    composite_from_layers,
+    directional_variables,
+    final_groupings,
+)
+from src.processing.multiyear_scoring import SUMMARY_SCORE_DECIMALS, WEIGHTS_FULL
+from src.processing.scenarios import ScenarioBaseline, get_baseline
+from src.processing.scoring_kernel import COMPONENTS, composite_scores
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Layer axis of the score tensor: positive layers, then risk drag
+TENSOR_LAYERS = POSITIVE_LAYERS + ["risk_drag"]
+
+# Thresholds on 0-1 scores that are perturbed (counts stay fixed)
+PERTURBED_THRESHOLDS = (
+    "THRESHOLD_IMPROVING_HIGH",
+    "THRESHOLD_IMPROVING_LOW",
+    "THRESHOLD_RISK_DRAG_SEVERE",
+    "MOMENTUM_POSITIVE_THRESHOLD",
+)
+
+DEFAULT_SCENARIOS = 2000
+DEFAULT_CONCENTRATION = 100.0  # Dirichlet concentration (higher = closer to the centre)
+DEFAULT_THRESHOLD_JITTER = 0.05
+CHUNK_SCENARIOS = 500  # Scenarios evaluated per batch
+
+RANK_PERCENTILES = (5, 50, 95)
+
+
+@dataclass
+class SensitivitySamples:
+    """Sampled parameters, one row per scenario."""
+
+    component_weights: np.ndarray  # (scenarios x 3)
+    layer_weights: np.ndarray  # (scenarios x positive layers)
+    thresholds: Dict[str, np.ndarray]  # name -> (scenarios,)
+
+    def __len__(self) -> int:
+        return len(self.component_weights)
+
+    def chunk(self, start: int, stop: int) -> "SensitivitySamples":
+        return SensitivitySamples(
+            component_weights=self.component_weights[start:stop],
+            layer_weights=self.layer_weights[start:stop],
+            thresholds={name: values[start:stop] for name, values in self.thresholds.items()},
+        )
+
+
+def sample_parameters(
+    n_scenarios: int = DEFAULT_SCENARIOS,
+    concentration: float = DEFAULT_CONCENTRATION,
+    threshold_jitter: float = DEFAULT_THRESHOLD_JITTER,
+    seed: Optional[int] = 0,
+) -> SensitivitySamples:
+    """
+    Draw weight vectors and threshold perturbations around the pipeline values.
+
+    Args:
+        n_scenarios: Number of parameter sets
+        concentration: Dirichlet concentration for both weight vectors
+        threshold_jitter: Half-width of the uniform threshold perturbation
+        seed: Random seed (None for a fresh draw)
+
+    Returns:
+        SensitivitySamples
+    """
+    rng = np.random.default_rng(seed)
+    component_centre = np.array([WEIGHTS_FULL[name] for name in COMPONENTS])
+    layer_centre = np.full(len(POSITIVE_LAYERS), 1.0 / len(POSITIVE_LAYERS))
+
+    base = classification_thresholds()
+    thresholds = {
+        name: np.clip(
+            base[name] + rng.uniform(-threshold_jitter, threshold_jitter, n_scenarios), 0.0, 1.0
+        )
+        for name in PERTURBED_THRESHOLDS
+    }
+    return SensitivitySamples(
+        component_weights=rng.dirichlet(concentration * component_centre, n_scenarios),
+        # Scaled so the centre is 1.0 per layer, as in the unweighted composite
+        layer_weights=rng.dirichlet(concentration * layer_centre, n_scenarios)
+        * len(POSITIVE_LAYERS),
+        thresholds=thresholds,
+    )
+
+
+def _layer_tensor_index(baseline: ScenarioBaseline):
+    """Geography and layer positions of each baseline feature row."""
+    geoids = baseline.classified.index
+    geo_index = geoids.get_indexer(baseline.features["geoid"])
+    layer_index = pd.Index(TENSOR_LAYERS).get_indexer(baseline.features["layer_name"])
+    keep = (geo_index >= 0) & (layer_index >= 0)
+    return geo_index[keep], layer_index[keep], keep
+
+
+def evaluate_batch(
+    baseline: ScenarioBaseline, samples: SensitivitySamples
+) -> Dict[str, np.ndarray]:
+    """
+    Score and classify every geography under every sampled parameter set.
+
+    Args:
+        baseline: Loaded ScenarioBaseline (see scenarios.get_baseline)
+        samples: Parameter sets to evaluate
+
+    Layer scores are rounded to the stored NUMERIC(5,4) scale before
+    classifying, as in scenarios.evaluate_scenario, so a draw at the pipeline
+    parameters reproduces the baseline labels.
+
+    Returns:
+        Dict of (scenarios x geographies) arrays: composite_score,
+        directional_status and final_grouping
+    """
+    n_scenarios, n_geos = len(samples), len(baseline.classified)
+    geo_index, layer_index, keep = _layer_tensor_index(baseline)
+
+    # (scenario x row) layer scores, scattered into (scenario x geo x layer)
+    layer_scores, _, _ = composite_scores(
+        baseline.components[keep], baseline.coverage_years[keep], samples.component_weights
+    )
+    tensor = np.full((n_scenarios, n_geos, len(TENSOR_LAYERS)), np.nan)
+    tensor[:, geo_index, layer_index] = np.round(layer_scores, SUMMARY_SCORE_DECIMALS)
+
+    momentum = np.full((n_geos, len(TENSOR_LAYERS)), np.nan)
+    momentum[geo_index, layer_index] = np.round(
+        baseline.features["layer_momentum_score"].to_numpy(dtype=float)[keep],
+        SUMMARY_SCORE_DECIMALS,
+    )
+
+    positive = tensor[..., : len(POSITIVE_LAYERS)]
+    risk_drag = tensor[..., len(POSITIVE_LAYERS)]
+    composite = composite_from_layers(positive, risk_drag, samples.layer_weights[:, None, :])
+
+    # Classification with per-scenario thresholds (broadcast over geographies)
+    thresholds = classification_thresholds(
+        {name: values[:, None] for name, values in samples.thresholds.items()}
+    )
+    variables = directional_variables(
+        positive, momentum[None, :, : len(POSITIVE_LAYERS)], risk_drag, thresholds
+    )
+    directional = DIRECTIONAL_RULES.labels(variables, thresholds, (n_scenarios, n_geos))
+
+    # Coverage-based confidence does not depend on weights or score thresholds
+    confidence = baseline.classified["confidence_level"].to_numpy(dtype=object)
+    n_reasons = baseline.classified["uncertainty_reasons"].map(len).to_numpy()
+    grouping = final_groupings(directional, confidence[None, :], n_reasons[None, :])
+
+    return {
+        "composite_score": composite,
+        "directional_status": directional,
+        "final_grouping": grouping,
+    }
+
+
+def composite_ranks(composite: np.ndarray) -> np.ndarray:
+    """Rank geographies per scenario (1 = highest composite; NaN stays NaN)."""
+    order = np.argsort(-np.where(np.isnan(composite), -np.inf, composite), axis=-1, kind="stable")
+    ranks = np.empty(composite.shape)
+    np.put_along_axis(
+        ranks, order, np.arange(1, composite.shape[-1] + 1, dtype=float)[None, :], axis=-1
+    )
+    return np.where(np.isnan(composite), np.nan, ranks)
+
+
+def _frequencies(labels: np.ndarray, names) -> Dict[str, np.ndarray]:
+    return {name: (labels == name).mean(axis=0) for name in names}
+
+
+def run_sensitivity_analysis(
+    baseline: ScenarioBaseline, samples: SensitivitySamples, chunk_size: int = CHUNK_SCENARIOS
+) -> pd.DataFrame:
+    """
+    Summarize rank and classification stability per geography.
+
+    Args:
+        baseline: Loaded ScenarioBaseline
+        samples: Sampled parameter sets
+        chunk_size: Scenarios evaluated per batch
+
+    Returns:
+        DataFrame (one row per geoid) with baseline and percentile ranks,
+        baseline/modal grouping, grouping stability and label frequencies
+    """
+    ranks, directional, grouping = [], [], []
+    for start in range(0, len(samples), chunk_size):
+        batch = evaluate_batch(baseline, samples.chunk(start, start + chunk_size))
+        ranks.append(composite_ranks(batch["composite_score"]))
+        directional.append(batch["directional_status"])
+        grouping.append(batch["final_grouping"])
+    ranks = np.concatenate(ranks)
+    directional = np.concatenate(directional)
+    grouping = np.concatenate(grouping)
+
+    classified = baseline.classified
+    baseline_rank = composite_ranks(classified["composite_score"].to_numpy(dtype=float)[None, :])[0]
+    baseline_grouping = classified["final_grouping"].to_numpy(dtype=object)
+
+    grouping_names = sorted(
+        {rule.label for rule in GROUPING_RULES.rules} | {GROUPING_RULES.default}
+    )
+    directional_names = sorted(
+        {rule.label for rule in DIRECTIONAL_RULES.rules} | {DIRECTIONAL_RULES.default}
+    )
+    grouping_freq = _frequencies(grouping, grouping_names)
+    directional_freq = _frequencies(directional, directional_names)
+
+    freq_matrix = np.stack([grouping_freq[name] for name in grouping_names], axis=-1)
+    with np.errstate(all="ignore"):
+        percentiles = np.nanpercentile(ranks, RANK_PERCENTILES, axis=0)
+
+    summary = pd.DataFrame(
+        {
+            "geoid": classified.index,
+            "n_scenarios": len(samples),
+            "baseline_rank": baseline_rank,
+            "rank_p05": percentiles[0],
+            "rank_median": percentiles[1],
+            "rank_p95": percentiles[2],
+            "baseline_grouping": baseline_grouping,
+            "modal_grouping": np.asarray(grouping_names, dtype=object)[freq_matrix.argmax(axis=-1)],
+            "grouping_stability": (grouping == baseline_grouping[None, :]).mean(axis=0),
+            "directional_stability": (
+                directional == classified["directional_status"].to_numpy(dtype=object)[None, :]
+            ).mean(axis=0),
+        }
+    )
+    summary["grouping_frequencies"] = [
+        {
+            name: round(float(grouping_freq[name][i]), 4)
+            for name in grouping_names
+            if grouping_freq[name][i] > 0
+        }
+        for i in range(len(summary))
+    ]
+    summary["directional_frequencies"] = [
+        {
+            name: round(float(directional_freq[name][i]), 4)
+            for name in directional_names
+            if directional_freq[name][i] > 0
+        }
+        for i in range(len(summary))
+    ]
+    return summary
+
+
+def store_sensitivity(summary: pd.DataFrame, as_of_year: int, parameters: Dict[str, Any]):
+    """
+    Replace classification_sensitivity rows for as_of_year (one row per geography).
+
+    Args:
+        summary: Output of run_sensitivity_analysis
+        as_of_year: Year the baseline describes
+        parameters: Sampling parameters recorded with every row
+    """
+
+    def optional(value):
+        return None if pd.isna(value) else float(value)
+
+    rows = [
+        {
+            "geoid": row["geoid"],
+            "as_of_year": int(as_of_year),
+            "n_scenarios": int(row["n_scenarios"]),
+            "baseline_rank": optional(row["baseline_rank"]),
+            "rank_p05": optional(row["rank_p05"]),
+            "rank_median": optional(row["rank_median"]),
+            "rank_p95": optional(row["rank_p95"]),
+            "baseline_grouping": row["baseline_grouping"],
+            "modal_grouping": row["modal_grouping"],
+            "grouping_stability": float(row["grouping_stability"]),
+            "directional_stability": float(row["directional_stability"]),
+            "grouping_frequencies": json.dumps(row["grouping_frequencies"]),
+            "directional_frequencies": json.dumps(row["directional_frequencies"]),
+            "parameters": json.dumps(parameters),
+        }
+        for row in summary.to_dict("records")
+    ]
+
+    with get_db() as db:
+        db.execute(
+            text("DELETE FROM classification_sensitivity WHERE as_of_year = :as_of_year"),
+            {"as_of_year": int(as_of_year)},
+        )
+        if rows:
+            db.execute(
+                text("""
+                INSERT INTO classification_sensitivity (
+                    geoid, as_of_year, n_scenarios,
+                    baseline_rank, rank_p05, rank_median, rank_p95,
+                    baseline_grouping, modal_grouping,
+                    grouping_stability, directional_stability,
+                    grouping_frequencies, directional_frequencies, parameters
+                ) VALUES (
+                    :geoid, :as_of_year, :n_scenarios,
+                    :baseline_rank, :rank_p05, :rank_median, :rank_p95,
+                    :baseline_grouping, :modal_grouping,
+                    :grouping_stability, :directional_stability,
+                    CAST(:grouping_frequencies AS jsonb), CAST(:directional_frequencies AS jsonb),
+                    CAST(:parameters AS jsonb)
+                )
+            """),
+                rows,
+            )
+        db.commit()
+
+    logger.info(f"Stored sensitivity summary for {len(rows)} geographies")
+
+
+def run_sensitivity(
+    as_of_year: Optional[int] = None,
+    n_scenarios: int = DEFAULT_SCENARIOS,
+    concentration: float = DEFAULT_CONCENTRATION,
+    threshold_jitter: float = DEFAULT_THRESHOLD_JITTER,
+    seed: Optional[int] = 0,
+    store: bool = True,
+) -> pd.DataFrame:
+    """
+    Main entry point: sample, evaluate, summarize and (optionally) store.
+
+    Returns:
+        Per-geography sensitivity summary
+    """
+    baseline = get_baseline(as_of_year)
+    samples = sample_parameters(n_scenarios, concentration, threshold_jitter, seed)
+
+    logger.info(
+        f"Evaluating {n_scenarios} scenarios for {len(baseline.classified)} geographies "
+        f"(as_of_year {baseline.as_of_year})"
+    )
+    summary = run_sensitivity_analysis(baseline, samples)
+
+    unstable = summary[summary["grouping_stability"] < 0.8]
+    logger.info(
+        f"Median grouping stability {summary['grouping_stability'].median():.2f}; "
+        f"{len(unstable)} geographies below 0.80"
+    )
+
+    if store:
+        parameters = {
+            "n_scenarios": n_scenarios,
+            "concentration": concentration,
+            "threshold_jitter": threshold_jitter,
+            "perturbed_thresholds": list(PERTURBED_THRESHOLDS),
+            "seed": seed,
+        }
+        store_sensitivity(summary, baseline.as_of_year, parameters)
+        log_refresh(
+            layer_name="classification_sensitivity",
+            data_source="layer_timeseries_features",
+            status="success",
+            records_processed=n_scenarios * len(summary),
+            records_inserted=len(summary),
+            metadata={"as_of_year": baseline.as_of_year, "n_scenarios": n_scenarios},
+        )
+
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo classification sensitivity")
+    parser.add_argument(
+        "--as-of-year", type=int, default=None, help="Defaults to the latest scored year"
+    )
+    parser.add_argument("--scenarios", type=int, default=DEFAULT_SCENARIOS)
+    parser.add_argument("--concentration", type=float, default=DEFAULT_CONCENTRATION)
+    parser.add_argument("--threshold-jitter", type=float, default=DEFAULT_THRESHOLD_JITTER)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--no-store", action="store_true", help="Print the summary without storing it"
+    )
+    args = parser.parse_args()
+
+    summary = run_sensitivity(
+        as_of_year=args.as_of_year,
+        n_scenarios=args.scenarios,
+        concentration=args.concentration,
+        threshold_jitter=args.threshold_jitter,
+        seed=args.seed,
+        store=not args.no_store,
+    )
+    if args.no_store:
+        print(
+            summary.drop(columns=["grouping_frequencies", "directional_frequencies"]).to_string(
+                index=False
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
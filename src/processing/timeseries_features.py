@@ -14,11 +14,14 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple, Optional
 from sqlalchemy import text
+from sqlalchemy.orm import Session
+import json
 from scipy import stats
 
 from config.settings import get_settings
-from config.database import get_db, log_refresh
+from config.database import get_db, log_refresh, use_db
 from src.utils.logging import get_logger
+from src.utils.prediction_utils import fit_trends
 
 logger = get_logger(__name__)
 settings = get_settings()
@@ -28,6 +31,20 @@ DEFAULT_WINDOW_SIZE = 5  # Default N_YEARS for rolling window
 MIN_YEARS_FOR_MOMENTUM = 3  # Minimum years needed to calculate meaningful trend
 MIN_YEARS_FOR_STABILITY = 3  # Minimum years for volatility metrics
 
+# Stored NUMERIC scale of layer_timeseries_features columns. Values are rounded
+# on write so every backend (and the in-memory pipeline) sees the same numbers.
+STORED_DECIMALS = {
+    'level_latest': 6,
+    'level_baseline': 6,
+    'momentum_slope': 6,
+    'momentum_delta': 6,
+    'momentum_percent_change': 4,
+    'momentum_fit_quality': 4,
+    'stability_volatility': 6,
+    'stability_cv': 4,
+    'stability_consistency': 4,
+}
+
 
 def compute_robust_slope(years: np.ndarray, values: np.ndarray) -> Tuple[float, float]:
     """
@@ -274,12 +291,36 @@ def compute_layer_timeseries_features(
     }
 
 
-def store_timeseries_features(features: List[Dict]):
+def timeseries_feature_rows(features: List[Dict]) -> List[Dict]:
+    """
+    Database rows for feature dicts (inputs are left unmodified).
+
+    data_gaps becomes a JSON string, NaN becomes NULL and floats are rounded
+    to their stored scale (STORED_DECIMALS).
+    """
+    def _stored(key, value):
+        if key == 'data_gaps':
+            return json.dumps(value)
+        if isinstance(value, float):
+            if np.isnan(value):
+                return None
+            if key in STORED_DECIMALS:
+                return float(np.round(value, STORED_DECIMALS[key]))
+        return value
+
+    return [
+        {key: _stored(key, value) for key, value in feature_dict.items()}
+        for feature_dict in features
+    ]
+
+
+def store_timeseries_features(features: List[Dict], db: Optional[Session] = None):
     """
     Store computed timeseries features to database.
 
     Args:
-        features: List of feature dicts
+        features: List of feature dicts (left unmodified)
+        db: Session to write in; the caller commits (default: own transaction)
     """
     if not features:
         logger.warning("No timeseries features to store")
@@ -287,14 +328,16 @@ def store_timeseries_features(features: List[Dict]):
 
     logger.info(f"Storing {len(features)} timeseries feature records")
 
-    with get_db() as db:
+    rows = timeseries_feature_rows(features)
+
+    with use_db(db) as session:
         # Delete existing features for this as_of_year
         as_of_year = features[0]['as_of_year']
         delete_sql = text("""
             DELETE FROM layer_timeseries_features
             WHERE as_of_year = :as_of_year
         """)
-        db.execute(delete_sql, {"as_of_year": as_of_year})
+        session.execute(delete_sql, {"as_of_year": as_of_year})
 
         # Insert new features
         insert_sql = text("""
@@ -314,50 +357,22 @@ def store_timeseries_features(features: List[Dict]):
                 :window_size, :computation_method
             )
         """)
-
-        for feature_dict in features:
-            # Convert data_gaps list to JSON string
-            import json
-            feature_dict['data_gaps'] = json.dumps(feature_dict['data_gaps'])
-
-            # Handle NaN values
-            for key, value in feature_dict.items():
-                if isinstance(value, float) and np.isnan(value):
-                    feature_dict[key] = None
-
-            db.execute(insert_sql, feature_dict)
-
-        db.commit()
+        session.execute(insert_sql, rows)
 
     logger.info("✓ Timeseries features stored successfully")
 
 
-def compute_all_timeseries_features(
-    window_size: int = DEFAULT_WINDOW_SIZE,
-    as_of_year: int = 2025
-) -> int:
+def timeseries_layer_configs() -> Dict[str, Dict[str, str]]:
     """
-    Compute timeseries features for all layers and geographies.
-
-    Args:
-        window_size: Years to look back
-        as_of_year: Reference year
+    Source table and primary metric column for each layer.
 
     Returns:
-        Count of features computed
+        Dict of layer_name -> {'table': ..., 'metric': ...}
     """
-    logger.info("=" * 70)
-    logger.info("TIMESERIES FEATURE COMPUTATION")
-    logger.info("=" * 70)
-    logger.info(f"Window size: {window_size} years")
-    logger.info(f"As of year: {as_of_year}")
-
-    # Define layer configurations
-    # Each layer specifies: table name, primary metric column
     def _metric_name(base_metric: str) -> str:
         return f"{base_metric}_effective" if settings.USE_EFFECTIVE_VALUES else base_metric
 
-    layer_configs = {
+    return {
         'employment_gravity': {
             'table': 'layer1_employment_gravity',
             'metric': _metric_name('economic_opportunity_index')
@@ -384,6 +399,224 @@ def compute_all_timeseries_features(
         }
     }
 
+
+def tract_timeseries_layer_configs() -> Dict[str, Dict[str, str]]:
+    """
+    Tract table and headline score column for each layer.
+
+    Tract tables carry no *_effective columns, so observed values are used.
+
+    Returns:
+        Dict of layer_name -> {'table': ..., 'metric': ...}
+    """
+    return {
+        'employment_gravity': {
+            'table': 'layer1_economic_opportunity_tract',
+            'metric': 'economic_accessibility_score'
+        },
+        'mobility_optionality': {
+            'table': 'layer2_mobility_accessibility_tract',
+            'metric': 'multimodal_accessibility_score'
+        },
+        'school_trajectory': {
+            'table': 'layer3_education_accessibility_tract',
+            'metric': 'education_opportunity_score'
+        },
+        'housing_elasticity': {
+            'table': 'layer4_housing_affordability_tract',
+            'metric': 'housing_affordability_score'
+        },
+        'demographic_momentum': {
+            'table': 'layer5_demographic_equity_tract',
+            'metric': 'demographic_opportunity_score'
+        },
+        'risk_drag': {
+            'table': 'layer6_risk_vulnerability_tract',
+            'metric': 'static_risk_score'
+        }
+    }
+
+
+def load_layer_observations(
+    layer_configs: Dict[str, Dict[str, str]],
+    window_size: int = DEFAULT_WINDOW_SIZE,
+    as_of_year: int = 2025,
+    geo_column: str = 'fips_code'
+) -> pd.DataFrame:
+    """
+    Observed metric values for every geography, one query per layer.
+
+    Same selection as extract_timeseries_data (non-null values from the
+    window start onwards), for all geographies at once.
+
+    Args:
+        layer_configs: Layer name -> {'table', 'metric'}
+        window_size: Years to look back
+        as_of_year: Reference year
+        geo_column: Geography key column of the layer tables
+
+    Returns:
+        Long DataFrame with geoid, layer_name, year, value
+    """
+    min_year = as_of_year - window_size + 1
+    frames = []
+
+    with get_db() as db:
+        for layer_name, config in layer_configs.items():
+            query = text(f"""
+                SELECT {geo_column} AS geoid, data_year AS year, {config['metric']} AS value
+                FROM {config['table']}
+                WHERE data_year >= :min_year
+                  AND {config['metric']} IS NOT NULL
+            """)
+            try:
+                rows = db.execute(query, {"min_year": min_year}).fetchall()
+            except Exception as e:
+                logger.warning(f"Error loading {layer_name} from {config['table']}: {e}")
+                db.rollback()
+                continue
+
+            frame = pd.DataFrame(rows, columns=['geoid', 'year', 'value'])
+            frame['layer_name'] = layer_name
+            frames.append(frame)
+
+    if not frames:
+        return pd.DataFrame(columns=['geoid', 'layer_name', 'year', 'value'])
+
+    df = pd.concat(frames, ignore_index=True)
+    df['year'] = pd.to_numeric(df['year'], errors='coerce')
+    df['value'] = pd.to_numeric(df['value'], errors='coerce')
+    return df.dropna(subset=['year', 'value'])
+
+
+def compute_series_features(
+    observations: pd.DataFrame,
+    window_size: int = DEFAULT_WINDOW_SIZE,
+    as_of_year: int = 2025
+) -> List[Dict]:
+    """
+    Timeseries features for every (geoid, layer) series at once.
+
+    Gives the same records as compute_layer_timeseries_features. Series are
+    packed into NaN-padded (series x years) matrices, so Theil-Sen slopes,
+    stability metrics and levels are computed column-wise rather than once
+    per geography.
+
+    Args:
+        observations: Long frame with geoid, layer_name, year, value
+        window_size: Years to look back
+        as_of_year: Reference year
+
+    Returns:
+        List of feature dicts, ordered by geoid then layer_name
+    """
+    obs = observations.dropna(subset=['year', 'value']).sort_values(['geoid', 'layer_name', 'year'])
+    if obs.empty:
+        return []
+
+    grouped = obs.groupby(['geoid', 'layer_name'], sort=False)
+    series = grouped.ngroup().to_numpy()
+    position = grouped.cumcount().to_numpy()
+    shape = (series.max() + 1, position.max() + 1)
+    years = np.full(shape, np.nan)
+    values = np.full(shape, np.nan)
+    years[series, position] = obs['year'].to_numpy(dtype=float)
+    values[series, position] = obs['value'].to_numpy(dtype=float)
+    keys = obs.loc[position == 0, ['geoid', 'layer_name']].to_numpy()
+
+    n = len(keys)
+    rows = np.arange(n)
+    coverage = np.sum(~np.isnan(values), axis=1)
+    level_latest = values[rows, coverage - 1]
+    level_baseline = values[:, 0]
+    has_momentum = coverage >= MIN_YEARS_FOR_MOMENTUM
+    has_stability = coverage >= MIN_YEARS_FOR_STABILITY
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # MOMENTUM: Theil-Sen slope and MAD of residuals
+        slope = np.full(n, np.nan)
+        fit_quality = np.full(n, np.nan)
+        if has_momentum.any():
+            slope[has_momentum], intercept = fit_trends(years[has_momentum], values[has_momentum])
+            residuals = values[has_momentum] - (
+                slope[has_momentum, None] * years[has_momentum] + intercept[:, None]
+            )
+            centred = residuals - np.nanmedian(residuals, axis=1, keepdims=True)
+            fit_quality[has_momentum] = np.nanmedian(np.abs(centred), axis=1)
+
+        delta = level_latest - level_baseline
+        momentum_delta = np.where(coverage >= 2, delta, np.nan)
+        percent_change = np.where(
+            has_momentum & (level_baseline != 0), delta / level_baseline * 100, np.nan
+        )
+
+        # STABILITY: IQR, CV and year-over-year consistency over observed values
+        volatility = np.full(n, np.nan)
+        cv = np.full(n, np.nan)
+        consistency = np.full(n, np.nan)
+        persistence = np.zeros(n, dtype=int)
+        if has_stability.any():
+            stable = values[has_stability]
+            q75, q25 = np.nanpercentile(stable, [75, 25], axis=1)
+            volatility[has_stability] = q75 - q25
+            mean = np.nanmean(stable, axis=1)
+            std = np.nanstd(stable, axis=1, ddof=1)
+            cv[has_stability] = np.where(mean != 0, std / mean, np.nan)
+
+            rising = np.diff(stable, axis=1) > 0
+            consistency[has_stability] = rising.sum(axis=1) / (coverage[has_stability] - 1)
+            streak = np.zeros(len(stable), dtype=int)
+            longest = np.zeros(len(stable), dtype=int)
+            for column in rising.T:
+                streak = np.where(column, streak + 1, 0)
+                longest = np.maximum(longest, streak)
+            persistence[has_stability] = longest
+
+    window_start = as_of_year - window_size + 1
+    records = []
+    for i in range(n):
+        observed = years[i, :coverage[i]].astype(int)
+        records.append({
+            'geoid': keys[i, 0],
+            'layer_name': keys[i, 1],
+            'as_of_year': as_of_year,
+            'level_latest': float(level_latest[i]),
+            'level_baseline': float(level_baseline[i]),
+            'momentum_slope': float(slope[i]),
+            'momentum_delta': float(momentum_delta[i]),
+            'momentum_percent_change': float(percent_change[i]),
+            'momentum_fit_quality': float(fit_quality[i]),
+            'stability_volatility': float(volatility[i]),
+            'stability_cv': float(cv[i]),
+            'stability_consistency': float(consistency[i]),
+            'stability_persistence': int(persistence[i]),
+            'coverage_years': int(coverage[i]),
+            'min_year': int(observed[0]),
+            'max_year': int(observed[-1]),
+            'data_gaps': sorted(set(range(window_start, as_of_year + 1)) - set(observed.tolist())),
+            'window_size': window_size,
+            'computation_method': 'theil_sen' if has_momentum[i] else 'insufficient_data'
+        })
+
+    return records
+
+
+def compute_timeseries_feature_records(
+    window_size: int = DEFAULT_WINDOW_SIZE,
+    as_of_year: int = 2025
+) -> List[Dict]:
+    """
+    Compute timeseries features for all layers and geographies without storing them.
+
+    Args:
+        window_size: Years to look back
+        as_of_year: Reference year
+
+    Returns:
+        List of feature dicts (see compute_layer_timeseries_features)
+    """
+    layer_configs = timeseries_layer_configs()
+
     # Get all geoids
     with get_db() as db:
         result = db.execute(text("SELECT fips_code FROM md_counties ORDER BY fips_code"))
@@ -391,33 +624,41 @@ def compute_all_timeseries_features(
 
     logger.info(f"Processing {len(geoids)} geographies across {len(layer_configs)} layers")
 
-    all_features = []
+    observations = load_layer_observations(layer_configs, window_size, as_of_year)
+    observations = observations[observations['geoid'].isin(geoids)]
+    all_features = compute_series_features(observations, window_size, as_of_year)
 
-    for geoid in geoids:
-        for layer_name, config in layer_configs.items():
-            try:
-                features = compute_layer_timeseries_features(
-                    geoid=geoid,
-                    layer_name=layer_name,
-                    layer_table=config['table'],
-                    metric_column=config['metric'],
-                    window_size=window_size,
-                    as_of_year=as_of_year
-                )
-
-                if features:
-                    all_features.append(features)
+    logger.info(f"✓ Computed {len(all_features)} timeseries feature records")
 
-            except Exception as e:
-                logger.warning(f"Error computing {layer_name} for {geoid}: {e}")
-                continue
+    return all_features
+
+
+def compute_all_timeseries_features(
+    window_size: int = DEFAULT_WINDOW_SIZE,
+    as_of_year: int = 2025
+) -> int:
+    """
+    Compute and store timeseries features for all layers and geographies.
+
+    Args:
+        window_size: Years to look back
+        as_of_year: Reference year
+
+    Returns:
+        Count of features computed
+    """
+    logger.info("=" * 70)
+    logger.info("TIMESERIES FEATURE COMPUTATION")
+    logger.info("=" * 70)
+    logger.info(f"Window size: {window_size} years")
+    logger.info(f"As of year: {as_of_year}")
+
+    all_features = compute_timeseries_feature_records(window_size, as_of_year)
 
     # Store all features
     if all_features:
         store_timeseries_features(all_features)
 
-    logger.info(f"✓ Computed {len(all_features)} timeseries feature records")
-
     # Log summary statistics
     df = pd.DataFrame(all_features)
     if not df.empty:
@@ -436,7 +677,7 @@ def compute_all_timeseries_features(
         metadata={
             "window_size": window_size,
             "as_of_year": as_of_year,
-            "layers_processed": len(layer_configs)
+            "layers_processed": len(timeseries_layer_configs())
         }
     )
 
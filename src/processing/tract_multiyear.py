@@ -0,0 +1,245 @@
+"""
+Maryland Viability Atlas - Tract-Level Multi-Year Synthesis
+Level + momentum + stability evidence and classification for census tracts
+
+Runs the county chain (timeseries features -> layer scores -> classification)
+over Maryland's ~1,475 census tracts, reading the headline score column of
+each layer*_tract table (tract_timeseries_layer_configs). Every step works
+on whole arrays rather than per geography:
+- one query per layer table for all tract observations in the window
+- batched Theil-Sen / stability kernel (compute_series_features)
+- grouped percentile ranks and composite scoring across all tracts
+- rule-set classification as vectorized masks
+
+Outputs are written in one transaction (bulk_insert executemany) to
+layer_timeseries_features_tract, layer_summary_scores_tract and
+final_synthesis_current_tract (migration 024). Percentiles are taken across
+Maryland tracts, so tract scores are not comparable with county scores.
+
+Usage:
+    python -m src.processing.tract_multiyear [--year 2025] [--window 5]
+"""
+
+import argparse
+import time
+from typing import Dict, List, Optional
+
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from config.database import bulk_insert, log_refresh, use_db
+from src.processing.multiyear_classification import (
+    classify_geographies,
+    final_synthesis_rows,
+    summary_scores_frame,
+)
+from src.processing.multiyear_scoring import (
+    compute_composite_scores,
+    layer_summary_score_rows,
+    normalize_layer_features,
+    timeseries_features_frame,
+)
+from src.processing.timeseries_features import (
+    DEFAULT_WINDOW_SIZE,
+    compute_series_features,
+    load_layer_observations,
+    timeseries_feature_rows,
+    tract_timeseries_layer_configs,
+)
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+TRACT_FEATURES_TABLE = "layer_timeseries_features_tract"
+TRACT_SCORES_TABLE = "layer_summary_scores_tract"
+TRACT_SYNTHESIS_TABLE = "final_synthesis_current_tract"
+
+
+def compute_tract_timeseries_features(
+    window_size: int = DEFAULT_WINDOW_SIZE, as_of_year: int = 2025
+) -> List[Dict]:
+    """
+    Timeseries features for every tract and layer.
+
+    Args:
+        window_size: Years to look back
+        as_of_year: Reference year
+
+    Returns:
+        List of feature dicts keyed by 11-digit tract geoid
+    """
+    layer_configs = tract_timeseries_layer_configs()
+    observations = load_layer_observations(
+        layer_configs, window_size, as_of_year, geo_column="tract_geoid"
+    )
+    logger.info(
+        f"Loaded {len(observations)} tract observations "
+        f"({observations['geoid'].nunique()} tracts, {len(layer_configs)} layers)"
+    )
+    return compute_series_features(observations, window_size, as_of_year)
+
+
+def score_tract_layers(features: List[Dict]) -> pd.DataFrame:
+    """
+    Layer summary scores for every tract (percentiles across Maryland tracts).
+
+    Args:
+        features: Tract feature dicts from compute_tract_timeseries_features
+
+    Returns:
+        Long DataFrame of layer scores (as compute_all_layer_scores)
+    """
+    df = timeseries_features_frame(features)
+    if df.empty:
+        return df
+    return compute_composite_scores(normalize_layer_features(df))
+
+
+def classify_tracts(scores: pd.DataFrame, as_of_year: int = 2025) -> pd.DataFrame:
+    """
+    Directional status, confidence and final grouping for every tract.
+
+    Args:
+        scores: Long tract layer scores from score_tract_layers
+        as_of_year: Reference year
+
+    Returns:
+        DataFrame with one classified row per tract
+    """
+    df = summary_scores_frame(scores)
+    if df.empty:
+        return df
+    df = classify_geographies(df)
+    df["current_as_of_year"] = as_of_year
+    return df
+
+
+def _with_county(rows: List[Dict]) -> List[Dict]:
+    # Tract GEOIDs start with the 5-digit county FIPS
+    return [{**row, "fips_code": row["geoid"][:5]} for row in rows]
+
+
+def store_tract_outputs(
+    features: List[Dict],
+    scores: pd.DataFrame,
+    classifications: pd.DataFrame,
+    as_of_year: int,
+    db: Optional[Session] = None,
+):
+    """
+    Replace tract features and scores for as_of_year and the current tract synthesis.
+
+    Args:
+        features: Tract feature dicts
+        scores: Tract layer scores
+        classifications: Classified tracts
+        as_of_year: Reference year
+        db: Session to write in; the caller commits (default: own transaction)
+    """
+    with use_db(db) as session:
+        for table in (TRACT_FEATURES_TABLE, TRACT_SCORES_TABLE):
+            session.execute(
+                text(f"DELETE FROM {table} WHERE as_of_year = :as_of_year"),
+                {"as_of_year": as_of_year},
+            )
+        session.execute(text(f"DELETE FROM {TRACT_SYNTHESIS_TABLE}"))
+
+        bulk_insert(
+            TRACT_FEATURES_TABLE, _with_county(timeseries_feature_rows(features)), db=session
+        )
+        if not scores.empty:
+            bulk_insert(
+                TRACT_SCORES_TABLE, _with_county(layer_summary_score_rows(scores)), db=session
+            )
+        if not classifications.empty:
+            bulk_insert(
+                TRACT_SYNTHESIS_TABLE,
+                _with_county(final_synthesis_rows(classifications)),
+                db=session,
+            )
+
+
+def run_tract_pipeline(
+    as_of_year: int = 2025, window_size: int = DEFAULT_WINDOW_SIZE, store: bool = True
+) -> pd.DataFrame:
+    """
+    Run the tract-level chain in memory and store all outputs in one transaction.
+
+    Args:
+        as_of_year: Reference year
+        window_size: Years to look back
+        store: Write outputs to the *_tract tables
+
+    Returns:
+        Classified tracts (empty when no tract data is available)
+    """
+    logger.info("=" * 70)
+    logger.info("TRACT-LEVEL MULTI-YEAR SYNTHESIS")
+    logger.info("=" * 70)
+    logger.info(f"As of year: {as_of_year}, window: {window_size} years")
+
+    timings = {}
+    started = time.perf_counter()
+
+    features = compute_tract_timeseries_features(window_size, as_of_year)
+    timings["timeseries"] = time.perf_counter() - started
+    if not features:
+        logger.error("No tract timeseries features computed")
+        return pd.DataFrame()
+
+    step = time.perf_counter()
+    scores = score_tract_layers(features)
+    timings["scoring"] = time.perf_counter() - step
+
+    step = time.perf_counter()
+    classifications = classify_tracts(scores, as_of_year)
+    timings["classification"] = time.perf_counter() - step
+    if classifications.empty:
+        logger.error("No tracts classified")
+        return classifications
+
+    if store:
+        step = time.perf_counter()
+        store_tract_outputs(features, scores, classifications, as_of_year)
+        timings["store"] = time.perf_counter() - step
+        log_refresh(
+            layer_name="tract_multiyear_pipeline",
+            data_source="layer*_tract",
+            status="success",
+            records_processed=len(classifications),
+            records_inserted=len(features) + len(scores) + len(classifications),
+            metadata={
+                "as_of_year": as_of_year,
+                "window_size": window_size,
+                "timings_seconds": {k: round(v, 3) for k, v in timings.items()},
+            },
+        )
+
+    logger.info(
+        f"✓ {len(classifications)} tracts classified from {len(features)} feature records "
+        f"in {time.perf_counter() - started:.2f}s "
+        f"({', '.join(f'{k}={v:.2f}s' for k, v in timings.items())})"
+    )
+    for grouping, count in classifications["final_grouping"].value_counts().items():
+        logger.info(f"  {grouping}: {count} tracts")
+
+    return classifications
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tract-level multi-year synthesis")
+    parser.add_argument("--year", type=int, default=2025, help="Reference year (default: 2025)")
+    parser.add_argument(
+        "--window", type=int, default=DEFAULT_WINDOW_SIZE, help="Years to look back"
+    )
+    parser.add_argument(
+        "--no-store", action="store_true", help="Compute without writing the *_tract tables"
+    )
+    args = parser.parse_args()
+
+    run_tract_pipeline(as_of_year=args.year, window_size=args.window, store=not args.no_store)
+
+
+if __name__ == "__main__":
+    main()
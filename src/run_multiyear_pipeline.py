@@ -3,39 +3,87 @@ Maryland Viability Atlas - Multi-Year Evidence Pipeline
 Orchestrates the complete pipeline from timeseries features to final synthesis
 
 Usage:
-    python src/run_multiyear_pipeline.py [--as-of-year 2021] [--skip-timeseries] [--skip-scoring]
+    python src/run_multiyear_pipeline.py [--as-of-year 2021] [--skip-timeseries] [--skip-scoring] [--in-memory]
+    python src/run_multiyear_pipeline.py --level tract [--year 2025]
 
 Steps:
     1. Compute timeseries features (level, momentum, stability)
     2. Compute layer summary scores (normalized 0-1)
     3. Classify counties (directional + confidence)
     4. Store final synthesis
+    5. Publish the API read model (pre-joined area/layer detail responses)
 
 All steps use multi-year evidence when available.
+
+By default each step stores its output and the next step reads it back from
+the database. With --in-memory the steps hand DataFrames to each other
+directly and all outputs are written at the end in a single transaction, so
+a failed run leaves the previous results untouched.
+
+With --level tract the same chain runs over census tracts
+(src/processing/tract_multiyear.py), always in memory, writing the *_tract
+tables in one transaction.
 """
 
 import argparse
 import sys
 from datetime import datetime
 from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
 
 # Ensure project root is on sys.path when running as a script
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from src.processing.timeseries_features import compute_all_timeseries_features
-from src.processing.multiyear_scoring import compute_all_layer_scores
+from config.database import get_db, log_refresh
+from src.processing.timeseries_features import (
+    compute_all_timeseries_features,
+    compute_timeseries_feature_records,
+    store_timeseries_features,
+)
+from src.processing.multiyear_scoring import (
+    compute_all_layer_scores,
+    store_layer_summary_scores,
+    timeseries_features_frame,
+)
 from src.processing.multiyear_classification import classify_all_counties, store_final_synthesis
+from src.processing.coverage import store_coverage_snapshot
+from src.processing.tract_multiyear import run_tract_pipeline
+from src.api.read_model import refresh_read_model
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
 
+def persist_outputs(
+    features: Optional[List[Dict]],
+    scores: Optional[pd.DataFrame],
+    classifications: pd.DataFrame
+):
+    """
+    Write in-memory pipeline outputs in one transaction.
+
+    Args:
+        features: Timeseries feature records (None = not recomputed)
+        scores: Layer summary scores (None = not recomputed)
+        classifications: Final synthesis classifications
+    """
+    with get_db() as db:
+        if features:
+            store_timeseries_features(features, db=db)
+        if scores is not None and not scores.empty:
+            store_layer_summary_scores(scores, db=db)
+        store_final_synthesis(classifications, db=db)
+
+
 def run_pipeline(
     as_of_year: int = 2025,
     skip_timeseries: bool = False,
-    skip_scoring: bool = False
+    skip_scoring: bool = False,
+    in_memory: bool = False
 ):
     """
     Run the complete multi-year evidence pipeline.
@@ -44,17 +92,35 @@ def run_pipeline(
         as_of_year: Reference year for analysis
         skip_timeseries: Skip timeseries computation (use existing)
         skip_scoring: Skip scoring computation (use existing)
+        in_memory: Pass results between steps in memory and store them all
+            in one transaction at the end
     """
     logger.info("=" * 80)
     logger.info("MARYLAND VIABILITY ATLAS - MULTI-YEAR EVIDENCE PIPELINE")
     logger.info("=" * 80)
     logger.info(f"As of year: {as_of_year}")
+    logger.info(f"Mode: {'in-memory' if in_memory else 'database'}")
     logger.info(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     logger.info("")
 
+    features = None
+    features_df = None
+    scores_df = None
+
     try:
         # STEP 1: Timeseries Features
-        if not skip_timeseries:
+        if not skip_timeseries and in_memory:
+            logger.info("─" * 80)
+            logger.info("STEP 1/3: Computing Timeseries Features")
+            logger.info("         (Level, Momentum, Stability)")
+            logger.info("─" * 80)
+            features = compute_timeseries_feature_records(
+                window_size=5,
+                as_of_year=as_of_year
+            )
+            features_df = timeseries_features_frame(features)
+            logger.info(f"✓ Step 1 complete: {len(features)} feature records computed\n")
+        elif not skip_timeseries:
             logger.info("─" * 80)
             logger.info("STEP 1/3: Computing Timeseries Features")
             logger.info("         (Level, Momentum, Stability)")
@@ -73,7 +139,11 @@ def run_pipeline(
             logger.info("STEP 2/3: Computing Layer Summary Scores")
             logger.info("         (Normalized 0-1 with Composition)")
             logger.info("─" * 80)
-            scores_df = compute_all_layer_scores(as_of_year=as_of_year)
+            scores_df = compute_all_layer_scores(
+                as_of_year=as_of_year,
+                features=features_df,
+                store=not in_memory
+            )
             logger.info(f"✓ Step 2 complete: {len(scores_df)} layer scores computed\n")
         else:
             logger.info("⏭  Skipping scoring computation (using existing)\n")
@@ -83,15 +153,48 @@ def run_pipeline(
         logger.info("STEP 3/3: Classifying Counties & Computing Final Synthesis")
         logger.info("         (Directional + Confidence + Grouping)")
         logger.info("─" * 80)
-        classifications_df = classify_all_counties(as_of_year=as_of_year)
+        classifications_df = classify_all_counties(
+            as_of_year=as_of_year,
+            scores=scores_df if in_memory else None
+        )
 
-        if not classifications_df.empty:
-            store_final_synthesis(classifications_df)
-            logger.info(f"✓ Step 3 complete: {len(classifications_df)} counties classified\n")
-        else:
+        if classifications_df.empty:
             logger.error("✗ Step 3 failed: No classifications generated\n")
             return False
 
+        if in_memory:
+            persist_outputs(features, scores_df, classifications_df)
+            log_refresh(
+                layer_name="multiyear_pipeline",
+                data_source="in_memory",
+                status="success",
+                records_processed=len(classifications_df),
+                records_inserted=(
+                    len(features or [])
+                    + (0 if scores_df is None else len(scores_df))
+                    + len(classifications_df)
+                ),
+                metadata={"as_of_year": as_of_year}
+            )
+            logger.info("✓ All pipeline outputs stored in one transaction")
+        else:
+            store_final_synthesis(classifications_df)
+        logger.info(f"✓ Step 3 complete: {len(classifications_df)} counties classified\n")
+
+        # STEP 4: API read model (derived; the API falls back to live queries without it)
+        try:
+            read_rows = refresh_read_model()
+            logger.info(f"✓ API read model published: {read_rows} rows\n")
+        except Exception as e:
+            logger.warning(f"API read model refresh failed; API will use live queries: {e}\n")
+
+        # STEP 5: Feature coverage snapshot (served by /metadata/coverage)
+        try:
+            store_coverage_snapshot()
+            logger.info("✓ Feature coverage snapshot stored\n")
+        except Exception as e:
+            logger.warning(f"Feature coverage snapshot failed: {e}\n")
+
         # SUMMARY
         logger.info("=" * 80)
         logger.info("PIPELINE COMPLETE")
@@ -148,14 +251,29 @@ def main():
         action='store_true',
         help='Skip scoring computation (use existing scores)'
     )
+    parser.add_argument(
+        '--in-memory',
+        action='store_true',
+        help='Pass results between steps in memory and store them in one transaction'
+    )
+    parser.add_argument(
+        '--level',
+        choices=['county', 'tract'],
+        default='county',
+        help='Geography level (default: county)'
+    )
 
     args = parser.parse_args()
 
-    success = run_pipeline(
-        as_of_year=args.year,
-        skip_timeseries=args.skip_timeseries,
-        skip_scoring=args.skip_scoring
-    )
+    if args.level == 'tract':
+        success = not run_tract_pipeline(as_of_year=args.year).empty
+    else:
+        success = run_pipeline(
+            as_of_year=args.year,
+            skip_timeseries=args.skip_timeseries,
+            skip_scoring=args.skip_scoring,
+            in_memory=args.in_memory
+        )
 
     sys.exit(0 if success else 1)
 
@@ -86,6 +86,12 @@ def main():
         help="Skip GeoJSON export after pipeline"
     )
 
+    parser.add_argument(
+        "--tracts",
+        action="store_true",
+        help="Also export multi-resolution tract-level GeoJSON"
+    )
+
     args = parser.parse_args()
 
     start_time = datetime.now()
@@ -121,10 +127,17 @@ def main():
             logger.info("=" * 60)
 
             result = run_geojson_export(level="county", versioned=True)
-            logger.info(
-                f"Export complete: {result['record_count']} features, "
-                f"output: {result['latest_path']}"
-            )
+            if result.get("skipped"):
+                logger.info(f"Export inputs unchanged; kept {result['latest_path']}")
+            else:
+                logger.info(
+                    f"Export complete: {result['record_count']} features, "
+                    f"output: {result['latest_path']}"
+                )
+
+            if args.tracts:
+                tract_result = run_geojson_export(level="tract", versioned=True)
+                logger.info(f"Tract export complete: {tract_result['record_count']} features")
 
         end_time = datetime.now()
         duration = (end_time - start_time).total_seconds()
@@ -3,17 +3,29 @@ Maryland Viability Atlas - Data Source Utilities
 Helper functions for accessing open data APIs with rate limiting
 """
 
-import requests
+import httpx
 import io
+import os
+import gzip
+import json
+import math
 import time
 import random
-import logging
+import shutil
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from datetime import datetime
+from pathlib import Path
 import pandas as pd
-from typing import Optional, Dict, Any, Tuple, List
-from functools import wraps
+from typing import Optional, Dict, Any, Tuple, List, Callable, Iterable, Sequence, Union
 from config.settings import get_settings
 from src.utils.logging import get_logger
+from src.utils.rate_limit import RateLimiter, host_limiter
+from src.utils.http_client import HTTPError, NO_RETRY, RequestSpec, get_http_client
+from src.utils.downloads import DownloadEngine, DownloadError
 
 logger = get_logger(__name__)
 settings = get_settings()
@@ -30,29 +42,19 @@ def attach_source_metadata(df: pd.DataFrame, source_url: str) -> pd.DataFrame:
     return df
 
 
-class RateLimiter:
-    """Simple rate limiter for API requests"""
-
-    def __init__(self, calls_per_minute: int):
-        self.calls_per_minute = calls_per_minute
-        self.min_interval = 60.0 / calls_per_minute
-        self.last_call = 0
-
-    def __call__(self, func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            elapsed = time.time() - self.last_call
-            if elapsed < self.min_interval:
-                time.sleep(self.min_interval - elapsed)
-            self.last_call = time.time()
-            return func(*args, **kwargs)
-        return wrapper
-
-
-# Rate limiters for different APIs
-census_limiter = RateLimiter(settings.CENSUS_API_RATE_LIMIT)
-bls_limiter = RateLimiter(settings.BLS_API_RATE_LIMIT)
-usaspending_limiter = RateLimiter(settings.USASPENDING_RATE_LIMIT)
+# Rate limiters for different APIs (shared across processes when RATE_LIMIT_STATE_PATH is set)
+census_limiter = RateLimiter(
+    settings.CENSUS_API_RATE_LIMIT, burst=settings.CENSUS_API_BURST,
+    name="census", state_path=settings.RATE_LIMIT_STATE_PATH,
+)
+bls_limiter = RateLimiter(
+    settings.BLS_API_RATE_LIMIT, burst=settings.BLS_API_BURST,
+    name="bls", state_path=settings.RATE_LIMIT_STATE_PATH,
+)
+usaspending_limiter = RateLimiter(
+    settings.USASPENDING_RATE_LIMIT, burst=settings.USASPENDING_BURST,
+    name="usaspending", state_path=settings.RATE_LIMIT_STATE_PATH,
+)
 
 
 @census_limiter
@@ -93,7 +95,8 @@ def fetch_census_data(
     logger.info(f"Fetching Census data: {dataset} ({year}), variables: {len(variables)}")
 
     try:
-        response = requests.get(url, params=params, timeout=30)
+        response = get_http_client().get(url, params=params, timeout=30)
+        census_limiter.record_response(response)
         response.raise_for_status()
 
         data = response.json()
@@ -104,12 +107,12 @@ def fetch_census_data(
 
         # First row is headers
         df = pd.DataFrame(data[1:], columns=data[0])
-        df = attach_source_metadata(df, response.url)
+        df = attach_source_metadata(df, str(response.url))
 
         logger.info(f"Fetched {len(df)} records from Census API")
         return df
 
-    except requests.exceptions.RequestException as e:
+    except HTTPError as e:
         logger.error(f"Census API request failed: {e}")
         raise
 
@@ -145,18 +148,19 @@ def fetch_bls_qcew(
         logger.info(f"Fetching BLS QCEW: {year} Q{quarter}, area 24{area_code}")
 
         try:
-            # Use requests with explicit timeout instead of pd.read_csv(url) which can hang
-            response = requests.get(url, timeout=60)
+            # Use the HTTP client with explicit timeout instead of pd.read_csv(url) which can hang
+            response = get_http_client().get(url, timeout=60)
+            bls_limiter.record_response(response)
             if response.status_code == 404 and year > 2000:
                 fallback_url = f"https://data.bls.gov/cew/data/api/{year - 1}/{quarter}/area/24{area_code}.csv"
                 logger.warning(f"QCEW {year} Q{quarter} not found; trying {year - 1} Q{quarter}")
-                response = requests.get(fallback_url, timeout=60)
+                response = get_http_client().get(fallback_url, timeout=60)
             response.raise_for_status()
             df = pd.read_csv(io.StringIO(response.text))
             all_data.append(df)
             time.sleep(0.5)  # Be respectful even with rate limiter
 
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             logger.warning(f"Timeout fetching QCEW for area 24{area_code} (60s limit)")
             continue
         except Exception as e:
@@ -207,7 +211,8 @@ def fetch_usaspending_county(
     logger.info(f"Fetching USASpending data: {start_date} to {end_date}")
 
     try:
-        response = requests.post(url, json=payload, timeout=60)
+        response = get_http_client().post(url, json=payload, timeout=60)
+        usaspending_limiter.record_response(response)
         response.raise_for_status()
 
         data = response.json()
@@ -221,7 +226,7 @@ def fetch_usaspending_county(
         logger.info(f"Fetched {len(df)} USASpending records")
         return df
 
-    except requests.exceptions.RequestException as e:
+    except HTTPError as e:
         logger.error(f"USASpending API request failed: {e}")
         raise
 
@@ -260,138 +265,175 @@ class FEMAAPIError(RuntimeError):
     """Raised when FEMA NFHL API fails after retries."""
 
 
-def fetch_fema_nfhl(
-    state_fips: str = "MD",
-    geometry: Optional[Tuple[float, float, float, float]] = None,
-    max_attempts: int = 10
-):
-    """
-    Fetch FEMA National Flood Hazard Layer (NFHL) flood hazard polygons.
+NFHL_WFS_URL = "https://hazards.fema.gov/arcgis/services/public/NFHL/MapServer/WFSServer"
+NFHL_OUT_FIELDS = "OBJECTID,SFHA_TF,FLD_ZONE,ZONE_SUBTY"
 
-    Endpoint (2026): https://hazards.fema.gov/arcgis/rest/services/public/NFHL/MapServer/28/query
-    Deprecated: https://hazards.fema.gov/gis/nfhl/... (no longer valid)
+Tile = Tuple[int, int]
+BBox = Tuple[float, float, float, float]
 
-    Args:
-        state_fips: State abbreviation (e.g., "MD") or FIPS (unused if geometry is provided).
-        geometry: (minx, miny, maxx, maxy) envelope in WGS84 (EPSG:4326).
 
-    Returns:
-        GeoDataFrame with NFHL features (can be empty).
+def _write_json_atomic(path: Path, payload: Any) -> None:
+    """Write JSON next to ``path`` and rename into place so readers never see partial files."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, path)
 
-    Example:
-        md_bbox = (-79.487651, 37.911717, -75.048939, 39.723043)
-        gdf = fetch_fema_nfhl("MD", geometry=md_bbox)
 
-    Note:
-        If the API fails persistently, download the NFHL geodatabase from FEMA MSC
-        and ingest locally: https://msc.fema.gov/portal/search
+class NFHLTileFetcher:
     """
-    import geopandas as gpd
+    Concurrent, cache-backed fetcher for FEMA NFHL flood hazard polygons.
 
-    local_logger = logging.getLogger(__name__)
-    session = requests.Session()
-    base_url = "https://hazards.fema.gov/arcgis/rest/services/public/NFHL/MapServer/28/query"
-
-    base_params = {
-        "outFields": "OBJECTID,SFHA_TF,FLD_ZONE,ZONE_SUBTY",
-        "returnGeometry": "true",
-        "outSR": 4326,
-        "f": "geojson",
-        "resultRecordCount": 500,
-        "where": "1=1"
-    }
+    Bounding boxes are snapped to a fixed lon/lat grid so neighbouring counties
+    resolve to the same tiles; each tile is downloaded at most once and stored
+    under ``cache_dir/layer<id>/``. Tiles older than ``max_age_days`` (default
+    FEMA_NFHL_TILE_MAX_AGE_DAYS) are downloaded again so map revisions are
+    picked up. Pages are checkpointed as they arrive, so an interrupted run
+    resumes from the last completed page instead of restarting.
+
+    Example:
+        fetcher = NFHLTileFetcher(max_workers=4)
+        features_by_county = fetcher.fetch_bboxes({"24001": (-79.5, 39.3, -78.3, 39.7)})
+    """
+
+    def __init__(
+        self,
+        service_url: Optional[str] = None,
+        layer_id: int = 28,
+        cache_dir: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        calls_per_minute: Optional[int] = None,
+        grid_size: float = 0.5,
+        page_size: int = 500,
+        max_attempts: int = 4,
+        timeout: int = 60,
+        backoff_base: float = 4.0,
+        max_backoff: float = 120.0,
+        wfs_url: Optional[str] = NFHL_WFS_URL,
+        out_fields: str = NFHL_OUT_FIELDS,
+        max_age_days: Optional[float] = None,
+    ):
+        self.service_url = (service_url or settings.FEMA_NFHL_URL).rstrip("/")
+        self.layer_id = layer_id
+        self.query_url = f"{self.service_url}/{layer_id}/query"
+        self.cache_dir = Path(cache_dir or settings.FEMA_NFHL_TILE_CACHE_DIR) / f"layer{layer_id}"
+        self.max_workers = max(1, max_workers or settings.FEMA_NFHL_MAX_WORKERS)
+        self.calls_per_minute = calls_per_minute or settings.FEMA_NFHL_RATE_LIMIT
+        self.grid_size = grid_size
+        self.page_size = page_size
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self.wfs_url = wfs_url
+        self.out_fields = out_fields
+        self.max_age_days = (
+            settings.FEMA_NFHL_TILE_MAX_AGE_DAYS if max_age_days is None else max_age_days
+        )
+        self.stats = {"cache_hits": 0, "tiles_fetched": 0, "requests": 0, "wfs_fallbacks": 0}
+        self._stats_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Tiling
+    # ------------------------------------------------------------------
+
+    def tiles_for_bbox(self, bbox: BBox) -> List[Tile]:
+        """Return grid tiles (column, row) covering a WGS84 bounding box."""
+        minx, miny, maxx, maxy = bbox
+        g = self.grid_size
+        x0, x1 = math.floor(minx / g), math.ceil(maxx / g)
+        y0, y1 = math.floor(miny / g), math.ceil(maxy / g)
+        return [(ix, iy) for ix in range(x0, max(x1, x0 + 1)) for iy in range(y0, max(y1, y0 + 1))]
+
+    def tile_bbox(self, tile: Tile) -> BBox:
+        ix, iy = tile
+        g = self.grid_size
+        return (ix * g, iy * g, (ix + 1) * g, (iy + 1) * g)
+
+    def _tile_path(self, tile: Tile) -> Path:
+        return self.cache_dir / f"g{self.grid_size:g}_{tile[0]}_{tile[1]}.json"
 
-    def _request_with_retries(params: Dict[str, Any]) -> Dict[str, Any]:
+    def _page_dir(self, tile: Tile) -> Path:
+        return self.cache_dir / f"g{self.grid_size:g}_{tile[0]}_{tile[1]}.pages"
+
+    def is_cached(self, tile: Tile) -> bool:
+        """True if the tile is on disk and younger than ``max_age_days``."""
+        path = self._tile_path(tile)
+        try:
+            age_days = (time.time() - path.stat().st_mtime) / 86400
+        except OSError:
+            return False
+        if age_days > self.max_age_days:
+            logger.info(f"Cached NFHL tile {tile} is {age_days:.0f} days old; refetching")
+            return False
+        return True
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[key] += n
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.max_backoff, self.backoff_base ** attempt)
+        return delay * random.uniform(1.0, 1.25)
+
+    def _get_json(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        limiter = host_limiter(url, self.calls_per_minute, state_path=settings.RATE_LIMIT_STATE_PATH)
         last_error: Optional[Exception] = None
-        for attempt in range(1, max_attempts + 1):
+        for attempt in range(1, self.max_attempts + 1):
+            limiter.acquire()
+            self._count("requests")
             try:
-                local_logger.info(f"FEMA NFHL request attempt {attempt} offset={params.get('resultOffset')}")
-                response = session.get(base_url, params=params, timeout=60)
-                local_logger.info(f"FEMA NFHL response status: {response.status_code}")
+                # Tile-level retries below own the policy, so the client sends once
+                response = get_http_client().get(url, params=params, timeout=self.timeout, retry=NO_RETRY)
+                limiter.record_response(response)
                 response.raise_for_status()
                 data = response.json()
                 if "error" in data:
                     raise RuntimeError(data["error"])
                 return data
-            except (requests.exceptions.HTTPError,
-                    requests.exceptions.ConnectionError,
-                    requests.exceptions.Timeout,
-                    requests.exceptions.ReadTimeout) as e:
+            except httpx.HTTPStatusError as e:
                 last_error = e
-                code = getattr(e.response, "status_code", None) if hasattr(e, "response") else None
-                if code not in (500, 429, None) and attempt >= 2:
+                code = getattr(e.response, "status_code", None)
+                if code not in (429, 500, 502, 503, 504, None):
                     break
-                sleep_for = min(120, (4 ** attempt)) + random.uniform(0, 10)
-                local_logger.warning(f"FEMA NFHL error on attempt {attempt}: {e}. Retrying in {sleep_for:.1f}s")
-                time.sleep(sleep_for)
-            except Exception as e:
+            except (HTTPError, ValueError, RuntimeError) as e:
                 last_error = e
-                sleep_for = min(120, (4 ** attempt)) + random.uniform(0, 10)
-                local_logger.warning(f"FEMA NFHL parse error on attempt {attempt}: {e}. Retrying in {sleep_for:.1f}s")
+            if attempt < self.max_attempts:
+                sleep_for = self._backoff(attempt)
+                logger.warning(f"FEMA NFHL error on attempt {attempt}: {last_error}. Retrying in {sleep_for:.1f}s")
                 time.sleep(sleep_for)
 
         raise FEMAAPIError(f"FEMA NFHL API failed after retries: {last_error}")
 
-    def _fetch_bbox_features(bbox: Tuple[float, float, float, float]) -> List[Dict[str, Any]]:
+    def _query_params(self, bbox: BBox, offset: int, count: int) -> Dict[str, Any]:
         minx, miny, maxx, maxy = bbox
-        params = dict(base_params)
-        params.update({
+        return {
+            "where": "1=1",
+            "outFields": self.out_fields,
+            "returnGeometry": "true",
+            "outSR": 4326,
+            "f": "geojson",
             "geometry": f"{minx},{miny},{maxx},{maxy}",
             "geometryType": "esriGeometryEnvelope",
             "spatialRel": "esriSpatialRelIntersects",
-            "inSR": 4326
-        })
-
-        all_features: List[Dict[str, Any]] = []
-        offset = 0
-        while True:
-            params["resultOffset"] = offset
-            data = _request_with_retries(params)
-            features = data.get("features", [])
-            if not features:
-                break
-            all_features.extend(features)
-            local_logger.info(f"Fetched {len(features)} features (offset {offset})")
-            if len(features) < base_params["resultRecordCount"]:
-                break
-            offset += base_params["resultRecordCount"]
-        return all_features
+            "inSR": 4326,
+            "resultOffset": offset,
+            "resultRecordCount": count,
+        }
 
-    def _split_bbox(bbox: Tuple[float, float, float, float], grid_size: float = 0.5) -> List[Tuple[float, float, float, float]]:
+    def precheck(self, bbox: BBox) -> None:
+        """Issue a single tiny query to fail fast when the service is down."""
         minx, miny, maxx, maxy = bbox
-        tiles = []
-        x = minx
-        while x < maxx:
-            y = miny
-            x2 = min(x + grid_size, maxx)
-            while y < maxy:
-                y2 = min(y + grid_size, maxy)
-                tiles.append((x, y, x2, y2))
-                y = y2
-            x = x2
-        return tiles
-
-    def _precheck_service() -> None:
-        if geometry is None:
-            return
-        minx, miny, maxx, maxy = geometry
-        cx = (minx + maxx) / 2
-        cy = (miny + maxy) / 2
-        test_bbox = (cx - 0.01, cy - 0.01, cx + 0.01, cy + 0.01)
-        params = dict(base_params)
-        params.update({
-            "geometry": f"{test_bbox[0]},{test_bbox[1]},{test_bbox[2]},{test_bbox[3]}",
-            "geometryType": "esriGeometryEnvelope",
-            "spatialRel": "esriSpatialRelIntersects",
-            "inSR": 4326,
-            "resultRecordCount": 1,
-            "resultOffset": 0
-        })
-        _request_with_retries(params)
+        cx, cy = (minx + maxx) / 2, (miny + maxy) / 2
+        self._get_json(self.query_url, self._query_params((cx - 0.01, cy - 0.01, cx + 0.01, cy + 0.01), 0, 1))
 
-    def _fetch_wfs(bbox: Tuple[float, float, float, float]) -> List[Dict[str, Any]]:
+    def _fetch_wfs(self, bbox: BBox) -> List[Dict[str, Any]]:
         minx, miny, maxx, maxy = bbox
-        wfs_url = "https://hazards.fema.gov/arcgis/services/public/NFHL/MapServer/WFSServer"
         params = {
             "SERVICE": "WFS",
             "REQUEST": "GetFeature",
@@ -402,51 +444,245 @@ def fetch_fema_nfhl(
             "MAXFEATURES": 1000
         }
         try:
-            resp = session.get(wfs_url, params=params, timeout=60)
+            limiter = host_limiter(self.wfs_url, self.calls_per_minute, state_path=settings.RATE_LIMIT_STATE_PATH)
+            limiter.acquire()
+            resp = get_http_client().get(self.wfs_url, params=params, timeout=self.timeout, retry=NO_RETRY)
+            limiter.record_response(resp)
             resp.raise_for_status()
-            data = resp.json()
-            return data.get("features", [])
+            return resp.json().get("features", [])
         except Exception as e:
-            local_logger.warning(f"WFS fallback failed: {e}")
+            logger.warning(f"WFS fallback failed: {e}")
             return []
 
+    # ------------------------------------------------------------------
+    # Tile fetching
+    # ------------------------------------------------------------------
+
+    def _fetch_tile(self, tile: Tile) -> List[Dict[str, Any]]:
+        """Page through one tile, reusing checkpointed pages from an interrupted run."""
+        bbox = self.tile_bbox(tile)
+        page_dir = self._page_dir(tile)
+        features: List[Dict[str, Any]] = []
+        offset = 0
+        while True:
+            page_path = page_dir / f"{offset:08d}.json"
+            if page_path.exists():
+                with open(page_path) as f:
+                    page = json.load(f)
+            else:
+                data = self._get_json(self.query_url, self._query_params(bbox, offset, self.page_size))
+                page = data.get("features", [])
+                _write_json_atomic(page_path, page)
+            features.extend(page)
+            if len(page) < self.page_size:
+                break
+            offset += self.page_size
+
+        _write_json_atomic(self._tile_path(tile), {
+            "layer_id": self.layer_id,
+            "tile": list(tile),
+            "bbox": list(bbox),
+            "fetched_at": datetime.utcnow().isoformat(),
+            "features": features,
+        })
+        shutil.rmtree(page_dir, ignore_errors=True)
+        self._count("tiles_fetched")
+        logger.info(f"Fetched NFHL tile {tile}: {len(features)} features")
+        return features
+
+    def _load_tile(self, tile: Tile) -> List[Dict[str, Any]]:
+        with open(self._tile_path(tile)) as f:
+            return json.load(f).get("features", [])
+
+    def fetch_tiles(self, tiles: List[Tile]) -> Dict[Tile, List[Dict[str, Any]]]:
+        """
+        Fetch features for a set of tiles, downloading only tiles not already cached.
+
+        Tiles whose REST query fails after retries fall back to the WFS endpoint;
+        fallback results are returned but not cached so a later run retries REST.
+        """
+        unique_tiles = list(dict.fromkeys(tiles))
+        results: Dict[Tile, List[Dict[str, Any]]] = {}
+        missing = []
+        for tile in unique_tiles:
+            if self.is_cached(tile):
+                results[tile] = self._load_tile(tile)
+                self._count("cache_hits")
+            else:
+                missing.append(tile)
+
+        if not missing:
+            return results
+
+        logger.info(
+            f"Fetching {len(missing)} NFHL tiles ({len(results)} cached) "
+            f"with {self.max_workers} workers"
+        )
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self._fetch_tile, tile): tile for tile in missing}
+            for future in as_completed(futures):
+                tile = futures[future]
+                try:
+                    results[tile] = future.result()
+                except FEMAAPIError as e:
+                    logger.warning(f"REST tile failed {tile}: {e}")
+                    results[tile] = self._fetch_wfs(self.tile_bbox(tile)) if self.wfs_url else []
+                    self._count("wfs_fallbacks")
+        return results
+
+    def fetch_bboxes(self, bboxes: Dict[str, BBox]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Fetch features for several bounding boxes, downloading shared tiles once.
+
+        Returns features from every tile covering each bbox, de-duplicated by
+        OBJECTID; callers clip to their own geometry.
+        """
+        tiles_by_key = {key: self.tiles_for_bbox(bbox) for key, bbox in bboxes.items()}
+        all_tiles = [tile for tiles in tiles_by_key.values() for tile in tiles]
+        tile_features = self.fetch_tiles(all_tiles)
+        return {
+            key: _dedupe_features(f for tile in tiles for f in tile_features.get(tile, []))
+            for key, tiles in tiles_by_key.items()
+        }
+
+
+def _dedupe_features(features) -> List[Dict[str, Any]]:
+    """Drop polygons repeated across tile boundaries (same OBJECTID)."""
+    seen = set()
+    unique = []
+    for feature in features:
+        props = feature.get("properties") or {}
+        object_id = props.get("OBJECTID", feature.get("id"))
+        if object_id is not None:
+            if object_id in seen:
+                continue
+            seen.add(object_id)
+        unique.append(feature)
+    return unique
+
+
+def fetch_fema_nfhl(
+    state_fips: str = "MD",
+    geometry: Optional[Tuple[float, float, float, float]] = None,
+    max_attempts: int = 10,
+    fetcher: Optional[NFHLTileFetcher] = None
+):
+    """
+    Fetch FEMA National Flood Hazard Layer (NFHL) flood hazard polygons.
+
+    Endpoint (2026): https://hazards.fema.gov/arcgis/rest/services/public/NFHL/MapServer/28/query
+    Deprecated: https://hazards.fema.gov/gis/nfhl/... (no longer valid)
+
+    Args:
+        state_fips: State abbreviation (e.g., "MD") or FIPS (unused if geometry is provided).
+        geometry: (minx, miny, maxx, maxy) envelope in WGS84 (EPSG:4326).
+        max_attempts: Retries per request when no fetcher is supplied.
+        fetcher: Optional shared NFHLTileFetcher (reuses its tile cache and workers).
+
+    Returns:
+        GeoDataFrame with NFHL features (can be empty).
+
+    Example:
+        md_bbox = (-79.487651, 37.911717, -75.048939, 39.723043)
+        gdf = fetch_fema_nfhl("MD", geometry=md_bbox)
+
+    Note:
+        If the API fails persistently, download the NFHL geodatabase from FEMA MSC
+        and ingest locally: https://msc.fema.gov/portal/search
+    """
+    import geopandas as gpd
+
     if geometry is None:
-        local_logger.warning("No geometry provided; returning empty GeoDataFrame")
+        logger.warning("No geometry provided; returning empty GeoDataFrame")
         return gpd.GeoDataFrame(geometry=[], crs="EPSG:4326")
 
-    # Pre-check service responsiveness
-    try:
-        _precheck_service()
-    except FEMAAPIError as e:
-        local_logger.error(f"FEMA NFHL service precheck failed: {e}")
-        return gpd.GeoDataFrame(geometry=[], crs="EPSG:4326")
+    fetcher = fetcher or NFHLTileFetcher(max_attempts=max_attempts)
 
-    # Tiling for large bboxes
-    minx, miny, maxx, maxy = geometry
-    width = maxx - minx
-    height = maxy - miny
-    tiles = [geometry]
-    if width > 0.5 or height > 0.5:
-        tiles = _split_bbox(geometry, grid_size=0.5)
-
-    all_features: List[Dict[str, Any]] = []
-    for bbox in tiles:
+    # Pre-check service responsiveness (skipped when every tile is cached)
+    if not all(fetcher.is_cached(tile) for tile in fetcher.tiles_for_bbox(geometry)):
         try:
-            all_features.extend(_fetch_bbox_features(bbox))
+            fetcher.precheck(geometry)
         except FEMAAPIError as e:
-            local_logger.warning(f"REST tile failed {bbox}: {e}")
-            all_features.extend(_fetch_wfs(bbox))
+            logger.error(f"FEMA NFHL service precheck failed: {e}")
+            return gpd.GeoDataFrame(geometry=[], crs="EPSG:4326")
+
+    all_features = fetcher.fetch_bboxes({"bbox": geometry})["bbox"]
 
     if not all_features:
-        local_logger.warning("No FEMA NFHL features returned")
+        logger.warning("No FEMA NFHL features returned")
         return gpd.GeoDataFrame(geometry=[], crs="EPSG:4326")
 
-    local_logger.info(f"Total FEMA NFHL features fetched: {len(all_features)}")
+    logger.info(f"Total FEMA NFHL features fetched: {len(all_features)}")
     gdf = gpd.GeoDataFrame.from_features(all_features, crs="EPSG:4326")
-    gdf = attach_source_metadata(gdf, base_url)
+    # Grid tiles overhang the requested envelope; keep only intersecting polygons
+    minx, miny, maxx, maxy = geometry
+    gdf = gdf.cx[minx:maxx, miny:maxy]
+    gdf = attach_source_metadata(gdf, fetcher.query_url)
     return gdf
 
 
+def fetch_arcgis_features(
+    query_url: str,
+    params: Dict[str, Any],
+    page_size: int = 2000,
+    timeout: int = 120,
+    max_pages: int = 200,
+) -> List[Dict[str, Any]]:
+    """
+    Page through an ArcGIS REST query endpoint, fetching pages concurrently.
+
+    The first page reveals the server's effective page size (services cap
+    ``resultRecordCount`` at their maxRecordCount); the match count then lets
+    every remaining page be requested at once. Services that refuse
+    ``returnCountOnly`` are paged sequentially.
+
+    Returns:
+        Features in server order
+    """
+    client = get_http_client()
+
+    def page_params(offset: int, count: int) -> Dict[str, Any]:
+        return {**params, "resultOffset": offset, "resultRecordCount": count}
+
+    resp = client.get(query_url, params=page_params(0, page_size), timeout=timeout)
+    resp.raise_for_status()
+    data = resp.json()
+    features = list(data.get("features", []))
+    if not features or (not data.get("exceededTransferLimit") and len(features) < page_size):
+        return features
+
+    step = len(features)
+    total = None
+    try:
+        count_resp = client.get(query_url, params={**params, "returnCountOnly": "true"}, timeout=timeout)
+        if count_resp.status_code == 200:
+            total = count_resp.json().get("count")
+    except (HTTPError, ValueError):
+        total = None
+
+    if isinstance(total, int):
+        offsets = list(range(step, min(total, step * max_pages), step))
+        results = client.fan_out([RequestSpec(query_url, params=page_params(o, step), timeout=timeout) for o in offsets])
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+            result.raise_for_status()
+            features.extend(result.json().get("features", []))
+        return features
+
+    offset = step
+    for _ in range(max_pages - 1):
+        resp = client.get(query_url, params=page_params(offset, step), timeout=timeout)
+        resp.raise_for_status()
+        data = resp.json()
+        page = data.get("features", [])
+        features.extend(page)
+        if not page or (not data.get("exceededTransferLimit") and len(page) < step):
+            break
+        offset += step
+    return features
+
+
 def fetch_irs_migration(year_range: str = "2122") -> pd.DataFrame:
     """
     Fetch IRS county-to-county migration data.
@@ -472,30 +708,279 @@ def fetch_irs_migration(year_range: str = "2122") -> pd.DataFrame:
         raise
 
 
-def _read_csv_from_bytes(content: bytes, dtype: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
-    import io
-    import zipfile
+# =============================================================================
+# STREAMING STATE-FILTERED CSV READER
+# =============================================================================
 
-    buffer = io.BytesIO(content)
-    if zipfile.is_zipfile(buffer):
-        buffer.seek(0)
-        with zipfile.ZipFile(buffer) as zf:
-            csv_candidates = [f for f in zf.namelist() if f.lower().endswith('.csv')]
-            if not csv_candidates:
-                raise ValueError("EJScreen zip did not contain a CSV file")
-            with zf.open(csv_candidates[0]) as f:
-                content = f.read()
-            try:
-                return pd.read_csv(io.BytesIO(content), dtype=dtype)
-            except Exception:
-                return pd.read_csv(io.BytesIO(content))
+CsvSource = Union[str, Path, bytes]
+MD_STATE_VALUES = frozenset({"MD", "24", "24.0", "MARYLAND"})
+
+
+class StateRowFilter:
+    """
+    Chunk predicate keeping the rows of one state.
 
-    buffer.seek(0)
+    Columns are resolved case-insensitively against the file header on the
+    first chunk. A value column (state abbreviation/name/FIPS) is preferred;
+    otherwise rows are kept when a GEOID-style column starts with ``prefix``.
+    When no candidate column exists every row is kept and a warning is logged,
+    so downstream filters still apply.
+    """
+
+    def __init__(
+        self,
+        values: Iterable[str] = MD_STATE_VALUES,
+        value_columns: Sequence[str] = (),
+        prefix: Optional[str] = None,
+        prefix_columns: Sequence[str] = (),
+        width: int = 0,
+    ):
+        self.values = {str(v).upper() for v in values}
+        self.value_columns = list(value_columns)
+        self.prefix = prefix
+        self.prefix_columns = list(prefix_columns)
+        self.width = width
+        self.column: Optional[str] = None
+        self.mode: Optional[str] = None
+
+    @property
+    def bound(self) -> bool:
+        """True once a filter column was found, i.e. rows were actually filtered."""
+        return self.mode in ("value", "prefix")
+
+    def wants(self, name: str) -> bool:
+        """True if ``name`` is a candidate filter column (used to keep it during column pruning)."""
+        key = name.strip().upper()
+        return key in {c.upper() for c in self.value_columns + self.prefix_columns}
+
+    def bind(self, columns: Sequence[str]) -> None:
+        lookup = {c.strip().upper(): c for c in columns}
+        for cand in self.value_columns:
+            if cand.upper() in lookup:
+                self.column, self.mode = lookup[cand.upper()], "value"
+                return
+        if self.prefix:
+            for cand in self.prefix_columns:
+                if cand.upper() in lookup:
+                    self.column, self.mode = lookup[cand.upper()], "prefix"
+                    return
+        self.column, self.mode = None, "all"
+        logger.warning(f"No state filter column among {self.value_columns + self.prefix_columns}; keeping all rows")
+
+    def __call__(self, chunk: pd.DataFrame) -> pd.Series:
+        if self.mode is None:
+            self.bind(list(chunk.columns))
+        if self.mode == "all":
+            return pd.Series(True, index=chunk.index)
+        values = chunk[self.column].astype(str).str.strip()
+        if self.mode == "value":
+            return values.str.upper().isin(self.values)
+        if self.width:
+            values = values.str.zfill(self.width)
+        return values.str.startswith(self.prefix)
+
+
+def maryland_row_filter(
+    value_columns: Sequence[str] = (),
+    prefix_columns: Sequence[str] = (),
+    width: int = 0,
+) -> StateRowFilter:
+    """Build a StateRowFilter for Maryland (abbreviation, name or FIPS 24)."""
+    return StateRowFilter(
+        values=MD_STATE_VALUES,
+        value_columns=value_columns,
+        prefix=settings.MD_STATE_FIPS,
+        prefix_columns=prefix_columns,
+        width=width,
+    )
+
+
+def _pick_zip_member(names: List[str], member_hints: Sequence[Union[str, Tuple[str, ...]]]) -> str:
+    candidates = [n for n in names if n.lower().endswith((".csv", ".txt"))]
+    if not candidates:
+        raise ValueError("Archive did not contain a CSV/TXT file")
+    for hint in member_hints:
+        parts = (hint,) if isinstance(hint, str) else hint
+        for name in candidates:
+            if all(p.lower() in name.lower() for p in parts):
+                return name
+    return candidates[0]
+
+
+@contextmanager
+def _open_csv_stream(source: CsvSource, member_hints: Sequence[Union[str, Tuple[str, ...]]] = ()):
+    """Yield a binary handle over a plain, gzip or zipped CSV without loading it into memory."""
+    if isinstance(source, (bytes, bytearray)):
+        raw = io.BytesIO(source)
+    else:
+        raw = open(source, "rb")
     try:
-        return pd.read_csv(buffer, dtype=dtype)
-    except Exception:
-        buffer.seek(0)
-        return pd.read_csv(buffer)
+        if zipfile.is_zipfile(raw):
+            raw.seek(0)
+            with zipfile.ZipFile(raw) as zf:
+                member = _pick_zip_member(zf.namelist(), member_hints)
+                with zf.open(member) as fh:
+                    yield fh
+            return
+        raw.seek(0)
+        magic = raw.read(2)
+        raw.seek(0)
+        if magic == b"\x1f\x8b":
+            with gzip.GzipFile(fileobj=raw) as fh:
+                yield fh
+            return
+        yield raw
+    finally:
+        raw.close()
+
+
+def write_state_subset(df: pd.DataFrame, path: Path, row_filter: Optional[Callable] = None) -> bool:
+    """
+    Write a state subset CSV via a temp file renamed into place, so readers never see partial files.
+
+    Empty frames are not cached, nor are reads whose StateRowFilter found no
+    filter column (those hold the whole national file, not a state subset).
+
+    Returns:
+        True if the subset was written
+    """
+    if df.empty:
+        logger.warning(f"Not caching empty state subset {path.name}")
+        return False
+    if not getattr(row_filter, "bound", True):
+        logger.warning(f"Not caching {path.name}: rows were not filtered by state")
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    return True
+
+
+def state_subset_path(name: str) -> Path:
+    """Location of a cached single-state subset of a national file."""
+    return Path(settings.STATE_SUBSET_CACHE_DIR) / name
+
+
+def read_state_subset(
+    path: Path, dtype: Any = str, max_age_days: Optional[float] = None
+) -> Optional[pd.DataFrame]:
+    """
+    Load a cached state subset.
+
+    Args:
+        path: Cache file from state_subset_path
+        dtype: Passed to pandas.read_csv
+        max_age_days: Older files count as missing (default: STATE_SUBSET_MAX_AGE_DAYS)
+
+    Returns:
+        DataFrame, or None if the subset is missing, expired or empty
+    """
+    if not path.exists():
+        return None
+    if max_age_days is None:
+        max_age_days = settings.STATE_SUBSET_MAX_AGE_DAYS
+    age_days = (time.time() - path.stat().st_mtime) / 86400
+    if age_days > max_age_days:
+        logger.info(f"Cached state subset {path} is {age_days:.0f} days old; refetching")
+        return None
+    df = pd.read_csv(path, dtype=dtype, low_memory=False)
+    if df.empty:
+        logger.warning(f"Ignoring empty cached state subset {path}")
+        return None
+    logger.info(f"Using cached state subset {path}")
+    return df
+
+
+def read_csv_filtered(
+    source: CsvSource,
+    row_filter: Optional[Callable[[pd.DataFrame], pd.Series]] = None,
+    columns: Optional[Sequence[str]] = None,
+    dtype: Any = str,
+    chunksize: Optional[int] = None,
+    member_hints: Sequence[Union[str, Tuple[str, ...]]] = (),
+    encodings: Sequence[str] = ("utf-8", "latin-1"),
+    cache_path: Optional[Path] = None,
+) -> pd.DataFrame:
+    """
+    Stream a national CSV in chunks, keeping only matching rows and columns.
+
+    Args:
+        source: Local path or raw bytes; zip archives and gzip streams are detected
+        row_filter: Callable returning a boolean mask per chunk (e.g. maryland_row_filter())
+        columns: Column names to keep (case-insensitive, missing names ignored); None keeps all
+        dtype: Passed to pandas.read_csv
+        chunksize: Rows per chunk (default: settings.NATIONAL_CSV_CHUNKSIZE)
+        member_hints: Preferred zip member names; a tuple hint requires all of its parts
+        encodings: Encodings tried in order when a chunk fails to decode
+        cache_path: Where to write the filtered subset; reused while newer than ``source``
+
+    Returns:
+        DataFrame holding only the filtered rows
+    """
+    if cache_path is not None and cache_path.exists():
+        stale = isinstance(source, (str, Path)) and Path(source).stat().st_mtime > cache_path.stat().st_mtime
+        cached = None if stale else read_state_subset(cache_path, dtype=dtype)
+        if cached is not None:
+            return cached
+
+    chunksize = chunksize or settings.NATIONAL_CSV_CHUNKSIZE
+    usecols = None
+    if columns is not None:
+        wanted = {c.upper() for c in columns}
+        filter_wants = getattr(row_filter, "wants", lambda name: False)
+        usecols = lambda name: name.strip().upper() in wanted or filter_wants(name)
+
+    last_error: Optional[Exception] = None
+    for encoding in encodings:
+        kept = []
+        header: List[str] = []
+        scanned = 0
+        try:
+            with _open_csv_stream(source, member_hints) as fh:
+                reader = pd.read_csv(
+                    fh, dtype=dtype, usecols=usecols, encoding=encoding,
+                    chunksize=chunksize, low_memory=False,
+                )
+                for chunk in reader:
+                    header = header or list(chunk.columns)
+                    scanned += len(chunk)
+                    if row_filter is not None:
+                        chunk = chunk[row_filter(chunk).to_numpy()]
+                    if not chunk.empty:
+                        kept.append(chunk)
+        except UnicodeDecodeError as e:
+            last_error = e
+            continue
+        except pd.errors.EmptyDataError:
+            return pd.DataFrame()
+
+        df = pd.concat(kept, ignore_index=True) if kept else pd.DataFrame(columns=header)
+        logger.info(f"Kept {len(df)} of {scanned} rows ({encoding})")
+        if cache_path is not None:
+            write_state_subset(df, cache_path, row_filter)
+        return df
+
+    raise ValueError(f"Could not decode CSV with any of {list(encodings)}: {last_error}")
+
+
+def fetch_csv_filtered(url: str, timeout: int = 120, **kwargs) -> Optional[pd.DataFrame]:
+    """
+    Stream a remote national file to a temporary file and read it with read_csv_filtered.
+
+    Returns None when the download fails, so callers can try the next candidate
+    URL. Keyword arguments are passed to read_csv_filtered.
+    """
+    tmp_dir = tempfile.mkdtemp(prefix="national_csv_")
+    try:
+        try:
+            path = DownloadEngine(timeout=timeout, max_attempts=1).fetch(url, Path(tmp_dir) / "source")
+        except (DownloadError, HTTPError) as e:
+            logger.debug(f"Download of {url} failed: {e}")
+            return None
+        return read_csv_filtered(path, **kwargs)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
 
 
 def _candidate_ejscreen_urls(base_url: str, year: int) -> list[str]:
@@ -542,8 +1027,8 @@ def _discover_ejscreen_urls(base_url: str, year: int) -> list[str]:
     base = base_url.rstrip("/")
     listing_url = f"{base}/{year}/"
     try:
-        resp = requests.get(listing_url, timeout=60)
-        if not resp.ok:
+        resp = get_http_client().get(listing_url, timeout=60)
+        if not resp.is_success:
             return []
         hrefs = re.findall(r'href="([^"]+)"', resp.text, flags=re.IGNORECASE)
         urls = []
@@ -574,48 +1059,59 @@ def fetch_epa_ejscreen(
         lookback_years: How many years to look back if data missing
 
     Returns:
-        DataFrame with environmental justice indicators
+        DataFrame with environmental justice indicators (Maryland block groups,
+        cached under settings.STATE_SUBSET_CACHE_DIR after the first download)
     """
     logger.info(f"Fetching EPA EJScreen data for {year}")
 
     years_to_try = [year - offset for offset in range(max(1, lookback_years) + 1) if year - offset > 0]
     last_error = None
+    # National files are streamed and only Maryland block groups are kept; the
+    # filter binds to each file's header, so every download gets a fresh one
+    def read_kwargs():
+        return dict(row_filter=maryland_row_filter(prefix_columns=['ID']), dtype={'ID': str})
 
     if prefer_zenodo and settings.EPA_EJSCREEN_ZENODO_URL:
+        cache_path = state_subset_path("ejscreen_zenodo_md.csv")
         try:
-            response = requests.get(settings.EPA_EJSCREEN_ZENODO_URL, timeout=180)
-            if response.status_code == 200:
-                df = _read_csv_from_bytes(response.content, dtype={'ID': str})
-                if 'ID' in df.columns:
-                    df_md = df[df['ID'].astype(str).str.startswith('24')].copy().reset_index(drop=True)
-                    df_md['ejscreen_year'] = year
-                    df_md = attach_source_metadata(df_md, settings.EPA_EJSCREEN_ZENODO_URL)
-                    logger.info(f"Fetched {len(df_md)} Maryland EJScreen records from Zenodo archive")
-                    return df_md
+            df_md = read_state_subset(cache_path, dtype={'ID': str})
+            if df_md is None:
+                kwargs = read_kwargs()
+                df_md = fetch_csv_filtered(settings.EPA_EJSCREEN_ZENODO_URL, timeout=180, **kwargs)
+                if df_md is not None and 'ID' in df_md.columns:
+                    df_md = attach_source_metadata(df_md.reset_index(drop=True), settings.EPA_EJSCREEN_ZENODO_URL)
+                    write_state_subset(df_md, cache_path, kwargs['row_filter'])
+            if df_md is not None and 'ID' in df_md.columns:
+                df_md['ejscreen_year'] = year
+                logger.info(f"Fetched {len(df_md)} Maryland EJScreen records from Zenodo archive")
+                return df_md
         except Exception as e:
             logger.warning(f"Zenodo EJScreen fetch failed: {e}")
 
     for target_year in years_to_try:
+        cache_path = state_subset_path(f"ejscreen_{target_year}_md.csv")
+        cached = read_state_subset(cache_path, dtype={'ID': str})
+        if cached is not None:
+            return cached
+
         for base_url in _ejscreen_base_urls(settings.EPA_EJSCREEN_URL):
             candidate_urls = _candidate_ejscreen_urls(base_url, target_year)
             candidate_urls.extend(_discover_ejscreen_urls(base_url, target_year))
 
             for url in candidate_urls:
                 try:
-                    response = requests.get(url, timeout=120)
-                    if response.status_code != 200:
-                        continue
-                    df = _read_csv_from_bytes(response.content, dtype={'ID': str})
-
-                    if 'ID' not in df.columns:
+                    kwargs = read_kwargs()
+                    df_md = fetch_csv_filtered(url, timeout=120, **kwargs)
+                    if df_md is None or 'ID' not in df_md.columns:
                         continue
 
-                    df_md = df[df['ID'].astype(str).str.startswith('24')].copy().reset_index(drop=True)
+                    df_md = df_md.reset_index(drop=True)
                     df_md['ejscreen_year'] = target_year
                     df_md = attach_source_metadata(df_md, url)
+                    write_state_subset(df_md, cache_path, kwargs['row_filter'])
 
                     logger.info(f"Fetched {len(df_md)} Maryland EJScreen records for {target_year}")
-                    return df_md.to_frame() if isinstance(df_md, pd.Series) else df_md
+                    return df_md
                 except Exception as e:
                     last_error = e
                     continue
@@ -624,14 +1120,25 @@ def fetch_epa_ejscreen(
     raise last_error if last_error else RuntimeError("EJScreen download failed")
 
 
-def download_file(url: str, save_path: str, timeout: int = 300) -> bool:
+def download_file(
+    url: str,
+    save_path: str,
+    timeout: int = 300,
+    expected_size: Optional[int] = None,
+    expected_sha256: Optional[str] = None,
+) -> bool:
     """
-    Download a file from URL with progress logging.
+    Download a file from URL, in parallel Range segments when the server allows.
+
+    Interrupted downloads resume from a ``.part`` file on the next call, and
+    ``save_path`` is only written once the body is complete and verified.
 
     Args:
         url: URL to download from
         save_path: Local path to save file
         timeout: Request timeout in seconds
+        expected_size: Reject the download unless it has exactly this many bytes
+        expected_sha256: Reject the download unless its SHA-256 matches
 
     Returns:
         True if successful, False otherwise
@@ -639,25 +1146,12 @@ def download_file(url: str, save_path: str, timeout: int = 300) -> bool:
     logger.info(f"Downloading: {url}")
 
     try:
-        response = requests.get(url, stream=True, timeout=timeout)
-        response.raise_for_status()
-
-        total_size = int(response.headers.get('content-length', 0))
-
-        with open(save_path, 'wb') as f:
-            if total_size == 0:
-                f.write(response.content)
-            else:
-                downloaded = 0
-                for chunk in response.iter_content(chunk_size=8192):
-                    downloaded += len(chunk)
-                    f.write(chunk)
-                    if downloaded % (1024 * 1024) == 0:  # Log every MB
-                        logger.debug(f"Downloaded {downloaded / (1024*1024):.1f} MB")
-
-        logger.info(f"Download complete: {save_path}")
-        return True
-
-    except Exception as e:
+        path = DownloadEngine(timeout=timeout).fetch(
+            url, save_path, expected_size=expected_size, expected_sha256=expected_sha256
+        )
+    except (DownloadError, HTTPError, OSError) as e:
         logger.error(f"Download failed: {e}")
         return False
+
+    logger.info(f"Download complete: {path} ({path.stat().st_size / (1024 * 1024):.1f} MB)")
+    return True
@@ -0,0 +1,304 @@
+"""
+Maryland Viability Atlas - Download engine
+Resumable, verified file downloads for large source files.
+
+Files are written to ``<dest>.part`` and only renamed onto the destination
+once complete and verified, so later stages never read a truncated file.
+Progress is checkpointed in a ``<dest>.part.json`` sidecar: an interrupted
+download resumes from the last flushed byte instead of starting over.
+
+When the server advertises ``Accept-Ranges: bytes`` and the file is large
+enough, the body is split into HTTP Range segments fetched in parallel.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import httpx
+
+from config.settings import get_settings
+from src.utils.http_client import get_http_client
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+CHUNK_SIZE = 1024 * 1024
+CHECKPOINT_BYTES = 8 * 1024 * 1024
+# Content-Length and Range offsets count bytes on the wire, so ask for the
+# unencoded body; httpx would otherwise request gzip and write decoded bytes.
+IDENTITY = {"Accept-Encoding": "identity"}
+
+
+class DownloadError(RuntimeError):
+    """Raised when a download cannot be completed or fails verification."""
+
+
+class _RangeIgnored(DownloadError):
+    """The server answered a Range request with the full body."""
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class DownloadEngine:
+    """
+    Segmented, resumable downloader.
+
+    Args:
+        segments: Parallel Range segments for large files (default: settings.DOWNLOAD_SEGMENTS)
+        min_segment_bytes: Files smaller than two segments of this size use one stream
+        max_attempts: Attempts per segment; each retry resumes where the last stopped
+        timeout: Per-request timeout in seconds
+
+    Example:
+        DownloadEngine().fetch(url, "data/cache/risk/slr.zip", expected_sha256="ab12...")
+    """
+
+    def __init__(
+        self,
+        segments: Optional[int] = None,
+        min_segment_bytes: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        timeout: float = 300,
+    ):
+        self.segments = max(1, segments or settings.DOWNLOAD_SEGMENTS)
+        self.min_segment_bytes = min_segment_bytes or settings.DOWNLOAD_MIN_SEGMENT_MB * 1024 * 1024
+        self.max_attempts = max_attempts or settings.HTTP_RETRY_ATTEMPTS
+        self.timeout = timeout
+        self._state_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Sidecar state
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _paths(dest: Path):
+        part = dest.with_name(dest.name + ".part")
+        return part, dest.with_name(dest.name + ".part.json")
+
+    def _save_state(self, state_path: Path, state: Dict[str, Any]) -> None:
+        with self._state_lock:
+            tmp_path = state_path.with_name(f".{state_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(state, f)
+            os.replace(tmp_path, state_path)
+
+    @staticmethod
+    def _load_state(state_path: Path, part_path: Path) -> Optional[Dict[str, Any]]:
+        if not state_path.exists() or not part_path.exists():
+            return None
+        try:
+            with open(state_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    # ------------------------------------------------------------------
+    # Probing and planning
+    # ------------------------------------------------------------------
+
+    def _probe(self, url: str) -> Dict[str, Any]:
+        """HEAD the URL for size, range support and a validator (ETag/Last-Modified)."""
+        try:
+            resp = get_http_client().client.head(url, headers=IDENTITY, timeout=self.timeout)
+        except httpx.HTTPError as e:
+            logger.debug(f"HEAD {url} failed ({e}); falling back to a single stream")
+            return {"size": None, "ranges": False, "validator": None}
+        if resp.status_code >= 400 and resp.status_code not in (403, 405, 501):
+            raise DownloadError(f"HTTP {resp.status_code} for {url}")
+        if resp.status_code >= 400:
+            return {"size": None, "ranges": False, "validator": None}
+        length = resp.headers.get("content-length")
+        return {
+            "size": int(length) if length and length.isdigit() else None,
+            "ranges": resp.headers.get("accept-ranges", "").lower() == "bytes",
+            "validator": resp.headers.get("etag") or resp.headers.get("last-modified"),
+        }
+
+    def _plan(self, url: str, info: Dict[str, Any]) -> Dict[str, Any]:
+        size = info["size"]
+        if info["ranges"] and size and size >= 2 * self.min_segment_bytes and self.segments > 1:
+            count = min(self.segments, size // self.min_segment_bytes)
+            step = -(-size // count)
+            bounds = [(start, min(size, start + step) - 1) for start in range(0, size, step)]
+        else:
+            bounds = [(0, size - 1 if size else None)]
+        return {
+            "url": url,
+            "size": size,
+            "ranges": info["ranges"],
+            "validator": info["validator"],
+            "segments": [{"start": s, "end": e, "done": 0} for s, e in bounds],
+        }
+
+    # ------------------------------------------------------------------
+    # Transfer
+    # ------------------------------------------------------------------
+
+    def _fetch_segment(
+        self, state: Dict[str, Any], seg: Dict[str, Any], part_path: Path, state_path: Path
+    ) -> None:
+        client = get_http_client().client
+        segmented = len(state["segments"]) > 1
+        last_error: Optional[Exception] = None
+        for attempt in range(1, self.max_attempts + 1):
+            pos = seg["start"] + seg["done"]
+            if seg["end"] is not None and pos > seg["end"]:
+                return
+            headers = dict(IDENTITY)
+            if segmented or (pos > 0 and state["ranges"]):
+                headers["Range"] = f"bytes={pos}-{'' if seg['end'] is None else seg['end']}"
+            elif pos > 0:
+                # No range support: restart the stream from scratch
+                seg["done"] = pos = 0
+            done = seg["done"]
+            try:
+                with client.stream(
+                    "GET", state["url"], headers=headers, timeout=self.timeout
+                ) as resp:
+                    if resp.status_code >= 400:
+                        raise DownloadError(f"HTTP {resp.status_code} for {state['url']}")
+                    if resp.headers.get("content-encoding", "identity").lower() != "identity":
+                        # Encoded anyway: offsets and Content-Length no longer match the
+                        # decoded bytes we write, so only a whole stream from byte 0 works
+                        state["encoded"] = True
+                        if "Range" in headers:
+                            if segmented:
+                                raise _RangeIgnored("server encoded a Range response")
+                            done = 0
+                            raise DownloadError("server encoded a Range response; restarting")
+                    if "Range" in headers and resp.status_code != 206:
+                        if segmented:
+                            raise _RangeIgnored("server ignored Range request")
+                        done = pos = 0
+                    with open(part_path, "r+b") as f:
+                        f.seek(pos)
+                        unsaved = 0
+                        for chunk in resp.iter_bytes(CHUNK_SIZE):
+                            f.write(chunk)
+                            done += len(chunk)
+                            unsaved += len(chunk)
+                            if unsaved >= CHECKPOINT_BYTES:
+                                # Only checkpoint bytes that have reached the file
+                                f.flush()
+                                seg["done"] = done
+                                self._save_state(state_path, state)
+                                unsaved = 0
+                        if not segmented:
+                            f.truncate()
+                seg["done"] = done
+                if seg["end"] is None:
+                    seg["end"] = seg["start"] + done - 1
+                self._save_state(state_path, state)
+                return
+            except _RangeIgnored:
+                raise
+            except (httpx.HTTPError, DownloadError) as e:
+                # The file was closed (and flushed) on the way out of the with block
+                seg["done"] = done
+                self._save_state(state_path, state)
+                last_error = e
+                if attempt < self.max_attempts:
+                    logger.warning(f"Download segment at byte {pos} failed ({e}); resuming")
+                    time.sleep(min(30.0, 2 ** (attempt - 1)))
+        raise DownloadError(f"Download failed after {self.max_attempts} attempts: {last_error}")
+
+    def _start(self, state: Dict[str, Any], part_path: Path, state_path: Path) -> None:
+        with open(part_path, "wb") as f:
+            if state["size"] and len(state["segments"]) > 1:
+                f.truncate(state["size"])
+        self._save_state(state_path, state)
+
+    def fetch(
+        self,
+        url: str,
+        dest: Union[str, Path],
+        expected_size: Optional[int] = None,
+        expected_sha256: Optional[str] = None,
+    ) -> Path:
+        """
+        Download ``url`` to ``dest``, resuming and verifying as configured.
+
+        Raises:
+            DownloadError: when the transfer fails or the result does not verify
+        """
+        dest = Path(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        part_path, state_path = self._paths(dest)
+        info = self._probe(url)
+
+        state = self._load_state(state_path, part_path)
+        if state and (
+            state.get("url") != url
+            or state.get("size") != info["size"]
+            or state.get("validator") != info["validator"]
+        ):
+            logger.info(f"Remote file changed since partial download of {dest.name}; restarting")
+            state = None
+        if state is None:
+            state = self._plan(url, info)
+            self._start(state, part_path, state_path)
+        else:
+            done = sum(seg["done"] for seg in state["segments"])
+            logger.info(f"Resuming {dest.name} from {done / 1e6:.1f} MB")
+
+        segments = state["segments"]
+        if len(segments) == 1:
+            self._fetch_segment(state, segments[0], part_path, state_path)
+        else:
+            logger.info(f"Downloading {dest.name} in {len(segments)} parallel segments")
+            try:
+                with ThreadPoolExecutor(max_workers=len(segments)) as pool:
+                    futures = [
+                        pool.submit(self._fetch_segment, state, seg, part_path, state_path)
+                        for seg in segments
+                    ]
+                    for future in futures:
+                        future.result()
+            except _RangeIgnored:
+                logger.info(f"Server ignored Range requests for {dest.name}; using a single stream")
+                state = self._plan(url, {**info, "ranges": False})
+                self._start(state, part_path, state_path)
+                self._fetch_segment(state, state["segments"][0], part_path, state_path)
+
+        try:
+            self._verify(part_path, state, expected_size, expected_sha256)
+        except DownloadError:
+            part_path.unlink(missing_ok=True)
+            state_path.unlink(missing_ok=True)
+            raise
+        os.replace(part_path, dest)
+        state_path.unlink(missing_ok=True)
+        return dest
+
+    @staticmethod
+    def _verify(
+        part_path: Path,
+        state: Dict[str, Any],
+        expected_size: Optional[int],
+        expected_sha256: Optional[str],
+    ) -> None:
+        actual = part_path.stat().st_size
+        # An encoded response advertises its compressed length
+        advertised = None if state.get("encoded") else state.get("size")
+        for label, size in (("expected", expected_size), ("advertised", advertised)):
+            if size is not None and actual != size:
+                raise DownloadError(f"Size mismatch: got {actual} bytes, {label} {size}")
+        if expected_sha256:
+            digest = _file_sha256(part_path)
+            if digest.lower() != expected_sha256.lower():
+                raise DownloadError(f"SHA-256 mismatch: got {digest}, expected {expected_sha256}")
@@ -0,0 +1,402 @@
+"""
+Maryland Viability Atlas - Shared HTTP client
+Pooled, keep-alive HTTP access for every external data fetcher.
+
+One process-wide ``HttpClient`` (see ``get_http_client``) owns an httpx
+connection pool, so repeated calls to the same API reuse TCP/TLS sessions
+instead of reconnecting per request. HTTP/2 is negotiated when the optional
+``h2`` package is installed. All fetchers share one retry policy (429/5xx and
+transport errors, exponential backoff honouring Retry-After) and can plug in
+a ``RateLimiter`` from ``src.utils.rate_limit``.
+
+With ``HTTP_REPLAY_MODE`` set, the default transports are wrapped in the
+record/replay layer from ``src.utils.http_replay``.
+
+``fan_out`` issues a batch of independent requests concurrently on an async
+pool; ``first_success`` does the same for ordered probes (e.g. newest year
+first), optionally a few at a time, and returns the highest-priority hit.
+
+``request_deadline`` bounds every request made inside it (including retries
+and backoff) by a shared wall-clock budget, so a caller that cannot interrupt
+a long-running loader can still stop its network traffic on time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import httpx
+
+from config.settings import get_settings
+from src.utils.http_replay import AsyncReplayTransport, ReplayTransport, replay_enabled
+from src.utils.logging import get_logger
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    HTTP2_AVAILABLE = False
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+HTTPError = httpx.HTTPError
+
+
+@dataclass
+class RetryPolicy:
+    """When and how long to wait before re-sending a request."""
+
+    max_attempts: int = 3
+    backoff_base: float = 1.0
+    max_backoff: float = 30.0
+    retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        try:
+            if retry_after is not None:
+                return min(self.max_backoff, max(0.0, float(retry_after)))
+        except ValueError:
+            pass
+        delay = min(self.max_backoff, self.backoff_base * (2 ** (attempt - 1)))
+        return delay * random.uniform(1.0, 1.25)
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+# Monotonic time after which requests in this context fail instead of being sent
+_DEADLINE: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "http_deadline", default=None
+)
+
+
+class DeadlineExceeded(httpx.TimeoutException):
+    """The ``request_deadline`` budget ran out before a request could be sent."""
+
+
+@contextmanager
+def request_deadline(seconds: float) -> Iterator[None]:
+    """
+    Cap every request made in this context to a shared budget of ``seconds``.
+
+    Per-request timeouts shrink to the time left, and once the budget is spent
+    further requests raise ``DeadlineExceeded`` without touching the network.
+    Nested deadlines keep the earlier of the two.
+    """
+    deadline = time.monotonic() + seconds
+    outer = _DEADLINE.get()
+    token = _DEADLINE.set(deadline if outer is None else min(outer, deadline))
+    try:
+        yield
+    finally:
+        _DEADLINE.reset(token)
+
+
+def _budgeted_timeout(timeout: float, method: str, url: str) -> float:
+    """``timeout`` capped to the current deadline; raises once it has passed."""
+    deadline = _DEADLINE.get()
+    if deadline is None:
+        return timeout
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise DeadlineExceeded(f"Request budget exhausted before {method} {url}")
+    return min(timeout, remaining)
+
+
+def _budgeted_delay(delay: float) -> float:
+    """Retry backoff, cut short so the next attempt fails fast at the deadline."""
+    deadline = _DEADLINE.get()
+    if deadline is None:
+        return delay
+    return min(delay, max(0.0, deadline - time.monotonic()))
+
+
+@dataclass
+class RequestSpec:
+    """One request in a fan-out batch."""
+
+    url: str
+    method: str = "GET"
+    params: Optional[Dict[str, Any]] = None
+    json: Any = None
+    headers: Optional[Dict[str, str]] = None
+    timeout: Optional[float] = None
+    tag: Any = field(default=None, compare=False)
+
+
+class HttpClient:
+    """
+    Pooled HTTP client with a uniform retry/timeout policy.
+
+    Args:
+        timeout: Default per-request timeout in seconds
+        retry: Default RetryPolicy
+        max_connections: Pool size shared by all threads
+        http2: Negotiate HTTP/2 (default: when ``h2`` is installed)
+        transport / async_transport: Custom httpx transports (tests, proxies)
+    """
+
+    def __init__(
+        self,
+        timeout: float = 60.0,
+        retry: Optional[RetryPolicy] = None,
+        max_connections: Optional[int] = None,
+        http2: Optional[bool] = None,
+        transport: Optional[httpx.BaseTransport] = None,
+        async_transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.timeout = timeout
+        self.retry = retry or RetryPolicy(max_attempts=settings.HTTP_RETRY_ATTEMPTS)
+        max_connections = max_connections or settings.HTTP_MAX_CONNECTIONS
+        self.limits = httpx.Limits(
+            max_connections=max_connections, max_keepalive_connections=max_connections
+        )
+        self.http2 = HTTP2_AVAILABLE if http2 is None else (http2 and HTTP2_AVAILABLE)
+        if transport is None and replay_enabled():
+            transport = ReplayTransport(httpx.HTTPTransport(limits=self.limits, http2=self.http2))
+        self._transport = transport
+        self._async_transport = async_transport
+        self._client: Optional[httpx.Client] = None
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Sync API
+    # ------------------------------------------------------------------
+
+    @property
+    def client(self) -> httpx.Client:
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(
+                    timeout=self.timeout,
+                    limits=self.limits,
+                    http2=self.http2,
+                    follow_redirects=True,
+                    transport=self._transport,
+                )
+            return self._client
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        json: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        limiter=None,
+        retry: Optional[RetryPolicy] = None,
+    ) -> httpx.Response:
+        """
+        Send a request, retrying transport errors and retryable statuses.
+
+        The final response is returned whatever its status; callers decide
+        whether a 404 is an error. Raises the last transport error if every
+        attempt failed to get a response.
+        """
+        retry = retry or self.retry
+        last_error: Optional[Exception] = None
+        for attempt in range(1, retry.max_attempts + 1):
+            if limiter is not None:
+                limiter.acquire()
+            attempt_timeout = _budgeted_timeout(timeout or self.timeout, method, url)
+            try:
+                response = self.client.request(
+                    method,
+                    url,
+                    params=params,
+                    json=json,
+                    headers=headers,
+                    timeout=attempt_timeout,
+                )
+            except httpx.TransportError as e:
+                last_error = e
+                retry_after = None
+            else:
+                if limiter is not None:
+                    limiter.record_response(response)
+                if (
+                    response.status_code not in retry.retry_statuses
+                    or attempt == retry.max_attempts
+                ):
+                    return response
+                retry_after = response.headers.get("Retry-After")
+                last_error = httpx.HTTPStatusError(
+                    f"HTTP {response.status_code}", request=response.request, response=response
+                )
+            if attempt < retry.max_attempts:
+                delay = _budgeted_delay(retry.delay(attempt, retry_after))
+                logger.debug(f"Retrying {method} {url} in {delay:.1f}s after: {last_error}")
+                time.sleep(delay)
+        raise last_error
+
+    def get(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("POST", url, **kwargs)
+
+    # ------------------------------------------------------------------
+    # Concurrent fan-out
+    # ------------------------------------------------------------------
+
+    async def _send_async(
+        self,
+        client: httpx.AsyncClient,
+        spec: RequestSpec,
+        semaphore: asyncio.Semaphore,
+        limiter,
+        retry: RetryPolicy,
+    ) -> Union[httpx.Response, Exception]:
+        last_error: Exception = RuntimeError("no attempts made")
+        for attempt in range(1, retry.max_attempts + 1):
+            async with semaphore:
+                if limiter is not None:
+                    await limiter.acquire_async()
+                try:
+                    attempt_timeout = _budgeted_timeout(
+                        spec.timeout or self.timeout, spec.method, spec.url
+                    )
+                except DeadlineExceeded as e:
+                    return e
+                try:
+                    response = await client.request(
+                        spec.method,
+                        spec.url,
+                        params=spec.params,
+                        json=spec.json,
+                        headers=spec.headers,
+                        timeout=attempt_timeout,
+                    )
+                except httpx.TransportError as e:
+                    last_error, retry_after = e, None
+                else:
+                    if limiter is not None:
+                        limiter.record_response(response)
+                    if (
+                        response.status_code not in retry.retry_statuses
+                        or attempt == retry.max_attempts
+                    ):
+                        return response
+                    last_error = httpx.HTTPStatusError(
+                        f"HTTP {response.status_code}", request=response.request, response=response
+                    )
+                    retry_after = response.headers.get("Retry-After")
+            if attempt < retry.max_attempts:
+                await asyncio.sleep(_budgeted_delay(retry.delay(attempt, retry_after)))
+        return last_error
+
+    async def fan_out_async(
+        self,
+        specs: Sequence[RequestSpec],
+        max_concurrency: Optional[int] = None,
+        limiter=None,
+        retry: Optional[RetryPolicy] = None,
+    ) -> List[Union[httpx.Response, Exception]]:
+        """Async form of ``fan_out`` for callers already inside an event loop."""
+        semaphore = asyncio.Semaphore(max_concurrency or settings.HTTP_FANOUT_CONCURRENCY)
+        retry = retry or self.retry
+        transport = self._async_transport
+        if transport is None and replay_enabled():
+            # The async client closes its transport on exit, so wrap a fresh one per batch
+            transport = AsyncReplayTransport(
+                httpx.AsyncHTTPTransport(limits=self.limits, http2=self.http2)
+            )
+        async with httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=self.limits,
+            http2=self.http2,
+            follow_redirects=True,
+            transport=transport,
+        ) as client:
+            return await asyncio.gather(
+                *(self._send_async(client, spec, semaphore, limiter, retry) for spec in specs)
+            )
+
+    def fan_out(
+        self,
+        specs: Sequence[RequestSpec],
+        max_concurrency: Optional[int] = None,
+        limiter=None,
+        retry: Optional[RetryPolicy] = None,
+    ) -> List[Union[httpx.Response, Exception]]:
+        """
+        Send independent requests concurrently on one pooled async connection set.
+
+        Returns one entry per spec, in order: the final response, or the
+        exception that prevented one.
+        """
+        if not specs:
+            return []
+        coro_factory = lambda: self.fan_out_async(specs, max_concurrency, limiter, retry)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro_factory())
+        # Called from inside an event loop (e.g. the API): run on a private loop
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(lambda: asyncio.run(coro_factory())).result()
+
+    def first_success(
+        self,
+        specs: Sequence[RequestSpec],
+        accept: Callable[[httpx.Response], bool] = lambda r: r.status_code == 200,
+        max_concurrency: Optional[int] = None,
+        limiter=None,
+        retry: Optional[RetryPolicy] = None,
+        batch_size: Optional[int] = None,
+    ) -> Tuple[Optional[int], List[Union[httpx.Response, Exception]]]:
+        """
+        Probe ``specs`` concurrently and pick the first accepted one in list order.
+
+        With ``batch_size``, specs are probed that many at a time in list order
+        and later batches are never sent once one is accepted, which keeps
+        quota-limited APIs from paying for probes that cannot win.
+
+        Returns ``(index, results)``: ``results`` holds one entry per probed
+        spec; ``index`` is None when nothing was accepted.
+        """
+        batch_size = batch_size or len(specs) or 1
+        results: List[Union[httpx.Response, Exception]] = []
+        for start in range(0, len(specs), batch_size):
+            results += self.fan_out(
+                specs[start : start + batch_size], max_concurrency, limiter, retry
+            )
+            for i in range(start, len(results)):
+                result = results[i]
+                if isinstance(result, httpx.Response):
+                    try:
+                        if accept(result):
+                            return i, results
+                    except Exception:
+                        continue
+        return None, results
+
+    def close(self) -> None:
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+
+_CLIENT: Optional[HttpClient] = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Return the process-wide pooled HTTP client."""
+    global _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            _CLIENT = HttpClient()
+        return _CLIENT
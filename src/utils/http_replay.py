@@ -0,0 +1,423 @@
+"""
+Maryland Viability Atlas - HTTP record/replay
+Offline fixture store for every fetcher that goes through the shared HTTP client.
+
+``ReplayTransport`` sits under ``HttpClient`` (and therefore under
+``download_file``) and is switched on with ``HTTP_REPLAY_MODE``:
+
+- ``off``: talk to the network directly (default)
+- ``record``: fetch live and (re)write responses to the store
+- ``replay``: serve only from the store; unrecorded requests raise ``ReplayMiss``
+- ``auto``: serve recorded responses, record misses
+
+Throttling (429) and server errors (5xx) are passed through live and never
+stored, so a transient outage is retried against the network instead of being
+replayed forever.
+
+Bodies are stored once under their SHA-256 (``objects/ab/abcd...``); a small
+JSON entry per request (``requests/<key>.json``) maps the method, URL and body
+to the recorded status, headers and body digest. API keys are stripped from the
+request key, so fixtures can be shared without leaking credentials and still
+match when a different key is configured.
+
+Replays are deterministic. ``HTTP_REPLAY_LATENCY_MS`` and
+``HTTP_REPLAY_BANDWIDTH_MBPS`` add simulated time-to-first-byte and transfer
+time so pipeline throughput can be profiled on a machine without network access.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+
+from config.settings import get_settings
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+REPLAY_MODES = ("off", "record", "replay", "auto")
+READ_SIZE = 64 * 1024
+
+# Query parameters / JSON body fields that carry credentials
+SENSITIVE_FIELDS = frozenset(
+    {"key", "api_key", "apikey", "token", "access_token", "registrationkey"}
+)
+
+# Recorded headers that are recomputed on replay
+_VOLATILE_HEADERS = frozenset({"content-length", "transfer-encoding", "connection", "keep-alive"})
+
+_RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)$")
+
+# Transient failures: returned to the caller (and its retry policy), not recorded
+_UNRECORDED_STATUSES = frozenset({429})
+
+
+def _recordable(status: int) -> bool:
+    return status < 500 and status not in _UNRECORDED_STATUSES
+
+
+class ReplayMiss(httpx.RequestError):
+    """A request in replay mode has no recorded response."""
+
+
+def _redact_url(url: str) -> str:
+    parts = urlsplit(url)
+    query = sorted(
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in SENSITIVE_FIELDS
+    )
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, urlencode(query), ""))
+
+
+def _redact_body(content: bytes) -> bytes:
+    if not content:
+        return b""
+    try:
+        payload = json.loads(content)
+    except ValueError:
+        return content
+    if isinstance(payload, dict):
+        payload = {k: v for k, v in payload.items() if k.lower() not in SENSITIVE_FIELDS}
+    return json.dumps(payload, sort_keys=True).encode()
+
+
+class FixtureStore:
+    """
+    Content-addressed response store.
+
+    Args:
+        root: Store directory (default: settings.HTTP_REPLAY_DIR)
+    """
+
+    def __init__(self, root: Optional[Union[str, Path]] = None):
+        self.root = Path(root or settings.HTTP_REPLAY_DIR)
+        self.objects_dir = self.root / "objects"
+        self.requests_dir = self.root / "requests"
+
+    @staticmethod
+    def request_key(request: httpx.Request) -> str:
+        """Stable key for a request; ignores credentials and Range headers."""
+        body = request.content if request.method not in ("GET", "HEAD") else b""
+        material = json.dumps(
+            [
+                request.method,
+                _redact_url(str(request.url)),
+                hashlib.sha256(_redact_body(body)).hexdigest(),
+            ]
+        )
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    def object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def _entry_path(self, key: str) -> Path:
+        return self.requests_dir / f"{key}.json"
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._entry_path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not self.object_path(entry["body"]).exists():
+            return None
+        return entry
+
+    def put_body(self, chunks: Iterable[bytes]) -> Tuple[str, int]:
+        """Write a body to the store, returning ``(sha256, size)``."""
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_name = tempfile.mkstemp(dir=self.objects_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    digest.update(chunk)
+                    size += len(chunk)
+                    f.write(chunk)
+            path = self.object_path(digest.hexdigest())
+            path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        return digest.hexdigest(), size
+
+    def put_entry(self, key: str, entry: Dict[str, Any]) -> None:
+        self.requests_dir.mkdir(parents=True, exist_ok=True)
+        path = self._entry_path(key)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(entry, f, indent=2)
+        os.replace(tmp_path, path)
+
+
+class _ReplayStream(httpx.SyncByteStream):
+    def __init__(self, path: Path, start: int, length: int, latency: float, bandwidth: float):
+        self.path, self.start, self.length = path, start, length
+        self.latency, self.bandwidth = latency, bandwidth
+
+    def __iter__(self):
+        if self.latency:
+            time.sleep(self.latency)
+        with open(self.path, "rb") as f:
+            f.seek(self.start)
+            remaining = self.length
+            while remaining > 0:
+                chunk = f.read(min(READ_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                if self.bandwidth:
+                    time.sleep(len(chunk) / self.bandwidth)
+                yield chunk
+
+
+class _AsyncReplayStream(httpx.AsyncByteStream):
+    def __init__(self, path: Path, start: int, length: int, latency: float, bandwidth: float):
+        self.path, self.start, self.length = path, start, length
+        self.latency, self.bandwidth = latency, bandwidth
+
+    async def __aiter__(self):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        with open(self.path, "rb") as f:
+            f.seek(self.start)
+            remaining = self.length
+            while remaining > 0:
+                chunk = f.read(min(READ_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                if self.bandwidth:
+                    await asyncio.sleep(len(chunk) / self.bandwidth)
+                yield chunk
+
+
+class _ReplayBase:
+    def __init__(
+        self,
+        store: Optional[FixtureStore] = None,
+        mode: Optional[str] = None,
+        latency_ms: Optional[float] = None,
+        bandwidth_mbps: Optional[float] = None,
+    ):
+        mode = (mode or settings.HTTP_REPLAY_MODE).lower()
+        if mode not in REPLAY_MODES:
+            raise ValueError(f"Unknown replay mode {mode!r}; expected one of {REPLAY_MODES}")
+        self.mode = mode
+        self.store = store or FixtureStore()
+        latency_ms = settings.HTTP_REPLAY_LATENCY_MS if latency_ms is None else latency_ms
+        bandwidth_mbps = (
+            settings.HTTP_REPLAY_BANDWIDTH_MBPS if bandwidth_mbps is None else bandwidth_mbps
+        )
+        self.latency = max(0.0, latency_ms) / 1000.0
+        self.bandwidth = max(0.0, bandwidth_mbps) * 1_000_000 / 8  # bytes per second
+        self._recorded: set = set()
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        # "record" refreshes the store, but reuses what it recorded this session
+        if self.mode == "record" and key not in self._recorded:
+            return None
+        return self.store.load(key)
+
+    def _miss(self, request: httpx.Request) -> ReplayMiss:
+        return ReplayMiss(
+            f"No recorded response for {request.method} {_redact_url(str(request.url))}",
+            request=request,
+        )
+
+    @staticmethod
+    def _forward(request: httpx.Request) -> httpx.Request:
+        """Record whole bodies: Range requests are answered from the stored object."""
+        if "range" not in request.headers:
+            return request
+        headers = [(k, v) for k, v in request.headers.raw if k.lower() != b"range"]
+        return httpx.Request(
+            request.method,
+            request.url,
+            headers=headers,
+            content=request.content,
+            extensions=request.extensions,
+        )
+
+    def _save(
+        self,
+        request: httpx.Request,
+        key: str,
+        upstream: httpx.Response,
+        digest: str,
+        size: int,
+        elapsed: float,
+    ) -> Dict[str, Any]:
+        entry = {
+            "method": request.method,
+            "url": _redact_url(str(request.url)),
+            "status": upstream.status_code,
+            "headers": [
+                [k.decode("latin-1"), v.decode("latin-1")]
+                for k, v in upstream.headers.raw
+                if k.decode("latin-1").lower() not in _VOLATILE_HEADERS
+            ],
+            "body": digest,
+            "size": size,
+            "elapsed": round(elapsed, 3),
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        }
+        if request.method == "HEAD":
+            length = upstream.headers.get("content-length")
+            if length is not None:
+                entry["headers"].append(["content-length", length])
+        self.store.put_entry(key, entry)
+        self._recorded.add(key)
+        logger.debug(f"Recorded {request.method} {entry['url']} ({size} bytes)")
+        return entry
+
+    def _replay_parts(
+        self, request: httpx.Request, entry: Dict[str, Any]
+    ) -> Tuple[int, List[List[str]], int, int]:
+        status = entry["status"]
+        headers = [list(h) for h in entry["headers"]]
+        size = entry["size"]
+        if request.method == "HEAD":
+            return status, headers, 0, 0
+
+        start, length = 0, size
+        match = _RANGE_RE.match(request.headers.get("range", "").strip())
+        if match and status == 200 and size:
+            first, last = match.groups()
+            if first:
+                start, end = int(first), min(int(last), size - 1) if last else size - 1
+            else:
+                start, end = max(0, size - int(last or 0)), size - 1
+            if start < size and start <= end:
+                status, length = 206, end - start + 1
+                headers.append(["content-range", f"bytes {start}-{end}/{size}"])
+        headers.append(["content-length", str(length)])
+        return status, headers, start, length
+
+
+class ReplayTransport(_ReplayBase, httpx.BaseTransport):
+    """
+    httpx transport that records to / replays from a ``FixtureStore``.
+
+    Args:
+        inner: Transport used for live requests (default: a new HTTPTransport)
+        store / mode / latency_ms / bandwidth_mbps: See module docstring;
+            defaults come from settings
+    """
+
+    def __init__(self, inner: Optional[httpx.BaseTransport] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.inner = inner or httpx.HTTPTransport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if self.mode == "off":
+            return self.inner.handle_request(request)
+        key = self.store.request_key(request)
+        entry = self._lookup(key)
+        if entry is None:
+            if self.mode == "replay":
+                raise self._miss(request)
+            with self._lock_for(key):
+                # Parallel Range segments of one download record the body once
+                entry = self._lookup(key) or self._record(request, key)
+        if isinstance(entry, httpx.Response):
+            return entry
+        return self._respond(request, entry)
+
+    def _record(self, request: httpx.Request, key: str) -> Union[Dict[str, Any], httpx.Response]:
+        start = time.monotonic()
+        upstream = self.inner.handle_request(self._forward(request))
+        if not _recordable(upstream.status_code):
+            logger.debug(
+                f"Not recording HTTP {upstream.status_code} for {_redact_url(str(request.url))}"
+            )
+            return upstream
+        try:
+            digest, size = self.store.put_body(upstream.stream)
+        finally:
+            upstream.close()
+        return self._save(request, key, upstream, digest, size, time.monotonic() - start)
+
+    def _respond(self, request: httpx.Request, entry: Dict[str, Any]) -> httpx.Response:
+        status, headers, start, length = self._replay_parts(request, entry)
+        stream = _ReplayStream(
+            self.store.object_path(entry["body"]), start, length, self.latency, self.bandwidth
+        )
+        return httpx.Response(status, headers=headers, stream=stream, request=request)
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class AsyncReplayTransport(_ReplayBase, httpx.AsyncBaseTransport):
+    """Async counterpart of ``ReplayTransport`` for fan-out batches."""
+
+    def __init__(self, inner: Optional[httpx.AsyncBaseTransport] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.inner = inner or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.mode == "off":
+            return await self.inner.handle_async_request(request)
+        key = self.store.request_key(request)
+        entry = self._lookup(key)
+        if entry is None:
+            if self.mode == "replay":
+                raise self._miss(request)
+            entry = await self._record(request, key)
+        if isinstance(entry, httpx.Response):
+            return entry
+        return self._respond(request, entry)
+
+    async def _record(
+        self, request: httpx.Request, key: str
+    ) -> Union[Dict[str, Any], httpx.Response]:
+        start = time.monotonic()
+        upstream = await self.inner.handle_async_request(self._forward(request))
+        if not _recordable(upstream.status_code):
+            logger.debug(
+                f"Not recording HTTP {upstream.status_code} for {_redact_url(str(request.url))}"
+            )
+            return upstream
+        try:
+            body = b"".join([chunk async for chunk in upstream.stream])
+        finally:
+            await upstream.aclose()
+        digest, size = self.store.put_body([body])
+        return self._save(request, key, upstream, digest, size, time.monotonic() - start)
+
+    def _respond(self, request: httpx.Request, entry: Dict[str, Any]) -> httpx.Response:
+        status, headers, start, length = self._replay_parts(request, entry)
+        stream = _AsyncReplayStream(
+            self.store.object_path(entry["body"]), start, length, self.latency, self.bandwidth
+        )
+        return httpx.Response(status, headers=headers, stream=stream, request=request)
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+
+def replay_enabled() -> bool:
+    return settings.HTTP_REPLAY_MODE.lower() != "off"
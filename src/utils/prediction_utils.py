@@ -9,70 +9,148 @@ Rules:
 
 from __future__ import annotations
 
-from typing import Iterable, Optional, Tuple, List
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
 from sqlalchemy import text
 
-from config.database import get_db
+from config.database import bulk_insert, get_db
 from config.settings import get_settings
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 settings = get_settings()
 
-try:
-    from scipy.stats import theilslopes
-except Exception:  # pragma: no cover - optional dependency
-    theilslopes = None
+# Series key columns in the long frame passed to predict_series
+SERIES_KEYS = ["fips_code", "metric"]
 
 
-def _fit_trend(years: np.ndarray, values: np.ndarray, method: str = "theil_sen") -> Tuple[float, float]:
-    if method == "theil_sen" and theilslopes is not None:
-        slope, intercept, *_ = theilslopes(values, years)
-        return float(slope), float(intercept)
+def fit_trends(
+    years: np.ndarray,
+    values: np.ndarray,
+    method: str = "theil_sen"
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fit a linear trend to every row of a (series x observations) matrix at once.
 
-    # Fallback to simple linear regression
-    slope, intercept = np.polyfit(years, values, 1)
-    return float(slope), float(intercept)
+    Theil-Sen takes the median of all pairwise slopes and the intercept
+    median(y) - slope * median(x), matching scipy.stats.theilslopes; any other
+    method is ordinary least squares.
 
+    Args:
+        years: (n_series x n_obs) observation years, NaN-padded
+        values: (n_series x n_obs) observed values, NaN where ``years`` is NaN
+        method: "theil_sen" or "ols"
 
-def _predict_series(
-    years: np.ndarray,
-    values: np.ndarray,
+    Returns:
+        Tuple of (slopes, intercepts), each (n_series,); NaN for series with
+        fewer than two observations
+    """
+    years = np.asarray(years, dtype=float)
+    values = np.asarray(values, dtype=float)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if method == "theil_sen":
+            # Slopes of every observation pair (i < j) in one (series x pairs) matrix
+            i, j = np.triu_indices(years.shape[1], k=1)
+            dx = years[:, j] - years[:, i]
+            dy = values[:, j] - values[:, i]
+            pair_slopes = np.where(dx > 0, dy / dx, np.nan)
+
+            valid = ~np.isnan(pair_slopes).all(axis=1)
+            slopes = np.full(len(years), np.nan)
+            intercepts = np.full(len(years), np.nan)
+            if valid.any():
+                slopes[valid] = np.nanmedian(pair_slopes[valid], axis=1)
+                intercepts[valid] = (
+                    np.nanmedian(values[valid], axis=1) - slopes[valid] * np.nanmedian(years[valid], axis=1)
+                )
+            return slopes, intercepts
+
+        n = np.sum(~np.isnan(years), axis=1)
+        x_mean = np.nansum(years, axis=1) / n
+        y_mean = np.nansum(values, axis=1) / n
+        dx = years - x_mean[:, None]
+        sxx = np.nansum(dx * dx, axis=1)
+        sxy = np.nansum(dx * (values - y_mean[:, None]), axis=1)
+        slopes = np.where((n >= 2) & (sxx > 0), sxy / sxx, np.nan)
+        return slopes, y_mean - slopes * x_mean
+
+
+def predict_series(
+    observations: pd.DataFrame,
     target_year: int,
     min_years: int = 3,
     max_extrap: int = 2,
     method: str = "theil_sen",
     clip: Optional[Tuple[float, float]] = None
-) -> List[Tuple[int, float, int]]:
-    if len(years) < min_years:
-        return []
+) -> pd.DataFrame:
+    """
+    Predict the years after each series' last observation, for all series at once.
+
+    A series is predicted only with at least ``min_years`` observations and
+    when its last year is before ``target_year``; predictions stop at
+    ``target_year`` or ``max_extrap`` years past the last observation.
 
-    last_year = int(np.max(years))
-    if last_year >= target_year:
-        return []
+    Args:
+        observations: Long frame with SERIES_KEYS, data_year and value columns
+        target_year: Latest year to predict
+        min_years: Minimum observed years per series
+        max_extrap: Maximum years to extrapolate
+        method: Trend method (see fit_trends)
+        clip: Optional (low, high) bounds for predicted values
 
-    end_year = min(target_year, last_year + max_extrap)
-    if end_year <= last_year:
-        return []
+    Returns:
+        DataFrame with SERIES_KEYS, data_year, pred_value and pred_years
+        (years past the last observation)
+    """
+    columns = [*SERIES_KEYS, "data_year", "pred_value", "pred_years"]
+    obs = observations.dropna(subset=["data_year", "value"]).sort_values([*SERIES_KEYS, "data_year"])
+    if obs.empty or max_extrap < 1:
+        return pd.DataFrame(columns=columns)
 
-    slope, intercept = _fit_trend(years, values, method=method)
-    predictions = []
+    # Pack every series into NaN-padded (series x observations) matrices
+    grouped = obs.groupby(SERIES_KEYS, sort=False)
+    series = grouped.ngroup().to_numpy()
+    position = grouped.cumcount().to_numpy()
+    shape = (series.max() + 1, position.max() + 1)
+    years = np.full(shape, np.nan)
+    values = np.full(shape, np.nan)
+    years[series, position] = obs["data_year"].to_numpy(dtype=float)
+    values[series, position] = obs["value"].to_numpy(dtype=float)
+    keys = obs.loc[position == 0, SERIES_KEYS].reset_index(drop=True)
 
-    for year in range(last_year + 1, end_year + 1):
-        pred = slope * year + intercept
-        if clip is not None:
-            pred = max(clip[0], min(clip[1], pred))
-        predictions.append((year, float(pred), year - last_year))
+    counts = np.sum(~np.isnan(years), axis=1)
+    last_year = np.nanmax(years, axis=1)
+    end_year = np.minimum(target_year, last_year + max_extrap)
+    eligible = (counts >= min_years) & (last_year < target_year) & (end_year > last_year)
+    if not eligible.any():
+        return pd.DataFrame(columns=columns)
 
-    return predictions
+    slopes = np.full(shape[0], np.nan)
+    intercepts = np.full(shape[0], np.nan)
+    slopes[eligible], intercepts[eligible] = fit_trends(years[eligible], values[eligible], method=method)
 
+    # (series x horizon) grid of candidate years
+    horizons = np.arange(1, max_extrap + 1)
+    pred_years = last_year[:, None] + horizons
+    predicted = slopes[:, None] * pred_years + intercepts[:, None]
+    if clip is not None:
+        predicted = np.clip(predicted, clip[0], clip[1])
+    keep = eligible[:, None] & (pred_years <= end_year[:, None]) & ~np.isnan(predicted)
 
-def apply_predictions_to_table(
+    rows, steps = np.nonzero(keep)
+    result = keys.iloc[rows].reset_index(drop=True)
+    result["data_year"] = pred_years[rows, steps].astype(int)
+    result["pred_value"] = predicted[rows, steps]
+    result["pred_years"] = horizons[steps]
+    return result[columns]
+
+
+def apply_table_predictions(
     table: str,
-    metric_col: str,
+    metric_cols: Sequence[str],
     target_year: Optional[int] = None,
     fips_col: str = "fips_code",
     year_col: str = "data_year",
@@ -82,95 +160,131 @@ def apply_predictions_to_table(
     clip: Optional[Tuple[float, float]] = None,
     source_label: str = "predicted",
     use_effective: Optional[bool] = None
-) -> int:
+) -> Dict[str, int]:
     """
-    Predict missing years for a metric and upsert into the table as *_pred columns.
-    Returns the number of predicted rows inserted/updated.
+    Predict missing years for several metrics of one table and upsert *_pred columns.
+
+    All metrics are read in one query, every (geography, metric) series is
+    fitted in one batch, and the predictions are written with one bulk
+    upsert. A row predicted for one metric keeps the stored *_pred values of
+    the others.
+
+    Returns:
+        Number of predicted rows per metric
     """
     target_year = target_year or settings.PREDICT_TO_YEAR
     min_years = min_years if min_years is not None else settings.PREDICTION_MIN_YEARS
     max_extrap = max_extrap if max_extrap is not None else settings.PREDICTION_MAX_EXTRAP_YEARS
     use_effective = use_effective if use_effective is not None else settings.USE_EFFECTIVE_VALUES
-
-    pred_col = f"{metric_col}_pred"
-    pred_flag_col = f"{metric_col}_predicted"
-    pred_method_col = f"{metric_col}_pred_method"
-    pred_years_col = f"{metric_col}_pred_years"
-    source_col = f"{metric_col}_source"
-    effective_col = f"{metric_col}_effective"
+    metric_cols = list(metric_cols)
 
     with get_db() as db:
         result = db.execute(text(f"""
-            SELECT {fips_col} AS fips_code, {year_col} AS data_year, {metric_col} AS value
+            SELECT {fips_col} AS fips_code, {year_col} AS data_year, {', '.join(metric_cols)}
             FROM {table}
-            WHERE {metric_col} IS NOT NULL
+            WHERE {' OR '.join(f'{col} IS NOT NULL' for col in metric_cols)}
             ORDER BY {fips_col}, {year_col}
         """))
         rows = result.fetchall()
 
         if not rows:
-            logger.warning(f"No data found for {table}.{metric_col}; skipping prediction")
-            return 0
-
-        df = pd.DataFrame(rows, columns=["fips_code", "data_year", "value"])
-        df["data_year"] = pd.to_numeric(df["data_year"], errors="coerce")
-        df["value"] = pd.to_numeric(df["value"], errors="coerce")
-
-        inserted = 0
-
-        for fips_code, sub in df.groupby("fips_code"):
-            years = sub["data_year"].values
-            values = sub["value"].values
-            predictions = _predict_series(
-                years=years,
-                values=values,
-                target_year=target_year,
-                min_years=min_years,
-                max_extrap=max_extrap,
-                method=method,
-                clip=clip
-            )
+            logger.warning(f"No data found for {table} ({', '.join(metric_cols)}); skipping prediction")
+            return {col: 0 for col in metric_cols}
+
+        wide = pd.DataFrame(rows, columns=["fips_code", "data_year", *metric_cols])
+        observations = wide.melt(
+            id_vars=["fips_code", "data_year"], var_name="metric", value_name="value"
+        )
+        observations["data_year"] = pd.to_numeric(observations["data_year"], errors="coerce")
+        observations["value"] = pd.to_numeric(observations["value"], errors="coerce")
 
-            for pred_year, pred_value, pred_years in predictions:
-                db.execute(text(f"""
-                    INSERT INTO {table} (
-                        {fips_col}, {year_col},
-                        {pred_col}, {pred_flag_col},
-                        {pred_method_col}, {pred_years_col},
-                        {source_col}{',' + effective_col if use_effective else ''}
-                    ) VALUES (
-                        :fips_code, :data_year,
-                        :pred_value, TRUE,
-                        :pred_method, :pred_years,
-                        :source_label{',' + ':effective_value' if use_effective else ''}
-                    )
-                    ON CONFLICT ({fips_col}, {year_col})
-                    DO UPDATE SET
-                        {pred_col} = EXCLUDED.{pred_col},
-                        {pred_flag_col} = EXCLUDED.{pred_flag_col},
-                        {pred_method_col} = EXCLUDED.{pred_method_col},
-                        {pred_years_col} = EXCLUDED.{pred_years_col},
-                        {source_col} = EXCLUDED.{source_col}
-                        {',' + f'{effective_col} = COALESCE({table}.{metric_col}, EXCLUDED.{pred_col})' if use_effective else ''}
-                """), {
-                    "fips_code": fips_code,
-                    "data_year": int(pred_year),
-                    "pred_value": float(pred_value),
-                    "pred_method": method,
-                    "pred_years": int(pred_years),
-                    "source_label": source_label,
-                    "effective_value": float(pred_value) if use_effective else None
-                })
-                inserted += 1
+        predictions = predict_series(
+            observations,
+            target_year=target_year,
+            min_years=min_years,
+            max_extrap=max_extrap,
+            method=method,
+            clip=clip
+        )
+        counts = predictions["metric"].value_counts()
+
+        if not predictions.empty:
+            bulk_insert(
+                table,
+                _prediction_records(predictions, metric_cols, fips_col, year_col, method, source_label),
+                conflict_cols=[fips_col, year_col],
+                keep_existing=True,
+                db=db
+            )
 
         if use_effective:
+            assignments = ", ".join(f"{col}_effective = COALESCE({col}, {col}_pred)" for col in metric_cols)
             db.execute(text(f"""
                 UPDATE {table}
-                SET {effective_col} = COALESCE({metric_col}, {pred_col})
+                SET {assignments}
                 WHERE {year_col} <= :target_year
             """), {"target_year": int(target_year)})
 
-        db.commit()
-
-    logger.info(f"Applied predictions for {table}.{metric_col}: {inserted} rows")
+    inserted = {col: int(counts.get(col, 0)) for col in metric_cols}
+    for col, count in inserted.items():
+        logger.info(f"Applied predictions for {table}.{col}: {count} rows")
     return inserted
+
+
+def _prediction_records(
+    predictions: pd.DataFrame,
+    metric_cols: List[str],
+    fips_col: str,
+    year_col: str,
+    method: str,
+    source_label: str
+) -> List[Dict]:
+    """One upsert row per (geography, year) with *_pred columns for every metric."""
+    index = ["fips_code", "data_year"]
+    pred_values = predictions.pivot(index=index, columns="metric", values="pred_value").reindex(columns=metric_cols)
+    pred_years = predictions.pivot(index=index, columns="metric", values="pred_years").reindex(columns=metric_cols)
+
+    records = pd.DataFrame({
+        fips_col: pred_values.index.get_level_values("fips_code"),
+        year_col: pred_values.index.get_level_values("data_year").astype(int),
+    })
+    for col in metric_cols:
+        present = pred_values[col].notna().to_numpy()
+        records[f"{col}_pred"] = np.where(present, pred_values[col].to_numpy(dtype=float), None)
+        records[f"{col}_predicted"] = np.where(present, True, None)
+        records[f"{col}_pred_method"] = np.where(present, method, None)
+        records[f"{col}_pred_years"] = [int(v) if ok else None for v, ok in zip(pred_years[col], present)]
+        records[f"{col}_source"] = np.where(present, source_label, None)
+    return records.astype(object).to_dict("records")
+
+
+def apply_predictions_to_table(
+    table: str,
+    metric_col: str,
+    target_year: Optional[int] = None,
+    fips_col: str = "fips_code",
+    year_col: str = "data_year",
+    min_years: Optional[int] = None,
+    max_extrap: Optional[int] = None,
+    method: str = "theil_sen",
+    clip: Optional[Tuple[float, float]] = None,
+    source_label: str = "predicted",
+    use_effective: Optional[bool] = None
+) -> int:
+    """
+    Predict missing years for a metric and upsert into the table as *_pred columns.
+    Returns the number of predicted rows inserted/updated.
+    """
+    return apply_table_predictions(
+        table,
+        [metric_col],
+        target_year=target_year,
+        fips_col=fips_col,
+        year_col=year_col,
+        min_years=min_years,
+        max_extrap=max_extrap,
+        method=method,
+        clip=clip,
+        source_label=source_label,
+        use_effective=use_effective
+    )[metric_col]
@@ -0,0 +1,295 @@
+"""
+Token-bucket rate limiting shared by threads, asyncio tasks and worker processes.
+
+Each limiter refills ``calls_per_minute`` tokens per minute up to ``burst``.
+Callers reserve a token under a lock and sleep outside it, so concurrent
+callers queue behind each other instead of all waking at once. When a
+``state_path`` is configured the bucket lives in a small SQLite table, so
+every process pointing at the same file shares one budget per API.
+
+HTTP 429/503 responses fed back through ``record_response`` halve the
+effective rate and pause the bucket (honouring Retry-After); successful
+responses restore the configured rate step by step.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from functools import wraps
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+BACKOFF_STATUS_CODES = (429, 503)
+
+
+@dataclass
+class BucketState:
+    """Token count as of ``updated``; ``updated`` lies in the future while paused."""
+
+    tokens: float
+    updated: float
+    scale: float = 1.0
+
+
+class _MemoryStore:
+    """Bucket state held in-process, guarded by a thread lock."""
+
+    def __init__(self):
+        self._state: Optional[BucketState] = None
+        self._lock = threading.Lock()
+
+    def transact(self, update):
+        with self._lock:
+            self._state, result = update(self._state)
+            return result
+
+
+class _SQLiteStore:
+    """Bucket state in a SQLite file so separate processes share one budget."""
+
+    def __init__(self, path: str, name: str):
+        self.path = str(path)
+        self.name = name
+        self._local = threading.local()
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limits ("
+                "name TEXT PRIMARY KEY, tokens REAL, updated REAL, scale REAL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def transact(self, update):
+        conn = self._connect()
+        # BEGIN IMMEDIATE takes the write lock up front, serialising all processes
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT tokens, updated, scale FROM rate_limits WHERE name = ?", (self.name,)
+            ).fetchone()
+            state = BucketState(*row) if row else None
+            state, result = update(state)
+            if state is not None:
+                conn.execute(
+                    "INSERT OR REPLACE INTO rate_limits (name, tokens, updated, scale) "
+                    "VALUES (?, ?, ?, ?)",
+                    (self.name, state.tokens, state.updated, state.scale),
+                )
+            conn.execute("COMMIT")
+            return result
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+
+def _retry_after_seconds(value: Any) -> Optional[float]:
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter for API requests.
+
+    Usable as a decorator (sync or async functions), a context manager, or by
+    calling ``acquire()`` / ``await acquire_async()`` before each request.
+
+    Args:
+        calls_per_minute: Sustained refill rate
+        burst: Bucket capacity; 1 means evenly spaced calls with no bursting
+        name: Bucket key when state is shared through ``state_path``
+        state_path: SQLite file for cross-process coordination (None = in-process)
+        min_scale: Floor for the adaptive rate multiplier after repeated 429/503s
+        recovery: Rate multiplier regained per successful response
+
+    Example:
+        census_limiter = RateLimiter(8, burst=2, name="census")
+
+        @census_limiter
+        def fetch(...):
+            response = requests.get(...)
+            census_limiter.record_response(response)
+    """
+
+    def __init__(
+        self,
+        calls_per_minute: int,
+        burst: int = 1,
+        name: Optional[str] = None,
+        state_path: Optional[str] = None,
+        min_scale: float = 1 / 16,
+        recovery: float = 0.1,
+    ):
+        if calls_per_minute <= 0:
+            raise ValueError("calls_per_minute must be positive")
+        self.calls_per_minute = calls_per_minute
+        self.rate = calls_per_minute / 60.0
+        self.min_interval = 60.0 / calls_per_minute
+        self.burst = max(1, burst)
+        self.name = name or f"limiter_{calls_per_minute}"
+        self.min_scale = min_scale
+        self.recovery = recovery
+        self.last_call = 0.0
+        self._store = _SQLiteStore(state_path, self.name) if state_path else _MemoryStore()
+
+    # ------------------------------------------------------------------
+    # Bucket arithmetic
+    # ------------------------------------------------------------------
+
+    def _refill(self, state: Optional[BucketState], now: float) -> BucketState:
+        if state is None:
+            return BucketState(tokens=float(self.burst), updated=now)
+        # While paused ``updated`` lies in the future and nothing accrues
+        if now > state.updated:
+            state.tokens = min(
+                float(self.burst), state.tokens + (now - state.updated) * self.rate * state.scale
+            )
+            state.updated = now
+        return state
+
+    def _reserve(self) -> float:
+        """Take one token and return how long the caller must wait before using it."""
+        now = time.time()
+
+        def update(state):
+            state = self._refill(state, now)
+            state.tokens -= 1
+            wait = (state.updated - now) + max(0.0, -state.tokens) / (self.rate * state.scale)
+            return state, wait
+
+        return self._store.transact(update)
+
+    def acquire(self) -> None:
+        """Block the calling thread until a token is available."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        self.last_call = time.time()
+
+    async def acquire_async(self) -> None:
+        """Wait for a token without blocking the event loop."""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        self.last_call = time.time()
+
+    # ------------------------------------------------------------------
+    # Adaptive backoff
+    # ------------------------------------------------------------------
+
+    def penalize(self, retry_after: Optional[float] = None) -> float:
+        """Halve the effective rate and pause the bucket; returns the pause in seconds."""
+        now = time.time()
+
+        def update(state):
+            state = self._refill(state, now)
+            state.scale = max(self.min_scale, state.scale / 2)
+            pause = retry_after if retry_after is not None else 1 / (self.rate * state.scale)
+            # The pause replaces any partial refill: one call may go out when it
+            # ends. Reservations already sleeping stay queued ahead of it.
+            state.tokens = 1.0 if state.tokens >= 0 else state.tokens
+            state.updated = max(state.updated, now + pause)
+            return state, pause
+
+        pause = self._store.transact(update)
+        logger.warning(
+            f"Rate limiter '{self.name}' backing off {pause:.1f}s after throttling response"
+        )
+        return pause
+
+    def reward(self) -> None:
+        """Recover part of the configured rate after a successful response."""
+
+        def update(state):
+            if state is not None:
+                state.scale = min(1.0, state.scale + self.recovery)
+            return state, None
+
+        self._store.transact(update)
+
+    def record_response(self, response: Any) -> None:
+        """Feed an HTTP response back into the limiter (429/503 back off, 2xx recover)."""
+        status = getattr(response, "status_code", None)
+        if status in BACKOFF_STATUS_CODES:
+            headers = getattr(response, "headers", None) or {}
+            self.penalize(_retry_after_seconds(headers.get("Retry-After")))
+        elif status is not None and status < 400:
+            self.reward()
+
+    @property
+    def scale(self) -> float:
+        """Current adaptive multiplier applied to the configured rate."""
+        return self._store.transact(lambda state: (state, state.scale if state else 1.0))
+
+    # ------------------------------------------------------------------
+    # Decorator / context manager
+    # ------------------------------------------------------------------
+
+    def __call__(self, func):
+        if asyncio.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                await self.acquire_async()
+                return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            self.acquire()
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    async def __aenter__(self):
+        await self.acquire_async()
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+_HOST_LIMITERS: Dict[str, RateLimiter] = {}
+_HOST_LIMITERS_LOCK = threading.Lock()
+
+
+def host_limiter(
+    url: str, calls_per_minute: int, burst: int = 1, state_path: Optional[str] = None
+) -> RateLimiter:
+    """Return the limiter shared by every request to the host serving ``url``."""
+    host = urlparse(url).netloc
+    with _HOST_LIMITERS_LOCK:
+        limiter = _HOST_LIMITERS.get(host)
+        if (
+            limiter is None
+            or limiter.calls_per_minute != calls_per_minute
+            or limiter.burst != burst
+        ):
+            limiter = RateLimiter(calls_per_minute, burst=burst, name=host, state_path=state_path)
+            _HOST_LIMITERS[host] = limiter
+        return limiter
@@ -1,10 +1,14 @@
+import asyncio
+import json
+import os
+import time
 from datetime import datetime
 from types import SimpleNamespace
 
 from fastapi.testclient import TestClient
 
 import src.api.main as api_main
-from src.api.routes import get_db_session
+from src.api.routes import get_async_db
 
 
 class DummyResult:
@@ -19,16 +23,21 @@ class DummyResult:
         return self._fetchall_value or []
 
 
-class DummySession:
-    def __init__(self, results):
+class DummyDatabase:
+    def __init__(self, results, delay=0.0):
         self._results = list(results)
-        self.closed = False
+        self.delay = delay
 
-    def execute(self, *args, **kwargs):
-        return self._results.pop(0)
+    async def _next(self):
+        result = self._results.pop(0)
+        await asyncio.sleep(self.delay)
+        return result
 
-    def close(self):
-        self.closed = True
+    async def fetchone(self, query, params=None):
+        return (await self._next()).fetchone()
+
+    async def fetchall(self, query, params=None):
+        return (await self._next()).fetchall()
 
 
 class AttrDict(SimpleNamespace):
@@ -36,8 +45,8 @@ class AttrDict(SimpleNamespace):
         return None
 
 
-def _client_with_db(results):
-    api_main.app.dependency_overrides[get_db_session] = lambda: DummySession(results)
+def _client_with_db(results, delay=0.0):
+    api_main.app.dependency_overrides[get_async_db] = lambda: DummyDatabase(results, delay)
     return TestClient(api_main.app)
 
 
@@ -81,6 +90,86 @@ def test_geojson_versioned_file(monkeypatch, tmp_path):
     assert resp.status_code == 200
 
 
+def test_geojson_precompressed_variant_and_conditional_get(monkeypatch, tmp_path):
+    from src.export.geojson_export import calculate_file_checksum, publish_immutable_copy, write_precompressed_variants
+
+    body = '{"type":"FeatureCollection","features":[' + ",".join(['{"type":"Feature"}'] * 200) + "]}"
+    geo_path = tmp_path / "md_counties_latest.geojson"
+    geo_path.write_text(body)
+    variants = write_precompressed_variants(str(geo_path))
+    checksum = calculate_file_checksum(str(geo_path))
+    publish_immutable_copy(str(geo_path), checksum)
+    monkeypatch.setattr(api_main.settings, "EXPORT_DIR", str(tmp_path), raising=False)
+
+    assert os.path.getsize(variants["gzip"]) < len(body)
+    client = TestClient(api_main.app)
+
+    resp = client.get("/api/v1/layers/counties/latest", headers={"Accept-Encoding": "gzip"})
+    assert resp.status_code == 200
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.headers["vary"] == "Accept-Encoding"
+    assert resp.headers["cache-control"] == "public, no-cache"
+    assert resp.headers["content-location"] == f"/api/v1/layers/counties/{checksum[:16]}"
+    assert resp.text == body
+
+    plain = client.get("/api/v1/layers/counties/latest", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["etag"] != resp.headers["etag"]
+
+    revalidated = client.get(
+        "/api/v1/layers/counties/latest",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": resp.headers["etag"]},
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+
+    immutable = client.get(resp.headers["content-location"])
+    assert immutable.status_code == 200
+    assert "immutable" in immutable.headers["cache-control"]
+    assert immutable.text == body
+
+
+def test_tract_geojson_by_resolution(monkeypatch, tmp_path):
+    (tmp_path / "md_tracts_low_latest.geojson").write_text('{"type":"FeatureCollection","features":[]}')
+    monkeypatch.setattr(api_main.settings, "EXPORT_DIR", str(tmp_path), raising=False)
+
+    client = TestClient(api_main.app)
+    assert client.get("/api/v1/layers/tracts/low").status_code == 200
+    assert client.get("/api/v1/layers/tracts/medium").status_code == 404
+    assert client.get("/api/v1/layers/tracts/ultra").status_code == 400
+
+
+def test_vector_tiles_and_tilejson(monkeypatch, tmp_path):
+    import geopandas as gpd
+    from shapely.geometry import box
+    from src.export.vector_tiles import write_mbtiles
+
+    gdf = gpd.GeoDataFrame({"fips_code": ["24001"]}, geometry=[box(-77.0, 39.0, -76.5, 39.5)], crs="EPSG:4326")
+    write_mbtiles(gdf, str(tmp_path / "md_counties.mbtiles"), "counties", 0, 4)
+    monkeypatch.setattr(api_main.settings, "EXPORT_DIR", str(tmp_path), raising=False)
+    client = TestClient(api_main.app)
+
+    tilejson = client.get("/api/v1/tiles/counties.json").json()
+    assert tilejson["maxzoom"] == 4
+    assert tilejson["vector_layers"][0]["id"] == "counties"
+    template = tilejson["tiles"][0]
+    assert template.endswith(f"/api/v1/tiles/counties/{{z}}/{{x}}/{{y}}.mvt?v={tilejson['version']}")
+
+    tile = client.get(template.replace("{z}/{x}/{y}", "0/0/0"), headers={"Accept-Encoding": "gzip"})
+    assert tile.status_code == 200
+    assert tile.headers["content-type"] == "application/vnd.mapbox-vector-tile"
+    assert tile.headers["content-encoding"] == "gzip"
+    assert "immutable" in tile.headers["cache-control"]
+
+    unversioned = client.get("/api/v1/tiles/counties/0/0/0.mvt", headers={"If-None-Match": tile.headers["etag"]})
+    assert unversioned.status_code == 304
+    assert "immutable" not in unversioned.headers["cache-control"]
+
+    # Southern hemisphere tile has no Maryland features
+    assert client.get("/api/v1/tiles/counties/1/0/1.mvt").status_code == 204
+    assert client.get("/api/v1/tiles/blocks/0/0/0.mvt").status_code == 404
+
+
 def test_area_detail_endpoint():
     result = AttrDict(
         fips_code="24001",
@@ -98,7 +187,8 @@ def test_area_detail_endpoint():
         risk_drag_score=0.2,
     )
 
-    client = _client_with_db([DummyResult(fetchone_value=result)])
+    # No read model row yet: falls back to the live synthesis query
+    client = _client_with_db([DummyResult(), DummyResult(fetchone_value=result)])
     resp = client.get("/api/v1/areas/24001")
     assert resp.status_code == 200
     body = resp.json()
@@ -124,15 +214,37 @@ def test_layer_detail_endpoint():
     )
 
     client = _client_with_db([
+        DummyResult(),
         DummyResult(fetchone_value=layer_result),
         DummyResult(fetchone_value=ts_result),
-    ])
+    ], delay=0.2)
 
+    start = time.monotonic()
     resp = client.get("/api/v1/areas/24001/layers/employment_gravity")
+    elapsed = time.monotonic() - start
     assert resp.status_code == 200
     body = resp.json()
     assert body["layer_key"] == "employment_gravity"
     assert body["score"] == 0.7
+    assert body["momentum_direction"] == "up"
+    # Read model miss, then layer and timeseries queries concurrently (not three round trips)
+    assert elapsed < 0.58
+
+
+def test_detail_endpoints_serve_read_model_row():
+    from src.api.read_model import build_layer_payload
+
+    layer_row = AttrDict(data_year=2024, economic_opportunity_index=0.61)
+    payload = build_layer_payload("employment_gravity", layer_row, AttrDict(momentum_slope=-0.05, coverage_years=4))
+
+    client = _client_with_db([DummyResult(fetchone_value=AttrDict(payload=json.dumps(payload)))])
+    resp = client.get("/api/v1/areas/24001/layers/employment_gravity")
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["score"] == 0.61
+    assert body["data_year"] == 2024
+    assert body["momentum_direction"] == "down"
 
 
 def test_refresh_status_endpoint():
@@ -150,3 +262,137 @@ def test_refresh_status_endpoint():
     resp = client.get("/api/v1/metadata/refresh?limit=1")
     assert resp.status_code == 200
     assert len(resp.json()) == 1
+
+
+def test_read_model_rows_cover_area_and_layers():
+    from src.api.read_model import AREA_KEY, build_read_model_rows
+
+    synthesis = AttrDict(
+        fips_code="24001",
+        data_year=2025,
+        final_grouping="stable_constrained",
+        directional_status="stable",
+        confidence_level="conditional",
+        composite_score=0.55,
+        updated_at=datetime(2025, 1, 1),
+        employment_gravity_score=0.6,
+        risk_drag_score=0.2,
+    )
+    layer_row = AttrDict(fips_code="24001", data_year=2025, economic_opportunity_index=0.7)
+    ts_row = AttrDict(geoid="24001", layer_name="employment_gravity", momentum_slope=0.02, coverage_years=5)
+
+    rows = build_read_model_rows([synthesis], {"employment_gravity": [layer_row]}, [ts_row])
+
+    by_key = {(r["geoid"], r["layer_key"]): json.loads(r["payload"]) for r in rows}
+    assert set(by_key) == {("24001", AREA_KEY), ("24001", "employment_gravity")}
+    assert by_key[("24001", AREA_KEY)]["county_name"]
+    assert by_key[("24001", AREA_KEY)]["last_updated"] == "2025-01-01T00:00:00"
+    assert by_key[("24001", "employment_gravity")]["momentum_direction"] == "up"
+
+
+def _synthesis_row(fips_code, score):
+    return AttrDict(
+        fips_code=fips_code,
+        data_year=2025,
+        final_grouping="stable_constrained",
+        directional_status="stable",
+        confidence_level="conditional",
+        composite_score=score,
+        updated_at=datetime(2025, 1, 1),
+        employment_gravity_score=score,
+    )
+
+
+def test_batch_area_details_mix_read_model_and_live_rows():
+    from src.api.read_model import build_area_payload
+
+    cached = AttrDict(geoid="24001", layer_key="area", payload=json.dumps(build_area_payload(_synthesis_row("24001", 0.4), "Allegany County")))
+    client = _client_with_db([
+        DummyResult(fetchall_value=[cached]),
+        DummyResult(fetchall_value=[_synthesis_row("24003", 0.7)]),
+    ])
+
+    resp = client.get("/api/v1/areas?geoids=24003,24001,24005")
+
+    assert resp.status_code == 200
+    # Request order is kept; 24005 has no data and is omitted
+    assert [a["fips_code"] for a in resp.json()] == ["24003", "24001"]
+    assert resp.json()[0]["composite_score"] == 0.7
+
+
+def test_batch_area_details_rejects_unknown_geoids():
+    client = _client_with_db([])
+    resp = client.get("/api/v1/areas?geoids=24001,99999")
+    assert resp.status_code == 404
+    assert "99999" in resp.json()["detail"]
+
+
+def test_all_layer_details_in_one_request():
+    from src.api.read_model import LAYER_CONFIGS, build_layer_payload
+
+    cached = [
+        AttrDict(geoid="24001", layer_key=key, payload=build_layer_payload(key, AttrDict(data_year=2025)))
+        for key in LAYER_CONFIGS if key != "risk_drag"
+    ]
+    client = _client_with_db([
+        DummyResult(fetchall_value=cached),
+        DummyResult(fetchone_value=AttrDict(data_year=2024, risk_drag_index=0.3)),
+        DummyResult(fetchall_value=[AttrDict(layer_name="risk_drag", momentum_slope=0.0, coverage_years=3)]),
+    ])
+
+    resp = client.get("/api/v1/areas/24001/layers")
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert [layer["layer_key"] for layer in body] == list(LAYER_CONFIGS)
+    assert body[-1]["score"] == 0.3
+    assert body[-1]["momentum_direction"] == "stable"
+
+
+def test_scenario_evaluate_endpoint(monkeypatch):
+    from tests.test_processing_scenarios import _baseline
+    from src.processing import scenarios
+
+    baseline = _baseline()
+    monkeypatch.setattr(scenarios, "get_baseline", lambda as_of_year=None: baseline)
+    client = TestClient(api_main.app)
+
+    resp = client.post(
+        "/api/v1/scenarios/evaluate",
+        json={"thresholds": {"THRESHOLD_IMPROVING_HIGH": 0.35, "THRESHOLD_IMPROVING_MIN_LAYERS": 2}},
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert len(body["results"]) == 24
+    assert body["summary"]["changed"] == len({c["geoid"] for c in body["changes"]})
+
+    resp = client.post("/api/v1/scenarios/evaluate", json={"layer_weights": {"unknown_layer": 1}})
+    assert resp.status_code == 422
+    assert "unknown_layer" in resp.json()["detail"]
+
+
+def test_metadata_coverage_cached_by_snapshot_id():
+    import src.api.routes as routes
+
+    routes._coverage_cache.update(id=None, report=None)
+    report = {"computed_at": "2026-10-18T00:00:00", "features": [], "by_year": []}
+
+    client = _client_with_db([DummyResult(fetchone_value=AttrDict(id=None))])
+    assert client.get("/api/v1/metadata/coverage").status_code == 404
+
+    client = _client_with_db([
+        DummyResult(fetchone_value=AttrDict(id=3)),
+        DummyResult(fetchone_value=AttrDict(id=3, report=json.dumps(report))),
+    ])
+    resp = client.get("/api/v1/metadata/coverage")
+    assert resp.status_code == 200
+    assert resp.json() == report
+    assert resp.headers["etag"] == '"coverage-3"'
+
+    # Same snapshot: served from cache with only the id lookup
+    client = _client_with_db([DummyResult(fetchone_value=AttrDict(id=3))])
+    assert client.get("/api/v1/metadata/coverage").json() == report
+
+    client = _client_with_db([DummyResult(fetchone_value=AttrDict(id=3))])
+    resp = client.get("/api/v1/metadata/coverage", headers={"If-None-Match": '"coverage-3"'})
+    assert resp.status_code == 304
@@ -0,0 +1,109 @@
+import os
+from datetime import datetime
+
+import geopandas as gpd
+import pandas as pd
+from shapely.geometry import box
+
+import src.export.geojson_export as ge
+
+
+def _synthesis(score=0.5, updated_at=datetime(2026, 1, 1)):
+    return pd.DataFrame(
+        {
+            "fips_code": ["24001", "24003"],
+            "data_year": [2025, 2025],
+            "synthesis_grouping": ["stable_constrained", "emerging_tailwinds"],
+            "composite_score": [score, 0.7],
+            "primary_strengths": [["Employment Gravity"], []],
+            "updated_at": [updated_at, updated_at],
+        }
+    )
+
+
+def _setup(monkeypatch, tmp_path, synthesis):
+    boundaries = gpd.GeoDataFrame(
+        {"fips_code": ["24001", "24003"], "county_name": ["Allegany", "Anne Arundel"]},
+        geometry=[box(-79.0, 39.4, -78.5, 39.7), box(-76.8, 38.8, -76.4, 39.2)],
+        crs="EPSG:4326",
+    )
+    versions = []
+    monkeypatch.setattr(ge.settings, "EXPORT_DIR", str(tmp_path))
+    monkeypatch.setattr(ge, "fetch_latest_synthesis", lambda: synthesis["df"])
+    monkeypatch.setattr(ge, "fetch_maryland_county_boundaries", lambda: boundaries.copy())
+    monkeypatch.setattr(ge, "log_refresh", lambda **kwargs: None)
+    monkeypatch.setattr(ge, "log_export_version", lambda *args, **kwargs: versions.append(args))
+    monkeypatch.setattr(ge, "export_tileset", lambda *args: None)
+    return versions
+
+
+def test_unchanged_inputs_skip_regeneration(monkeypatch, tmp_path):
+    synthesis = {"df": _synthesis()}
+    versions = _setup(monkeypatch, tmp_path, synthesis)
+
+    first = ge.run_geojson_export()
+    latest_mtime = os.stat(first["latest_path"]).st_mtime_ns
+
+    # A re-run of the pipeline only bumps updated_at: still the same data
+    synthesis["df"] = _synthesis(updated_at=datetime(2026, 1, 2))
+    second = ge.run_geojson_export()
+
+    assert first["skipped"] is False and second["skipped"] is True
+    assert second["checksum"] == first["checksum"]
+    assert os.stat(first["latest_path"]).st_mtime_ns == latest_mtime
+    assert len(versions) == 1
+
+    # Forced rebuild of the original inputs reproduces the same bytes
+    synthesis["df"] = _synthesis()
+    forced = ge.run_geojson_export(force=True)
+    assert forced["skipped"] is False
+    assert forced["checksum"] == first["checksum"]
+
+
+def test_fingerprint_ignores_row_order():
+    config = {"boundary_year": 2020}
+    df = pd.concat([_synthesis(), _synthesis(score=0.6).iloc[:1].assign(fips_code="24005")])
+    # Sorts first alphabetically and is the same on every row, as in final_synthesis_current
+    df["classification_version"] = "v2.0"
+    shuffled = df.sample(frac=1, random_state=3)
+    assert list(shuffled["fips_code"]) != list(df["fips_code"])
+
+    assert ge.compute_export_fingerprint(
+        "county", {"synthesis": df}, config
+    ) == ge.compute_export_fingerprint("county", {"synthesis": shuffled}, config)
+    assert ge.compute_export_fingerprint(
+        "county", {"synthesis": df}, config
+    ) == ge.compute_export_fingerprint("county", {"synthesis": df.iloc[::-1]}, config)
+
+
+def test_fingerprint_ignores_run_timestamps():
+    config = {"boundary_year": 2020}
+    df = _synthesis().assign(last_updated="2026-01-01T00:00:00")
+    rerun = _synthesis(updated_at=datetime(2026, 1, 2)).assign(last_updated="2026-01-02T00:00:00")
+
+    assert ge.compute_export_fingerprint(
+        "county", {"synthesis": df}, config
+    ) == ge.compute_export_fingerprint("county", {"synthesis": rerun}, config)
+
+
+def test_changed_inputs_publish_new_content_addressed_version(monkeypatch, tmp_path):
+    synthesis = {"df": _synthesis()}
+    _setup(monkeypatch, tmp_path, synthesis)
+
+    first = ge.run_geojson_export()
+    synthesis["df"] = _synthesis(score=0.9)
+    second = ge.run_geojson_export()
+
+    assert second["skipped"] is False
+    assert second["checksum"] != first["checksum"]
+    assert (
+        os.path.basename(second["immutable_path"])
+        == f"md_counties_{second['checksum'][:16]}.geojson"
+    )
+    # Previous content-addressed version is untouched by the new export
+    assert ge.calculate_file_checksum(first["immutable_path"]) == first["checksum"]
+    assert ge.calculate_file_checksum(
+        first["immutable_path"] + ".gz"
+    ) != ge.calculate_file_checksum(second["immutable_path"] + ".gz")
+    # Dated snapshot shares storage with the content-addressed file
+    assert os.path.samefile(second["versioned_path"], second["immutable_path"])
@@ -0,0 +1,66 @@
+import json
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+from shapely.geometry import Point, Polygon
+
+from src.export.geojson_export import export_geojson, prepare_geojson_properties
+from src.export.geojson_writer import geometry_json, write_geojson
+
+
+def _gdf():
+    return gpd.GeoDataFrame(
+        {
+            "fips_code": ["24001", "24003"],
+            "composite_score": [0.123456789, np.nan],
+            "coverage_years": pd.array([5, None], dtype="Int64"),
+            "primary_strengths": [("Employment Gravity",), None],
+            "uncertainty_reasons": [["sparse_data"], None],
+            "updated_at": pd.to_datetime(["2026-01-02 03:04:05", None]),
+        },
+        geometry=[
+            Polygon([(-76.123456789, 39.1), (-76.2, 39.333333333), (-76.0, 39.2)]),
+            None,
+        ],
+        crs="EPSG:4326",
+    )
+
+
+def test_writes_identical_outputs_with_json_native_properties(tmp_path):
+    gdf = prepare_geojson_properties(_gdf())
+    latest, versioned = tmp_path / "latest.geojson", tmp_path / "out" / "v.geojson"
+
+    export_geojson(gdf, [str(latest), str(versioned)], precision=5)
+
+    assert latest.read_bytes() == versioned.read_bytes()
+    collection = json.loads(latest.read_text())
+    first, second = collection["features"]
+    assert first["properties"]["composite_score"] == 0.1235
+    assert first["properties"]["primary_strengths"] == '["Employment Gravity"]'
+    assert first["properties"]["uncertainty_reasons"] == '["sparse_data"]'
+    assert first["properties"]["updated_at"] == "2026-01-02T03:04:05"
+    assert first["properties"]["coverage_years"] == 5
+    assert first["geometry"]["coordinates"][0][0] == [-76.12346, 39.1]
+    assert second["properties"]["composite_score"] is None
+    assert second["properties"]["coverage_years"] is None
+    assert second["properties"]["primary_strengths"] == "[]"
+    assert second["geometry"] is None
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_output_is_readable_by_gdal(tmp_path):
+    gdf = _gdf().iloc[:1]
+    path = tmp_path / "counties.geojson"
+
+    write_geojson(gdf, [str(path)])
+    roundtrip = gpd.read_file(path)
+
+    assert roundtrip["fips_code"].tolist() == ["24001"]
+    assert roundtrip.geometry.iloc[0].equals_exact(gdf.geometry.iloc[0], tolerance=1e-6)
+
+
+def test_geometry_precision_is_quantized():
+    encoded = geometry_json([Point(-76.987654321, 39.123456789)], precision=3)
+
+    assert json.loads(encoded[0]) == {"type": "Point", "coordinates": [-76.988, 39.123]}
@@ -0,0 +1,154 @@
+import json
+import os
+
+import geopandas as gpd
+import pandas as pd
+import pytest
+import shapely
+from shapely.geometry import box
+
+import src.export.tract_export as te
+from src.export.tract_export import (
+    TRACT_PROPERTIES,
+    ExportBudgetError,
+    ZoomBand,
+    prune_tract_properties,
+    simplify_coverage,
+    write_tract_artifacts,
+)
+
+
+def _wavy_square(x0, y0, size=0.1, steps=200):
+    """Square whose top edge is a dense zig-zag (lots of removable vertices)."""
+    top = [
+        (x0 + size * i / steps, y0 + size + (0.0005 if i % 2 else 0.0)) for i in range(steps + 1)
+    ]
+    return shapely.Polygon([(x0, y0), (x0 + size, y0)] + top[::-1] + [(x0, y0)])
+
+
+def _tracts():
+    return gpd.GeoDataFrame(
+        {
+            "geoid": ["24001000100", "24001000200"],
+            "fips_code": ["24001", "24001"],
+            "data_year": [2024, 2025],
+            "employment_gravity_score": [0.123456, None],
+            "unused_column": ["x", "y"],
+        },
+        geometry=[_wavy_square(-76.5, 39.0), box(-76.4, 39.0, -76.3, 39.1)],
+        crs="EPSG:4326",
+    )
+
+
+BANDS = (
+    ZoomBand("low", 0, 7, tolerance=0.01, precision=3, budget_kb=64),
+    ZoomBand("high", 8, 22, tolerance=0.00001, precision=6, budget_kb=64),
+)
+
+
+def test_properties_are_pruned_and_rounded():
+    pruned = prune_tract_properties(_tracts())
+
+    assert list(pruned.columns) == TRACT_PROPERTIES + ["geometry"]
+    assert pruned["employment_gravity_score"].iloc[0] == 0.123
+    assert pruned["risk_drag_score"].isna().all()
+
+
+def test_coverage_simplification_drops_vertices_and_keeps_polygons_valid():
+    tracts = _tracts()
+    simplified = simplify_coverage(tracts.geometry, 0.01)
+
+    assert (
+        shapely.get_num_coordinates(simplified.values).sum()
+        < shapely.get_num_coordinates(tracts.geometry.values).sum() / 10
+    )
+    assert simplified.is_valid.all()
+
+
+def test_writes_one_artifact_per_band_with_size_report(tmp_path):
+    report = write_tract_artifacts(
+        prune_tract_properties(_tracts()), str(tmp_path), bands=BANDS, version="20260101"
+    )
+
+    low, high = report
+    assert low["vertices"] < high["vertices"]
+    assert low["raw_bytes"] < high["raw_bytes"]
+    assert all(entry["within_budget"] for entry in report)
+    assert (tmp_path / "md_tracts_low_latest.geojson.gz").exists()
+    assert (tmp_path / "md_tracts_high_20260101.geojson").exists()
+    assert not list(tmp_path.glob(".*staging*"))
+
+    features = json.loads((tmp_path / "md_tracts_low_latest.geojson").read_text())["features"]
+    assert set(features[0]["properties"]) == set(TRACT_PROPERTIES)
+    manifest = json.loads((tmp_path / "md_tracts_manifest.json").read_text())
+    assert [a["path"] for a in manifest["artifacts"]] == [
+        "md_tracts_low_latest.geojson",
+        "md_tracts_high_latest.geojson",
+    ]
+
+
+def test_dated_versions_link_content_addressed_files(tmp_path):
+    report = write_tract_artifacts(
+        prune_tract_properties(_tracts()), str(tmp_path), bands=BANDS, version="20260101"
+    )
+
+    for entry in report:
+        assert os.path.basename(entry["immutable_path"]) == (
+            f"md_tracts_{entry['resolution']}_{entry['checksum'][:16]}.geojson"
+        )
+        for suffix in ("", ".gz"):
+            assert os.path.samefile(
+                entry["versioned_path"] + suffix, entry["immutable_path"] + suffix
+            )
+
+
+def _setup_export(monkeypatch, tmp_path):
+    tracts = _tracts()
+    builds = []
+
+    def export_tileset(gdf, name, export_dir):
+        builds.append(name)
+        path = os.path.join(export_dir, f"md_{name}.mbtiles")
+        with open(path, "wb") as f:
+            f.write(b"tiles")
+        return {"path": path}
+
+    monkeypatch.setattr(te.settings, "EXPORT_DIR", str(tmp_path))
+    monkeypatch.setattr(
+        te, "fetch_latest_tract_scores", lambda: pd.DataFrame(tracts.drop(columns="geometry"))
+    )
+    monkeypatch.setattr(
+        te, "fetch_maryland_tract_boundaries", lambda: tracts[["geoid", "geometry"]]
+    )
+    monkeypatch.setattr(te, "log_refresh", lambda **kwargs: None)
+    monkeypatch.setattr(te, "export_tileset", export_tileset)
+    return builds
+
+
+@pytest.mark.parametrize(
+    "artifact",
+    ["md_tracts_low_latest.geojson.gz", "md_tracts_high_latest.geojson", "md_tracts.mbtiles"],
+)
+def test_missing_or_stale_artifact_triggers_rebuild(monkeypatch, tmp_path, artifact):
+    builds = _setup_export(monkeypatch, tmp_path)
+
+    assert te.run_tract_export()["skipped"] is False
+    assert te.run_tract_export()["skipped"] is True
+
+    (tmp_path / artifact).unlink()
+    assert te.run_tract_export()["skipped"] is False
+    assert (tmp_path / artifact).exists()
+
+    # Rewritten in place: same name, different bytes
+    (tmp_path / artifact).write_bytes(b"stale")
+    assert te.run_tract_export()["skipped"] is False
+    assert len(builds) == 3
+
+
+def test_over_budget_export_fails_without_publishing(tmp_path):
+    tight = (ZoomBand("high", 0, 22, tolerance=0.0, precision=6, budget_kb=0),)
+
+    with pytest.raises(ExportBudgetError, match="high"):
+        write_tract_artifacts(prune_tract_properties(_tracts()), str(tmp_path), bands=tight)
+
+    assert list(tmp_path.iterdir()) == []
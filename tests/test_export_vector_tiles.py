@@ -0,0 +1,138 @@
+import gzip
+import sqlite3
+import struct
+
+import geopandas as gpd
+from shapely.geometry import box
+
+from src.export.vector_tiles import encode_tile, tile_bounds, write_mbtiles
+
+
+def _varint(buf, pos):
+    result = shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            return result, pos
+
+
+def _fields(buf):
+    pos = 0
+    while pos < len(buf):
+        key, pos = _varint(buf, pos)
+        wire = key & 0x7
+        if wire == 0:
+            value, pos = _varint(buf, pos)
+        elif wire == 1:
+            value, pos = buf[pos : pos + 8], pos + 8
+        else:
+            length, pos = _varint(buf, pos)
+            value, pos = buf[pos : pos + length], pos + length
+        yield key >> 3, value
+
+
+def _packed(buf):
+    values, pos = [], 0
+    while pos < len(buf):
+        value, pos = _varint(buf, pos)
+        values.append(value)
+    return values
+
+
+def _unzigzag(n):
+    return (n >> 1) ^ -(n & 1)
+
+
+def _decode_layer(tile):
+    ((field, layer),) = list(_fields(tile))
+    assert field == 3
+    decoded = {"features": [], "keys": [], "values": []}
+    for number, value in _fields(layer):
+        if number == 1:
+            decoded["name"] = value.decode()
+        elif number == 5:
+            decoded["extent"] = value
+        elif number == 3:
+            decoded["keys"].append(value.decode())
+        elif number == 4:
+            ((kind, raw),) = list(_fields(value))
+            decoded["values"].append(
+                raw.decode() if kind == 1 else struct.unpack("<d", raw)[0] if kind == 3 else raw
+            )
+        elif number == 2:
+            feature = dict((n, v) for n, v in _fields(value))
+            decoded["features"].append(feature)
+    return decoded
+
+
+def _decode_rings(commands):
+    rings, x, y, i = [], 0, 0, 0
+    while i < len(commands):
+        command, count = commands[i] & 0x7, commands[i] >> 3
+        i += 1
+        if command == 7:
+            continue
+        if command == 1:
+            rings.append([])
+        for _ in range(count):
+            x += _unzigzag(commands[i])
+            y += _unzigzag(commands[i + 1])
+            rings[-1].append((x, y))
+            i += 2
+    return rings
+
+
+def test_encodes_polygon_with_attributes_and_clockwise_exterior():
+    square = box(0, 0, 100, 100)
+    tile = encode_tile(
+        "counties", [(7, square, {"fips_code": "24001", "score": 0.5, "missing": None})]
+    )
+
+    layer = _decode_layer(tile)
+    assert layer["name"] == "counties"
+    assert layer["extent"] == 4096
+    assert layer["keys"] == ["fips_code", "score"]
+    assert layer["values"] == ["24001", 0.5]
+    feature = layer["features"][0]
+    assert feature[1] == 7 and feature[3] == 3
+    assert _packed(feature[2]) == [0, 0, 1, 1]
+    (ring,) = _decode_rings(_packed(feature[4]))
+    assert sorted(ring) == [(0, 0), (0, 100), (100, 0), (100, 100)]
+    area = sum(x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in zip(ring, ring[1:] + ring[:1]))
+    assert area > 0
+
+
+def test_mbtiles_archive_covers_features_at_each_zoom(tmp_path):
+    gdf = gpd.GeoDataFrame(
+        {"fips_code": ["24001", "24003"], "composite_score": [0.5, None]},
+        geometry=[box(-77.0, 39.0, -76.5, 39.5), box(-76.5, 39.0, -76.0, 39.5)],
+        crs="EPSG:4326",
+    )
+
+    summary = write_mbtiles(gdf, str(tmp_path / "md_counties.mbtiles"), "counties", 0, 8)
+
+    conn = sqlite3.connect(summary["path"])
+    zooms = dict(
+        conn.execute("SELECT zoom_level, COUNT(*) FROM tiles GROUP BY zoom_level").fetchall()
+    )
+    metadata = dict(conn.execute("SELECT name, value FROM metadata").fetchall())
+    assert sorted(zooms) == list(range(0, 9))
+    assert summary["tiles"] == sum(zooms.values())
+    assert metadata["format"] == "pbf" and metadata["maxzoom"] == "8"
+
+    # z0 tile (TMS row 0) holds both counties; properties survive the round trip
+    (data,) = conn.execute("SELECT tile_data FROM tiles WHERE zoom_level = 0").fetchone()
+    layer = _decode_layer(gzip.decompress(data))
+    assert len(layer["features"]) == 2
+    assert "24003" in layer["values"]
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_tile_bounds_tile_the_world():
+    minx, miny, maxx, maxy = tile_bounds(1, 1, 0)
+
+    assert minx == 0 and maxy == 20037508.342789244
+    assert round(maxx - minx) == round(maxy - miny) == 20037508
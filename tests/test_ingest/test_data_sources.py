@@ -2,47 +2,48 @@
 Regression tests for data source utilities.
 
 These tests verify that:
-1. BLS QCEW fetch uses requests with timeout (not pd.read_csv directly)
+1. BLS QCEW fetch uses the shared HTTP client with timeout (not pd.read_csv directly)
 2. Timeout errors are properly caught and logged
 3. Rate limiters are properly applied
 """
 
 import pytest
 from unittest.mock import patch, MagicMock
+import httpx
 import pandas as pd
-import requests
 
 
 class TestBLSQCEWTimeout:
     """Test that BLS QCEW fetch has proper timeout handling."""
 
-    @patch('src.utils.data_sources.requests.get')
-    def test_bls_qcew_uses_requests_with_timeout(self, mock_get):
-        """BLS QCEW fetch should use requests.get with timeout."""
+    @patch('src.utils.data_sources.get_http_client')
+    def test_bls_qcew_uses_client_with_timeout(self, mock_client):
+        """BLS QCEW fetch should use the HTTP client with timeout."""
         from src.utils.data_sources import fetch_bls_qcew
 
         # Mock successful response
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.text = "area_fips,own_code,industry_code\n24001,0,10\n"
+        mock_get = mock_client.return_value.get
         mock_get.return_value = mock_response
 
         # Call with minimal area to speed up test
         fetch_bls_qcew(year=2024, quarter=1, area_codes=["001"])
 
-        # Verify requests.get was called with timeout
+        # Verify the client was called with timeout
         mock_get.assert_called()
         call_kwargs = mock_get.call_args[1]
-        assert 'timeout' in call_kwargs, "requests.get should be called with timeout"
+        assert 'timeout' in call_kwargs, "client.get should be called with timeout"
         assert call_kwargs['timeout'] == 60, "timeout should be 60 seconds"
 
-    @patch('src.utils.data_sources.requests.get')
-    def test_bls_qcew_handles_timeout_gracefully(self, mock_get):
+    @patch('src.utils.data_sources.get_http_client')
+    def test_bls_qcew_handles_timeout_gracefully(self, mock_client):
         """BLS QCEW fetch should handle timeout without crashing."""
         from src.utils.data_sources import fetch_bls_qcew
 
         # Mock timeout exception
-        mock_get.side_effect = requests.exceptions.Timeout("Connection timed out")
+        mock_client.return_value.get.side_effect = httpx.ReadTimeout("Connection timed out")
 
         # Should not raise, should return empty DataFrame
         result = fetch_bls_qcew(year=2024, quarter=1, area_codes=["001"])
@@ -50,13 +51,13 @@ class TestBLSQCEWTimeout:
         assert isinstance(result, pd.DataFrame)
         assert result.empty, "Should return empty DataFrame on timeout"
 
-    @patch('src.utils.data_sources.requests.get')
-    def test_bls_qcew_handles_connection_error(self, mock_get):
+    @patch('src.utils.data_sources.get_http_client')
+    def test_bls_qcew_handles_connection_error(self, mock_client):
         """BLS QCEW fetch should handle connection errors gracefully."""
         from src.utils.data_sources import fetch_bls_qcew
 
         # Mock connection error
-        mock_get.side_effect = requests.exceptions.ConnectionError("Connection refused")
+        mock_client.return_value.get.side_effect = httpx.ConnectError("Connection refused")
 
         # Should not raise, should return empty DataFrame
         result = fetch_bls_qcew(year=2024, quarter=1, area_codes=["001"])
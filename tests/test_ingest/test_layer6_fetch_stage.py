@@ -0,0 +1,125 @@
+"""
+Tests for the concurrent Layer 6 source fetch stage.
+
+These tests verify that:
+1. Source loaders run concurrently (wall time ~ slowest source, not the sum)
+2. Failures and per-source timeouts become data gaps instead of aborting
+   (and abandoned loaders stop making requests at their deadline)
+3. compute_risk_vulnerability merges pre-fetched sources and reports gaps
+"""
+
+import threading
+import time
+
+import httpx
+import pandas as pd
+
+import src.ingest.layer6_risk_vulnerability as layer6v
+from config.settings import MD_COUNTY_FIPS
+from src.utils.http_client import HTTPError, HttpClient, NO_RETRY
+
+
+def _county_frame(**cols):
+    df = pd.DataFrame({"fips_code": list(MD_COUNTY_FIPS.keys())})
+    for name, value in cols.items():
+        df[name] = value
+    return df
+
+
+def _sleepy(seconds, df):
+    def loader():
+        time.sleep(seconds)
+        return df
+
+    return loader
+
+
+def _boom():
+    raise RuntimeError("upstream 503")
+
+
+class TestFetchRiskSources:
+
+    def test_sources_run_concurrently(self):
+        loaders = {f"src{i}": _sleepy(0.2, _county_frame(value=i)) for i in range(5)}
+
+        start = time.monotonic()
+        results = layer6v.fetch_risk_sources(2025, loaders=loaders, max_workers=5)
+        elapsed = time.monotonic() - start
+
+        assert elapsed < 0.6, f"5 x 0.2s loaders took {elapsed:.2f}s; expected concurrent execution"
+        assert all(r.status == "ok" for r in results.values())
+        assert all(r.seconds >= 0.2 for r in results.values())
+
+    def test_failures_and_timeouts_become_gaps(self):
+        loaders = {
+            "good": _sleepy(0.0, _county_frame(value=1)),
+            "empty": lambda: pd.DataFrame(),
+            "broken": _boom,
+            "slow": _sleepy(2.0, _county_frame(value=2)),
+        }
+
+        start = time.monotonic()
+        results = layer6v.fetch_risk_sources(
+            2025, loaders=loaders, max_workers=4, timeouts={"slow": 0.2}
+        )
+        elapsed = time.monotonic() - start
+
+        assert elapsed < 1.5
+        assert results["good"].status == "ok"
+        assert results["empty"].status == "empty"
+        assert results["broken"].status == "failed"
+        assert "upstream 503" in results["broken"].error
+        assert results["slow"].status == "timeout"
+        assert results["slow"].data.empty
+
+        summary = layer6v.summarize_source_gaps(results)
+        assert summary["data_gaps"] == ["broken", "empty", "slow"]
+        assert summary["source_status"]["good"] == "ok"
+        assert set(summary["source_errors"]) == {"broken", "slow"}
+
+    def test_timed_out_loader_stops_issuing_requests(self):
+        def slow_api(request):
+            time.sleep(0.05)
+            return httpx.Response(200, json=[])
+
+        client = HttpClient(transport=httpx.MockTransport(slow_api), retry=NO_RETRY)
+        stopped = threading.Event()
+
+        def paging_loader():
+            # Walks 100 slow pages (~5s) unless its requests are cut off
+            try:
+                for page in range(100):
+                    client.get("https://api.example.com/pages", params={"page": page})
+            except HTTPError:
+                pass
+            finally:
+                stopped.set()
+            return _county_frame(value=3)
+
+        results = layer6v.fetch_risk_sources(
+            2025, loaders={"paged": paging_loader}, max_workers=1, timeouts={"paged": 0.2}
+        )
+
+        assert results["paged"].status == "timeout"
+        assert stopped.wait(0.5), "abandoned loader kept sending requests past its budget"
+
+
+class TestComputeWithPrefetchedSources:
+
+    def test_merge_uses_fetched_sources_and_reports_gaps(self):
+        ok = lambda name, df: layer6v.SourceFetchResult(name, df, "ok", 0.1)
+        sources = {
+            "adaptive_capacity": ok("adaptive_capacity", layer6v.fetch_adaptive_capacity_metrics()),
+            "heat": ok("heat", _county_frame(heat_vulnerability_score=0.4)),
+            "slr": layer6v.SourceFetchResult("slr", pd.DataFrame(), "timeout", 5.0, "exceeded"),
+        }
+
+        df = layer6v.compute_risk_vulnerability(2025, sources=sources)
+
+        assert len(df) == len(MD_COUNTY_FIPS)
+        assert df["risk_drag_index"].between(0, 1).all()
+        assert (df["heat_vulnerability_score"] == 0.4).all()
+        report = df.attrs["source_report"]
+        assert report["data_gaps"] == ["slr"]
+        assert report["source_status"]["slr"] == "timeout"
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+
+from src.processing.classification_rules import Rule, RuleSet
+from src.processing.multiyear_classification import (
+    classification_thresholds,
+    classify_confidence_level,
+    classify_directional_status,
+    classify_geographies,
+)
+
+
+def test_rule_set_first_match_wins_with_reasons():
+    rules = RuleSet(
+        name="example",
+        rules=[
+            Rule("low", "value < LIMIT and not flagged", ("below_limit",)),
+            Rule("flagged", "flagged or value != value"),
+        ],
+        default="ok",
+    )
+    variables = {
+        "value": np.array([1.0, 1.0, 5.0, np.nan]),
+        "flagged": np.array([False, True, False, False]),
+    }
+
+    labels, reasons = rules.classify(variables, {"LIMIT": 2.0})
+
+    assert labels.tolist() == ["low", "flagged", "ok", "flagged"]
+    assert reasons == [["below_limit"], [], [], []]
+
+
+def test_not_over_scalar_operand_is_logical():
+    rules = RuleSet(
+        name="scalar_not",
+        rules=[Rule("open", "value > 0 and not CLOSED"), Rule("no_flag", "not FLAG_COUNT")],
+        default="closed",
+    )
+    variables = {"value": np.array([1.0, -1.0])}
+
+    # ~False == -1 and ~True == -2 are both truthy; `not` must negate the truth value
+    assert rules.labels(variables, {"CLOSED": False, "FLAG_COUNT": 1}).tolist() == [
+        "open",
+        "closed",
+    ]
+    assert rules.labels(variables, {"CLOSED": True, "FLAG_COUNT": 0}).tolist() == [
+        "no_flag",
+        "no_flag",
+    ]
+
+
+def test_classify_geographies_matches_row_functions():
+    layers = [
+        "employment_gravity",
+        "mobility_optionality",
+        "school_trajectory",
+        "housing_elasticity",
+        "demographic_momentum",
+    ]
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({"geoid": [f"240{i:02d}" for i in range(40)]})
+    for layer in layers + ["risk_drag"]:
+        values = rng.choice([0.1, 0.3, 0.5, 0.6, 0.9, np.nan], len(df))
+        df[f"{layer}_score"] = values
+        df[f"{layer}_coverage"] = rng.choice([1.0, 3.0, 5.0, np.nan], len(df))
+    for layer in layers[:2]:
+        df[f"{layer}_momentum"] = rng.choice([0.2, 0.5, 0.8, np.nan], len(df))
+
+    result = classify_geographies(df)
+
+    for i, row in df.iterrows():
+        assert result.loc[i, "directional_status"] == classify_directional_status(row)
+        level, reasons = classify_confidence_level(row)
+        assert result.loc[i, "confidence_level"] == level
+        assert result.loc[i, "uncertainty_reasons"] == reasons
+
+
+def test_classify_geographies_threshold_override():
+    df = pd.DataFrame(
+        {
+            "employment_gravity_score": [0.55],
+            "mobility_optionality_score": [0.55],
+            "school_trajectory_score": [0.55],
+            "housing_elasticity_score": [0.55],
+            "demographic_momentum_score": [0.55],
+            "employment_gravity_coverage": [5],
+        }
+    )
+
+    default = classify_geographies(df)
+    relaxed = classify_geographies(df, classification_thresholds({"THRESHOLD_IMPROVING_HIGH": 0.5}))
+
+    assert default.loc[0, "directional_status"] == "stable"
+    assert relaxed.loc[0, "directional_status"] == "improving"
+    assert relaxed.loc[0, "final_grouping"] == "emerging_tailwinds"
@@ -1,3 +1,5 @@
+from datetime import datetime
+
 import pytest
 
 from src.processing.feature_registry import (
@@ -5,6 +7,8 @@ from src.processing.feature_registry import (
     get_feature,
     get_primary_features,
     get_ai_dependent_features,
+    feature_coverage_by_year,
+    validate_feature_coverage,
 )
 
 
@@ -28,3 +32,84 @@ def test_get_ai_dependent_features_only_ai():
     ai_features = get_ai_dependent_features()
 
     assert all(f.requires_ai for f in ai_features)
+
+
+def test_feature_coverage_one_query_per_table():
+    from sqlalchemy import event, text
+
+    import config.database as database
+    from config.settings import MD_COUNTY_FIPS
+    from src.processing.coverage import store_coverage_snapshot
+
+    if not database.IS_EMBEDDED:
+        pytest.skip("requires a sqlite:/// DATABASE_URL")
+
+    database.init_embedded_db()
+    fips = list(MD_COUNTY_FIPS)
+    try:
+        with database.get_db() as db:
+            db.execute(
+                text(
+                    "INSERT INTO layer6_risk_drag (fips_code, data_year, risk_drag_index) "
+                    "VALUES (:fips_code, :data_year, :value)"
+                ),
+                [{"fips_code": f, "data_year": 2024, "value": 0.5} for f in fips[:10]]
+                + [{"fips_code": f, "data_year": 2025, "value": 0.5 if i < 4 else None}
+                   for i, f in enumerate(fips)],
+            )
+
+        statements = []
+
+        def count_selects(conn, cursor, statement, *args):
+            if statement.lstrip().upper().startswith("SELECT") and "sqlite_master" not in statement:
+                statements.append(statement)
+
+        event.listen(database.engine, "before_cursor_execute", count_selects)
+        try:
+            with database.get_db() as db:
+                coverage = validate_feature_coverage(db)
+        finally:
+            event.remove(database.engine, "before_cursor_execute", count_selects)
+
+        # Six layer tables exist in the embedded schema; policy_persistence does not
+        assert len(statements) == 6
+        assert coverage["risk_drag"]["risk_drag_composite"] == 10
+        assert coverage["risk_drag"]["air_quality_burden"] == 0
+        assert coverage["policy_persistence"]["federal_spending_consistency"] == 0
+
+        with database.get_db() as db:
+            by_year = [r for r in feature_coverage_by_year(db) if r["feature"] == "risk_drag_composite"]
+        assert [(r["data_year"], r["geo_count"], r["total_geos"]) for r in by_year] == [
+            (2024, 10, 10),
+            (2025, 4, len(fips)),
+        ]
+
+        report = store_coverage_snapshot()
+        summary = next(f for f in report["features"] if f["feature"] == "risk_drag_composite")
+        assert (summary["years_covered"], summary["latest_year"], summary["geo_count"]) == (2, 2025, 4)
+        with database.get_db() as db:
+            assert db.execute(text("SELECT feature_count FROM feature_coverage_snapshots")).scalar() == len(
+                report["features"]
+            )
+
+        # Expired snapshots are pruned when the next one is stored; recent ones are kept
+        with database.get_db() as db:
+            db.execute(
+                text(
+                    "INSERT INTO feature_coverage_snapshots (computed_at, feature_count, report) "
+                    "VALUES (:computed_at, 0, '{}')"
+                ),
+                [{"computed_at": datetime(2020, 1, 1)}, {"computed_at": datetime.utcnow()}],
+            )
+        store_coverage_snapshot(retention_days=30)
+        with database.get_db() as db:
+            kept = db.execute(
+                text("SELECT feature_count FROM feature_coverage_snapshots")
+            ).scalars().all()
+        assert sorted(kept) == [0] + [len(report["features"])] * 2
+    finally:
+        with database.get_db() as db:
+            tables = db.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'")).scalars().all()
+            for table in tables:
+                if not table.startswith("sqlite_"):
+                    db.execute(text(f"DROP TABLE {table}"))
@@ -2,11 +2,13 @@ import numpy as np
 import pandas as pd
 import pytest
 
+from src.processing.multiyear_classification import summary_scores_frame
 from src.processing.multiyear_scoring import (
     percentile_normalize,
     calculate_missingness_penalty,
     normalize_layer_features,
     compute_composite_scores,
+    timeseries_features_frame,
     WEIGHTS_FULL,
     WEIGHTS_NO_MOMENTUM,
 )
@@ -78,3 +80,30 @@ def test_compute_composite_scores_weights_and_penalty():
     # Row 2: level + momentum, penalty (coverage 4 -> penalty 0.1)
     expected_partial = (0.625 * 0.7 + 0.375 * 0.5) * (1 - 0.5 * 0.1)
     assert result.loc[2, "layer_overall_score"] == pytest.approx(expected_partial)
+
+
+def test_in_memory_handoff_matches_stored_precision():
+    records = [
+        {"geoid": geoid, "layer_name": layer, "as_of_year": 2025,
+         "level_latest": level, "momentum_slope": level, "stability_consistency": 2 / 3,
+         "stability_persistence": 1, "coverage_years": 5, "data_gaps": [], "window_size": 5}
+        for geoid, level in (("24003", 0.3333333), ("24001", 0.1234567))
+        for layer in ("risk_drag", "employment_gravity")
+    ]
+
+    features = timeseries_features_frame(records)
+
+    assert features[["geoid", "layer_name"]].values.tolist() == [
+        ["24001", "employment_gravity"], ["24001", "risk_drag"],
+        ["24003", "employment_gravity"], ["24003", "risk_drag"],
+    ]
+    assert "data_gaps" not in features.columns
+    assert features["level_latest"].tolist() == [0.123457, 0.123457, 0.333333, 0.333333]
+    assert features["stability_consistency"].iloc[0] == 0.6667
+
+    scores = compute_composite_scores(normalize_layer_features(features))
+    wide = summary_scores_frame(scores)
+
+    assert wide["geoid"].tolist() == ["24001", "24003"]
+    # 0.5 * level + 0.3 * momentum + 0.2 * 0.6667, rounded like NUMERIC(5,4)
+    assert wide["employment_gravity_score"].tolist() == [0.5333, 0.9333]
@@ -7,6 +7,10 @@ from src.processing.normalization import (
     robust_zscore_normalize,
     minmax_normalize,
     normalize_feature,
+    normalize_features_frame,
+    fetch_layer_data,
+    normalize_all_layers,
+    store_normalized_features,
 )
 from src.processing.feature_registry import Directionality, NormMethod, FeatureDefinition
 
@@ -98,3 +102,100 @@ def test_normalize_feature_success_with_nan_padding():
     assert result.loc[0] == pytest.approx(1 / 3)
     assert result.loc[1] == pytest.approx(2 / 3)
     assert result.loc[2] == pytest.approx(1.0)
+
+
+def test_normalize_features_frame_matches_per_feature():
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({
+        "a": rng.normal(size=12),
+        "b": rng.lognormal(size=12),
+        "c": rng.random(12),
+        "flat": [2.0] * 12,
+        "sparse": [1.0, 2.0] + [np.nan] * 10,
+    })
+    df.loc[[1, 7], "a"] = np.nan
+
+    def feature(name, column, method, directionality=Directionality.POSITIVE):
+        return FeatureDefinition(
+            name=name,
+            layer="test_layer",
+            source_table="test_table",
+            source_column=column,
+            directionality=directionality,
+            norm_method=method,
+            unit="unit",
+            description="desc",
+        )
+
+    features = [
+        feature("a_pct", "a", NormMethod.PERCENTILE),
+        feature("a_neg", "a", NormMethod.PERCENTILE, Directionality.NEGATIVE),
+        feature("b_robust", "b", NormMethod.ROBUST_ZSCORE, Directionality.NEGATIVE),
+        feature("c_minmax", "c", NormMethod.MINMAX),
+        feature("flat_robust", "flat", NormMethod.ROBUST_ZSCORE),
+        feature("flat_minmax", "flat", NormMethod.MINMAX, Directionality.NEGATIVE),
+        feature("sparse", "sparse", NormMethod.PERCENTILE),
+        feature("missing", "missing_col", NormMethod.PERCENTILE),
+    ]
+
+    result = normalize_features_frame(df, features)
+
+    for f in features:
+        pd.testing.assert_series_equal(
+            result[f.name], normalize_feature(df, f), check_names=False, check_dtype=False
+        )
+
+
+def test_normalization_reads_registry_columns_and_bulk_stores():
+    from sqlalchemy import text
+
+    import config.database as database
+    from config.settings import MD_COUNTY_FIPS
+
+    if not database.IS_EMBEDDED:
+        pytest.skip("requires a sqlite:/// DATABASE_URL")
+
+    database.init_embedded_db()
+    try:
+        with database.get_db() as db:
+            db.execute(
+                text(
+                    "INSERT INTO layer1_employment_gravity "
+                    "(fips_code, data_year, economic_opportunity_index, economic_opportunity_index_effective) "
+                    "VALUES (:fips_code, :data_year, :value, :value)"
+                ),
+                [
+                    {"fips_code": fips, "data_year": year, "value": i / 10}
+                    for i, fips in enumerate(MD_COUNTY_FIPS)
+                    for year in (2024, 2025)
+                ],
+            )
+
+        df = fetch_layer_data("employment_gravity")
+        # Only registry columns present in the table are selected
+        assert list(df.columns) == ["fips_code", "data_year", "economic_opportunity_index"]
+        assert set(df["data_year"]) == {2025}
+
+        normalized = normalize_all_layers()
+        assert normalized["mobility_optionality"].empty
+        layer = normalized["employment_gravity"]
+        assert layer["economic_opportunity_index_normalized"].notna().all()
+        assert layer["employment_sector_diversity_normalized"].isna().all()
+
+        store_normalized_features(normalized, 2025)
+        store_normalized_features(normalized, 2025)
+
+        with database.get_db() as db:
+            rows = db.execute(text(
+                "SELECT feature_name, COUNT(*), MAX(normalized_value) FROM normalized_features GROUP BY feature_name"
+            )).fetchall()
+        assert [(name, count) for name, count, _ in rows] == [
+            ("economic_opportunity_index", len(MD_COUNTY_FIPS))
+        ]
+        assert rows[0][2] == pytest.approx(1.0)
+    finally:
+        with database.get_db() as db:
+            tables = db.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'")).scalars().all()
+            for table in tables:
+                if not table.startswith("sqlite_"):
+                    db.execute(text(f"DROP TABLE {table}"))
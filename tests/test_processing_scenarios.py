@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.processing.multiyear_classification import summary_scores_frame
+from src.processing.multiyear_scoring import compute_composite_scores, normalize_layer_features
+from src.processing.scenarios import ScenarioError, build_baseline, evaluate_scenario
+
+LAYERS = [
+    "employment_gravity",
+    "mobility_optionality",
+    "school_trajectory",
+    "housing_elasticity",
+    "demographic_momentum",
+    "risk_drag",
+]
+
+
+def _baseline():
+    rng = np.random.default_rng(11)
+    geoids = [f"240{i:02d}" for i in range(1, 25)]
+    features = pd.DataFrame(
+        [(g, layer) for g in geoids for layer in LAYERS], columns=["geoid", "layer_name"]
+    )
+    n = len(features)
+    features["as_of_year"] = 2025
+    features["level_latest"] = rng.random(n)
+    features["momentum_slope"] = np.where(rng.random(n) < 0.3, np.nan, rng.normal(size=n))
+    features["stability_consistency"] = np.where(rng.random(n) < 0.3, np.nan, rng.random(n))
+    features["coverage_years"] = rng.choice([2, 3, 4, 5], n)
+
+    # Stored summary scores are what the pipeline would have written (NUMERIC(5,4))
+    stored = compute_composite_scores(normalize_layer_features(features))
+    summary = summary_scores_frame(stored)
+    return build_baseline(features, summary, 2025)
+
+
+def test_scenario_without_overrides_matches_baseline():
+    result = evaluate_scenario(_baseline())
+
+    assert result["as_of_year"] == 2025
+    assert len(result["results"]) == 24
+    assert result["changes"] == []
+    assert result["summary"]["changed"] == 0
+    for row in result["results"]:
+        assert row["composite_score"] == row["baseline_composite_score"]
+        assert row["final_grouping"] == row["baseline_final_grouping"]
+
+
+def test_scenario_overrides_report_changed_classifications():
+    baseline = _baseline()
+
+    result = evaluate_scenario(
+        baseline,
+        component_weights={"momentum": 0.0, "stability": 0.0},
+        layer_weights={"school_trajectory": 3.0},
+        thresholds={"THRESHOLD_IMPROVING_HIGH": 0.35, "THRESHOLD_IMPROVING_MIN_LAYERS": 2},
+    )
+
+    assert result["parameters"]["component_weights"] == {
+        "level": 1.0,
+        "momentum": 0.0,
+        "stability": 0.0,
+    }
+    assert result["parameters"]["layer_weights"]["school_trajectory"] == 3.0
+    assert result["parameters"]["thresholds"]["THRESHOLD_IMPROVING_HIGH"] == 0.35
+    assert result["summary"]["changed"] > 0
+
+    changed = {row["geoid"] for row in result["results"] if row["changed"]}
+    assert {change["geoid"] for change in result["changes"]} == changed
+    for change in result["changes"]:
+        assert change["baseline"] != change["scenario"]
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"thresholds": {"NOT_A_THRESHOLD": 1}},
+        {"layer_weights": {"risk_drag": 1.0}},
+        {"component_weights": {"level": -1.0}},
+        {"layer_weights": {layer: 0.0 for layer in LAYERS[:5]}},
+    ],
+)
+def test_scenario_rejects_invalid_parameters(kwargs):
+    with pytest.raises(ScenarioError):
+        evaluate_scenario(_baseline(), **kwargs)
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.processing.feature_registry import FEATURES_BY_LAYER
+from src.processing.multiyear_scoring import percentile_normalize
+from src.processing.scoring_kernel import (
+    composite_scores,
+    grouped_percentile_rank,
+    layer_feature_weights,
+    missingness_penalty,
+    weighted_layer_scores,
+    weights_to_dicts,
+)
+
+
+def test_weighted_layer_scores_all_layers_at_once():
+    layers = ["employment_gravity", "mobility_optionality"]
+    columns, weights, layer_index = layer_feature_weights(layers)
+
+    assert len(columns) == sum(len(FEATURES_BY_LAYER[layer]) for layer in layers)
+
+    rng = np.random.default_rng(7)
+    values = rng.random((6, len(columns)))
+    values[0, :] = np.nan  # no data at all
+    values[1, layer_index == 1] = np.nan  # no mobility data
+    values[2, 0] = np.nan  # one employment feature missing
+
+    scores, coverage = weighted_layer_scores(values, weights, layer_index)
+
+    assert scores.shape == coverage.shape == (6, 2)
+    assert np.isnan(scores[0]).all()
+    assert (coverage[0] == 0.0).all()
+    assert np.isnan(scores[1, 1])
+
+    for row in range(1, 6):
+        for layer in range(2):
+            cols = layer_index == layer
+            mask = cols & ~np.isnan(values[row])
+            if not mask.any():
+                continue
+            expected = np.average(values[row, mask], weights=weights[mask])
+            assert scores[row, layer] == pytest.approx(expected)
+            assert coverage[row, layer] == pytest.approx(mask.sum() / cols.sum())
+
+
+def test_grouped_percentile_rank_matches_per_group_ranking():
+    df = pd.DataFrame(
+        {
+            "layer_name": ["a", "a", "a", "b", "b", "b"],
+            "level_latest": [3.0, 1.0, np.nan, 5.0, 5.0, 2.0],
+        }
+    )
+
+    ranks = grouped_percentile_rank(df[["level_latest"]], df["layer_name"])
+
+    for layer, group in df.groupby("layer_name"):
+        expected = percentile_normalize(group["level_latest"])
+        pd.testing.assert_series_equal(
+            ranks.loc[group.index, "level_latest"], expected, check_names=False
+        )
+
+
+def test_composite_scores_vectorized_cases():
+    components = np.array(
+        [
+            [0.8, 0.6, 0.4],
+            [0.6, np.nan, np.nan],
+            [0.7, 0.5, np.nan],
+            [np.nan, 0.5, 0.5],
+        ]
+    )
+    coverage = np.array([5, 2, 4, 5])
+
+    scores, weights, penalty = composite_scores(components, coverage)
+
+    np.testing.assert_allclose(penalty, missingness_penalty(coverage))
+    assert scores[0] == pytest.approx(0.5 * 0.8 + 0.3 * 0.6 + 0.2 * 0.4)
+    assert scores[1] == pytest.approx(0.6 * (1 - 0.5 * 0.6))
+    assert scores[2] == pytest.approx((0.625 * 0.7 + 0.375 * 0.5) * (1 - 0.5 * 0.1))
+    assert np.isnan(scores[3])
+
+    dicts = weights_to_dicts(weights)
+    assert dicts[1] == {"level": 1.0, "momentum": 0.0, "stability": 0.0}
+    assert dicts[3] is None
@@ -0,0 +1,93 @@
+import numpy as np
+
+from src.processing.multiyear_classification import classification_thresholds
+from src.processing.multiyear_scoring import WEIGHTS_FULL
+from src.processing.scenarios import evaluate_scenario
+from src.processing.scoring_kernel import COMPONENTS
+from src.processing.sensitivity import (
+    PERTURBED_THRESHOLDS,
+    POSITIVE_LAYERS,
+    SensitivitySamples,
+    composite_ranks,
+    evaluate_batch,
+    run_sensitivity_analysis,
+    sample_parameters,
+)
+from tests.test_processing_scenarios import _baseline
+
+
+def test_batched_scenarios_match_single_scenario_engine():
+    baseline = _baseline()
+    samples = sample_parameters(8, concentration=20.0, threshold_jitter=0.1, seed=5)
+
+    batch = evaluate_batch(baseline, samples)
+
+    assert batch["final_grouping"].shape == (8, 24)
+    for i in range(8):
+        single = evaluate_scenario(
+            baseline,
+            component_weights=dict(zip(COMPONENTS, samples.component_weights[i])),
+            layer_weights=dict(zip(POSITIVE_LAYERS, samples.layer_weights[i])),
+            thresholds={name: float(values[i]) for name, values in samples.thresholds.items()},
+        )
+        assert batch["final_grouping"][i].tolist() == [
+            r["final_grouping"] for r in single["results"]
+        ]
+        assert batch["directional_status"][i].tolist() == [
+            r["directional_status"] for r in single["results"]
+        ]
+        np.testing.assert_allclose(
+            np.round(batch["composite_score"][i], 4),
+            [r["composite_score"] for r in single["results"]],
+            atol=1e-4,
+        )
+
+
+def test_unperturbed_draw_reproduces_baseline():
+    baseline = _baseline()
+    base = classification_thresholds()
+    samples = SensitivitySamples(
+        component_weights=np.array([[WEIGHTS_FULL[name] for name in COMPONENTS]]),
+        layer_weights=np.ones((1, len(POSITIVE_LAYERS))),
+        thresholds={name: np.array([base[name]]) for name in PERTURBED_THRESHOLDS},
+    )
+
+    batch = evaluate_batch(baseline, samples)
+    single = evaluate_scenario(baseline)
+
+    assert single["changes"] == []
+    assert batch["final_grouping"][0].tolist() == [r["final_grouping"] for r in single["results"]]
+    assert batch["directional_status"][0].tolist() == [
+        r["directional_status"] for r in single["results"]
+    ]
+    assert np.round(batch["composite_score"][0], 4).tolist() == [
+        r["composite_score"] for r in single["results"]
+    ]
+    assert batch["final_grouping"][0].tolist() == baseline.classified["final_grouping"].tolist()
+
+
+def test_composite_ranks_descending_with_nan():
+    ranks = composite_ranks(np.array([[0.2, np.nan, 0.9, 0.5]]))
+    assert ranks[0, 0] == 3 and ranks[0, 2] == 1 and ranks[0, 3] == 2
+    assert np.isnan(ranks[0, 1])
+
+
+def test_sensitivity_summary_intervals_and_frequencies():
+    baseline = _baseline()
+    summary = run_sensitivity_analysis(baseline, sample_parameters(300, seed=1), chunk_size=128)
+
+    assert len(summary) == 24
+    assert (summary["n_scenarios"] == 300).all()
+    assert (summary["rank_p05"] <= summary["rank_median"]).all()
+    assert (summary["rank_median"] <= summary["rank_p95"]).all()
+    assert summary["grouping_stability"].between(0, 1).all()
+    for freqs, stability, grouping in zip(
+        summary["grouping_frequencies"], summary["grouping_stability"], summary["baseline_grouping"]
+    ):
+        assert abs(sum(freqs.values()) - 1.0) < 1e-3
+        assert abs(freqs.get(grouping, 0.0) - stability) < 1e-3
+
+    # Without any perturbation every classification is perfectly stable
+    still = sample_parameters(50, concentration=1e9, threshold_jitter=0.0, seed=2)
+    stable = run_sensitivity_analysis(baseline, still)
+    assert (stable["grouping_stability"] == 1.0).all()
@@ -69,3 +69,35 @@ def test_compute_layer_timeseries_features_full_window(monkeypatch):
     assert result["level_latest"] == pytest.approx(5.0)
     assert result["level_baseline"] == pytest.approx(1.0)
     assert result["stability_persistence"] == 4
+
+
+def test_compute_series_features_matches_per_geography(monkeypatch):
+    rng = np.random.default_rng(11)
+    rows = []
+    for g in range(60):
+        for layer in ("employment_gravity", "risk_drag"):
+            years = np.sort(rng.choice(np.arange(2020, 2027), rng.integers(1, 7), replace=False))
+            values = np.round(rng.random(len(years)), 1) if g % 3 else rng.normal(size=len(years))
+            rows += [(f"24{g:03d}", layer, int(y), float(v)) for y, v in zip(years, values)]
+    observations = pd.DataFrame(rows, columns=["geoid", "layer_name", "year", "value"])
+
+    batch = tf.compute_series_features(observations, window_size=5, as_of_year=2025)
+    assert [(r["geoid"], r["layer_name"]) for r in batch] == sorted(
+        set(zip(observations["geoid"], observations["layer_name"]))
+    )
+
+    for record in batch:
+        data = observations[
+            (observations["geoid"] == record["geoid"]) & (observations["layer_name"] == record["layer_name"])
+        ].sort_values("year")[["year", "value"]]
+        monkeypatch.setattr(tf, "extract_timeseries_data", lambda *args, **kwargs: data)
+        expected = tf.compute_layer_timeseries_features(
+            record["geoid"], record["layer_name"], "table", "metric", window_size=5, as_of_year=2025
+        )
+
+        assert record.keys() == expected.keys()
+        for key, value in expected.items():
+            if isinstance(value, float):
+                assert record[key] == pytest.approx(value, nan_ok=True), key
+            else:
+                assert record[key] == value, key
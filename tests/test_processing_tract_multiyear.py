@@ -0,0 +1,129 @@
+import re
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sqlalchemy import text
+
+import config.database as database
+from config.settings import MD_COUNTY_FIPS
+from src.processing.timeseries_features import tract_timeseries_layer_configs
+from src.processing.tract_multiyear import run_tract_pipeline
+
+
+@pytest.fixture
+def tract_db():
+    if not database.IS_EMBEDDED:
+        pytest.skip("requires a sqlite:/// DATABASE_URL")
+
+    database.init_embedded_db()
+    rng = np.random.default_rng(2)
+    fips = list(MD_COUNTY_FIPS)
+    tracts = [f"{fips[i % len(fips)]}{i:06d}" for i in range(60)]
+    with database.get_db() as db:
+        for config in tract_timeseries_layer_configs().values():
+            db.execute(
+                text(
+                    f"INSERT INTO {config['table']} "
+                    f"(tract_geoid, fips_code, data_year, {config['metric']}) "
+                    "VALUES (:tract, :fips_code, :data_year, :value)"
+                ),
+                [
+                    {
+                        "tract": t,
+                        "fips_code": t[:5],
+                        "data_year": year,
+                        "value": float(rng.random()),
+                    }
+                    for t in tracts
+                    for year in range(2019, 2026)
+                    if rng.random() > 0.2
+                ],
+            )
+    yield tracts
+
+    with database.get_db() as db:
+        tables = (
+            db.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'")).scalars().all()
+        )
+        for table in tables:
+            if not table.startswith("sqlite_"):
+                db.execute(text(f"DROP TABLE {table}"))
+
+
+def test_run_tract_pipeline_stores_tract_tables(tract_db):
+    classifications = run_tract_pipeline(as_of_year=2025)
+
+    assert sorted(classifications["geoid"]) == sorted(tract_db)
+    assert classifications["composite_score"].between(0, 1).all()
+
+    # Rerunning replaces rather than duplicates
+    run_tract_pipeline(as_of_year=2025)
+
+    with database.get_db() as db:
+        features = db.execute(
+            text(
+                "SELECT COUNT(*), COUNT(DISTINCT geoid) FROM layer_timeseries_features_tract "
+                "WHERE as_of_year = 2025"
+            )
+        ).one()
+        scores = db.execute(
+            text(
+                "SELECT COUNT(*), MIN(layer_level_score), MAX(layer_level_score) "
+                "FROM layer_summary_scores_tract"
+            )
+        ).one()
+        synthesis = db.execute(
+            text(
+                "SELECT geoid, fips_code, final_grouping FROM final_synthesis_current_tract "
+                "ORDER BY geoid"
+            )
+        ).fetchall()
+
+    assert features == (len(tract_db) * 6, len(tract_db))
+    assert scores[0] == len(tract_db) * 6
+    assert 0 < scores[1] and scores[2] == pytest.approx(1.0)
+    assert [row.geoid for row in synthesis] == sorted(tract_db)
+    assert all(row.fips_code == row.geoid[:5] for row in synthesis)
+    assert {row.final_grouping for row in synthesis} == set(classifications["final_grouping"])
+
+
+def _declared_precision(table):
+    migration = Path(__file__).parents[1] / "migrations" / "024_tract_multiyear_synthesis.sql"
+    sql = migration.read_text()
+    body = re.search(rf"CREATE TABLE IF NOT EXISTS {table} \((.*?)\n\);", sql, re.S).group(1)
+    return {
+        name: 10 ** (int(p) - int(s))
+        for name, p, s in re.findall(r"(\w+) NUMERIC\((\d+),(\d+)\)", body)
+    }
+
+
+def test_stored_tract_features_fit_declared_precision(tract_db):
+    # Percentile-rank series can start near 1/1475: huge percent changes and CVs
+    config = tract_timeseries_layer_configs()["employment_gravity"]
+    with database.get_db() as db:
+        db.execute(
+            text(f"UPDATE {config['table']} SET {config['metric']} = 1.0 / 1475"),
+        )
+        db.execute(
+            text(f"UPDATE {config['table']} SET {config['metric']} = 1.0 WHERE data_year = 2025"),
+        )
+
+    run_tract_pipeline(as_of_year=2025)
+
+    for table in (
+        "layer_timeseries_features_tract",
+        "layer_summary_scores_tract",
+        "final_synthesis_current_tract",
+    ):
+        limits = _declared_precision(table)
+        with database.get_db() as db:
+            for column, limit in limits.items():
+                largest = db.execute(text(f"SELECT MAX(ABS({column})) FROM {table}")).scalar()
+                assert largest is None or largest < limit, (table, column, largest)
+
+    with database.get_db() as db:
+        largest_change = db.execute(
+            text("SELECT MAX(momentum_percent_change) FROM layer_timeseries_features_tract")
+        ).scalar()
+    assert largest_change > 10_000
@@ -1,5 +1,7 @@
 import sys
+from contextlib import contextmanager
 
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -95,10 +97,16 @@ def test_run_multiyear_pipeline_success(monkeypatch):
         "store_final_synthesis",
         lambda df: calls.__setitem__("store", calls["store"] + 1),
     )
+    monkeypatch.setattr(
+        run_multiyear,
+        "refresh_read_model",
+        lambda: calls.__setitem__("read_model", calls.get("read_model", 0) + 1) or 7,
+    )
 
     assert run_multiyear.run_pipeline(as_of_year=2025) is True
     assert calls["timeseries"] == 1
     assert calls["store"] == 1
+    assert calls["read_model"] == 1
 
 
 def test_run_multiyear_pipeline_skip_flags(monkeypatch):
@@ -132,6 +140,8 @@ def test_run_multiyear_pipeline_skip_flags(monkeypatch):
         lambda df: calls.__setitem__("store", calls["store"] + 1),
     )
 
+    monkeypatch.setattr(run_multiyear, "refresh_read_model", lambda: 7)
+
     assert run_multiyear.run_pipeline(as_of_year=2025, skip_timeseries=True, skip_scoring=True) is True
     assert calls["timeseries"] == 0
     assert calls["scores"] == 0
@@ -144,3 +154,101 @@ def test_run_multiyear_pipeline_no_classifications(monkeypatch):
     monkeypatch.setattr(run_multiyear, "classify_all_counties", lambda **kwargs: pd.DataFrame())
 
     assert run_multiyear.run_pipeline(as_of_year=2025) is False
+
+
+def test_run_multiyear_pipeline_in_memory(monkeypatch):
+    calls = {"stored": [], "commits": 0}
+    session = object()
+    records = [{"geoid": "24001", "layer_name": "employment_gravity", "as_of_year": 2025,
+                "level_latest": 0.1234567, "coverage_years": 5, "data_gaps": []}]
+    scores = pd.DataFrame({"geoid": ["24001"], "layer_name": ["employment_gravity"]})
+
+    @contextmanager
+    def fake_db():
+        yield session
+        calls["commits"] += 1
+
+    def fake_scores(**kwargs):
+        assert kwargs["store"] is False
+        assert kwargs["features"]["level_latest"].tolist() == [0.123457]
+        return scores
+
+    def fake_classify(**kwargs):
+        assert kwargs["scores"] is scores
+        return pd.DataFrame(
+            {
+                "geoid": ["24001"],
+                "final_grouping": ["stable_constrained"],
+                "directional_status": ["stable"],
+                "confidence_level": ["conditional"],
+            }
+        )
+
+    def fake_store(name):
+        return lambda data, db=None: calls["stored"].append((name, db))
+
+    monkeypatch.setattr(run_multiyear, "compute_all_timeseries_features", lambda **kwargs: pytest.fail("stored step"))
+    monkeypatch.setattr(run_multiyear, "compute_timeseries_feature_records", lambda **kwargs: records)
+    monkeypatch.setattr(run_multiyear, "compute_all_layer_scores", fake_scores)
+    monkeypatch.setattr(run_multiyear, "classify_all_counties", fake_classify)
+    monkeypatch.setattr(run_multiyear, "store_timeseries_features", fake_store("features"))
+    monkeypatch.setattr(run_multiyear, "store_layer_summary_scores", fake_store("scores"))
+    monkeypatch.setattr(run_multiyear, "store_final_synthesis", fake_store("synthesis"))
+    monkeypatch.setattr(run_multiyear, "get_db", fake_db)
+    monkeypatch.setattr(run_multiyear, "log_refresh", lambda **kwargs: None)
+    monkeypatch.setattr(run_multiyear, "refresh_read_model", lambda: 7)
+
+    assert run_multiyear.run_pipeline(as_of_year=2025, in_memory=True) is True
+    assert calls["stored"] == [("features", session), ("scores", session), ("synthesis", session)]
+    assert calls["commits"] == 1
+
+
+@pytest.fixture
+def embedded_db():
+    from sqlalchemy import text
+
+    import config.database as database
+    from config.settings import MD_COUNTY_FIPS
+    from src.processing.timeseries_features import timeseries_layer_configs
+
+    if not database.IS_EMBEDDED:
+        pytest.skip("requires a sqlite:/// DATABASE_URL")
+
+    database.init_embedded_db()
+    rng = np.random.default_rng(5)
+    with database.get_db() as db:
+        for config in timeseries_layer_configs().values():
+            base = config["metric"].removesuffix("_effective")
+            db.execute(
+                text(
+                    f"INSERT INTO {config['table']} (fips_code, data_year, {base}, {base}_effective) "
+                    "VALUES (:fips_code, :data_year, :value, :value)"
+                ),
+                [
+                    {"fips_code": fips, "data_year": year, "value": float(rng.random())}
+                    for fips in MD_COUNTY_FIPS
+                    for year in range(2019, 2026)
+                    if rng.random() > 0.1
+                ],
+            )
+    yield database
+
+    with database.get_db() as db:
+        tables = db.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'")).scalars().all()
+        for table in tables:
+            if not table.startswith("sqlite_"):
+                db.execute(text(f"DROP TABLE {table}"))
+
+
+def test_run_multiyear_pipeline_embedded_backend(embedded_db):
+    from sqlalchemy import text
+
+    query = text("SELECT geoid, final_grouping, composite_score FROM final_synthesis_current ORDER BY geoid")
+    results = {}
+    for in_memory in (False, True):
+        assert run_multiyear.run_pipeline(as_of_year=2025, in_memory=in_memory) is True
+        with embedded_db.get_db() as db:
+            results[in_memory] = db.execute(query).fetchall()
+
+    assert len(results[False]) == 24
+    assert results[True] == results[False]
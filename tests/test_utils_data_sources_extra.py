@@ -1,11 +1,12 @@
-import io
-import zipfile
 from types import SimpleNamespace
 
+import httpx
 import pandas as pd
 import pytest
 
 import src.utils.data_sources as ds
+import src.utils.downloads as downloads
+from src.utils.http_client import HttpClient
 
 
 class DummyResponse:
@@ -29,6 +30,13 @@ class DummyResponse:
             yield self.content[i : i + chunk_size]
 
 
+def use_mock_transport(monkeypatch, handler):
+    client = HttpClient(transport=httpx.MockTransport(handler), async_transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(ds, "get_http_client", lambda: client)
+    monkeypatch.setattr(downloads, "get_http_client", lambda: client)
+    return client
+
+
 def test_rate_limiter_sleeps_when_called_too_fast(monkeypatch):
     limiter = ds.RateLimiter(calls_per_minute=60)  # 1 call/sec
     calls = []
@@ -50,22 +58,6 @@ def test_rate_limiter_sleeps_when_called_too_fast(monkeypatch):
     assert sleeps and sleeps[0] == pytest.approx(0.9)
 
 
-def test_read_csv_from_bytes_handles_plain_and_zip():
-    csv_bytes = b"ID,VAL\n24001,1\n24003,2\n"
-
-    plain_df = ds._read_csv_from_bytes(csv_bytes, dtype={"ID": str})
-    assert list(plain_df.columns) == ["ID", "VAL"]
-    assert plain_df["ID"].tolist() == ["24001", "24003"]
-
-    buffer = io.BytesIO()
-    with zipfile.ZipFile(buffer, mode="w") as zf:
-        zf.writestr("data.csv", csv_bytes)
-
-    zip_df = ds._read_csv_from_bytes(buffer.getvalue(), dtype={"ID": str})
-    assert list(zip_df.columns) == ["ID", "VAL"]
-    assert zip_df["ID"].tolist() == ["24001", "24003"]
-
-
 def test_candidate_ejscreen_urls_contains_expected_variants():
     urls = ds._candidate_ejscreen_urls("https://example.com", 2023)
     assert any("EJSCREEN_2023_StatePct.csv" in url for url in urls)
@@ -79,10 +71,7 @@ def test_discover_ejscreen_urls_parses_listing(monkeypatch):
     <a href="https://cdn.example.com/EJSCREEN_2023_StatePct_with_AS_CNMI_GU_VI.csv">abs</a>
     """
 
-    def fake_get(url, timeout=60):
-        return DummyResponse(status_code=200, text=html, ok=True)
-
-    monkeypatch.setattr(ds.requests, "get", fake_get)
+    use_mock_transport(monkeypatch, lambda request: httpx.Response(200, text=html))
 
     urls = ds._discover_ejscreen_urls("https://example.com", 2023)
     assert "https://example.com/2023/EJSCREEN_2023_StatePct.csv" in urls
@@ -90,12 +79,13 @@ def test_discover_ejscreen_urls_parses_listing(monkeypatch):
     assert "https://cdn.example.com/EJSCREEN_2023_StatePct_with_AS_CNMI_GU_VI.csv" in urls
 
 
-def test_fetch_epa_ejscreen_success(monkeypatch):
+def test_fetch_epa_ejscreen_success(monkeypatch, tmp_path):
     csv_bytes = b"ID,VAL\n24001,1\n11001,2\n"
 
+    monkeypatch.setattr(ds.settings, "STATE_SUBSET_CACHE_DIR", str(tmp_path))
     monkeypatch.setattr(ds, "_candidate_ejscreen_urls", lambda base, year: ["https://example.com/file.csv"])
     monkeypatch.setattr(ds, "_discover_ejscreen_urls", lambda base, year: [])
-    monkeypatch.setattr(ds.requests, "get", lambda url, timeout=120: DummyResponse(status_code=200, content=csv_bytes))
+    use_mock_transport(monkeypatch, lambda request: httpx.Response(200, content=csv_bytes))
 
     df = ds.fetch_epa_ejscreen(year=2023, lookback_years=0)
     assert df["ID"].tolist() == ["24001"]
@@ -108,11 +98,7 @@ def test_fetch_census_data_success(monkeypatch):
         ["Allegany County, MD", "100", "24", "001"],
     ]
 
-    monkeypatch.setattr(
-        ds.requests,
-        "get",
-        lambda url, params=None, timeout=30: DummyResponse(status_code=200, json_data=json_payload),
-    )
+    use_mock_transport(monkeypatch, lambda request: httpx.Response(200, json=json_payload))
 
     df = ds.fetch_census_data.__wrapped__(
         dataset="acs/acs5",
@@ -127,11 +113,7 @@ def test_fetch_census_data_success(monkeypatch):
 def test_fetch_usaspending_county_success(monkeypatch):
     payload = {"results": [{"county_name": "Allegany", "amount": 123.45}]}
 
-    monkeypatch.setattr(
-        ds.requests,
-        "post",
-        lambda url, json=None, timeout=60: DummyResponse(status_code=200, json_data=payload),
-    )
+    use_mock_transport(monkeypatch, lambda request: httpx.Response(200, json=payload))
 
     df = ds.fetch_usaspending_county.__wrapped__("2023-01-01", "2023-12-31")
     assert df.iloc[0]["county_name"] == "Allegany"
@@ -153,11 +135,7 @@ def test_download_file_success(monkeypatch, tmp_path):
     content = b"hello-world"
     file_path = tmp_path / "file.bin"
 
-    monkeypatch.setattr(
-        ds.requests,
-        "get",
-        lambda url, stream=True, timeout=300: DummyResponse(status_code=200, content=content),
-    )
+    use_mock_transport(monkeypatch, lambda request: httpx.Response(200, content=content))
 
     assert ds.download_file("https://example.com/file.bin", str(file_path))
     assert file_path.read_bytes() == content
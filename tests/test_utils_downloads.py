@@ -0,0 +1,185 @@
+import gzip
+import hashlib
+import re
+import threading
+
+import httpx
+import pytest
+
+import src.utils.downloads as downloads
+from src.utils.http_client import HttpClient
+
+BODY = bytes(range(256)) * 40  # 10,240 bytes
+
+
+class RangeServer:
+    """MockTransport handler serving BODY, honouring Range requests when enabled."""
+
+    def __init__(self, ranges=True, fail_after=None):
+        self.ranges = ranges
+        self.fail_after = fail_after
+        self.gets = []
+        self.lock = threading.Lock()
+
+    def __call__(self, request):
+        headers = {"etag": '"v1"'}
+        if self.ranges:
+            headers["accept-ranges"] = "bytes"
+        if request.method == "HEAD":
+            return httpx.Response(200, headers={**headers, "content-length": str(len(BODY))})
+
+        range_header = request.headers.get("range")
+        with self.lock:
+            self.gets.append(range_header)
+        if range_header and self.ranges:
+            start, end = re.match(r"bytes=(\d+)-(\d*)", range_header).groups()
+            start, end = int(start), int(end) if end else len(BODY) - 1
+            body, status = BODY[start : end + 1], 206
+        else:
+            body, status = BODY, 200
+        if self.fail_after is not None:
+            limit, self.fail_after = self.fail_after, None
+            return httpx.Response(status, headers=headers, stream=DroppedStream(body[:limit]))
+        return httpx.Response(status, headers=headers, content=body)
+
+
+class DroppedStream(httpx.SyncByteStream):
+    """Yields part of a body, then fails as if the connection dropped."""
+
+    def __init__(self, head):
+        self.head = head
+
+    def __iter__(self):
+        for i in range(0, len(self.head), 1000):
+            yield self.head[i : i + 1000]
+        raise httpx.ReadError("connection reset")
+
+
+class GzipRangeServer:
+    """Serves BODY gzip-encoded unless identity is honoured; Range counts encoded bytes."""
+
+    def __init__(self, honour_identity=True):
+        self.honour_identity = honour_identity
+        self.encodings = []
+        self.lock = threading.Lock()
+
+    def __call__(self, request):
+        accept = request.headers.get("accept-encoding", "")
+        with self.lock:
+            self.encodings.append(accept)
+        if self.honour_identity and accept == "identity":
+            return RangeServer()(request)
+
+        encoded = gzip.compress(BODY, mtime=0)
+        headers = {"etag": '"v1"', "accept-ranges": "bytes", "content-encoding": "gzip"}
+        if request.method == "HEAD":
+            return httpx.Response(200, headers={**headers, "content-length": str(len(encoded))})
+        range_header = request.headers.get("range")
+        if range_header:
+            start, end = re.match(r"bytes=(\d+)-(\d*)", range_header).groups()
+            start, end = int(start), int(end) if end else len(encoded) - 1
+            return httpx.Response(
+                206, headers=headers, stream=httpx.ByteStream(encoded[start : end + 1])
+            )
+        return httpx.Response(200, headers=headers, stream=httpx.ByteStream(encoded))
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    def _serve(server):
+        client = HttpClient(transport=httpx.MockTransport(server))
+        monkeypatch.setattr(downloads, "get_http_client", lambda: client)
+        return server
+
+    return _serve
+
+
+def test_large_file_is_fetched_in_parallel_segments(serve, tmp_path):
+    server = serve(RangeServer())
+    dest = tmp_path / "file.bin"
+
+    downloads.DownloadEngine(segments=4, min_segment_bytes=1024).fetch(
+        "https://example.com/file.bin", dest
+    )
+
+    assert dest.read_bytes() == BODY
+    assert sorted(server.gets) == [
+        "bytes=0-2559",
+        "bytes=2560-5119",
+        "bytes=5120-7679",
+        "bytes=7680-10239",
+    ]
+    assert not (tmp_path / "file.bin.part").exists()
+    assert not (tmp_path / "file.bin.part.json").exists()
+
+
+def test_interrupted_download_resumes_from_checkpoint(serve, tmp_path, monkeypatch):
+    server = serve(RangeServer(fail_after=4000))
+    monkeypatch.setattr(downloads, "CHUNK_SIZE", 1000)
+    monkeypatch.setattr(downloads, "CHECKPOINT_BYTES", 1000)
+    dest = tmp_path / "file.bin"
+    engine = downloads.DownloadEngine(segments=1, max_attempts=1)
+
+    with pytest.raises(downloads.DownloadError):
+        engine.fetch("https://example.com/file.bin", dest, expected_size=len(BODY))
+    assert not dest.exists()
+
+    engine.fetch("https://example.com/file.bin", dest, expected_size=len(BODY))
+
+    assert dest.read_bytes() == BODY
+    assert server.gets == [None, "bytes=4000-10239"]
+
+
+def test_checksum_mismatch_discards_file(serve, tmp_path):
+    serve(RangeServer())
+    dest = tmp_path / "file.bin"
+
+    with pytest.raises(downloads.DownloadError, match="SHA-256"):
+        downloads.DownloadEngine().fetch(
+            "https://example.com/file.bin", dest, expected_sha256="0" * 64
+        )
+
+    assert list(tmp_path.iterdir()) == []
+    good = hashlib.sha256(BODY).hexdigest()
+    assert (
+        downloads.DownloadEngine().fetch("https://example.com/file.bin", dest, expected_sha256=good)
+        == dest
+    )
+
+
+def test_server_without_range_support_uses_single_stream(serve, tmp_path):
+    server = serve(RangeServer(ranges=False))
+    dest = tmp_path / "file.bin"
+
+    downloads.DownloadEngine(segments=4, min_segment_bytes=1024).fetch(
+        "https://example.com/file.bin", dest
+    )
+
+    assert dest.read_bytes() == BODY
+    assert server.gets == [None]
+
+
+def test_segments_request_unencoded_bytes(serve, tmp_path):
+    server = serve(GzipRangeServer())
+    dest = tmp_path / "file.bin"
+
+    downloads.DownloadEngine(segments=4, min_segment_bytes=1024).fetch(
+        "https://example.com/file.bin", dest
+    )
+
+    assert dest.read_bytes() == BODY
+    assert len(server.encodings) == 5
+    assert set(server.encodings) == {"identity"}
+
+
+def test_encoded_range_responses_fall_back_to_single_stream(serve, tmp_path):
+    server = serve(GzipRangeServer(honour_identity=False))
+    dest = tmp_path / "file.bin"
+
+    # Range offsets count encoded bytes, so segments cannot be stitched together
+    downloads.DownloadEngine(segments=4, min_segment_bytes=16).fetch(
+        "https://example.com/file.bin", dest
+    )
+
+    assert dest.read_bytes() == BODY
+    assert set(server.encodings) == {"identity"}
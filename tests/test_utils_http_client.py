@@ -0,0 +1,174 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+import src.utils.data_sources as ds
+import src.utils.http_client as hc
+
+FAST_RETRY = hc.RetryPolicy(max_attempts=3, backoff_base=0.0, max_backoff=0.0)
+
+
+def _client(handler, async_handler=None, **kwargs):
+    return hc.HttpClient(
+        transport=httpx.MockTransport(handler),
+        async_transport=httpx.MockTransport(async_handler or handler),
+        retry=FAST_RETRY,
+        **kwargs,
+    )
+
+
+def test_retries_retryable_status_then_returns_response():
+    statuses = iter([503, 429, 200])
+    client = _client(lambda request: httpx.Response(next(statuses), json={"ok": True}))
+
+    response = client.get("https://api.example.com/data")
+
+    assert response.status_code == 200
+    assert response.json() == {"ok": True}
+
+
+def test_non_retryable_status_is_returned_immediately():
+    calls = []
+
+    def handler(request):
+        calls.append(request.url)
+        return httpx.Response(404)
+
+    assert _client(handler).get("https://api.example.com/missing").status_code == 404
+    assert len(calls) == 1
+
+
+def test_transport_errors_raise_after_retries():
+    def handler(request):
+        raise httpx.ConnectError("refused", request=request)
+
+    with pytest.raises(httpx.ConnectError):
+        _client(handler).get("https://api.example.com/data")
+
+
+def test_fan_out_runs_concurrently_and_preserves_order():
+    async def slow(request):
+        await asyncio.sleep(0.2)
+        return httpx.Response(200, json={"n": int(request.url.params["n"])})
+
+    client = _client(lambda request: httpx.Response(500), async_handler=slow)
+    specs = [hc.RequestSpec("https://api.example.com/q", params={"n": n}) for n in range(6)]
+
+    start = time.monotonic()
+    results = client.fan_out(specs, max_concurrency=6)
+    elapsed = time.monotonic() - start
+
+    assert [r.json()["n"] for r in results] == list(range(6))
+    assert elapsed < 0.8
+
+
+def test_first_success_keeps_highest_priority_hit():
+    async def handler(request):
+        year = int(request.url.params["year"])
+        # Newest year is slow to fail, older years answer immediately
+        await asyncio.sleep(0.1 if year == 2025 else 0.0)
+        return httpx.Response(204 if year == 2025 else 200, json=[["h"], [year]])
+
+    client = _client(lambda request: httpx.Response(500), async_handler=handler)
+    specs = [
+        hc.RequestSpec("https://api.example.com/q", params={"year": y}, tag=y)
+        for y in (2025, 2024, 2023)
+    ]
+
+    hit, results = client.first_success(specs)
+
+    assert specs[hit].tag == 2024
+    assert len(results) == 3
+
+
+def test_first_success_batches_stop_at_first_hit():
+    sent = []
+
+    async def handler(request):
+        year = int(request.url.params["year"])
+        sent.append(year)
+        return httpx.Response(200 if year == 2022 else 204)
+
+    limiter = ds.RateLimiter(calls_per_minute=6000, burst=100)
+    acquired = []
+    original = limiter.acquire_async
+
+    async def counting_acquire():
+        acquired.append(1)
+        await original()
+
+    limiter.acquire_async = counting_acquire
+    client = _client(lambda request: httpx.Response(500), async_handler=handler)
+    specs = [
+        hc.RequestSpec("https://api.example.com/q", params={"year": y}, tag=y)
+        for y in range(2025, 2013, -1)
+    ]
+
+    hit, results = client.first_success(specs, limiter=limiter, batch_size=4)
+
+    assert specs[hit].tag == 2022
+    assert sorted(sent, reverse=True) == [2025, 2024, 2023, 2022]
+    assert len(results) == 4 and len(acquired) == 4
+
+    assert client.first_success(specs[4:8], batch_size=2)[0] is None
+    assert len(sent) == 8
+
+
+def test_request_deadline_caps_timeouts_and_fails_fast_once_spent():
+    timeouts = []
+
+    def handler(request):
+        timeouts.append(request.extensions["timeout"]["read"])
+        return httpx.Response(503)
+
+    client = hc.HttpClient(
+        transport=httpx.MockTransport(handler),
+        async_transport=httpx.MockTransport(handler),
+        retry=hc.RetryPolicy(max_attempts=50, backoff_base=0.05),
+    )
+
+    start = time.monotonic()
+    with hc.request_deadline(0.2):
+        with pytest.raises(hc.DeadlineExceeded):
+            client.get("https://api.example.com/slow")
+        sent = len(timeouts)
+        with pytest.raises(hc.DeadlineExceeded):
+            client.get("https://api.example.com/next")
+        assert len(timeouts) == sent
+        _, results = client.first_success([hc.RequestSpec("https://api.example.com/probe")])
+        assert isinstance(results[0], hc.DeadlineExceeded)
+
+    assert time.monotonic() - start < 1.0
+    assert all(t <= 0.2 for t in timeouts)
+    # Outside the context the default timeout applies again
+    client.get("https://api.example.com/after", retry=hc.NO_RETRY)
+    assert timeouts[-1] == client.timeout
+
+
+def test_arcgis_pages_are_fetched_after_discovering_page_size(monkeypatch):
+    features = [{"attributes": {"id": i}} for i in range(25)]
+
+    def page(request):
+        params = request.url.params
+        if params.get("returnCountOnly") == "true":
+            return httpx.Response(200, json={"count": len(features)})
+        offset = int(params["resultOffset"])
+        count = min(int(params["resultRecordCount"]), 10)  # server caps pages at 10
+        chunk = features[offset : offset + count]
+        return httpx.Response(
+            200, json={"features": chunk, "exceededTransferLimit": offset + count < len(features)}
+        )
+
+    async def async_page(request):
+        return page(request)
+
+    client = _client(page, async_handler=async_page)
+    monkeypatch.setattr(ds, "get_http_client", lambda: client)
+
+    result = ds.fetch_arcgis_features(
+        "https://gis.example.com/query", {"where": "1=1", "f": "json"}, page_size=2000
+    )
+
+    assert [f["attributes"]["id"] for f in result] == list(range(25))
@@ -0,0 +1,111 @@
+import time
+
+import httpx
+import pytest
+
+import src.utils.downloads as downloads
+from src.utils.http_client import HttpClient, RetryPolicy
+from src.utils.http_replay import FixtureStore, ReplayMiss, ReplayTransport
+
+BODY = b"0123456789" * 1024
+
+
+class Upstream:
+    def __init__(self):
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append((request.method, request.headers.get("range"), str(request.url)))
+        headers = {"accept-ranges": "bytes", "etag": '"v1"'}
+        if request.method == "HEAD":
+            return httpx.Response(200, headers={**headers, "content-length": str(len(BODY))})
+        return httpx.Response(200, headers=headers, content=BODY)
+
+
+def offline(request):
+    raise AssertionError(f"network access during replay: {request.url}")
+
+
+def _client(store, mode, handler, **kwargs):
+    transport = ReplayTransport(httpx.MockTransport(handler), store=store, mode=mode, **kwargs)
+    return httpx.Client(transport=transport)
+
+
+def test_recorded_responses_replay_offline_without_credentials(tmp_path):
+    store = FixtureStore(tmp_path)
+    upstream = Upstream()
+
+    with _client(store, "auto", upstream) as client:
+        first = client.get("https://api.census.gov/data", params={"get": "NAME", "key": "secret-1"})
+        again = client.get("https://api.census.gov/data", params={"key": "secret-1", "get": "NAME"})
+    assert len(upstream.requests) == 1
+
+    with _client(store, "replay", offline) as client:
+        replayed = client.get("https://api.census.gov/data", params={"get": "NAME", "key": "other"})
+        with pytest.raises(ReplayMiss):
+            client.get("https://api.census.gov/data", params={"get": "POP"})
+
+    assert first.content == again.content == replayed.content == BODY
+    assert replayed.headers["etag"] == '"v1"'
+    assert "secret" not in "".join(p.read_text() for p in (tmp_path / "requests").iterdir())
+
+
+def test_identical_bodies_are_stored_once(tmp_path):
+    store = FixtureStore(tmp_path)
+    with _client(store, "record", Upstream()) as client:
+        client.get("https://example.com/a.csv")
+        client.get("https://example.com/b.csv")
+
+    assert len(list((tmp_path / "requests").iterdir())) == 2
+    assert len(list((tmp_path / "objects").rglob("*"))) == 2  # one shard dir + one object
+
+
+def test_segmented_download_replays_ranges_from_one_recording(tmp_path, monkeypatch):
+    store = FixtureStore(tmp_path / "store")
+    upstream = Upstream()
+    engine = downloads.DownloadEngine(segments=4, min_segment_bytes=1024)
+
+    for mode, handler in (("auto", upstream), ("replay", offline)):
+        client = HttpClient(
+            transport=ReplayTransport(httpx.MockTransport(handler), store=store, mode=mode)
+        )
+        monkeypatch.setattr(downloads, "get_http_client", lambda: client)
+        dest = engine.fetch("https://example.com/big.bin", tmp_path / f"{mode}.bin")
+        assert dest.read_bytes() == BODY
+
+    # The upstream saw one HEAD and one full GET; the four Range segments were cut from the store
+    assert sorted(m for m, _, _ in upstream.requests) == ["GET", "HEAD"]
+    assert all(r is None for _, r, _ in upstream.requests)
+
+
+def test_replay_simulates_latency_and_bandwidth(tmp_path):
+    store = FixtureStore(tmp_path)
+    with _client(store, "record", Upstream()) as client:
+        client.get("https://example.com/a.csv")
+
+    # 10 KB at 0.8 Mbit/s (100 KB/s) takes ~0.1s, plus 50ms to first byte
+    with _client(store, "replay", offline, latency_ms=50, bandwidth_mbps=0.8) as client:
+        start = time.monotonic()
+        assert client.get("https://example.com/a.csv").content == BODY
+        assert time.monotonic() - start >= 0.15
+
+
+def test_server_errors_are_retried_live_not_recorded(tmp_path):
+    store = FixtureStore(tmp_path)
+    statuses = [503, 200]
+
+    def flaky(request):
+        status = statuses.pop(0)
+        return httpx.Response(status, content=BODY if status == 200 else b"down")
+
+    client = HttpClient(
+        retry=RetryPolicy(max_attempts=2, backoff_base=0.0),
+        transport=ReplayTransport(httpx.MockTransport(flaky), store=store, mode="auto"),
+    )
+    assert client.get("https://example.com/a.csv").content == BODY
+    assert not statuses
+
+    # Only the 200 was stored: replay serves it, not the 503
+    with _client(store, "replay", offline) as replay:
+        assert replay.get("https://example.com/a.csv").status_code == 200
+    assert len(list((tmp_path / "requests").iterdir())) == 1
@@ -0,0 +1,207 @@
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+import src.utils.data_sources as ds
+
+
+def _square(object_id, x, y, size=0.05):
+    return {
+        "type": "Feature",
+        "properties": {"OBJECTID": object_id, "SFHA_TF": "T", "FLD_ZONE": "AE", "ZONE_SUBTY": None},
+        "geometry": {
+            "type": "Polygon",
+            "coordinates": [[[x, y], [x + size, y], [x + size, y + size], [x, y + size], [x, y]]],
+        },
+    }
+
+
+# One polygon straddles the x=-76.5 tile boundary
+FEATURES = [
+    _square(1, -76.9, 39.1),
+    _square(2, -76.8, 39.2),
+    _square(3, -76.7, 39.3),
+    _square(4, -76.52, 39.05),
+    _square(5, -76.3, 39.1),
+    _square(6, -76.2, 39.4),
+]
+
+
+class ArcGISStandIn:
+    """Minimal ArcGIS REST MapServer query endpoint serving FEATURES as GeoJSON."""
+
+    def __init__(self, fail_first=0, fail_after=None):
+        self.requests = []
+        self.fail_first = fail_first
+        self.fail_after = fail_after
+        self.lock = threading.Lock()
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                with stand_in.lock:
+                    stand_in.requests.append(params)
+                    n = len(stand_in.requests)
+                if n <= stand_in.fail_first or (
+                    stand_in.fail_after is not None and n > stand_in.fail_after
+                ):
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+
+                minx, miny, maxx, maxy = (float(v) for v in params["geometry"].split(","))
+                hits = []
+                for feature in FEATURES:
+                    ring = feature["geometry"]["coordinates"][0]
+                    fx0, fy0 = ring[0]
+                    fx1, fy1 = ring[2]
+                    if fx0 <= maxx and fx1 >= minx and fy0 <= maxy and fy1 >= miny:
+                        hits.append(feature)
+                offset = int(params.get("resultOffset", 0))
+                count = int(params.get("resultRecordCount", 500))
+                body = json.dumps(
+                    {"type": "FeatureCollection", "features": hits[offset : offset + count]}
+                )
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(body.encode())
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = (
+            f"http://127.0.0.1:{self.server.server_port}/arcgis/rest/services/public/NFHL/MapServer"
+        )
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _fetcher(service_url, cache_dir, **kwargs):
+    defaults = dict(
+        service_url=service_url,
+        cache_dir=str(cache_dir),
+        max_workers=4,
+        calls_per_minute=60000,
+        page_size=2,
+        max_attempts=3,
+        backoff_base=0.0,
+        max_backoff=0.0,
+        wfs_url=None,
+    )
+    defaults.update(kwargs)
+    return ds.NFHLTileFetcher(**defaults)
+
+
+def test_tiles_snap_to_shared_grid():
+    fetcher = ds.NFHLTileFetcher(grid_size=0.5, cache_dir="unused")
+    west = fetcher.tiles_for_bbox((-76.95, 39.05, -76.55, 39.45))
+    east = fetcher.tiles_for_bbox((-76.60, 39.05, -76.10, 39.45))
+    assert west == [(-154, 78)]
+    assert (-154, 78) in east
+    assert fetcher.tile_bbox((-154, 78)) == (-77.0, 39.0, -76.5, 39.5)
+
+
+def test_fetch_bboxes_dedupes_tiles_and_features(tmp_path):
+    with ArcGISStandIn() as server:
+        fetcher = _fetcher(server.url, tmp_path)
+        result = fetcher.fetch_bboxes(
+            {
+                "west": (-76.95, 39.05, -76.55, 39.45),
+                "east": (-76.60, 39.05, -76.10, 39.45),
+            }
+        )
+
+    west_ids = sorted(f["properties"]["OBJECTID"] for f in result["west"])
+    east_ids = sorted(f["properties"]["OBJECTID"] for f in result["east"])
+    assert west_ids == [1, 2, 3, 4]
+    assert east_ids == [1, 2, 3, 4, 5, 6]
+    # Two tiles, each paged once per 2 features (+ terminal short page): no tile fetched twice
+    tiles_requested = {r["geometry"] for r in server.requests}
+    assert len(tiles_requested) == 2
+    assert fetcher.stats["tiles_fetched"] == 2
+
+
+def test_cached_tiles_skip_network(tmp_path):
+    bbox = {"county": (-76.95, 39.05, -76.55, 39.45)}
+    with ArcGISStandIn() as server:
+        _fetcher(server.url, tmp_path).fetch_bboxes(bbox)
+        first_run = len(server.requests)
+        fetcher = _fetcher(server.url, tmp_path)
+        result = fetcher.fetch_bboxes(bbox)
+
+    assert len(server.requests) == first_run
+    assert fetcher.stats["cache_hits"] == 1
+    assert len(result["county"]) == 4
+
+
+def test_expired_tiles_are_fetched_again(tmp_path):
+    bbox = {"county": (-76.95, 39.05, -76.55, 39.45)}
+    with ArcGISStandIn() as server:
+        fetcher = _fetcher(server.url, tmp_path, max_age_days=30)
+        fetcher.fetch_bboxes(bbox)
+        first_run = len(server.requests)
+
+        tile_path = fetcher._tile_path((-154, 78))
+        stale = time.time() - 31 * 86400
+        os.utime(tile_path, (stale, stale))
+        assert not fetcher.is_cached((-154, 78))
+
+        fetcher = _fetcher(server.url, tmp_path, max_age_days=30)
+        result = fetcher.fetch_bboxes(bbox)
+
+    assert len(server.requests) == 2 * first_run
+    assert fetcher.stats["cache_hits"] == 0
+    assert fetcher.stats["tiles_fetched"] == 1
+    assert len(result["county"]) == 4
+    assert fetcher.is_cached((-154, 78))
+
+
+def test_interrupted_tile_resumes_from_checkpointed_pages(tmp_path):
+    bbox = {"county": (-76.95, 39.05, -76.55, 39.45)}
+    # Server dies after the first page; retries exhaust and the tile is not completed
+    with ArcGISStandIn(fail_after=1) as server:
+        fetcher = _fetcher(server.url, tmp_path, max_attempts=1)
+        assert fetcher.fetch_bboxes(bbox)["county"] == []
+    assert not fetcher.is_cached((-154, 78))
+
+    with ArcGISStandIn() as server:
+        fetcher = _fetcher(server.url, tmp_path)
+        result = fetcher.fetch_bboxes(bbox)
+        offsets = [int(r["resultOffset"]) for r in server.requests]
+
+    assert 0 not in offsets
+    assert sorted(f["properties"]["OBJECTID"] for f in result["county"]) == [1, 2, 3, 4]
+    assert fetcher.is_cached((-154, 78))
+
+
+def test_transient_errors_are_retried(tmp_path):
+    with ArcGISStandIn(fail_first=1) as server:
+        fetcher = _fetcher(server.url, tmp_path, max_workers=1)
+        result = fetcher.fetch_bboxes({"county": (-76.95, 39.05, -76.55, 39.45)})
+    assert len(result["county"]) == 4
+
+
+def test_fetch_fema_nfhl_clips_to_requested_envelope(tmp_path):
+    pytest.importorskip("geopandas")
+    with ArcGISStandIn() as server:
+        fetcher = _fetcher(server.url, tmp_path)
+        gdf = ds.fetch_fema_nfhl("MD", geometry=(-76.95, 39.05, -76.75, 39.25), fetcher=fetcher)
+
+    assert sorted(gdf["OBJECTID"].tolist()) == [1, 2]
+    assert gdf["is_real"].all()
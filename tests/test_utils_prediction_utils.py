@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import theilslopes
+from sqlalchemy import text
+
+import config.database as database
+from src.utils.prediction_utils import apply_table_predictions, predict_series
+
+
+def test_predict_series_matches_theilslopes_per_series():
+    rng = np.random.default_rng(7)
+    rows = []
+    for i in range(50):
+        years = np.sort(rng.choice(np.arange(2014, 2025), rng.integers(1, 9), replace=False))
+        rows += [(f"24{i:03d}", "index", int(year), float(rng.random())) for year in years]
+    observations = pd.DataFrame(rows, columns=["fips_code", "metric", "data_year", "value"])
+
+    result = predict_series(
+        observations, target_year=2025, min_years=3, max_extrap=2, clip=(0.0, 1.0)
+    )
+
+    expected = []
+    for fips_code, sub in observations.groupby("fips_code"):
+        years, values = sub["data_year"].to_numpy(), sub["value"].to_numpy()
+        if len(years) < 3 or years.max() >= 2025:
+            continue
+        slope, intercept, *_ = theilslopes(values, years)
+        for year in range(years.max() + 1, min(2025, years.max() + 2) + 1):
+            expected.append(
+                (fips_code, year, min(1.0, max(0.0, slope * year + intercept)), year - years.max())
+            )
+
+    assert len(expected) > 0
+    assert list(zip(result["fips_code"], result["data_year"], result["pred_years"])) == [
+        (fips_code, year, steps) for fips_code, year, _, steps in expected
+    ]
+    assert result["pred_value"].to_numpy() == pytest.approx([value for _, _, value, _ in expected])
+
+
+@pytest.fixture
+def prediction_table():
+    if not database.IS_EMBEDDED:
+        pytest.skip("requires a sqlite:/// DATABASE_URL")
+
+    metric_columns = ",\n".join(
+        f"{m} REAL, {m}_pred REAL, {m}_predicted BOOLEAN, {m}_pred_method TEXT, "
+        f"{m}_pred_years INTEGER, {m}_source TEXT, {m}_effective REAL"
+        for m in ("alpha", "beta")
+    )
+    with database.get_db() as db:
+        db.execute(text(f"""
+            CREATE TABLE prediction_test (
+                fips_code TEXT, data_year INTEGER, {metric_columns},
+                UNIQUE(fips_code, data_year)
+            )
+        """))
+        db.execute(
+            text(
+                "INSERT INTO prediction_test (fips_code, data_year, alpha, beta) "
+                "VALUES (:f, :y, :a, :b)"
+            ),
+            [
+                {"f": "24001", "y": 2020, "a": 0.1, "b": None},
+                {"f": "24001", "y": 2021, "a": 0.2, "b": None},
+                {"f": "24001", "y": 2022, "a": 0.3, "b": None},
+                {"f": "24003", "y": 2021, "a": 0.5, "b": 0.9},
+                {"f": "24003", "y": 2022, "a": 0.5, "b": 0.8},
+                {"f": "24003", "y": 2023, "a": 0.5, "b": 0.7},
+                {"f": "24003", "y": 2024, "a": 0.5, "b": None},
+            ],
+        )
+        # Earlier prediction for beta that this run does not recompute
+        db.execute(
+            text(
+                "UPDATE prediction_test SET beta_pred = 0.65, beta_predicted = TRUE "
+                "WHERE data_year = 2024"
+            )
+        )
+    yield
+    with database.get_db() as db:
+        db.execute(text("DROP TABLE prediction_test"))
+
+
+def test_apply_table_predictions_bulk_upserts_all_metrics(prediction_table):
+    counts = apply_table_predictions(
+        "prediction_test",
+        ["alpha", "beta"],
+        target_year=2025,
+        min_years=3,
+        max_extrap=2,
+        clip=(0.0, 1.0),
+        use_effective=True,
+    )
+
+    assert counts == {"alpha": 3, "beta": 2}
+    with database.get_db() as db:
+        rows = db.execute(text("""
+            SELECT fips_code, data_year, alpha_pred, alpha_pred_years,
+                   beta_pred, beta_predicted, alpha_effective
+            FROM prediction_test WHERE data_year >= 2023 ORDER BY fips_code, data_year
+        """)).fetchall()
+
+    by_key = {(row[0], row[1]): row[2:] for row in rows}
+    assert by_key[("24001", 2023)][:2] == (pytest.approx(0.4), 1)
+    assert by_key[("24001", 2024)][:2] == (pytest.approx(0.5), 2)
+    assert by_key[("24001", 2024)][4] == pytest.approx(
+        0.5
+    )  # effective falls back to the prediction
+    assert by_key[("24003", 2024)][2:4] == (pytest.approx(0.6), 1)
+    assert by_key[("24003", 2025)][0] == pytest.approx(0.5)
+    assert by_key[("24003", 2025)][2] == pytest.approx(0.5)
+    assert by_key[("24003", 2023)][4] == pytest.approx(0.5)  # observed value wins
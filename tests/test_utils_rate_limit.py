@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+import src.utils.rate_limit as rl
+
+
+class FakeClock:
+    def __init__(self, start=1000.0):
+        self.now = start
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rl.time, "time", fake.time)
+    monkeypatch.setattr(rl.time, "sleep", fake.sleep)
+    return fake
+
+
+class DummyResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+def test_burst_then_sustained_rate(clock):
+    limiter = rl.RateLimiter(calls_per_minute=60, burst=3)
+
+    for _ in range(3):
+        limiter.acquire()
+    assert clock.sleeps == []
+
+    limiter.acquire()
+    limiter.acquire()
+    assert clock.sleeps == pytest.approx([1.0, 1.0])
+
+
+def test_throttling_response_pauses_and_halves_rate(clock):
+    limiter = rl.RateLimiter(calls_per_minute=60)
+    limiter.acquire()
+
+    limiter.record_response(DummyResponse(429, {"Retry-After": "5"}))
+    assert limiter.scale == 0.5
+    limiter.acquire()
+    assert clock.sleeps[-1] == pytest.approx(5.0)
+
+    # Half rate: next token takes 2s instead of 1s
+    limiter.acquire()
+    assert clock.sleeps[-1] == pytest.approx(2.0)
+
+    for _ in range(5):
+        limiter.record_response(DummyResponse(200))
+    assert limiter.scale == pytest.approx(1.0)
+
+
+def test_sqlite_state_is_shared_between_limiters(clock, tmp_path):
+    path = str(tmp_path / "limits.sqlite")
+    worker_a = rl.RateLimiter(calls_per_minute=60, burst=2, name="census", state_path=path)
+    worker_b = rl.RateLimiter(calls_per_minute=60, burst=2, name="census", state_path=path)
+    other_api = rl.RateLimiter(calls_per_minute=60, burst=2, name="bls", state_path=path)
+
+    worker_a.acquire()
+    worker_a.acquire()
+    other_api.acquire()
+    assert clock.sleeps == []
+
+    # The shared census bucket is empty even though worker_b never called
+    worker_b.acquire()
+    assert clock.sleeps == pytest.approx([1.0])
+
+
+def test_threads_queue_behind_each_other():
+    limiter = rl.RateLimiter(calls_per_minute=1200)  # one call every 50ms
+    start = time.monotonic()
+    threads = [threading.Thread(target=limiter.acquire) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert time.monotonic() - start >= 0.2
+
+
+def test_async_functions_are_limited_without_blocking_the_loop():
+    limiter = rl.RateLimiter(calls_per_minute=1200)
+    ticks = []
+
+    @limiter
+    async def call():
+        return time.monotonic()
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.01)
+
+    async def main():
+        results = await asyncio.gather(*(call() for _ in range(4)), ticker())
+        return results[:4]
+
+    stamps = sorted(asyncio.run(main()))
+    assert stamps[-1] - stamps[0] >= 0.12
+    assert len(ticks) == 5
@@ -0,0 +1,173 @@
+import gzip
+import io
+import os
+import zipfile
+
+import httpx
+import pandas as pd
+
+import src.utils.data_sources as ds
+from tests.test_utils_data_sources_extra import use_mock_transport
+
+NATIONAL_CSV = (
+    "ID,ST_ABBR,VAL,EXTRA\n"
+    "24001000100,MD,1,x\n"
+    "11001000100,DC,2,x\n"
+    "24003000200,MD,3,x\n"
+    "51001000100,VA,4,x\n"
+    "24510000300,MD,5,x\n"
+).encode()
+
+
+def test_filters_rows_and_prunes_columns_across_chunks(tmp_path):
+    path = tmp_path / "national.csv"
+    path.write_bytes(NATIONAL_CSV)
+
+    df = ds.read_csv_filtered(
+        path,
+        row_filter=ds.maryland_row_filter(prefix_columns=["id"]),
+        columns=["val"],
+        chunksize=2,
+    )
+
+    assert df["ID"].tolist() == ["24001000100", "24003000200", "24510000300"]
+    # Filter column is kept alongside the requested ones; EXTRA/ST_ABBR are dropped
+    assert list(df.columns) == ["ID", "VAL"]
+
+
+def test_reads_preferred_zip_member_and_gzip(tmp_path):
+    zip_path = tmp_path / "national.zip"
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        zf.writestr("readme.txt", "not,data\n1,2\n")
+        zf.writestr("lihtcpub.csv", NATIONAL_CSV)
+    gz_path = tmp_path / "national.csv.gz"
+    gz_path.write_bytes(gzip.compress(NATIONAL_CSV))
+
+    row_filter = ds.maryland_row_filter(value_columns=["st_abbr"])
+    from_zip = ds.read_csv_filtered(
+        zip_path, row_filter=row_filter, member_hints=(("lihtc", "pub"),)
+    )
+    from_gz = ds.read_csv_filtered(
+        gz_path, row_filter=ds.maryland_row_filter(value_columns=["st_abbr"])
+    )
+
+    assert len(from_zip) == 3
+    assert from_gz.equals(from_zip)
+
+
+def test_falls_back_to_next_encoding():
+    content = "ID,NAME\n24001,Caf\xe9\n11001,Other\n".encode("latin-1")
+
+    df = ds.read_csv_filtered(content, row_filter=ds.maryland_row_filter(prefix_columns=["ID"]))
+
+    assert df["NAME"].tolist() == ["Caf\xe9"]
+
+
+def test_subset_cache_is_reused_until_source_changes(tmp_path):
+    path = tmp_path / "national.csv"
+    path.write_bytes(NATIONAL_CSV)
+    cache_path = tmp_path / "cache" / "national_md.csv"
+    row_filter = ds.maryland_row_filter(prefix_columns=["ID"])
+
+    ds.read_csv_filtered(path, row_filter=row_filter, cache_path=cache_path)
+    assert len(pd.read_csv(cache_path)) == 3
+
+    # Cache is newer than the source: served without rereading the national file
+    os.utime(path, (0, 0))
+    path.write_bytes(b"garbage")
+    os.utime(path, (0, 0))
+    assert len(ds.read_csv_filtered(path, row_filter=row_filter, cache_path=cache_path)) == 3
+
+    # A newer source invalidates the cache
+    path.write_bytes(NATIONAL_CSV.replace(b"51001000100,VA", b"24005000100,MD"))
+    assert (
+        len(
+            ds.read_csv_filtered(
+                path,
+                row_filter=ds.maryland_row_filter(prefix_columns=["ID"]),
+                cache_path=cache_path,
+            )
+        )
+        == 4
+    )
+
+
+def test_fetch_epa_ejscreen_serves_cached_subset(monkeypatch, tmp_path):
+    calls = []
+
+    def handler(request):
+        if request.method == "GET":
+            calls.append(str(request.url))
+        return httpx.Response(200, content=NATIONAL_CSV)
+
+    monkeypatch.setattr(ds.settings, "STATE_SUBSET_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(
+        ds, "_candidate_ejscreen_urls", lambda base, year: ["https://example.com/file.csv"]
+    )
+    monkeypatch.setattr(ds, "_discover_ejscreen_urls", lambda base, year: [])
+    use_mock_transport(monkeypatch, handler)
+
+    first = ds.fetch_epa_ejscreen(year=2023, lookback_years=0)
+    second = ds.fetch_epa_ejscreen(year=2023, lookback_years=0)
+
+    assert len(calls) == 1
+    assert (tmp_path / "ejscreen_2023_md.csv").exists()
+    assert (
+        first["ID"].tolist()
+        == second["ID"].tolist()
+        == ["24001000100", "24003000200", "24510000300"]
+    )
+    assert second["source_url"].iloc[0] == "https://example.com/file.csv"
+
+
+def test_state_subset_cache_skips_empty_unfiltered_and_expired(tmp_path):
+    cache_path = tmp_path / "national_md.csv"
+    subset = pd.DataFrame({"ID": ["24001000100"], "VAL": ["1"]})
+
+    assert ds.write_state_subset(subset.iloc[:0], cache_path) is False
+    unbound = ds.maryland_row_filter(prefix_columns=["ID"])
+    unbound.bind(["NAME", "VAL"])
+    assert ds.write_state_subset(subset, cache_path, unbound) is False
+    assert not cache_path.exists()
+
+    bound = ds.maryland_row_filter(prefix_columns=["ID"])
+    bound.bind(["ID", "VAL"])
+    assert ds.write_state_subset(subset, cache_path, bound) is True
+    assert ds.read_state_subset(cache_path)["ID"].tolist() == ["24001000100"]
+
+    forty_days_ago = cache_path.stat().st_mtime - 40 * 86400
+    os.utime(cache_path, (forty_days_ago, forty_days_ago))
+    assert ds.read_state_subset(cache_path, max_age_days=30) is None
+    assert ds.read_state_subset(cache_path, max_age_days=60) is not None
+
+    # Subsets written before empty results were rejected count as misses
+    cache_path.write_text("ID,VAL\n")
+    assert ds.read_state_subset(cache_path) is None
+
+
+def test_fetch_cdc_svi_refetches_over_empty_cached_subset(monkeypatch, tmp_path):
+    import src.ingest.layer6_risk_vulnerability as layer6
+
+    svi_csv = (
+        "FIPS,ST_ABBR,E_TOTPOP,RPL_THEMES\n"
+        "24001000100,MD,1000,0.4\n"
+        "51001000100,VA,2000,0.6\n"
+        "24003000200,MD,3000,0.8\n"
+    ).encode()
+    calls = []
+
+    def handler(request):
+        if request.method == "GET":
+            calls.append(str(request.url))
+        return httpx.Response(200, content=svi_csv)
+
+    monkeypatch.setattr(ds.settings, "STATE_SUBSET_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(layer6, "_candidate_svi_urls", lambda year: ["https://example.com/svi.csv"])
+    use_mock_transport(monkeypatch, handler)
+    (tmp_path / "cdc_svi_2022_md.csv").write_text("FIPS,ST_ABBR,svi_year,source_url\n")
+
+    df = layer6.fetch_cdc_svi_data(year=2022, lookback_years=0)
+
+    assert len(calls) == 1
+    assert df["tract_geoid"].tolist() == ["24001000100", "24003000200"]
+    assert len(pd.read_csv(tmp_path / "cdc_svi_2022_md.csv")) == 2